@@ -6,6 +6,7 @@ from datetime import datetime
 
 # Auth import
 from utils.auth import is_authenticated, login, logout, get_current_user, show_user_info_sidebar
+from utils.lazy_imports import warm_up
 
 # ========== PAGE CONFIG ==========
 st.set_page_config(
@@ -717,4 +718,6 @@ def main():
         """, unsafe_allow_html=True)
 
 if __name__ == "__main__":
+    # Import heavy page libraries (sklearn, scipy, folium, ...) in the background, once per server process
+    warm_up()
     main()
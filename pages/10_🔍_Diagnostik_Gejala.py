@@ -8,9 +8,10 @@ import json
 import os
 import uuid
 from datetime import datetime
-import google.generativeai as genai
 
 from utils.auth import require_auth, show_user_info_sidebar
+from services.reference_data_service import get_reference
+from services.plant_diagnosis_service import get_diagnosis_client
 
 st.set_page_config(page_title="Diagnostik Gejala Cerdas", page_icon="🔍", layout="wide")
 
@@ -22,88 +23,7 @@ show_user_info_sidebar()
 
 # ========== DISEASE DATABASE V2.0 (Weighted) ==========
 # Importance weights: 0.1 (low/generic) to 1.0 (pathognomonic/specific)
-DISEASE_DATABASE = {
-    "Blas Padi (Blast)": {
-        "symptoms": {
-            "Bercak coklat belah ketupat": 1.0,
-            "Pusat bercak berwarna abu-abu": 0.8,
-            "Daun mengering/terbakar": 0.4,
-            "Leher malai membusuk (neck blast)": 0.9
-        },
-        "causes": "Jamur Pyricularia oryzae",
-        "treatment": [
-            "Aplikasi fungisida sistemik (Trisiklazol/Propikonazol)",
-            "Aplikasi saat anakan maksimum dan awal berbunga",
-            "Kurangi dosis Nitrogen (Urea) sementara"
-        ],
-        "prevention": ["Gunakan varietas tahan (Inpari 32/42)", "Jarak tanam Legowo", "Perlakuan benih"],
-        "severity": "Tinggi"
-    },
-    "Hawar Daun Bakteri (Kresek)": {
-        "symptoms": {
-            "Garis kuning/jingga di tepi daun": 0.9,
-            "Eksudat bakteri (butiran kuning)": 1.0,
-            "Daun melintir dan layu": 0.7,
-            "Warna daun pucat keabu-abuan": 0.3
-        },
-        "causes": "Bakteri Xanthomonas oryzae pv. oryzae",
-        "treatment": [
-            "Semprot bakterisida/antibiotik pertanian (Kasugamisin)",
-            "Aplikasi tembaga hidroksida",
-            "Buang sumber infeksi dari lahan"
-        ],
-        "prevention": ["Benih bersertifikat", "Hindari pemupukan N berlebih", "Pengaturan air"],
-        "severity": "Tinggi"
-    },
-    "Bule Jagung (Downy Mildew)": {
-        "symptoms": {
-            "Garis khlorotik/putih memanjang": 1.0,
-            "Lapisan spora putih di bawah daun": 0.9,
-            "Pertumbuhan kerdil": 0.5,
-            "Daun kaku dan tegak": 0.7
-        },
-        "causes": "Jamur Peronosclerospora maydis",
-        "treatment": [
-            "Cabut dan musnahkan tanaman sakit segara (Erradikasi)",
-            "Aplikasi fungisida Metalaksil pada tanaman sekitar",
-            "Proteksi preventif"
-        ],
-        "prevention": ["Seed treatment dengan Metalaksil", "Waktu tanam serempak", "Rotasi tanaman"],
-        "severity": "Sangat Tinggi"
-    },
-    "Virus Kuning (Bule Cabai)": {
-        "symptoms": {
-            "Daun menguning terang (mosaik)": 1.0,
-            "Daun mengerut/mengecil": 0.8,
-            "Tanaman kerdil dan tidak berbuah": 0.7,
-            "Terdapat kutu kebul di bawah daun": 0.6
-        },
-        "causes": "Gemini Virus (Vektor: Bemisia tabaci)",
-        "treatment": [
-            "Tidak ada obat virus (Fokus kendali vektor)",
-            "Semprot insektisida Abamektin/Imidakloprid",
-            "Aplikasi pupuk mikro untuk daya tahan"
-        ],
-        "prevention": ["Gunakan mulsa perak", "Gunakan bibit sehat", "Tanaman barrier"],
-        "severity": "Sangat Tinggi"
-    },
-    "Busuk Buah Antraknosa": {
-        "symptoms": {
-            "Bercak coklat kehitaman melingkar": 1.0,
-            "Buah mengkerut dan kering": 0.8,
-            "Spora berwarna oranye/merah muda": 0.9,
-            "Bercak melekuk (sunken)": 0.7
-        },
-        "causes": "Jamur Colletotrichum spp.",
-        "treatment": [
-            "Semprot fungisida berbahan aktif Mankozeb/Kabit",
-            "Buang buah yang busuk jauh dari lahan",
-            "Kurangi kelembaban tajuk"
-        ],
-        "prevention": ["Jarak tanam longgar", " Drainase baik", "Varietas toleran"],
-        "severity": "Tinggi"
-    }
-}
+DISEASE_DATABASE = get_reference("disease_database")
 
 # ========== DESIGN SYSTEM (Premium Glassmorphism) ==========
 st.markdown("""
@@ -306,8 +226,6 @@ def main():
             st.markdown("### 🤖 Reasoning AI (Google Gemini)")
             if api_key and top['prob'] > 0.1:
                 try:
-                    genai.configure(api_key=api_key)
-                    model = genai.GenerativeModel('gemini-1.5-flash')
                     prompt = f"""
                     Sebagai ahli patologi tanaman, jelaskan mengapa gejala {symptoms} 
                     diduga kuat sebagai {top['name']} (probabilitas {top['prob']*100:.1f}%).
@@ -315,10 +233,11 @@ def main():
                     Gunakan Bahasa Indonesia yang profesional namun mudah dimengerti petani.
                     """
                     with st.spinner("AI sedang menyusun penjelasan..."):
-                        response = model.generate_content(prompt)
+                        # Cached per prompt, so reruns of this page don't call the API again
+                        reasoning = get_diagnosis_client(api_key).explain(prompt, model_name='gemini-1.5-flash')
                         st.markdown(f"""
                         <div class="glass-card" style="border-left: 5px solid #059669; background: #f0fdf4;">
-                            {response.text}
+                            {reasoning}
                         </div>
                         """, unsafe_allow_html=True)
                 except Exception as e:
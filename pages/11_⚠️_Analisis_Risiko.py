@@ -6,9 +6,10 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import GradientBoostingClassifier
-from sklearn.preprocessing import StandardScaler
+from utils.lazy_imports import lazy_attr
+LogisticRegression = lazy_attr("sklearn.linear_model", "LogisticRegression")
+GradientBoostingClassifier = lazy_attr("sklearn.ensemble", "GradientBoostingClassifier")
+StandardScaler = lazy_attr("sklearn.preprocessing", "StandardScaler")
 
 from utils.auth import require_auth, show_user_info_sidebar
 
@@ -10,15 +10,22 @@ import plotly.express as px
 from datetime import datetime
 
 # ML Imports
-from sklearn.linear_model import LinearRegression, Ridge, Lasso
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.tree import DecisionTreeRegressor
-from sklearn.preprocessing import StandardScaler, PolynomialFeatures
-from sklearn.model_selection import cross_val_score
-from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error
+from utils.lazy_imports import lazy_attr, lazy_import
+LinearRegression = lazy_attr("sklearn.linear_model", "LinearRegression")
+Ridge = lazy_attr("sklearn.linear_model", "Ridge")
+Lasso = lazy_attr("sklearn.linear_model", "Lasso")
+RandomForestRegressor = lazy_attr("sklearn.ensemble", "RandomForestRegressor")
+GradientBoostingRegressor = lazy_attr("sklearn.ensemble", "GradientBoostingRegressor")
+DecisionTreeRegressor = lazy_attr("sklearn.tree", "DecisionTreeRegressor")
+StandardScaler = lazy_attr("sklearn.preprocessing", "StandardScaler")
+PolynomialFeatures = lazy_attr("sklearn.preprocessing", "PolynomialFeatures")
+cross_val_score = lazy_attr("sklearn.model_selection", "cross_val_score")
+r2_score = lazy_attr("sklearn.metrics", "r2_score")
+mean_squared_error = lazy_attr("sklearn.metrics", "mean_squared_error")
+mean_absolute_error = lazy_attr("sklearn.metrics", "mean_absolute_error")
 
 # Stats Imports
-from scipy import stats
+stats = lazy_import("scipy.stats")
 
 from utils.auth import require_auth, show_user_info_sidebar
 
@@ -192,14 +199,15 @@ def calculate_bnt(df, col_perlakuan, col_hasil, kt_galat, db_galat, alpha=0.05):
 # ==========================================
 # 🤖 ML ENGINE (EXISTING)
 # ==========================================
+# Model factories: estimators (and sklearn itself) are only created when training runs
 AVAILABLE_MODELS = {
-    "Linear Regression": LinearRegression(),
-    "Ridge Regression": Ridge(alpha=1.0),
-    "Lasso Regression": Lasso(alpha=1.0),
+    "Linear Regression": lambda: LinearRegression(),
+    "Ridge Regression": lambda: Ridge(alpha=1.0),
+    "Lasso Regression": lambda: Lasso(alpha=1.0),
     "Polynomial Regression (deg=2)": "polynomial",
-    "Decision Tree": DecisionTreeRegressor(max_depth=5, random_state=42),
-    "Random Forest": RandomForestRegressor(n_estimators=100, max_depth=5, random_state=42),
-    "Gradient Boosting": GradientBoostingRegressor(n_estimators=100, max_depth=3, random_state=42)
+    "Decision Tree": lambda: DecisionTreeRegressor(max_depth=5, random_state=42),
+    "Random Forest": lambda: RandomForestRegressor(n_estimators=100, max_depth=5, random_state=42),
+    "Gradient Boosting": lambda: GradientBoostingRegressor(n_estimators=100, max_depth=3, random_state=42)
 }
 
 def train_and_evaluate_models(X, y, model_names):
@@ -216,7 +224,7 @@ def train_and_evaluate_models(X, y, model_names):
             y_pred = model.predict(X_poly)
             cv_scores = cross_val_score(model, X_poly, y, cv=5, scoring='r2')
         else:
-            model = AVAILABLE_MODELS[model_name]
+            model = AVAILABLE_MODELS[model_name]()
             model.fit(X_scaled, y)
             y_pred = model.predict(X_scaled)
             cv_scores = cross_val_score(model, X_scaled, y, cv=5, scoring='r2')
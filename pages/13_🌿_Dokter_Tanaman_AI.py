@@ -1,11 +1,8 @@
 import streamlit as st
-import google.generativeai as genai
-from PIL import Image
-import json
 import os
-from datetime import datetime
 
 from utils.auth import require_auth, show_user_info_sidebar
+from services.plant_diagnosis_service import DEFAULT_MODEL, DEFAULT_MODELS, get_diagnosis_client
 
 st.set_page_config(page_title="Dokter Tanaman AI (Gemini)", page_icon="🌿", layout="wide")
 
@@ -28,66 +25,17 @@ if not api_key:
         api_key = os.environ["GOOGLE_API_KEY"]
 
 # ========== GEMINI LOGIC ==========
-def get_gemini_models(api_key):
-    """Fetch available Gemini models from API"""
-    try:
-        genai.configure(api_key=api_key)
-        models = []
-        for m in genai.list_models():
-            if 'generateContent' in m.supported_generation_methods:
-                models.append(m.name)
-        return models
-    except Exception as e:
-        return []
-
-def analyze_with_gemini(image, key, model_name='models/gemini-1.5-flash'):
+def analyze_with_gemini(images, key, model_name=DEFAULT_MODEL):
     """
-    Analyze image using Google Gemini
+    Analyze uploaded images (file bytes) using Google Gemini.
+    Returns a list of (result, error) in input order.
     """
     if not key:
-        return None, "API Key belum diisi."
-        
-    try:
-        genai.configure(api_key=key)
-        model = genai.GenerativeModel(model_name)
-        
-        prompt = """
-        You are an expert agricultural plant pathologist. Analyze this image of a plant.
-        Identify if there is any disease, pest, or nutrient deficiency.
-        
-        IMPORTANT: Provide the response strictly in INDONESIAN language (Bahasa Indonesia).
-        
-        Return the result strictly in this JSON format:
-        {
-            "is_healthy": boolean,
-            "diagnosis": "Nama penyakit/hama/defisiensi atau 'Sehat' jika tidak ada (Dalam Bahasa Indonesia)",
-            "confidence": float (0.0 to 1.0),
-            "severity": "None" | "Low" | "Medium" | "High" | "Critical",
-            "symptoms_observed": ["Daftar", "gejala", "visual", "yang", "terlihat"],
-            "explanation": "Penjelasan singkat mengapa Anda membuat diagnosis ini berdasarkan bukti visual (Dalam Bahasa Indonesia).",
-            "treatment_recommendations": {
-                "immediate": ["Tindakan 1", "Tindakan 2"],
-                "short_term": ["Tindakan 1", "Tindakan 2"],
-                "prevention": ["Tindakan 1", "Tindakan 2"]
-            }
-        }
-        Do not allow markdown formatting in the response, just raw JSON.
-        """
-        
-        with st.spinner(f"🤖 Meminta analisis ke {model_name}..."):
-            # Gemini 1.5 Flash/Pro supports image directly in list
-            # Legacy models might act differently, but 'generateContent' is standard for newer ones
-            response = model.generate_content([prompt, image])
-            text_response = response.text.replace('```json', '').replace('```', '').strip()
-            
-            try:
-                data = json.loads(text_response)
-                return data, None
-            except json.JSONDecodeError:
-                return None, f"Gagal memproses respons AI: {text_response}"
-                
-    except Exception as e:
-        return None, str(e)
+        return [(None, "API Key belum diisi.")] * len(images)
+
+    client = get_diagnosis_client(key)
+    with st.spinner(f"🤖 Meminta analisis ke {model_name} ({len(images)} foto)..."):
+        return client.diagnose_batch(images, model_name=model_name)
 
 # ========== MAIN APP ==========
 st.title("🌿 Dokter Tanaman AI (Gemini)")
@@ -101,13 +49,10 @@ with st.sidebar:
     # Model Selection Logic
     available_models = []
     if api_key:
-        available_models = get_gemini_models(api_key)
+        available_models = get_diagnosis_client(api_key).list_models()
     
     # Default options if fetch fails
-    default_options = ["models/gemini-1.5-flash", "models/gemini-1.5-pro", "models/gemini-pro-vision"]
-    
-    # Merge found models
-    options = available_models if available_models else default_options
+    options = available_models if available_models else DEFAULT_MODELS
     
     selected_model = st.selectbox(
         "Pilih Model AI", 
@@ -126,30 +71,37 @@ with col1:
     st.subheader("📸 Upload Foto")
     input_method = st.radio("Metode:", ["Upload File", "Kamera"], horizontal=True)
     
-    image = None
+    uploads = []
     if input_method == "Upload File":
-        uploaded_file = st.file_uploader("Pilih foto daun/tanaman", type=['jpg', 'png', 'jpeg'])
-        if uploaded_file:
-            image = Image.open(uploaded_file)
+        uploaded_files = st.file_uploader("Pilih foto daun/tanaman (bisa lebih dari satu)", type=['jpg', 'png', 'jpeg'],
+                                          accept_multiple_files=True)
+        uploads = [(f.name, f.getvalue()) for f in uploaded_files or []]
     else:
         camera_photo = st.camera_input("Ambil foto")
         if camera_photo:
-            image = Image.open(camera_photo)
+            uploads = [("Foto kamera", camera_photo.getvalue())]
 
 with col2:
-    if image:
-        st.image(image, caption="Preview Citra", use_container_width=True)
+    if uploads:
+        if len(uploads) == 1:
+            st.image(uploads[0][1], caption="Preview Citra", use_container_width=True)
+        else:
+            st.image([data for _, data in uploads], caption=[name for name, _ in uploads], width=150)
         
         if not api_key:
             st.warning("⚠️ Masukkan Google API Key di Sidebar untuk memulai analisis.")
             
         if api_key and st.button("🔍 Analisis Sekarang", type="primary", use_container_width=True):
-            result, error = analyze_with_gemini(image, api_key, model_name=selected_model)
-            
-            if error:
-                st.error(f"Terjadi Kesalahan: {error}")
-            elif result:
-                st.session_state['last_diagnosis'] = result
+            outcomes = analyze_with_gemini([data for _, data in uploads], api_key, model_name=selected_model)
+            diagnoses = []
+            for (name, _), (result, error) in zip(uploads, outcomes):
+                if error:
+                    st.error(f"Terjadi Kesalahan ({name}): {error}")
+                elif result:
+                    diagnoses.append((name, result))
+            if diagnoses:
+                st.session_state['diagnoses'] = diagnoses
+                st.session_state['last_diagnosis'] = diagnoses[0][1]
 
 # ========== RESULTS DISPLAY ==========
 if 'last_diagnosis' in st.session_state:
@@ -157,6 +109,16 @@ if 'last_diagnosis' in st.session_state:
     
     st.divider()
     st.subheader("🎯 Hasil Diagnosis")
+
+    diagnoses = st.session_state.get('diagnoses', [])
+    if len(diagnoses) > 1:
+        st.dataframe([
+            {"Foto": name, "Diagnosis": d.get('diagnosis'), "Keparahan": d.get('severity'),
+             "Confidence": f"{(d.get('confidence') or 0)*100:.0f}%"}
+            for name, d in diagnoses
+        ], use_container_width=True, hide_index=True)
+        pick = st.selectbox("Detail untuk foto:", range(len(diagnoses)), format_func=lambda i: diagnoses[i][0])
+        data = diagnoses[pick][1]
     
     # Header Card
     severity_color = {
@@ -171,7 +133,7 @@ if 'last_diagnosis' in st.session_state:
     with c2:
         st.metric("Tingkat Keparahan", data['severity'])
     with c3:
-        st.metric("AI Confidence", f"{data['confidence']*100:.0f}%")
+        st.metric("AI Confidence", f"{(data.get('confidence') or 0)*100:.0f}%")
         
     # Explanation
     st.info(f"💡 **Analisis AI:** {data['explanation']}")
@@ -6,7 +6,8 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 from PIL import Image
-import cv2
+from utils.lazy_imports import lazy_import
+cv2 = lazy_import("cv2")
 from datetime import datetime
 
 from utils.auth import require_auth, show_user_info_sidebar
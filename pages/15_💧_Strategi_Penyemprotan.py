@@ -8,8 +8,9 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 import requests
-import folium
-from streamlit_folium import st_folium
+from utils.lazy_imports import lazy_attr, lazy_import
+folium = lazy_import("folium")
+st_folium = lazy_attr("streamlit_folium", "st_folium")
 
 from utils.auth import require_auth, show_user_info_sidebar
 
@@ -8,7 +8,8 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
-from sklearn.ensemble import RandomForestRegressor
+from utils.lazy_imports import lazy_attr
+RandomForestRegressor = lazy_attr("sklearn.ensemble", "RandomForestRegressor")
 from datetime import datetime
 import requests
 import sys
@@ -8,6 +8,7 @@ import plotly.express as px
 from datetime import datetime
 
 from utils.auth import require_auth, show_user_info_sidebar
+from services.reference_data_service import get_reference
 
 st.set_page_config(page_title="Panduan Hama & Penyakit", page_icon="🐛", layout="wide")
 
@@ -82,378 +83,8 @@ st.markdown("""
 
 # ========== DATABASE HAMA ==========
 
-HAMA_DATABASE = {
-    "Ulat Grayak (Spodoptera litura)": {
-        "kategori": "Hama Pemakan Daun",
-        "nama_latin": "Spodoptera litura",
-        "tanaman_inang": ["Padi", "Jagung", "Kedelai", "Cabai", "Tomat", "Kubis", "Bawang"],
-        "gejala": [
-            "Daun berlubang-lubang",
-            "Daun tinggal tulang daun (kerangka)",
-            "Kotoran ulat berwarna hitam di daun",
-            "Serangan dimulai dari daun muda",
-            "Populasi tinggi saat musim hujan"
-        ],
-        "ciri_hama": {
-            "Telur": "Kelompok, ditutupi bulu coklat, 100-300 butir/kelompok",
-            "Larva": "Warna hijau-coklat-hitam, garis kuning di punggung, 3-4 cm",
-            "Pupa": "Di dalam tanah, coklat kehitaman",
-            "Dewasa": "Ngengat coklat, sayap 3-4 cm"
-        },
-        "siklus_hidup": "28-35 hari (telur 3 hari, larva 14-21 hari, pupa 7-10 hari)",
-        "tingkat_kerusakan": "Sangat Tinggi (dapat merusak 100% daun)",
-        "ambang_ekonomi": "2 ekor larva/tanaman atau 10% tanaman terserang",
-        "ae_threshold": 2,
-        "ae_unit": "ekor larva/tanaman",
-        "pengendalian": {
-            "Kultur Teknis": [
-                "Sanitasi lahan - bersihkan gulma dan sisa tanaman",
-                "Rotasi tanaman dengan non-inang",
-                "Tanam serentak untuk memutus siklus",
-                "Pengairan berselang untuk mengurangi kelembaban",
-                "Pemasangan perangkap feromon seks"
-            ],
-            "Mekanis": [
-                "Kumpulkan dan musnahkan kelompok telur",
-                "Tangkap larva secara manual (pagi hari)",
-                "Perangkap cahaya untuk ngengat dewasa",
-                "Perangkap feromon (1-2 buah/ha)"
-            ],
-            "Hayati": [
-                "Trichogramma spp. (parasitoid telur) - 100.000/ha",
-                "Telenomus remus (parasitoid telur)",
-                "Bacillus thuringiensis (Bt) - 2-3 g/L",
-                "NPV (Nuclear Polyhedrosis Virus) - 2 ml/L",
-                "Predator: Laba-laba, kumbang kubah"
-            ],
-            "Nabati": [
-                "Ekstrak daun mimba - semprot 400-500 L/ha",
-                "Ekstrak tembakau - encerkan 1:2",
-                "Ekstrak daun sirsak - semprot langsung",
-                "Formula kombinasi (mimba+bawang putih+cabai)"
-            ],
-            "Kimia": [
-                "Insektisida golongan piretroid (jika populasi tinggi)",
-                "Aplikasi sore hari saat larva aktif",
-                "Rotasi bahan aktif untuk hindari resistensi",
-                "Perhatikan masa tunggu panen"
-            ]
-        },
-        "tips_pengendalian": "Monitoring rutin! Kendalikan saat populasi masih rendah. Kombinasikan kultur teknis + hayati + nabati untuk hasil optimal.",
-        "link_pestisida": "Mimba, Tembakau, Sirsak, Mahoni, Suren"
-    },
-    
-    "Kutu Daun (Aphids)": {
-        "kategori": "Hama Penghisap",
-        "nama_latin": "Aphis spp., Myzus persicae",
-        "tanaman_inang": ["Cabai", "Tomat", "Kentang", "Kubis", "Bawang", "Sayuran daun"],
-        "gejala": [
-            "Daun mengkerut dan menggulung",
-            "Daun muda kerdil dan pucat",
-            "Embun madu (honeydew) pada daun",
-            "Jamur jelaga hitam pada embun madu",
-            "Tanaman kerdil dan pertumbuhan terhambat",
-            "Vektor virus (mosaik, keriting)"
-        ],
-        "ciri_hama": {
-            "Nimfa": "Hijau muda, tanpa sayap, 1-2 mm",
-            "Dewasa": "Hijau/hitam, ada yang bersayap, 2-3 mm",
-            "Koloni": "Berkelompok di pucuk dan daun muda"
-        },
-        "siklus_hidup": "7-10 hari (reproduksi parthenogenesis - tanpa kawin)",
-        "tingkat_kerusakan": "Tinggi (vektor virus berbahaya)",
-        "ambang_ekonomi": "5-10 ekor/daun atau 25% tanaman terserang",
-        "ae_threshold": 7.5,
-        "ae_unit": "ekor/daun",
-        "pengendalian": {
-            "Kultur Teknis": [
-                "Gunakan mulsa plastik perak (reflektif)",
-                "Tanam tanaman perangkap (mustard)",
-                "Hindari kelebihan nitrogen (daun terlalu lembut)",
-                "Sanitasi gulma inang virus",
-                "Jarak tanam optimal untuk sirkulasi udara"
-            ],
-            "Mekanis": [
-                "Semprotkan air keras untuk jatuhkan kutu",
-                "Pangkas dan musnahkan bagian terserang berat",
-                "Perangkap kuning (sticky trap) - 20-40/ha"
-            ],
-            "Hayati": [
-                "Kumbang koksi (Coccinella spp.) - predator alami",
-                "Aphidius colemani (parasitoid) - 500-1000/ha",
-                "Chrysoperla (lacewing) - predator",
-                "Jamur Beauveria bassiana - 2-3 g/L",
-                "Tanam bunga untuk menarik musuh alami"
-            ],
-            "Nabati": [
-                "Ekstrak bawang putih - encerkan 1:5",
-                "Ekstrak cabai rawit - encerkan 1:3",
-                "Sabun insektisida (sabun cuci + air) - 10 ml/L",
-                "Minyak nimba - 5 ml/L"
-            ],
-            "Kimia": [
-                "Insektisida sistemik (imidakloprid) - hanya jika berat",
-                "Hindari piretroid (bunuh musuh alami)",
-                "Aplikasi bergantian dengan hayati"
-            ]
-        },
-        "tips_pengendalian": "Kutu daun berkembang cepat! Kendalikan sejak dini. Mulsa perak sangat efektif. Jangan bunuh musuh alami!",
-        "link_pestisida": "Bawang Putih, Cabai Rawit, Mimba, Cengkeh"
-    },
-    
-    "Penggerek Batang (Stem Borer)": {
-        "kategori": "Hama Penggerek",
-        "nama_latin": "Ostrinia furnacalis, Chilo suppressalis",
-        "tanaman_inang": ["Padi", "Jagung", "Tebu"],
-        "gejala": [
-            "Daun muda mengering (sundep)",
-            "Malai hampa (beluk)",
-            "Lubang gerek pada batang",
-            "Batang mudah patah",
-            "Kotoran/frass di lubang gerek"
-        ],
-        "ciri_hama": {
-            "Telur": "Kelompok di daun, pipih, putih kekuningan",
-            "Larva": "Putih kecoklatan, kepala coklat, 2-3 cm",
-            "Pupa": "Di dalam batang",
-            "Dewasa": "Ngengat kuning kecoklatan"
-        },
-        "siklus_hidup": "30-40 hari",
-        "tingkat_kerusakan": "Sangat Tinggi (kehilangan hasil 20-80%)",
-        "ambang_ekonomi": "2 kelompok telur/m² atau 5% sundep",
-        "ae_threshold": 5,
-        "ae_unit": "% sundep/beluk",
-        "pengendalian": {
-            "Kultur Teknis": [
-                "Tanam varietas tahan (batang keras)",
-                "Tanam serentak dalam hamparan luas",
-                "Pengairan berselang (larva mati saat kering)",
-                "Pemupukan berimbang (jangan over N)",
-                "Sanitasi jerami - bakar/benamkan"
-            ],
-            "Mekanis": [
-                "Kumpulkan dan musnahkan kelompok telur",
-                "Potong dan bakar tanaman sundep",
-                "Perangkap cahaya untuk ngengat",
-                "Perangkap feromon"
-            ],
-            "Hayati": [
-                "Trichogramma japonicum (parasitoid telur) - 150.000/ha",
-                "Beauveria bassiana - 3-5 g/L",
-                "Predator: Laba-laba, kepik"
-            ],
-            "Nabati": [
-                "Ekstrak mimba - aplikasi preventif",
-                "Ekstrak mahoni - untuk telur dan larva muda",
-                "Ekstrak brotowali - racun perut"
-            ],
-            "Kimia": [
-                "Insektisida granular (karbofuran) - di pucuk",
-                "Hanya untuk serangan berat",
-                "Aplikasi saat telur menetas"
-            ]
-        },
-        "tips_pengendalian": "Sulit dikendalikan setelah masuk batang! Fokus pada telur dan larva muda. Tanam serentak sangat penting!",
-        "link_pestisida": "Mimba, Mahoni, Brotowali, Tembakau"
-    },
-    
-    "Wereng Coklat (Brown Planthopper)": {
-        "kategori": "Hama Penghisap",
-        "nama_latin": "Nilaparvata lugens",
-        "tanaman_inang": ["Padi"],
-        "gejala": [
-            "Hopperburn - tanaman menguning lalu coklat mengering",
-            "Tanaman roboh seperti terbakar",
-            "Embun madu pada daun bawah",
-            "Vektor virus kerdil (grassy stunt, ragged stunt)"
-        ],
-        "ciri_hama": {
-            "Nimfa": "Putih kecoklatan, tidak bersayap",
-            "Dewasa": "Coklat, sayap lebih panjang dari tubuh, 3-4 mm",
-            "Koloni": "Di pangkal batang dekat permukaan air"
-        },
-        "siklus_hidup": "25-30 hari",
-        "tingkat_kerusakan": "Sangat Tinggi (dapat gagal panen total)",
-        "ambang_ekonomi": "5-10 ekor/rumpun (fase vegetatif), 10-15 ekor/rumpun (generatif)",
-        "ae_threshold": 12.5,
-        "ae_unit": "ekor/rumpun",
-        "pengendalian": {
-            "Kultur Teknis": [
-                "Tanam varietas tahan (IR64, Ciherang, Inpari)",
-                "Tanam serentak dalam hamparan luas",
-                "Pergiliran varietas untuk hindari resistensi",
-                "Pemupukan berimbang (hindari over N)",
-                "Pengairan berselang (keringkan berkala)",
-                "Jarak tanam optimal (25x25 cm)"
-            ],
-            "Mekanis": [
-                "Gunakan jaring/kain untuk tangkap wereng",
-                "Giring wereng ke satu titik lalu musnahkan"
-            ],
-            "Hayati": [
-                "Laba-laba (Lycosa, Pardosa) - predator utama",
-                "Mirid bugs (Cyrtorhinus lividipennis) - predator telur",
-                "Jamur Metarhizium anisopliae - 5 g/L",
-                "Hindari insektisida broad spectrum (bunuh predator)"
-            ],
-            "Nabati": [
-                "Ekstrak mimba - sistemik",
-                "Ekstrak brotowali - efektif untuk wereng",
-                "Ekstrak tembakau - racun kontak"
-            ],
-            "Kimia": [
-                "HANYA jika populasi >15 ekor/rumpun",
-                "Gunakan insektisida selektif (buprofezin, pimetrozin)",
-                "HINDARI piretroid and organofosfat (bunuh predator)",
-                "Rotasi bahan aktif"
-            ]
-        },
-        "tips_pengendalian": "Varietas tahan + laba-laba = kunci sukses! Jangan semprotkan insektisida broad spectrum. Monitoring rutin sangat penting!",
-        "link_pestisida": "Mimba, Brotowali, Tembakau"
-    },
-    
-    "Keong Mas (Golden Snail)": {
-        "kategori": "Mollusca",
-        "nama_latin": "Pomacea canaliculata",
-        "tanaman_inang": ["Padi (terutama bibit muda)"],
-        "gejala": [
-            "Bibit padi dimakan habis",
-            "Tanaman muda putus di pangkal",
-            "Serangan berat saat 0-30 HST",
-            "Kelompok telur merah muda di batang/pematang"
-        ],
-        "ciri_hama": {
-            "Telur": "Kelompok, merah muda, di atas permukaan air",
-            "Keong": "Cangkang coklat kekuningan, 3-7 cm"
-        },
-        "siklus_hidup": "60-90 hari",
-        "tingkat_kerusakan": "Sangat Tinggi (dapat gagal tanam)",
-        "ambang_ekonomi": "1-2 ekor/m² (bibit muda)",
-        "ae_threshold": 1.5,
-        "ae_unit": "ekor/m²",
-        "pengendalian": {
-            "Kultur Teknis": [
-                "Tanam bibit umur >21 hari (batang keras)",
-                "Keringkan sawah 3-7 hari sebelum tanam",
-                "Buat pagar plastik di pematang",
-                "Hindari pemindahan keong antar lahan"
-            ],
-            "Mekanis": [
-                "Kumpulkan keong secara manual",
-                "Hancurkan kelompok telur",
-                "Buat perangkap dari daun pisang/pepaya",
-                "Gunakan bebek sebagai predator (10-20 ekor/ha)"
-            ],
-            "Hayati": [
-                "Bebek - predator alami terbaik",
-                "Ikan lele, mujair - pemakan keong",
-                "Burung - pemakan keong"
-            ],
-            "Nabati": [
-                "Ekstrak akar tuba - moluskisida kuat",
-                "Ekstrak biji jarak - beracun untuk keong",
-                "Saponin dari biji teh - 50-100 ppm"
-            ],
-            "Kimia": [
-                "Niklosamida (moluskisida) - 3-5 kg/ha",
-                "Aplikasi saat air dangkal",
-                "Hanya untuk serangan berat"
-            ]
-        },
-        "tips_pengendalian": "Bebek adalah solusi terbaik! Tanam bibit tua. Keringkan sawah sebelum tanam. Hancurkan telur!",
-        "link_pestisida": "Akar Tuba, Jarak"
-    },
-    "Thrips Cabai (Scirtothrips dorsalis)": {
-        "kategori": "Hama Penghisap",
-        "nama_latin": "Scirtothrips dorsalis",
-        "tanaman_inang": ["Cabai", "Tomat", "Semangka", "Melon", "Mangga", "Jeruk"],
-        "gejala": [
-            "Daun mengeriting ke atas (cekung)",
-            "Warna perak pada sisi bawah daun",
-            "Pertumbuhan kerdil",
-            "Bunga rontok",
-            "Bercak coklat pada buah"
-        ],
-        "ciri_hama": {
-            "Larva": "Kecil, putih/kuning, lincah",
-            "Dewasa": "Coklat kekuningan, sayap seperti sisir, sangat kecil (1 mm)"
-        },
-        "siklus_hidup": "15-20 hari",
-        "tingkat_kerusakan": "Sangat Tinggi (vektor virus keriting)",
-        "ambang_ekonomi": "10-20 ekor/daun",
-        "ae_threshold": 15,
-        "ae_unit": "ekor/daun",
-        "pengendalian": {
-            "Kultur Teknis": ["Mulsa perak", "Irigasi drenching", "Tanam serentak"],
-            "Hayati": ["Kumbang Macan", "Jamur Beauveria bassiana"],
-            "Nabati": ["Ekstrak tembakau", "Ekstrak sirsak", "Minyak Nimba"]
-        },
-        "tips_pengendalian": "Gunakan mulsa perak dan monitoring sejak pembibitan!",
-        "link_pestisida": "Tembakau, Sirsak, Nimba"
-    },
-    "Tikus Sawah (Rattus argentiventer)": {
-        "kategori": "Vertebrata",
-        "nama_latin": "Rattus argentiventer",
-        "tanaman_inang": ["Padi", "Jagung", "Singkong"],
-        "gejala": [
-            "Tanaman dipotong di batang",
-            "Banyak ditemukan liang/lubang di pematang",
-            "Serangan biasanya di tengah lahan",
-            "Kehilangan hasil sangat mendadak"
-        ],
-        "ciri_hama": {
-            "Dewasa": "Pengerat, coklat kelabu, ekor panjang",
-            "Karakter": "Aktif malam hari (nocturnal)"
-        },
-        "siklus_hidup": "Reproduksi sangat cepat (masa bunting 21 hari)",
-        "tingkat_kerusakan": "Sangat Tinggi (dapat menghancurkan seluruh petak)",
-        "ambang_ekonomi": "Ada tanda lubang aktif",
-        "ae_threshold": 1,
-        "ae_unit": "lubang aktif/ha",
-        "pengendalian": {
-            "Mekanis": ["Gropyokan", "TBS (Trap Barrier System)", "Linear Trap"],
-            "Hayati": ["Burung hantu (Tyto alba)", "Ular sawah"],
-            "Kimia": ["Rodentisida antikoagulan (umpan)"]
-        },
-        "tips_pengendalian": "Gropyokan serentak di awal musim tanam sangat efektif!",
-        "link_pestisida": "Tidak ada (Gunakan predator burung hantu)"
-    },
-    "Walang Sangit (Leptocorisa oratorius)": {
-        "kategori": "Hama Pengisap Biji",
-        "nama_latin": "Leptocorisa oratorius",
-        "tanaman_inang": ["Padi"],
-        "gejala": [
-            "Bulir padi hampa atau bercak coklat",
-            "Bau menyengat di sekitar lahan",
-            "Serangan pada fase masak susu"
-        ],
-        "ciri_hama": {
-            "Dewasa": "Bentuk panjang, hijau kecoklatan, bau sangit"
-        },
-        "siklus_hidup": "35-45 hari",
-        "tingkat_kerusakan": "Tinggi",
-        "ambang_ekonomi": "10 ekor/20 rumpun",
-        "ae_threshold": 0.5,
-        "ae_unit": "ekor/rumpun",
-        "pengendalian": {
-            "Kultur Teknis": ["Tanam serentak", "Bersihkan rumputan"],
-            "Mekanis": ["Perangkap bangkai kepiting/ikan"],
-            "Nabati": ["Ekstrak daun sirsak"]
-        },
-        "tips_pengendalian": "Gunakan perangkap bau bau busuk (ikan/kepiting) untuk menarik walang sangit!",
-        "link_pestisida": "Sirsak"
-    }
-}
+HAMA_DATABASE = get_reference("hama_database")
 
-# Update AE thresholds for existing HAMA
-HAMA_DATABASE["Ulat Grayak (Spodoptera litura)"]["ae_threshold"] = 2
-HAMA_DATABASE["Ulat Grayak (Spodoptera litura)"]["ae_unit"] = "ekor larva/tanaman"
-HAMA_DATABASE["Kutu Daun (Aphids)"]["ae_threshold"] = 7.5
-HAMA_DATABASE["Kutu Daun (Aphids)"]["ae_unit"] = "ekor/daun"
-HAMA_DATABASE["Penggerek Batang (Stem Borer)"]["ae_threshold"] = 5
-HAMA_DATABASE["Penggerek Batang (Stem Borer)"]["ae_unit"] = "% sundep/beluk"
-HAMA_DATABASE["Wereng Coklat (Brown Planthopper)"]["ae_threshold"] = 12.5
-HAMA_DATABASE["Wereng Coklat (Brown Planthopper)"]["ae_unit"] = "ekor/rumpun"
 
 
 
@@ -480,231 +111,7 @@ COMMERCIAL_SOLUTIONS = {
 
 # ========== DATABASE PENYAKIT ==========
 
-PENYAKIT_DATABASE = {
-    "Busuk Daun (Late Blight)": {
-        "kategori": "Penyakit Jamur",
-        "nama_latin": "Phytophthora infestans",
-        "tanaman_inang": ["Tomat", "Kentang", "Cabai"],
-        "gejala": [
-            "Bercak coklat kehitaman pada daun",
-            "Bercak basah dan berbau busuk",
-            "Miselium putih di bawah daun (pagi hari)",
-            "Daun cepat mengering dan mati",
-            "Buah busuk dengan bercak coklat",
-            "Penyebaran sangat cepat saat hujan"
-        ],
-        "kondisi_ideal": {
-            "Suhu": "18-22°C",
-            "Kelembaban": ">90%",
-            "Cuaca": "Hujan, kabut, embun berat"
-        },
-        "tingkat_kerusakan": "Sangat Tinggi (dapat merusak 100% dalam 1-2 minggu)",
-        "pengendalian": {
-            "Kultur Teknis": [
-                "Tanam varietas tahan",
-                "Jarak tanam lebar untuk sirkulasi udara",
-                "Hindari tanam saat musim hujan",
-                "Drainase baik - hindari genangan",
-                "Mulsa plastik untuk cegah percikan air",
-                "Sanitasi - buang tanaman sakit"
-            ],
-            "Mekanis": [
-                "Pangkas daun terserang",
-                "Atur kanopi untuk sirkulasi udara",
-                "Hindari penyiraman dari atas"
-            ],
-            "Hayati": [
-                "Trichoderma spp. - antagonis jamur",
-                "Bacillus subtilis - bakterisida",
-                "Pseudomonas fluorescens"
-            ],
-            "Nabati": [
-                "Ekstrak bawang putih - antijamur kuat",
-                "Ekstrak kunyit - curcumin antijamur",
-                "Ekstrak jahe - gingerol antijamur",
-                "Ekstrak lengkuas - galangin",
-                "Kombinasi kunyit+jahe+lengkuas sangat efektif"
-            ],
-            "Kimia": [
-                "Fungisida berbahan aktif mankozeb, propineb",
-                "Aplikasi preventif sebelum hujan",
-                "Interval 5-7 hari saat musim hujan",
-                "Rotasi bahan aktif"
-            ]
-        },
-        "tips_pengendalian": "Preventif sangat penting! Aplikasi fungisida sebelum hujan. Kombinasi kunyit+jahe+lengkuas efektif!",
-        "link_pestisida": "Bawang Putih, Kunyit, Jahe, Lengkuas, Sirih"
-    },
-    
-    "Layu Bakteri (Bacterial Wilt)": {
-        "kategori": "Penyakit Bakteri",
-        "nama_latin": "Ralstonia solanacearum",
-        "tanaman_inang": ["Tomat", "Cabai", "Kentang", "Terong", "Pisang"],
-        "gejala": [
-            "Layu mendadak tanpa menguning",
-            "Layu siang hari, segar pagi hari (awal)",
-            "Layu permanen (lanjut)",
-            "Pembuluh berlendir putih kecoklatan",
-            "Akar dan batang bawah busuk",
-            "Tanaman mati dalam 1-2 minggu"
-        ],
-        "kondisi_ideal": {
-            "Suhu": "25-35°C",
-            "Kelembaban": "Tinggi",
-            "pH tanah": "6.0-7.0"
-        },
-        "tingkat_kerusakan": "Sangat Tinggi (tidak ada obat, hanya preventif)",
-        "pengendalian": {
-            "Kultur Teknis": [
-                "Tanam varietas tahan/toleran",
-                "Rotasi tanaman dengan non-Solanaceae (3-4 tahun)",
-                "Sanitasi alat - celup klorin 10%",
-                "Drainase sempurna",
-                "pH tanah 5.0-5.5 (bakteri kurang aktif)",
-                "Solarisasi tanah (plastik transparan 4-6 minggu)",
-                "Hindari luka pada akar"
-            ],
-            "Mekanis": [
-                "Cabut dan bakar tanaman sakit",
-                "Jangan komposkan tanaman sakit",
-                "Karantina lahan terinfeksi"
-            ],
-            "Hayati": [
-                "Pseudomonas fluorescens - antagonis bakteri",
-                "Bacillus subtilis",
-                "Trichoderma spp.",
-                "Aplikasi saat tanam dan berkala"
-            ],
-            "Nabati": [
-                "Ekstrak bawang putih - antibakteri kuat",
-                "Ekstrak lengkuas - galangin antibakteri",
-                "Ekstrak sirih - kavikol antibakteri",
-                "Ekstrak jahe - antibakteri",
-                "Aplikasi preventif sejak tanam"
-            ],
-            "Kimia": [
-                "Bakterisida (streptomisin, oksitetrasiklin)",
-                "Hanya efektif untuk preventif",
-                "Tidak efektif setelah tanaman sakit",
-                "Aplikasi saat tanam dan berkala"
-            ]
-        },
-        "tips_pengendalian": "TIDAK ADA OBAT! Fokus preventif: varietas tahan + rotasi + sanitasi. Bawang putih+lengkuas+sirih untuk preventif!",
-        "link_pestisida": "Bawang Putih, Lengkuas, Sirih, Jahe, Kunyit"
-    },
-    
-    "Antraknosa (Anthracnose)": {
-        "kategori": "Penyakit Jamur",
-        "nama_latin": "Colletotrichum spp.",
-        "tanaman_inang": ["Cabai", "Tomat", "Mangga", "Pepaya", "Pisang"],
-        "gejala": [
-            "Bercak bulat cekung pada buah",
-            "Bercak coklat dengan lingkaran konsentris",
-            "Titik hitam (acervuli) di tengah bercak",
-            "Buah busuk dan rontok",
-            "Bercak pada daun dan batang"
-        ],
-        "kondisi_ideal": {
-            "Suhu": "25-30°C",
-            "Kelembaban": ">80%",
-            "Cuaca": "Hujan, lembab"
-        },
-        "tingkat_kerusakan": "Tinggi (kehilangan hasil 30-100%)",
-        "pengendalian": {
-            "Kultur Teknis": [
-                "Sanitasi - buang buah busuk",
-                "Drainase baik",
-                "Jarak tanam optimal",
-                "Pemupukan K untuk kulit buah kuat",
-                "Panen tepat waktu",
-                "Hindari luka pada buah"
-            ],
-            "Mekanis": [
-                "Pangkas cabang sakit",
-                "Buang buah terserang",
-                "Bungkus buah (untuk mangga)"
-            ],
-            "Hayati": [
-                "Trichoderma harzianum - antagonis",
-                "Bacillus subtilis"
-            ],
-            "Nabati": [
-                "Ekstrak kunyit - curcumin antijamur",
-                "Ekstrak bawang putih",
-                "Ekstrak jahe",
-                "Ekstrak sirih"
-            ],
-            "Kimia": [
-                "Fungisida berbahan aktif mankozeb, propineb",
-                "Aplikasi preventif saat pembungaan",
-                "Interval 7-10 hari"
-            ]
-        },
-        "tips_pengendalian": "Sanitasi buah busuk penting! Pemupukan K untuk kulit buah kuat. Kunyit sangat efektif!",
-        "link_pestisida": "Kunyit, Bawang Putih, Jahe, Sirih"
-    },
-    "Bercak Ungu (Purple Blotch)": {
-        "kategori": "Penyakit Jamur",
-        "nama_latin": "Alternaria porri",
-        "tanaman_inang": ["Bawang Merah", "Bawang Putih"],
-        "gejala": [
-            "Bercak putih kecil di daun",
-            "Melebar menjadi warna ungu",
-            "Pusat bercak coklat kehitaman",
-            "Ujung daun mengering",
-            "Umbi membusuk"
-        ],
-        "kondisi_ideal": {"Suhu": "25-30°C", "Kelembaban": "Tinggi"},
-        "tingkat_kerusakan": "Tinggi",
-        "pengendalian": {
-            "Kultur Teknis": ["Benih sehat", "Drainase lancar"],
-            "Hayati": ["Trichoderma"],
-            "Nabati": ["Ekstrak bawang putih", "Sirih"]
-        },
-        "tips_pengendalian": "Hindari genangan air dan pastikan ventilasi lahan baik!",
-        "link_pestisida": "Bawang Putih, Sirih"
-    },
-    "Blast Padi (Neck Blast)": {
-        "kategori": "Penyakit Jamur",
-        "nama_latin": "Pyricularia oryzae",
-        "tanaman_inang": ["Padi"],
-        "gejala": [
-            "Bercak coklat bentuk belah ketupat di daun",
-            "Busuk pada leher malai (potong leher)",
-            "Malai hampa atau gabah hampa",
-            "Daun menguning dan mengering"
-        ],
-        "kondisi_ideal": {"Suhu": "Malam dingin, siang hangat", "Kelembaban": "Sangat tinggi"},
-        "tingkat_kerusakan": "Sangat Tinggi (dapat merusak 50-80% hasil)",
-        "pengendalian": {
-            "Kultur Teknis": ["Gunakan varietas tahan", "Atur jarak tanam", "Pupuk Nitrogen secukupnya"],
-            "Hayati": ["Pseudomonas fluorescens"],
-            "Kimia": ["Fungisida sistemik"]
-        },
-        "tips_pengendalian": "Jangan beri pupuk N berlebih saat musim hujan!",
-        "link_pestisida": "Lengkuas, Jahe"
-    },
-    "Virus Kuning (Bule/Gemini)": {
-        "kategori": "Penyakit Virus",
-        "nama_latin": "Gemini Virus / Peronosclerospora",
-        "tanaman_inang": ["Cabai", "Jagung", "Tomat"],
-        "gejala": [
-            "Daun menguning cerah",
-            "Pertumbuhan kerdil",
-            "Daun mengeriting dan menebal",
-            "Produksi buah menurun drastis"
-        ],
-        "kondisi_ideal": {"Vektor": "Kutu Kebul (Bemisia tabaci)"},
-        "tingkat_kerusakan": "Sangat Tinggi",
-        "pengendalian": {
-            "Kultur Teknis": ["Benih tahan", "Mulsa perak"],
-            "Mekanis": ["Cabut tanaman sakit sejak awal"],
-            "Nabati": ["Kendalikan vektor dengan Nimba/Bawang Putih"]
-        },
-        "tips_pengendalian": "Kendalikan kutu kebul sebagai pembawa virus! Cabut tanaman yang menunjukkan gejala kuning sejak dini.",
-        "link_pestisida": "Nimba, Bawang Putih"
-    }
-}
+PENYAKIT_DATABASE = get_reference("penyakit_database")
 
 # ========== HELPER FUNCTIONS ==========
 
@@ -8,6 +8,7 @@ import plotly.express as px
 from datetime import datetime, timedelta
 
 from utils.auth import require_auth, show_user_info_sidebar
+from services.reference_data_service import get_reference
 
 st.set_page_config(page_title="Panduan Budidaya Sayuran", page_icon="🥬", layout="wide")
 
@@ -24,456 +25,7 @@ from services.crop_service import CropService
 
 # ========== DATABASE BUDIDAYA SAYURAN ==========
 
-SAYURAN_DATABASE = {
-    "Cabai Merah": {
-        "kategori": "Sayuran Buah",
-        "nama_latin": "Capsicum annuum",
-        "umur_panen": "90-120 hari",
-        "hasil_panen": "15-25 ton/ha",
-        
-        "persiapan_lahan": {
-            "langkah": [
-                "Bersihkan lahan dari gulma dan sisa tanaman",
-                "Gemburkan tanah dengan cangkul/traktor (kedalaman 30-40 cm)",
-                "Buat bedengan lebar 100-120 cm, tinggi 30-40 cm",
-                "Jarak antar bedengan 50-60 cm",
-                "Aplikasikan pupuk kandang 20-30 ton/ha (2-3 minggu sebelum tanam)",
-                "Aplikasikan kapur 1-2 ton/ha jika pH <6.0",
-                "Pasang mulsa plastik hitam perak (opsional tapi sangat dianjurkan)"
-            ],
-            "waktu": "3-4 minggu sebelum tanam",
-            "tips": "Mulsa plastik mengurangi gulma 90% dan meningkatkan hasil 30-40%!"
-        },
-        
-        "persemaian": {
-            "langkah": [
-                "Siapkan media semai: tanah + kompos + sekam (1:1:1)",
-                "Gunakan tray semai 72 lubang atau polybag kecil",
-                "Rendam benih dalam air hangat 3-4 jam",
-                "Tanam benih kedalaman 0.5-1 cm, 1 benih/lubang",
-                "Siram dengan sprayer halus 2x sehari",
-                "Letakkan di tempat teduh dengan naungan 50%",
-                "Bibit siap pindah umur 21-30 hari (4-6 daun sejati)"
-            ],
-            "kebutuhan_benih": "200-300 gram/ha",
-            "waktu": "21-30 hari",
-            "tips": "Rendam benih dalam POC/MOL sebelum semai untuk vigor lebih baik!"
-        },
-        
-        "penanaman": {
-            "langkah": [
-                "Buat lubang tanam diameter 10 cm, kedalaman 10-15 cm",
-                "Jarak tanam: 60 x 60 cm atau 70 x 50 cm",
-                "Aplikasikan pupuk dasar di lubang tanam:",
-                "  - NPK 15-15-15: 5-10 gram/lubang",
-                "  - Pupuk kandang matang: 1 genggam/lubang",
-                "Pindahkan bibit dengan hati-hati (jangan rusak akar)",
-                "Tanam sore hari (hindari siang hari)",
-                "Siram langsung setelah tanam",
-                "Pasang ajir/lanjaran setinggi 1.5-2 meter"
-            ],
-            "populasi": "22.000-28.000 tanaman/ha",
-            "waktu_tanam": "Awal musim hujan atau dengan irigasi",
-            "tips": "Tanam sore hari dan siram untuk mengurangi stress transplanting!"
-        },
-        
-        "pemupukan": {
-            "jadwal": [
-                {
-                    "waktu": "Dasar (saat tanam)",
-                    "pupuk": "NPK 15-15-15: 200-300 kg/ha + Pupuk kandang 20-30 ton/ha"
-                },
-                {
-                    "waktu": "14 HST",
-                    "pupuk": "Urea 100 kg/ha + KCl 50 kg/ha (kocor)"
-                },
-                {
-                    "waktu": "28 HST",
-                    "pupuk": "NPK 16-16-16: 150 kg/ha (kocor)"
-                },
-                {
-                    "waktu": "42 HST (mulai berbunga)",
-                    "pupuk": "NPK 15-15-15: 150 kg/ha + KCl 100 kg/ha"
-                },
-                {
-                    "waktu": "56 HST dan seterusnya (setiap 2 minggu)",
-                    "pupuk": "NPK 15-15-15: 100 kg/ha + KCl 100 kg/ha"
-                }
-            ],
-            "pupuk_daun": "Semprot pupuk daun NPK + mikronutrien setiap 7-10 hari",
-            "tips": "Tingkatkan K saat berbuah untuk buah besar dan berkualitas!"
-        },
-        
-        "pengairan": {
-            "sistem": "Drip irrigation (terbaik) atau kocor manual",
-            "frekuensi": [
-                "Fase vegetatif (0-40 HST): Setiap 2-3 hari",
-                "Fase generatif (>40 HST): Setiap 1-2 hari",
-                "Musim kemarau: Setiap hari",
-                "Saat berbunga: Jangan sampai kekeringan!"
-            ],
-            "volume": "200-300 ml/tanaman/hari",
-            "tips": "Drip irrigation hemat air 50% dan hasil meningkat 30%!"
-        },
-        
-        "pemeliharaan": {
-            "penyiangan": "Setiap 2 minggu atau gunakan mulsa plastik",
-            "pewiwilan": "Buang tunas air di bawah cabang utama",
-            "pemangkasan": "Pangkas daun tua dan sakit untuk sirkulasi udara",
-            "perempelan": "Buang buah cacat/kecil untuk fokus ke buah bagus",
-            "tips": "Pewiwilan rutin meningkatkan hasil 20-30%!"
-        },
-        
-        "hama_penyakit": {
-            "hama_utama": [
-                "Thrips - gunakan mulsa perak + perangkap kuning",
-                "Kutu daun - semprot mimba atau bawang putih",
-                "Ulat grayak - BTI atau tangkap manual",
-                "Lalat buah - perangkap methyl eugenol"
-            ],
-            "penyakit_utama": [
-                "Layu bakteri - preventif: varietas tahan + rotasi tanaman",
-                "Antraknosa - fungisida nabati (kunyit+jahe) preventif",
-                "Busuk buah - sanitasi + drainase baik"
-            ],
-            "tips": "Preventif lebih baik! Monitoring rutin setiap 2-3 hari!"
-        },
-        
-        "panen": {
-            "ciri_panen": [
-                "Buah berwarna merah penuh (untuk cabai merah)",
-                "Kulit mengkilap dan keras",
-                "Umur 90-120 hari setelah tanam",
-                "Panen pertama umur 75-80 hari"
-            ],
-            "cara_panen": "Petik dengan tangkai, gunakan gunting/pisau tajam",
-            "frekuensi": "Setiap 2-3 hari sekali",
-            "masa_panen": "3-4 bulan (panen berkali-kali)",
-            "tips": "Panen pagi hari untuk kesegaran maksimal!"
-        },
-        
-        "pascapanen": {
-            "sortasi": "Pisahkan berdasarkan ukuran dan kualitas (A, B, C)",
-            "pencucian": "Cuci dengan air bersih, tiriskan",
-            "pengemasan": "Keranjang plastik berlubang atau karung jaring",
-            "penyimpanan": "Suhu ruang: 3-5 hari, Kulkas: 7-10 hari",
-            "tips": "Jangan tumpuk terlalu tinggi, cabai mudah memar!"
-        },
-        
-        "analisis_usaha": {
-            "biaya_produksi": {
-                "Sewa lahan (1 ha, 6 bulan)": "Rp 5.000.000",
-                "Benih": "Rp 500.000",
-                "Pupuk kandang": "Rp 6.000.000",
-                "Pupuk kimia": "Rp 8.000.000",
-                "Pestisida": "Rp 3.000.000",
-                "Mulsa plastik": "Rp 4.000.000",
-                "Ajir/lanjaran": "Rp 3.000.000",
-                "Tenaga kerja": "Rp 15.000.000",
-                "Lain-lain": "Rp 3.500.000",
-                "TOTAL": "Rp 48.000.000"
-            },
-            "pendapatan": {
-                "Hasil panen": "20 ton/ha",
-                "Harga jual": "Rp 15.000/kg (rata-rata)",
-                "Total pendapatan": "Rp 300.000.000"
-            },
-            "keuntungan": {
-                "Pendapatan": "Rp 300.000.000",
-                "Biaya": "Rp 48.000.000",
-                "Keuntungan bersih": "Rp 252.000.000",
-                "ROI": "525%",
-                "B/C Ratio": "6.25"
-            },
-            "tips": "Harga cabai fluktuatif! Panen saat harga tinggi untuk profit maksimal!"
-        }
-    },
-    
-    "Tomat": {
-        "kategori": "Sayuran Buah",
-        "nama_latin": "Solanum lycopersicum",
-        "umur_panen": "60-90 hari",
-        "hasil_panen": "30-50 ton/ha",
-        
-        "persiapan_lahan": {
-            "langkah": [
-                "Bersihkan lahan dari gulma",
-                "Gemburkan tanah kedalaman 30-40 cm",
-                "Buat bedengan lebar 100-120 cm, tinggi 30-40 cm",
-                "Jarak antar bedengan 60 cm",
-                "Aplikasikan pupuk kandang 30-40 ton/ha",
-                "Aplikasikan kapur 1-2 ton/ha + dolomit untuk Ca",
-                "Pasang mulsa plastik hitam perak"
-            ],
-            "waktu": "3-4 minggu sebelum tanam",
-            "tips": "Dolomit penting untuk cegah blossom end rot (ujung buah busuk)!"
-        },
-        
-        "persemaian": {
-            "langkah": [
-                "Media semai: tanah + kompos + sekam (1:1:1)",
-                "Tray semai 72 lubang",
-                "Tanam benih kedalaman 0.5 cm",
-                "Siram 2x sehari dengan sprayer halus",
-                "Naungan 50% sampai berkecambah",
-                "Bibit siap pindah umur 21-25 hari (4-5 daun)"
-            ],
-            "kebutuhan_benih": "150-200 gram/ha",
-            "waktu": "21-25 hari",
-            "tips": "Bibit tomat lebih cepat dari cabai, jangan terlalu tua di persemaian!"
-        },
-        
-        "penanaman": {
-            "langkah": [
-                "Jarak tanam: 60 x 50 cm atau 70 x 40 cm",
-                "Lubang tanam diameter 10 cm, kedalaman 15 cm",
-                "Pupuk dasar: NPK 15-15-15 (10 g/lubang) + pupuk kandang",
-                "Tanam sore hari",
-                "Siram langsung",
-                "Pasang ajir setinggi 1.5-2 meter"
-            ],
-            "populasi": "28.000-33.000 tanaman/ha",
-            "waktu_tanam": "Dataran tinggi: sepanjang tahun, Dataran rendah: musim kemarau",
-            "tips": "Tomat dataran tinggi lebih manis dan tahan lama!"
-        },
-        
-        "pemupukan": {
-            "jadwal": [
-                {
-                    "waktu": "Dasar (saat tanam)",
-                    "pupuk": "NPK 15-15-15: 300-400 kg/ha + Pupuk kandang 30-40 ton/ha"
-                },
-                {
-                    "waktu": "10 HST",
-                    "pupuk": "Urea 100 kg/ha + KCl 50 kg/ha"
-                },
-                {
-                    "waktu": "20 HST",
-                    "pupuk": "NPK 16-16-16: 150 kg/ha"
-                },
-                {
-                    "waktu": "30 HST (mulai berbunga)",
-                    "pupuk": "NPK 15-15-15: 150 kg/ha + KCl 100 kg/ha + Ca(NO3)2 50 kg/ha"
-                },
-                {
-                    "waktu": "40 HST dan seterusnya (setiap 10 hari)",
-                    "pupuk": "NPK 15-15-15: 100 kg/ha + KCl 100 kg/ha + Ca(NO3)2 50 kg/ha"
-                }
-            ],
-            "pupuk_daun": "NPK + Ca + B setiap 7 hari untuk cegah blossom end rot",
-            "tips": "Ca sangat penting! Kekurangan Ca = ujung buah busuk (blossom end rot)!"
-        },
-        
-        "pengairan": {
-            "sistem": "Drip irrigation (sangat dianjurkan)",
-            "frekuensi": [
-                "Fase vegetatif: Setiap 2 hari",
-                "Fase berbunga: Setiap hari (JANGAN sampai stress air!)",
-                "Fase berbuah: Setiap hari",
-                "Kurangi air saat buah mulai matang (untuk rasa manis)"
-            ],
-            "volume": "300-400 ml/tanaman/hari",
-            "tips": "Pengairan tidak teratur = buah pecah! Konsisten sangat penting!"
-        },
-        
-        "pemeliharaan": {
-            "penyiangan": "Gunakan mulsa plastik (sangat efektif)",
-            "pewiwilan": "Buang tunas air setiap minggu (PENTING!)",
-            "pemangkasan": "Sistem 1-2 batang utama, buang cabang lain",
-            "perempelan": "Buang buah kecil/cacat, sisakan 4-6 buah/tandan",
-            "tips": "Pewiwilan rutin = buah besar dan berkualitas! Jangan malas wiwil!"
-        },
-        
-        "hama_penyakit": {
-            "hama_utama": [
-                "Ulat buah - BTI + perangkap feromon",
-                "Kutu daun - mulsa perak + mimba",
-                "Thrips - perangkap kuning + bawang putih",
-                "Tungau - semprot air keras + predator alami"
-            ],
-            "penyakit_utama": [
-                "Layu bakteri - varietas tahan + rotasi + sanitasi",
-                "Busuk daun (late blight) - fungisida preventif + drainase",
-                "Blossom end rot - Ca cukup + pengairan teratur",
-                "Virus - kendalikan thrips + cabut tanaman sakit"
-            ],
-            "tips": "Blossom end rot BUKAN penyakit! Itu defisiensi Ca + stress air!"
-        },
-        
-        "panen": {
-            "ciri_panen": [
-                "Buah berwarna merah penuh (untuk tomat merah)",
-                "Kulit mengkilap",
-                "Umur 60-75 hari setelah tanam",
-                "Panen pertama umur 55-60 hari"
-            ],
-            "cara_panen": "Petik dengan tangkai, pagi hari",
-            "frekuensi": "Setiap 2-3 hari",
-            "masa_panen": "2-3 bulan",
-            "tips": "Panen saat 80% merah untuk transportasi jauh, 100% merah untuk lokal!"
-        },
-        
-        "pascapanen": {
-            "sortasi": "Grade A (>100g), B (70-100g), C (<70g)",
-            "pencucian": "Cuci lembut, jangan gosok",
-            "pengemasan": "Keranjang plastik + alas koran",
-            "penyimpanan": "Suhu ruang: 5-7 hari, Kulkas: 10-14 hari",
-            "tips": "Jangan simpan di kulkas jika belum matang! Rasa jadi hambar!"
-        },
-        
-        "analisis_usaha": {
-            "biaya_produksi": {
-                "Sewa lahan (1 ha, 4 bulan)": "Rp 4.000.000",
-                "Benih": "Rp 3.000.000",
-                "Pupuk kandang": "Rp 8.000.000",
-                "Pupuk kimia": "Rp 10.000.000",
-                "Pestisida": "Rp 4.000.000",
-                "Mulsa + ajir": "Rp 7.000.000",
-                "Tenaga kerja": "Rp 20.000.000",
-                "Lain-lain": "Rp 4.000.000",
-                "TOTAL": "Rp 60.000.000"
-            },
-            "pendapatan": {
-                "Hasil panen": "40 ton/ha",
-                "Harga jual": "Rp 8.000/kg (rata-rata)",
-                "Total pendapatan": "Rp 320.000.000"
-            },
-            "keuntungan": {
-                "Pendapatan": "Rp 320.000.000",
-                "Biaya": "Rp 60.000.000",
-                "Keuntungan bersih": "Rp 260.000.000",
-                "ROI": "433%",
-                "B/C Ratio": "5.33"
-            },
-            "tips": "Tomat dataran tinggi harga lebih stabil dan kualitas lebih baik!"
-        }
-    },
-    
-    "Kangkung": {
-        "kategori": "Sayuran Daun",
-        "nama_latin": "Ipomoea aquatica",
-        "umur_panen": "25-30 hari",
-        "hasil_panen": "15-20 ton/ha",
-        
-        "persiapan_lahan": {
-            "langkah": [
-                "Bersihkan lahan",
-                "Gemburkan tanah kedalaman 20-30 cm",
-                "Buat bedengan lebar 100 cm, tinggi 20-30 cm",
-                "Jarak antar bedengan 30-40 cm",
-                "Aplikasikan pupuk kandang 10-15 ton/ha",
-                "Ratakan bedengan"
-            ],
-            "waktu": "1-2 minggu sebelum tanam",
-            "tips": "Kangkung tumbuh cepat, tidak perlu persiapan rumit!"
-        },
-        
-        "penanaman": {
-            "metode": "Sebar benih langsung atau tugal",
-            "langkah": [
-                "Rendam benih 12-24 jam untuk mempercepat perkecambahan",
-                "Sebar benih merata atau tugal jarak 5x5 cm",
-                "Tutup tipis dengan tanah/kompos",
-                "Siram dengan gembor halus",
-                "Benih berkecambah 3-5 hari"
-            ],
-            "kebutuhan_benih": "10-15 kg/ha (sebar), 5-8 kg/ha (tugal)",
-            "waktu_tanam": "Sepanjang tahun",
-            "tips": "Rendam benih untuk perkecambahan seragam!"
-        },
-        
-        "pemupukan": {
-            "jadwal": [
-                {
-                    "waktu": "Dasar (saat tanam)",
-                    "pupuk": "Pupuk kandang 10-15 ton/ha + Urea 50 kg/ha"
-                },
-                {
-                    "waktu": "10 HST",
-                    "pupuk": "Urea 100 kg/ha (kocor atau tabur)"
-                },
-                {
-                    "waktu": "20 HST (jika panen >30 hari)",
-                    "pupuk": "Urea 50 kg/ha"
-                }
-            ],
-            "pupuk_organik": "POC/MOL setiap 5 hari untuk pertumbuhan maksimal",
-            "tips": "Kangkung suka N tinggi! Urea atau POC sangat efektif!"
-        },
-        
-        "pengairan": {
-            "sistem": "Genangan (kangkung air) atau kocor (kangkung darat)",
-            "frekuensi": [
-                "Kangkung air: Tergenang terus (5-10 cm)",
-                "Kangkung darat: Siram 2x sehari (pagi & sore)"
-            ],
-            "tips": "Kangkung air lebih cepat tumbuh tapi perlu air banyak!"
-        },
-        
-        "pemeliharaan": {
-            "penyiangan": "Sekali saat umur 10-15 hari",
-            "penjarangan": "Jika terlalu rapat, jarang saat umur 7 hari",
-            "tips": "Kangkung tumbuh cepat, pemeliharaan minimal!"
-        },
-        
-        "hama_penyakit": {
-            "hama_utama": [
-                "Ulat daun - BTI atau tangkap manual",
-                "Kutu daun - semprot air keras atau sabun"
-            ],
-            "penyakit_utama": [
-                "Karat putih - hindari genangan berlebihan",
-                "Busuk akar - drainase baik"
-            ],
-            "tips": "Kangkung jarang terserang hama berat, sangat mudah!"
-        },
-        
-        "panen": {
-            "ciri_panen": [
-                "Umur 25-30 hari",
-                "Tinggi 25-30 cm",
-                "Daun hijau segar"
-            ],
-            "cara_panen": "Cabut seluruh tanaman atau potong 5 cm dari pangkal",
-            "frekuensi": "Sekali panen (cabut) atau 2-3x panen (potong)",
-            "tips": "Panen pagi hari untuk kesegaran maksimal!"
-        },
-        
-        "pascapanen": {
-            "sortasi": "Buang daun kuning/rusak",
-            "pencucian": "Cuci bersih",
-            "pengemasan": "Ikat per 250-500 gram",
-            "penyimpanan": "Suhu ruang: 1-2 hari, Kulkas: 3-5 hari",
-            "tips": "Kangkung cepat layu, jual segera setelah panen!"
-        },
-        
-        "analisis_usaha": {
-            "biaya_produksi": {
-                "Sewa lahan (1 ha, 1 bulan)": "Rp 500.000",
-                "Benih": "Rp 300.000",
-                "Pupuk kandang": "Rp 3.000.000",
-                "Pupuk kimia": "Rp 1.000.000",
-                "Pestisida": "Rp 200.000",
-                "Tenaga kerja": "Rp 3.000.000",
-                "Lain-lain": "Rp 500.000",
-                "TOTAL": "Rp 8.500.000"
-            },
-            "pendapatan": {
-                "Hasil panen": "18 ton/ha",
-                "Harga jual": "Rp 3.000/kg",
-                "Total pendapatan": "Rp 54.000.000"
-            },
-            "keuntungan": {
-                "Pendapatan": "Rp 54.000.000",
-                "Biaya": "Rp 8.500.000",
-                "Keuntungan bersih": "Rp 45.500.000",
-                "ROI": "535%",
-                "B/C Ratio": "6.35"
-            },
-            "tips": "Kangkung = cash crop! Cepat panen, cepat untung, bisa 12x setahun!"
-        }
-    }
-}
+SAYURAN_DATABASE = dict(get_reference("sayuran_database"))
 
 # MERGE WITH CENTRALIZED CROP SERVICE
 # We overlay data from the service if available
@@ -485,8 +37,9 @@ for crop_name in CropService.get_all_crops():
         # But wait, the service guide structure might be partial.
         # For now, let's just update if keys exist, or add if it matches structure.
         # Simplest integration: If 'guide' data in service has 'analisis_usaha', we can use it.
+        # (Reference data is shared and read-only, so merge into a new per-run dict)
         if crop_name in SAYURAN_DATABASE:
-             SAYURAN_DATABASE[crop_name].update(service_guide)
+             SAYURAN_DATABASE[crop_name] = {**SAYURAN_DATABASE[crop_name], **service_guide}
         elif 'kategori' in service_guide: # Only add if it looks like a full guide object
              SAYURAN_DATABASE[crop_name] = service_guide
 
@@ -3,11 +3,13 @@
 # Version: 1.0.0
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 
 from utils.auth import require_auth, show_user_info_sidebar
+from services.planting_sweep_service import DEFAULT_PANICLE_CAP_M2, pareto_frontier, sweep_planting
 
 st.set_page_config(page_title="Kalkulator Potensi Panen Padi", page_icon="🌾", layout="wide")
 
@@ -75,6 +77,27 @@ RICE_VARIETIES = {
     "Ciliwung": {"tillers": 21, "grains": 155, "weight": 27, "description": "Tahan hama, hasil tinggi"}
 }
 
+SWEEP_RANK_OPTIONS = {
+    "GKP Bersih tertinggi": "gkp_net_ton",
+    "Margin tertinggi": "margin",
+    "Biaya benih + tanam terendah": "total_cost",
+}
+
+SWEEP_COLUMNS = {
+    "rank": "Peringkat",
+    "pattern": "Pola Tanam",
+    "spacing_row": "Jarak Baris (cm)",
+    "spacing_plant": "Jarak Tanam (cm)",
+    "variety": "Varietas",
+    "loss_pct": "Kehilangan (%)",
+    "population": "Populasi (rumpun/ha)",
+    "gkp_net_ton": "GKP Bersih (ton/ha)",
+    "seed_cost": "Biaya Benih (Rp/ha)",
+    "labor_cost": "Biaya Tanam (Rp/ha)",
+    "margin": "Margin (Rp/ha)",
+    "pareto": "Pareto",
+}
+
 # ========== CALCULATION FUNCTIONS ==========
 
 def calculate_population(spacing_row, spacing_plant, pattern_factor=1.0):
@@ -474,6 +497,93 @@ with tab3:
     fig_line.update_traces(line_color='#10b981', line_width=3)
     st.plotly_chart(fig_line, use_container_width=True)
 
+    st.markdown("---")
+    st.markdown("#### 🔎 Sweep Semua Kombinasi")
+    st.caption("Semua pola tanam × varietas × jarak tanam Custom × skenario kehilangan dihitung sekaligus, "
+               "lengkap dengan biaya benih & tenaga tanam per hektar.")
+
+    sw1, sw2, sw3 = st.columns(3)
+    with sw1:
+        row_range = st.slider("Jarak Antar Baris Custom (cm)", 15.0, 40.0, (15.0, 40.0), step=2.5)
+        plant_range = st.slider("Jarak Dalam Baris Custom (cm)", 10.0, 40.0, (10.0, 40.0), step=2.5)
+    with sw2:
+        loss_scenarios = st.multiselect("Skenario Kehilangan (%)", list(range(5, 41, 5)), default=[10, 15, 20, 25])
+        include_current = st.checkbox("Sertakan parameter saat ini sebagai varietas", value=True)
+    with sw3:
+        rank_label = st.selectbox("Urutkan Berdasarkan", list(SWEEP_RANK_OPTIONS))
+        cap_on = st.checkbox("Batasi malai per m² (kompensasi anakan)", value=True,
+                             help="Tanpa batas, jarak tanam terapat selalu menang karena hasil naik linear dengan populasi")
+        panicle_cap = st.number_input("Maks. Malai per m²", min_value=200, max_value=2000,
+                                      value=DEFAULT_PANICLE_CAP_M2, step=50, disabled=not cap_on)
+
+    sweep_varieties = dict(RICE_VARIETIES)
+    if include_current:
+        sweep_varieties["Input Saat Ini"] = {"tillers": tillers, "grains": grains, "weight": weight_1000}
+
+    # The sweep only runs on request; widget changes elsewhere on the page reuse the stored result
+    sweep_inputs = (row_range, plant_range, tuple(sorted(loss_scenarios)), plants_per_hill,
+                    tuple((k, tuple(sorted(v.items()))) for k, v in sweep_varieties.items()),
+                    rank_label, panicle_cap if cap_on else None)
+    if not loss_scenarios:
+        st.warning("Pilih minimal satu skenario kehilangan.")
+    elif st.button("🔎 Jalankan Sweep", type="primary", key="sweep_run"):
+        sweep = sweep_planting(
+            PLANTING_PATTERNS, sweep_varieties, plants_per_hill=plants_per_hill,
+            loss_scenarios=sorted(loss_scenarios),
+            row_spacings=np.arange(row_range[0], row_range[1] + 0.01, 2.5),
+            plant_spacings=np.arange(plant_range[0], plant_range[1] + 0.01, 2.5),
+            rank_by=SWEEP_RANK_OPTIONS[rank_label],
+            max_panicles_per_m2=panicle_cap if cap_on else None,
+        )
+        st.session_state["planting_sweep"] = (sweep_inputs, sweep, pareto_frontier(sweep))
+        st.session_state.pop("planting_sweep_csv", None)
+
+    stored_sweep = st.session_state.get("planting_sweep")
+    if stored_sweep and stored_sweep[0] != sweep_inputs:
+        st.info("Parameter berubah — klik **Jalankan Sweep** untuk menghitung ulang.")
+    elif stored_sweep and loss_scenarios:
+        _, sweep, frontier = stored_sweep
+
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Kombinasi Dievaluasi", f"{len(sweep):,}")
+        m2.metric("Titik Pareto", f"{len(frontier):,}")
+        m3.metric("GKP Bersih Terbaik", f"{sweep['gkp_net_ton'].max():.2f} ton/ha")
+
+        st.markdown(f"**🏆 20 Konfigurasi Teratas ({rank_label})**")
+        st.dataframe(sweep.head(20)[list(SWEEP_COLUMNS)].rename(columns=SWEEP_COLUMNS),
+                     use_container_width=True, hide_index=True)
+
+        base_loss = sweep["loss_pct"].min()
+        at_loss = sweep[sweep["loss_pct"] == base_loss]
+        fig_pareto = go.Figure()
+        fig_pareto.add_trace(go.Scattergl(
+            x=at_loss["total_cost"], y=at_loss["gkp_net_ton"], mode="markers", name="Semua konfigurasi",
+            marker=dict(color="#cbd5e1", size=5),
+            text=at_loss["pattern"] + " " + at_loss["spacing_row"].astype(str) + "×"
+                 + at_loss["spacing_plant"].astype(str) + " | " + at_loss["variety"],
+        ))
+        # Pareto over yield, seed cost and labour cost: drawn as points, not a 2-D frontier line
+        fig_pareto.add_trace(go.Scatter(
+            x=frontier["total_cost"], y=frontier["gkp_net_ton"], mode="markers", name="Titik Pareto",
+            marker=dict(color="#10b981", size=8),
+            text=frontier["pattern"] + " " + frontier["spacing_row"].astype(str) + "×"
+                 + frontier["spacing_plant"].astype(str) + " | " + frontier["variety"],
+        ))
+        fig_pareto.update_layout(
+            title=f"Hasil vs Biaya Benih + Tanam (kehilangan {base_loss:.0f}%)",
+            xaxis_title="Biaya Benih + Tenaga Tanam (Rp/ha)", yaxis_title="GKP Bersih (ton/ha)", height=450
+        )
+        st.plotly_chart(fig_pareto, use_container_width=True)
+
+        with st.expander(f"📋 Titik Pareto ({len(frontier)} konfigurasi)"):
+            st.dataframe(frontier[list(SWEEP_COLUMNS)].rename(columns=SWEEP_COLUMNS),
+                         use_container_width=True, hide_index=True)
+        if st.button("📄 Siapkan CSV Sweep", key="sweep_csv_prepare"):
+            st.session_state["planting_sweep_csv"] = sweep.to_csv(index=False).encode("utf-8")
+        if "planting_sweep_csv" in st.session_state:
+            st.download_button("📥 Unduh Hasil Sweep (CSV)", st.session_state["planting_sweep_csv"],
+                               file_name="sweep_pola_tanam.csv", mime="text/csv")
+
 # ========== TAB 4: PANDUAN ==========
 with tab4:
     st.markdown("### 📚 Panduan Penggunaan")
@@ -8,6 +8,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 
 from utils.auth import require_auth, show_user_info_sidebar
+from services.reference_data_service import copy_reference
+from services.catalog_index_service import ALL, CatalogIndex
 
 st.set_page_config(page_title="Katalog Pupuk & Harga", page_icon="🧪", layout="wide")
 
@@ -19,756 +21,17 @@ show_user_info_sidebar()
 
 # ========== DATABASE INITIALIZATION ==========
 
-# Default Data
-FERTILIZER_DATABASE_DEFAULT = {
-    # UREA
-    "Urea Pusri": {
-        "category": "Urea",
-        "brand": "PT Pupuk Sriwidjaja (Pusri)",
-        "formula": "CO(NH₂)₂",
-        "n_content": 46,
-        "p_content": 0,
-        "k_content": 0,
-        "price_per_kg": 2400,
-        "package_sizes": ["50 kg"],
-        "description": "Pupuk nitrogen tunggal untuk fase vegetatif",
-        "usage": "Padi, jagung, sayuran",
-        "dosage": "200-300 kg/ha",
-        "application": "Tabur/kocor, 2-3 kali aplikasi"
-    },
-    "Urea Petrokimia": {
-        "category": "Urea",
-        "brand": "PT Petrokimia Gresik",
-        "formula": "CO(NH₂)₂",
-        "n_content": 46,
-        "p_content": 0,
-        "k_content": 0,
-        "price_per_kg": 2400,
-        "package_sizes": ["50 kg"],
-        "description": "Pupuk nitrogen untuk pertumbuhan vegetatif",
-        "usage": "Padi, jagung, tebu",
-        "dosage": "200-300 kg/ha",
-        "application": "Tabur/kocor, split application"
-    },
-    "Urea Kaltim": {
-        "category": "Urea",
-        "brand": "PT Pupuk Kalimantan Timur",
-        "formula": "CO(NH₂)₂",
-        "n_content": 46,
-        "p_content": 0,
-        "k_content": 0,
-        "price_per_kg": 2400,
-        "package_sizes": ["50 kg"],
-        "description": "Pupuk nitrogen butiran (granul) berkualitas tinggi",
-        "usage": "Padi, jagung, hortalikultura",
-        "dosage": "200-300 kg/ha",
-        "application": "Tabur/kocor"
-    },
-    
-    # NPK PHONSKA
-    "NPK Phonska (Subsidi)": {
-        "category": "NPK",
-        "brand": "PT Petrokimia Gresik",
-        "formula": "15-10-12",
-        "n_content": 15,
-        "p_content": 10,
-        "k_content": 12,
-        "price_per_kg": 2300,
-        "package_sizes": ["50 kg"],
-        "description": "Pupuk majemuk subsidi untuk tanaman pangan",
-        "usage": "Padi, jagung, kedelai",
-        "dosage": "250-400 kg/ha",
-        "application": "Tabur saat tanam"
-    },
-    "NPK Phonska Plus": {
-        "category": "NPK",
-        "brand": "PT Petrokimia Gresik",
-        "formula": "15-15-15+9S+0.1Zn",
-        "n_content": 15,
-        "p_content": 15,
-        "k_content": 15,
-        "price_per_kg": 3200,
-        "package_sizes": ["25 kg", "50 kg"],
-        "description": "Pupuk majemuk non-subsidi dengan tambahan Sulfur dan Zinc",
-        "usage": "Padi, jagung, hortikultura",
-        "dosage": "200-350 kg/ha",
-        "application": "Tabur/kocor"
-    },
-    "NPK Mutiara 16-16-16": {
-        "category": "NPK",
-        "brand": "Yara / PT Meroke Tetap Jaya",
-        "formula": "16-16-16",
-        "n_content": 16,
-        "p_content": 16,
-        "k_content": 16,
-        "price_per_kg": 18000,
-        "package_sizes": ["1 kg", "5 kg", "50 kg"],
-        "description": "Pupuk majemuk impor berkualitas tinggi untuk hortikultura",
-        "usage": "Sayuran, buah-buahan, tanaman hias",
-        "dosage": "200-500 kg/ha",
-        "application": "Tabur/kocor"
-    },
-    "NPK Pelangi 16-16-16": {
-        "category": "NPK",
-        "brand": "PT Pupuk Kalimantan Timur",
-        "formula": "16-16-16",
-        "n_content": 16,
-        "p_content": 16,
-        "k_content": 16,
-        "price_per_kg": 12000,
-        "package_sizes": ["50 kg"],
-        "description": "Pupuk majemuk dengan teknologi blend merata",
-        "usage": "Padi, jagung, perkebunan",
-        "dosage": "250-400 kg/ha",
-        "application": "Tabur"
-    },
-    
-    # NPK GROWER
-    "NPK Meroke Grower 15-09-20": {
-        "category": "NPK",
-        "brand": "PT Meroke Tetap Jaya",
-        "formula": "15-09-20+TE",
-        "n_content": 15,
-        "p_content": 9,
-        "k_content": 20,
-        "price_per_kg": 19500,
-        "package_sizes": ["50 kg"],
-        "description": "Pupuk untuk fase generatif/pembesaran buah",
-        "usage": "Cabai, tomat, melon, jeruk",
-        "dosage": "300-500 kg/ha",
-        "application": "Kocor/tabur"
-    },
-    
-    # SP-36 & TSP
-    "SP-36 Petro": {
-        "category": "Fosfat",
-        "brand": "PT Petrokimia Gresik",
-        "formula": "P₂O₅ 36%",
-        "n_content": 0,
-        "p_content": 36,
-        "k_content": 0,
-        "price_per_kg": 2400,
-        "package_sizes": ["50 kg"],
-        "description": "Pupuk sumber fosfat utama untuk perakaran",
-        "usage": "Padi, jagung, kedelai",
-        "dosage": "100-150 kg/ha",
-        "application": "Tabur saat tanam"
-    },
-    "TSP 46": {
-        "category": "Fosfat",
-        "brand": "Import",
-        "formula": "P₂O₅ 46%",
-        "n_content": 0,
-        "p_content": 46,
-        "k_content": 0,
-        "price_per_kg": 15000,
-        "package_sizes": ["50 kg"],
-        "description": "Triple Super Phosphate kandungan P sangat tinggi",
-        "usage": "Perkebunan, holtikultura",
-        "dosage": "100-200 kg/ha",
-        "application": "Tabur"
-    },
-    
-    # KCl / MOP
-    "KCl Mahkota": {
-        "category": "Kalium",
-        "brand": "PT Wilmar Nabati Indonesia",
-        "formula": "K₂O 60%",
-        "n_content": 0,
-        "p_content": 0,
-        "k_content": 60,
-        "price_per_kg": 9500,
-        "package_sizes": ["50 kg"],
-        "description": "Pupuk sumber kalium untuk ketahanan penyakit",
-        "usage": "Padi, sawit, jagung",
-        "dosage": "100-200 kg/ha",
-        "application": "Tabur"
-    },
-    "ZK (Kalium Sulfat)": {
-        "category": "Kalium",
-        "brand": "PT Petrokimia Gresik",
-        "formula": "K₂O 50% + S 17%",
-        "n_content": 0,
-        "p_content": 0,
-        "k_content": 50,
-        "price_per_kg": 16000,
-        "package_sizes": ["25 kg", "50 kg"],
-        "description": "Pupuk kalium bebas klor, sangat baik untuk tembakau & jeruk",
-        "usage": "Tembakau, kentang, wortel, jeruk",
-        "dosage": "150-250 kg/ha",
-        "application": "Tabur/kocor"
-    },
-
-    # KHUSUS HIDROPONIK
-    "AB Mix Sayuran Daun": {
-        "category": "Hidroponik",
-        "brand": "Lokal Premium",
-        "formula": "Pekatan A + Pekatan B",
-        "n_content": 10,
-        "p_content": 5,
-        "k_content": 15,
-        "price_per_kg": 45000,
-        "package_sizes": ["1 set (5 liter)"],
-        "description": "Nutrisi lengkap untuk sayuran daun hidroponik",
-        "usage": "Selada, sawi, pakcoy, kangkung",
-        "dosage": "5 ml A + 5 ml B per 1 liter air",
-        "application": "Sirkulasi/NFT/Wick"
-    },
-    "AB Mix Buah": {
-        "category": "Hidroponik",
-        "brand": "Lokal Premium",
-        "formula": "Pekatan A + Pekatan B",
-        "n_content": 8,
-        "p_content": 8,
-        "k_content": 22,
-        "price_per_kg": 55000,
-        "package_sizes": ["1 set (5 liter)"],
-        "description": "Nutrisi lengkap untuk sayuran buah hidroponik",
-        "usage": "Melon, tomat, cabai, stroberi",
-        "dosage": "5 ml A + 5 ml B per 1 liter air",
-        "application": "Sirkulasi/Drip Irigasi"
-    },
-    
-    # HAYATI & ORGANIK
-    "EM4 Pertanian": {
-        "category": "Hayati",
-        "brand": "PT Songgolangit Persada",
-        "formula": "Lactobacillus, ragi, fotosintetik",
-        "n_content": 0.1,
-        "p_content": 0.1,
-        "k_content": 0.1,
-        "price_per_kg": 25000, # per liter
-        "package_sizes": ["1 liter"],
-        "description": "Mikroorganisme efektif untuk dekomposisi dan kesehatan tanah",
-        "usage": "Semua tanaman, pembuatan kompos",
-        "dosage": "1-2 ml per liter air",
-        "application": "Semprot tanah/siraman"
-    },
-    "Biotara": {
-        "category": "Hayati",
-        "brand": "PT Pupuk Indonesia",
-        "formula": "Trichoderma + N-Fixer",
-        "n_content": 1,
-        "p_content": 1,
-        "k_content": 1,
-        "price_per_kg": 22000,
-        "package_sizes": ["1 kg"],
-        "description": "Pupuk hayati khusus untuk lahan rawa/asam",
-        "usage": "Padi rawa, jagung",
-        "dosage": "25-50 kg/ha",
-        "application": "Tabur bersama pupuk kimia"
-    },
-    
-    # KEBOMAS & PREMIUM
-    "NPK Kebomas 15-15-15": {
-        "category": "NPK",
-        "brand": "PT Petrokimia Gresik",
-        "formula": "15-15-15",
-        "n_content": 15,
-        "p_content": 15,
-        "k_content": 15,
-        "price_per_kg": 9500,
-        "package_sizes": ["50 kg"],
-        "description": "Pupuk majemuk untuk tanaman pangan dan hortikultura",
-        "usage": "Padi, jagung, kedelai",
-        "dosage": "250-400 kg/ha",
-        "application": "Tabur"
-    },
-    "NPK YaraMila Winner": {
-        "category": "NPK Premium",
-        "brand": "Yara International",
-        "formula": "15-09-20+TE",
-        "n_content": 15,
-        "p_content": 9,
-        "k_content": 20,
-        "price_per_kg": 22000,
-        "package_sizes": ["50 kg"],
-        "description": "Pupuk premium dengan teknologi prill, larut air sempurna",
-        "usage": "Buah-buahan, sayuran bernilai tinggi",
-        "dosage": "300-500 kg/ha",
-        "application": "Kocor/tabur"
-    },
-    
-    # ZA
-    "ZA Petrokimia": {
-        "category": "ZA",
-        "brand": "PT Petrokimia Gresik",
-        "formula": "(NH₄)₂SO₄",
-        "n_content": 21,
-        "p_content": 0,
-        "k_content": 0,
-        "price_per_kg": 4500,
-        "package_sizes": ["50 kg"],
-        "description": "Pupuk nitrogen plus sulfur 24%",
-        "usage": "Padi, tebu, hortikultura",
-        "dosage": "150-250 kg/ha",
-        "application": "Tabur"
-    },
-    "ZA Pusri": {
-        "category": "ZA",
-        "brand": "PT Pupuk Sriwidjaja",
-        "formula": "(NH₄)₂SO₄",
-        "n_content": 21,
-        "p_content": 0,
-        "k_content": 0,
-        "price_per_kg": 4500,
-        "package_sizes": ["50 kg"],
-        "description": "Pupuk nitrogen amonium tinggi sulfur",
-        "usage": "Padi, jagung, sayuran",
-        "dosage": "150-250 kg/ha",
-        "application": "Tabur"
-    },
-    
-    # KCl / MOP Variants
-    "KCl Putih (MOP)": {
-        "category": "Kalium",
-        "brand": "Import",
-        "formula": "K₂O 60%",
-        "n_content": 0,
-        "p_content": 0,
-        "k_content": 60,
-        "price_per_kg": 11000,
-        "package_sizes": ["50 kg"],
-        "description": "Kalium Klorida berkualitas tunggi untuk hasil optimal",
-        "usage": "Padi, jagung, buah",
-        "dosage": "100-200 kg/ha",
-        "application": "Tabur"
-    },
-    
-    # ORGANIK
-    "Petroganik": {
-        "category": "Organik",
-        "brand": "PT Petrokimia Gresik",
-        "formula": "Organik Granul",
-        "n_content": 2,
-        "p_content": 1,
-        "k_content": 2,
-        "price_per_kg": 1200,
-        "package_sizes": ["40 kg"],
-        "description": "Pupuk organik granul untuk memperbaiki struktur tanah",
-        "usage": "Semua tanaman",
-        "dosage": "500-1000 kg/ha",
-        "application": "Tabur saat olah tanah"
-    },
-    "NASA POC": {
-        "category": "Organik Cair",
-        "brand": "PT Natural Nusantara",
-        "formula": "Organik Cair",
-        "n_content": 3,
-        "p_content": 2,
-        "k_content": 2,
-        "price_per_kg": 45000,
-        "package_sizes": ["500 ml", "3 liter"],
-        "description": "Pupuk organik cair multiguna",
-        "usage": "Semua tanaman",
-        "dosage": "3-5 tutup botol per tangki",
-        "application": "Semprot daun"
-    },
-    "DI GROW Hijau/Putih (Growth)": {
-        "category": "Organik Cair",
-        "brand": "Dynapharm",
-        "formula": "Biostimulan Vegetatif",
-        "n_content": 4,
-        "p_content": 2,
-        "k_content": 2,
-        "price_per_kg": 175000, # per Liter
-        "package_sizes": ["500 ml", "1 Liter", "4 Liter"],
-        "description": "Growth Booster dari ekstrak rumput laut Atlantik Utara untuk fase vegetatif.",
-        "usage": "Padi, cabai, sayuran, bawang",
-        "dosage": "3-5 ml per liter air",
-        "application": "Semprot daun (7-10 hari sekali)"
-    },
-    "DI GROW Merah (Fruits)": {
-        "category": "Organik Cair",
-        "brand": "Dynapharm",
-        "formula": "Biostimulan Generatif",
-        "n_content": 2,
-        "p_content": 4,
-        "k_content": 5,
-        "price_per_kg": 185000, # per Liter
-        "package_sizes": ["500 ml", "1 Liter", "4 Liter"],
-        "description": "Fruit & Flower Booster untuk merangsang pembuahan dan mencegah rontok.",
-        "usage": "Melon, buah-buahan, tanaman berbunga",
-        "dosage": "3-5 ml per liter air",
-        "application": "Semprot daun (7-10 hari sekali)"
-    },
-    
-    # MIKRO & SEKUNDER
-    "Gandasil D": {
-        "category": "Mikro",
-        "brand": "Kalbe",
-        "formula": "N-P-K + Mikro",
-        "n_content": 20,
-        "p_content": 15,
-        "k_content": 15,
-        "price_per_kg": 35000, # per 500g biasanya
-        "package_sizes": ["100g", "500g"],
-        "description": "Pupuk daun untuk fase vegetatif",
-        "usage": "Sayuran, tanaman hias",
-        "dosage": "2-3 g/liter",
-        "application": "Semprot"
-    },
-    "Gandasil B": {
-        "category": "Mikro",
-        "brand": "Kalbe",
-        "formula": "N-P-K + Mikro",
-        "n_content": 6,
-        "p_content": 20,
-        "k_content": 30,
-        "price_per_kg": 35000,
-        "package_sizes": ["100g", "500g"],
-        "description": "Pupuk daun untuk fase generatif (buah)",
-        "usage": "Buah, bunga",
-        "dosage": "2-3 g/liter",
-        "application": "Semprot"
-    },
-    "Dolomit Super": {
-        "category": "Sekunder",
-        "brand": "Lokal",
-        "formula": "CaMg(CO₃)₂",
-        "n_content": 0,
-        "p_content": 0,
-        "k_content": 0,
-        "price_per_kg": 800,
-        "package_sizes": ["50 kg", "Curah"],
-        "description": "Kapur pertanian untuk menaikkan pH tanah",
-        "usage": "Tanah masam",
-        "dosage": "1-2 ton/ha",
-        "application": "Tabur"
-    },
-    "Kieserite (Magnesium)": {
-        "category": "Sekunder",
-        "brand": "Import",
-        "formula": "MgSO₄",
-        "n_content": 0,
-        "p_content": 0,
-        "k_content": 0,
-        "price_per_kg": 6500,
-        "package_sizes": ["50 kg"],
-        "description": "Sumber Magnesium dan Sulfur cepat serap",
-        "usage": "Tanaman tahunan, buah",
-        "dosage": "100-200 kg/ha",
-        "application": "Tabur"
-    },
-    
-    # KHUSUS GENERATIF & PEMBUNGAAN
-    "KNO3 Merah (DGW)": {
-        "category": "Kalium Nitrat",
-        "brand": "DGW",
-        "formula": "15-0-14",
-        "n_content": 15,
-        "p_content": 0,
-        "k_content": 14,
-        "price_per_kg": 35000,
-        "package_sizes": ["2 kg", "25 kg"],
-        "description": "Pupuk kalium nitrat untuk fase vegetatif",
-        "usage": "Cabai, tomat, bawang merah",
-        "dosage": "2-5 g/liter air",
-        "application": "Kocor/semprot"
-    },
-    "KNO3 Putih (Pak Tani)": {
-        "category": "Kalium Nitrat",
-        "brand": "Saprotan Utama (Pak Tani)",
-        "formula": "13-0-45",
-        "n_content": 13,
-        "p_content": 0,
-        "k_content": 45,
-        "price_per_kg": 45000,
-        "package_sizes": ["2 kg", "25 kg"],
-        "description": "Pupuk kalium nitrat kristal untuk fase generatif/pembuahan",
-        "usage": "Melon, semangka, jeruk, kentang",
-        "dosage": "3-10 g/liter air",
-        "application": "Kocor/semprot"
-    },
-    "MKP (Pak Tani)": {
-        "category": "Fosfat Kalium",
-        "brand": "Saprotan Utama (Pak Tani)",
-        "formula": "0-52-34",
-        "n_content": 0,
-        "p_content": 52,
-        "k_content": 34,
-        "price_per_kg": 55000,
-        "package_sizes": ["1 kg"],
-        "description": "Mono Kalium Fosfat, larut air 100% untuk merangsang pembungaan",
-        "usage": "Tanaman buah, hortikultura",
-        "dosage": "2-4 g/liter air",
-        "application": "Semprot/kocor"
-    },
-    "Meroke MAP": {
-        "category": "Fosfat Amonium",
-        "brand": "PT Meroke Tetap Jaya",
-        "formula": "12-61-0",
-        "n_content": 12,
-        "p_content": 61,
-        "k_content": 0,
-        "price_per_kg": 48000,
-        "package_sizes": ["1 kg", "25 kg"],
-        "description": "Mono Amonium Fosfat untuk sistem perakaran dan energi tanaman",
-        "usage": "Semua jenis tanaman",
-        "dosage": "2-5 g/liter air",
-        "application": "Sistem fertigasi/hidroponik"
-    },
-}
-
-PESTICIDE_DATABASE_DEFAULT = {
-    # INSEKTISIDA
-    "Curacron 500EC": {
-        "category": "Insektisida",
-        "brand": "Syngenta",
-        "active_ingredient": "Profenofos 500 g/l",
-        "target_pests": ["Ulat Grayak", "Kutu Daun", "Thrips", "Penggerek Batang", "Lalat Buah"],
-        "price": 125000,
-        "unit": "500 ml",
-        "description": "Insektisida racun kontak dan lambung spektrum luas.",
-        "usage": "Cabai, Bawang Merah, Tomat, Kubis",
-        "dosage": "1-2 ml/liter air"
-    },
-    "Regent 50SC": {
-        "category": "Insektisida",
-        "brand": "BASF",
-        "active_ingredient": "Fipronil 50 g/l",
-        "target_pests": ["Wereng Coklat", "Penggerek Batang", "Thrips", "Rayap"],
-        "price": 85000,
-        "unit": "100 ml",
-        "description": "Insektisida sistemik racun kontak dan lambung dengan efek ZPT.",
-        "usage": "Padi, Cabai, Jagung, Kelapa Sawit",
-        "dosage": "1-2 ml/liter air"
-    },
-    "Prevathon 50SC": {
-        "category": "Insektisida",
-        "brand": "FMC",
-        "active_ingredient": "Kloramtraniliprol 50 g/l",
-        "target_pests": ["Ulat Grayak", "Penggerek Batang", "Ulat Krop"],
-        "price": 195000,
-        "unit": "250 ml",
-        "description": "Insektisida sistemik translaminar, sangat efektif memutus siklus ulat.",
-        "usage": "Padi, Bawang Merah, Kubis, Cabai",
-        "dosage": "3 ml/liter air"
-    },
-    "Alika 247ZC": {
-        "category": "Insektisida",
-        "brand": "Syngenta",
-        "active_ingredient": "Lambda cyhalothrin + Thiamethoxam",
-        "target_pests": ["Kutu Daun", "Kutu Kebul", "Ulat Grayak", "Wereng"],
-        "price": 95000,
-        "unit": "100 ml",
-        "description": "Insektisida campur, knockdown cepat dan proteksi lama.",
-        "usage": "Cabai, Tomat, Kentang, Mangga",
-        "dosage": "0.5-1 ml/liter air"
-    },
-    "Decis 25EC": {
-        "category": "Insektisida",
-        "brand": "Bayer",
-        "active_ingredient": "Deltametrin 25 g/l",
-        "target_pests": ["Ulat", "Belalang", "Lalat Buah", "Kutu Daun"],
-        "price": 55000,
-        "unit": "100 ml",
-        "description": "Insektisida racun kontak dan lambung golongan piretroid yang legendaris.",
-        "usage": "Sayuran, Jagung, Kedelai",
-        "dosage": "1 ml/liter air"
-    },
-    "Confidor 200SL": {
-        "category": "Insektisida",
-        "brand": "Bayer",
-        "active_ingredient": "Imidakloprid 200 g/l",
-        "target_pests": ["Thrips", "Kutu Daun", "Wereng", "Lalat Bibit"],
-        "price": 115000,
-        "unit": "100 ml",
-        "description": "Insektisida sistemik spesialis hama penghisap.",
-        "usage": "Cabai, Tomat, Padi, Semangka",
-        "dosage": "0.5-1 ml/liter air"
-    },
-    "Dursban 200EC": {
-        "category": "Insektisida",
-        "brand": "Corteva",
-        "active_ingredient": "Klorpirifos 200 g/l",
-        "target_pests": ["Ulat Tanpa Daun", "Kumbang Badak", "Rayap"],
-        "price": 110000,
-        "unit": "500 ml",
-        "description": "Insektisida racun kontak, lambung dan pernapasan (fumigan).",
-        "usage": "Kelapa Sawit, Jagung, Kakao",
-        "dosage": "2-3 ml/liter air"
-    },
-    
-    # RAINBOW PRODUCTS (NEW)
-    "Onrole 20 SG": {
-        "category": "Insektisida",
-        "brand": "Rainbow Agrosciences",
-        "active_ingredient": "Dinotefuran 20%",
-        "target_pests": ["Wereng Coklat", "Penggerek Batang Padi"],
-        "price": 45000,
-        "unit": "100 gr",
-        "description": "Insektisida racun kontak dan lambung sistemik untuk wereng.",
-        "usage": "Padi",
-        "dosage": "150-300 g/ha"
-    },
-    "Abinsec 18 EC": {
-        "category": "Insektisida",
-        "brand": "Rainbow Agrosciences",
-        "active_ingredient": "Abamectin 18 g/l",
-        "target_pests": ["Thrips", "Kutu Daun", "Tungau"],
-        "price": 65000,
-        "unit": "250 ml",
-        "description": "Insektisida racun kontak dan lambung spektrum luas.",
-        "usage": "Cabai, Tomat, Jeruk",
-        "dosage": "0.5-1 ml/liter air"
-    },
-
-    # FUNGISIDA
-    "Amistartop 325SC": {
-        "category": "Fungisida",
-        "brand": "Syngenta",
-        "active_ingredient": "Azoksistrobin + Difenokonazol",
-        "target_pests": ["Busuk Daun", "Antraknosa", "Blas Padi", "Bercak Daun"],
-        "price": 285000,
-        "unit": "250 ml",
-        "description": "Fungisida sistemik premium dengan ZPT pemacu pertumbuhan.",
-        "usage": "Padi, Bawang Merah, Cabai, Tomat",
-        "dosage": "0.5-1 ml/liter air"
-    },
-    "Antracol 70WP": {
-        "category": "Fungisida",
-        "brand": "Bayer",
-        "active_ingredient": "Propineb 70%",
-        "target_pests": ["Busuk Daun", "Bercak Daun", "Embun Tepung"],
-        "price": 115000,
-        "unit": "1 kg",
-        "description": "Fungisida kontak protektif dengan kandungan Zinc (Zn).",
-        "usage": "Sayuran, Buah, Tanaman Hias",
-        "dosage": "2-3 g/liter air"
-    },
-    "Score 250EC": {
-        "category": "Fungisida",
-        "brand": "Syngenta",
-        "active_ingredient": "Difenokonazol 250 g/l",
-        "target_pests": ["Busuk Buah", "Bercak Ungu", "Bercak Daun Alternaria"],
-        "price": 175000,
-        "unit": "250 ml",
-        "description": "Fungisida sistemik ZPT, sangat baik untuk pematangan buah.",
-        "usage": "Padi, Semangka, Tomat, Cabai",
-        "dosage": "0.5 ml/liter air"
-    },
-    "Dithane M-45": {
-        "category": "Fungisida",
-        "brand": "Corteva",
-        "active_ingredient": "Mankozeb 80%",
-        "target_pests": ["Busuk Daun", "Cacar Daun", "Karat Daun"],
-        "price": 125000,
-        "unit": "1 kg",
-        "description": "Fungisida kontak multiguna spektrum luas.",
-        "usage": "Kentang, Bawang, Cabai, Tomat",
-        "dosage": "2-4 g/liter air"
-    },
-    "Nativo 75WG": {
-        "category": "Fungisida",
-        "brand": "Bayer",
-        "active_ingredient": "Tebuconazole + Trifloxystrobin",
-        "target_pests": ["Blas Padi", "Gosong Palsu", "Antraknosa"],
-        "price": 65000,
-        "unit": "50 gr",
-        "description": "Fungisida sistemik kombinasi dua bahan aktif untuk padi bening.",
-        "usage": "Padi, Cabai, Bawang Merah",
-        "dosage": "150-200 g/hektar"
-    },
-    "Raineb 70 WP": {
-        "category": "Fungisida",
-        "brand": "Rainbow Agrosciences",
-        "active_ingredient": "Propineb 70%",
-        "target_pests": ["Hawar Pelepah", "Busuk Daun", "Bercak Daun"],
-        "price": 85000,
-        "unit": "1 kg",
-        "description": "Fungisida kontak protektif untuk penyakit jamur.",
-        "usage": "Padi, Sayuran",
-        "dosage": "2-3 g/liter air"
-    },
-    "Raincozeb 80 WP": {
-        "category": "Fungisida",
-        "brand": "Rainbow Agrosciences",
-        "active_ingredient": "Mancozeb 80%",
-        "target_pests": ["Hawar Daun", "Busuk Buah", "Karat Daun"],
-        "price": 95000,
-        "unit": "1 kg",
-        "description": "Fungisida kontak protektif berwarna kuning/biru.",
-        "usage": "Hortikultura, Perkebunan",
-        "dosage": "2-4 g/liter air"
-    },
-    "Bakterisida Agrimycin": {
-        "category": "Bakterisida",
-        "brand": "Pfizer/Agro",
-        "active_ingredient": "Streptomisin sulfat",
-        "target_pests": ["Layu Bakteri", "Hawar Daun Bakteri"],
-        "price": 45000,
-        "unit": "20 gr",
-        "description": "Antibiotik pertanian untuk mengendalikan serangan bakteri.",
-        "usage": "Tomat, Cabai, Padi (Kresek)",
-        "dosage": "1-2 g/liter air"
-    },
-
-    # HERBISIDA
-    "Roundup 486SL": {
-        "category": "Herbisida",
-        "brand": "Bayer",
-        "active_ingredient": "Glifosat Isopropilamina 486 g/l",
-        "target_pests": ["Alang-alang", "Rumput Liar", "Gulma Berdaun Lebar"],
-        "price": 145000,
-        "unit": "1 Liter",
-        "description": "Herbisida sistemik purna tumbuh nomor 1, mati sampai akar.",
-        "usage": "Perkebunan (Sawit/Karet), Persiapan Lahan",
-        "dosage": "5-10 ml/liter air"
-    },
-    "Gramoxone 276SL": {
-        "category": "Herbisida",
-        "brand": "Syngenta",
-        "active_ingredient": "Paraquat Diklorida 276 g/l",
-        "target_pests": ["Gulma Hijau", "Rumput Teki", "Gulma Berdaun Lebar"],
-        "price": 95000,
-        "unit": "1 Liter",
-        "description": "Herbisida kontak purna tumbuh, rumput gosong dalam hitungan jam.",
-        "usage": "Lahan tanpa tanaman, Pematang Sawah",
-        "dosage": "10-20 ml/liter air"
-    },
-    "Garlon 670EC": {
-        "category": "Herbisida",
-        "brand": "Corteva",
-        "active_ingredient": "Triklofir Butoksi Etil Ester",
-        "target_pests": ["Gulma Berkayu", "Tunggul Pohon", "Semak Belukar"],
-        "price": 285000,
-        "unit": "500 ml",
-        "description": "Herbisida khusus untuk mematikan tanaman berkayu dan semak besar.",
-        "usage": "Perkebunan Kelapa Sawit, Lahan Non-Crop",
-        "dosage": "1-2 liter/hektar"
-    },
-    "Maizcare 550 SC": {
-        "category": "Herbisida",
-        "brand": "Rainbow Agrosciences",
-        "active_ingredient": "Atrazine 500 g/l + Mesotrione 50 g/l",
-        "target_pests": ["Gulma Berdaun Lebar", "Gulma Rumput"],
-        "price": 135000,
-        "unit": "1 Liter",
-        "description": "Herbisida selektif untuk mengendalikan gulma pada tanaman jagung.",
-        "usage": "Jagung",
-        "dosage": "1.5-2 liter/ha"
-    },
-    "Lava 276 SL": {
-        "category": "Herbisida",
-        "brand": "Rainbow Agrosciences",
-        "active_ingredient": "Paraquat Diklorida 276 g/l",
-        "target_pests": ["Gulma Umum", "Rumput Liar"],
-        "price": 85000,
-        "unit": "1 Liter",
-        "description": "Herbisida kontak purna tumbuh yang sangat cepat membakar gulma.",
-        "usage": "Lahan tanpa tanaman, persiapan lahan",
-        "dosage": "10-20 ml/liter air"
-    },
-}
+# Default data: services/reference_data (fertilizer_catalog, pesticide_catalog);
+# each session edits its own copy
 
 # Session State Init
 DB_VERSION = "1.6" # Increment to force refresh
 
 if 'db_version' not in st.session_state or st.session_state.db_version != DB_VERSION:
-    st.session_state.fertilizer_db = FERTILIZER_DATABASE_DEFAULT.copy()
-    st.session_state.pesticide_db = PESTICIDE_DATABASE_DEFAULT.copy()
+    st.session_state.fertilizer_db = copy_reference("fertilizer_catalog")
+    st.session_state.pesticide_db = copy_reference("pesticide_catalog")
     st.session_state.db_version = DB_VERSION
+    st.session_state.fertilizer_db_rev = st.session_state.get("fertilizer_db_rev", 0) + 1
 
 # Global variables for convenience (points to session state)
 FERTILIZER_DATABASE = st.session_state.fertilizer_db
@@ -779,43 +42,77 @@ PESTICIDE_DATABASE_COMMERCIAL = st.session_state.pesticide_db
 
 # ========== HELPER FUNCTIONS ==========
 
-def get_categories():
-    """Get unique categories"""
-    return sorted(list(set([v["category"] for v in FERTILIZER_DATABASE.values()])))
-
-def get_brands():
-    """Get unique brands"""
-    return sorted(list(set([v["brand"] for v in FERTILIZER_DATABASE.values()])))
+PRODUCTS_PER_PAGE = 20
+SORT_OPTIONS = {
+    "Nama (A-Z)": ("name", False),
+    "Nama (Z-A)": ("name", True),
+    "Harga (Termurah)": ("price", False),
+    "Harga (Termahal)": ("price", True),
+    "Kandungan N": ("n_content", True),
+    "Kandungan P": ("p_content", True),
+    "Kandungan K": ("k_content", True),
+}
 
-def filter_fertilizers(category=None, brand=None, search_term=None, price_range=None):
-    """Filter fertilizers based on criteria"""
-    filtered = {}
-    
-    for name, data in FERTILIZER_DATABASE.items():
-        # Category filter
-        if category and category != "Semua" and data["category"] != category:
+def get_fertilizer_index():
+    """Facet / price / text index of this session's catalog, rebuilt only when the catalog changes"""
+    rev = st.session_state.get("fertilizer_db_rev", 0)
+    cached = st.session_state.get("fertilizer_index")
+    if cached is None or cached[0] != rev:
+        index = CatalogIndex(FERTILIZER_DATABASE, facets=("category", "brand"), price_field="price_per_kg",
+                             text_fields=("description", "usage"),
+                             sort_fields=("n_content", "p_content", "k_content"))
+        cached = (rev, index)
+        st.session_state.fertilizer_index = cached
+    return cached[1]
+
+def mark_fertilizer_db_changed():
+    st.session_state.fertilizer_db_rev = st.session_state.get("fertilizer_db_rev", 0) + 1
+
+def facet_option_label(counts):
+    return lambda value: value if value == ALL else f"{value} ({counts.get(value, 0)})"
+
+def import_price_list(df):
+    """
+    Merge a distributor price list (columns: name, price_per_kg, optional brand/category/n/p/k/...) into the catalog.
+    Every row is validated before the catalog is touched, so a bad row leaves it unchanged.
+    """
+    df = df.rename(columns=lambda c: str(c).strip().lower())
+    missing = {"name", "price_per_kg"} - set(df.columns)
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ada: {', '.join(sorted(missing))}")
+    parsed = []
+    for line, row in enumerate(df.to_dict("records"), start=2):
+        row = {k: v for k, v in row.items() if not pd.isna(v)}
+        name = str(row.pop("name", "")).strip()
+        if not name or "price_per_kg" not in row:
             continue
-        
-        # Brand filter
-        if brand and brand != "Semua" and data["brand"] != brand:
-            continue
-        
-        # Search filter
-        if search_term:
-            search_lower = search_term.lower()
-            if not (search_lower in name.lower() or 
-                   search_lower in data["description"].lower() or
-                   search_lower in data["usage"].lower()):
-                continue
-        
-        # Price filter
-        if price_range:
-            if not (price_range[0] <= data["price_per_kg"] <= price_range[1]):
-                continue
-        
-        filtered[name] = data
-    
-    return filtered
+        try:
+            row["price_per_kg"] = int(float(row["price_per_kg"]))
+            for key in ("n_content", "p_content", "k_content"):
+                if key in row:
+                    row[key] = float(row[key])
+        except (TypeError, ValueError):
+            raise ValueError(f"Baris {line} ({name}): harga / kandungan harus berupa angka") from None
+        parsed.append((name, row))
+
+    added = updated = 0
+    for name, row in parsed:
+        if name in FERTILIZER_DATABASE:
+            FERTILIZER_DATABASE[name].update(row)
+            updated += 1
+        else:
+            entry = {
+                "brand": "-", "category": "Lainnya", "formula": "-",
+                "n_content": 0.0, "p_content": 0.0, "k_content": 0.0,
+                "description": "", "usage": "", "dosage": "-", "application": "-",
+                "package_sizes": [],
+            }
+            entry.update(row)
+            if isinstance(entry["package_sizes"], str):
+                entry["package_sizes"] = [p.strip() for p in entry["package_sizes"].split(";") if p.strip()]
+            FERTILIZER_DATABASE[name] = entry
+            added += 1
+    return added, updated
 
 # ========== CUSTOM CSS ==========
 st.markdown("""
@@ -895,29 +192,38 @@ with st.sidebar:
     # Search
     search_term = st.text_input("🔎 Cari Pupuk", placeholder="Nama, deskripsi, atau penggunaan...")
     
-    # Category filter
-    categories = ["Semua"] + get_categories()
-    selected_category = st.selectbox("Kategori", categories)
-    
-    # Brand filter
-    brands = ["Semua"] + get_brands()
-    selected_brand = st.selectbox("Produsen", brands)
+    fert_index = get_fertilizer_index()
+    max_price = max(250000, max(fert_index.prices, default=0))
     
     # Price range
     st.markdown("**Range Harga (Rp/kg atau unit):**")
     price_range = st.slider(
         "Pilih range harga",
         min_value=0,
-        max_value=250000,
-        value=(0, 250000),
+        max_value=max_price,
+        value=(0, max_price),
         step=500,
         format="Rp %d"
     )
     
+    # Facet counts follow the other active filters
+    _, facet_counts = fert_index.query(
+        {"category": st.session_state.get("fert_category", ALL), "brand": st.session_state.get("fert_brand", ALL)},
+        text=search_term, price_range=price_range,
+    )
+    
+    # Category filter
+    selected_category = st.selectbox("Kategori", [ALL] + fert_index.facet_values("category"), key="fert_category",
+                                     format_func=facet_option_label(facet_counts["category"]))
+    
+    # Brand filter
+    selected_brand = st.selectbox("Produsen", [ALL] + fert_index.facet_values("brand"), key="fert_brand",
+                                  format_func=facet_option_label(facet_counts["brand"]))
+    
     # Sort by
     sort_by = st.selectbox(
         "Urutkan Berdasarkan",
-        ["Nama (A-Z)", "Nama (Z-A)", "Harga (Termurah)", "Harga (Termahal)", "Kandungan N", "Kandungan P", "Kandungan K"]
+        list(SORT_OPTIONS)
     )
     
     st.metric("Total Produk", total_products)
@@ -933,6 +239,7 @@ with st.sidebar:
         new_price = st.number_input("Harga Baru (Rp/kg):", value=float(current_price), step=100.0, key="new_fert_price")
         if st.button("Update Harga Pupuk"):
             st.session_state.fertilizer_db[prod_to_edit]['price_per_kg'] = int(new_price)
+            mark_fertilizer_db_changed()
             st.success(f"Harga {prod_to_edit} diperbarui!")
             st.rerun()
 
@@ -946,9 +253,27 @@ with st.sidebar:
             st.success(f"Harga {pest_to_edit} diperbarui!")
             st.rerun()
 
+    # Distributor price list import
+    with st.expander("📥 Impor Daftar Harga Distributor (CSV)"):
+        st.caption("Kolom wajib: name, price_per_kg. Opsional: brand, category, formula, n_content, p_content, "
+                   "k_content, description, usage, dosage, application, package_sizes (pisahkan dengan ;)")
+        price_file = st.file_uploader("Unggah CSV", type=["csv"], key="fert_price_csv")
+        if price_file is not None and st.button("Impor Daftar Harga"):
+            try:
+                added, updated = import_price_list(pd.read_csv(price_file))
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                st.success(f"{added} produk baru, {updated} produk diperbarui.")
+                st.rerun()
+            finally:
+                # Any path through the import invalidates the facet index
+                mark_fertilizer_db_changed()
+
     if st.button("🔄 Reset ke Harga Default", type="secondary"):
-        st.session_state.fertilizer_db = FERTILIZER_DATABASE_DEFAULT.copy()
-        st.session_state.pesticide_db = PESTICIDE_DATABASE_DEFAULT.copy()
+        st.session_state.fertilizer_db = copy_reference("fertilizer_catalog")
+        st.session_state.pesticide_db = copy_reference("pesticide_catalog")
+        mark_fertilizer_db_changed()
         st.success("Harga telah dikembalikan ke default.")
         st.rerun()
     
@@ -958,29 +283,13 @@ with st.sidebar:
 
 # ========== MAIN CONTENT ==========
 
-# Apply filters
-filtered_fertilizers = filter_fertilizers(
-    category=selected_category if selected_category != "Semua" else None,
-    brand=selected_brand if selected_brand != "Semua" else None,
-    search_term=search_term if search_term else None,
-    price_range=price_range
+# Apply filters (bitset index) and sort
+fert_mask, _ = fert_index.query(
+    {"category": selected_category, "brand": selected_brand},
+    text=search_term, price_range=price_range,
 )
-
-# Sort
-if sort_by == "Nama (A-Z)":
-    filtered_fertilizers = dict(sorted(filtered_fertilizers.items()))
-elif sort_by == "Nama (Z-A)":
-    filtered_fertilizers = dict(sorted(filtered_fertilizers.items(), reverse=True))
-elif sort_by == "Harga (Termurah)":
-    filtered_fertilizers = dict(sorted(filtered_fertilizers.items(), key=lambda x: x[1]["price_per_kg"]))
-elif sort_by == "Harga (Termahal)":
-    filtered_fertilizers = dict(sorted(filtered_fertilizers.items(), key=lambda x: x[1]["price_per_kg"], reverse=True))
-elif sort_by == "Kandungan N":
-    filtered_fertilizers = dict(sorted(filtered_fertilizers.items(), key=lambda x: x[1]["n_content"], reverse=True))
-elif sort_by == "Kandungan P":
-    filtered_fertilizers = dict(sorted(filtered_fertilizers.items(), key=lambda x: x[1]["p_content"], reverse=True))
-elif sort_by == "Kandungan K":
-    filtered_fertilizers = dict(sorted(filtered_fertilizers.items(), key=lambda x: x[1]["k_content"], reverse=True))
+sort_field, sort_desc = SORT_OPTIONS[sort_by]
+filtered_fertilizers = fert_index.select(fert_mask, sort_by=sort_field, descending=sort_desc)
 
 # Display results
 st.markdown(f"### Menampilkan {len(filtered_fertilizers)} produk")
@@ -996,6 +305,11 @@ else:
         # Display products in grid
         cols_per_row = 2
         products_list = list(filtered_fertilizers.items())
+        n_pages = -(-len(products_list) // PRODUCTS_PER_PAGE)
+        if n_pages > 1:
+            page = st.number_input(f"Halaman (dari {n_pages})", min_value=1, max_value=n_pages, value=1, step=1)
+            start = (page - 1) * PRODUCTS_PER_PAGE
+            products_list = products_list[start:start + PRODUCTS_PER_PAGE]
         
         for i in range(0, len(products_list), cols_per_row):
             cols = st.columns(cols_per_row)
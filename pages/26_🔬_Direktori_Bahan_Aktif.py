@@ -9,6 +9,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 
 from utils.auth import require_auth, show_user_info_sidebar
+from services.reference_data_service import get_reference
+from services.catalog_index_service import ALL, CatalogIndex
 
 st.set_page_config(page_title="Direktori Bahan Aktif Pestisida", page_icon="🔬", layout="wide")
 
@@ -23,443 +25,18 @@ show_user_info_sidebar()
 # ==========================================
 # Data compiled from WHO Pesticide Specifications, FAO guidelines, and scientific literature
 
-ACTIVE_INGREDIENTS = {
-    # --- BOTANICALS (NEW) ---
-    "Azadirachtin": {
-        "category": "Botanical",
-        "chemical_class": "Limonoid (Tetranortriterpenoid)",
-        "cas_number": "11141-17-6",
-        "mode_of_action": "Antifeedant, IGR (Insect Growth Regulator), Repellent",
-        "moa_detail": "Mengganggu sistem hormonal (ecdysone) serangga, menghambat pergantian kulit (molting), dan mengurangi nafsu makan.",
-        "target_pests": "Ulat, wereng, kutu daun, lalat putih, thrips",
-        "crops": "Padi, sayuran, palawija, tanaman hias",
-        "toxicity_class": "WHO Class U (Unlikely to present acute hazard)",
-        "ld50_oral": ">5000 mg/kg (tikus)",
-        "ld50_dermal": ">2000 mg/kg",
-        "phi": "0-3 hari",
-        "environmental_fate": "Biodegradable, cepat terurai oleh sinar UV (waktu paruh < 4 hari). Aman untuk cacing tanah.",
-        "safety_precautions": "Relatif aman, namun hindari kontak mata langsung. Aman bagi musuh alami.",
-        "resistance_risk": "Sangat Rendah (mekanisme kompleks menyulitkan resistensi)",
-        "references": "Mordue (Luntz) & Blackwell (1993), Schmutterer (1990)"
-    },
-    
-    "Rotenon": {
-        "category": "Botanical",
-        "chemical_class": "Isoflavonoid",
-        "cas_number": "83-79-4",
-        "mode_of_action": "Respiration inhibitor (Mitochondrial Complex I)",
-        "moa_detail": "Menghambat transport elektron pada mitokondria, menyebabkan kegagalan produksi energi (ATP) dan kelumpuhan saraf.",
-        "target_pests": "Ikan liar (piscicide), ulat, kutu, kumbang",
-        "crops": "Sayuran, tambak (persiapan lahan)",
-        "toxicity_class": "WHO Class II (Moderately Hazardous)",
-        "ld50_oral": "132-1500 mg/kg (tikus)",
-        "ld50_dermal": ">5000 mg/kg",
-        "phi": "1-3 hari (cepat terurai)",
-        "environmental_fate": "Sangat toksik bagi ikan dan kehidupan air. Cepat terurai oleh cahaya dan udara.",
-        "safety_precautions": "Sangat berbahaya bagi ikan! Jangan gunakan dekat perairan alami. Gunakan masker.",
-        "resistance_risk": "Rendah",
-        "references": "O'Brien (2014), EPA (2007)"
-    },
-
-    "Eugenol": {
-        "category": "Botanical",
-        "chemical_class": "Phenylpropene (Minyak Atsiri)",
-        "cas_number": "97-53-0",
-        "mode_of_action": "Neurotoxin (Octopamine blocker), Membrane disruptor",
-        "moa_detail": "Merusak membran sel jamur/bakteri dan memblokir reseptor octopamine pada serangga.",
-        "target_pests": "Jamur (fungisida), bakteri, serangga gudang, nyamuk",
-        "crops": "Cengkeh, penyimpanan benih, sayuran",
-        "toxicity_class": "WHO Class U (Unlikely to present acute hazard)",
-        "ld50_oral": "2680 mg/kg (tikus)",
-        "ld50_dermal": "Aman (iritasi ringan)",
-        "phi": "0-1 hari",
-        "environmental_fate": "Volatil (mudah menguap), residu sangat rendah.",
-        "safety_precautions": "Dapat menyebabkan iritasi kulit/mata pada konsentrasi tinggi.",
-        "resistance_risk": "Rendah",
-        "references": "Rani et al. (2018)"
-    },
-
-    "Pyrethrin": {
-        "category": "Botanical",
-        "chemical_class": "Pyrethroid (Alami)",
-        "cas_number": "8003-34-7",
-        "mode_of_action": "Sodium channel modulator (Knock-down effect)",
-        "moa_detail": "Menjaga saluran natrium tetap terbuka, menyebabkan eksitasi saraf berulang dan kelumpuhan instan.",
-        "target_pests": "Nyamuk, lalat, semut, kutu daun, ulat (semua serangga lunak)",
-        "crops": "Hortikultura, tanaman hias, rumah tangga",
-        "toxicity_class": "WHO Class II (Moderately Hazardous)",
-        "ld50_oral": "1030 mg/kg (tikus)",
-        "ld50_dermal": ">1500 mg/kg",
-        "phi": "0-1 hari",
-        "environmental_fate": "Sangat cepat terurai oleh sinar matahari (photodegradable). Toksik bagi ikan.",
-        "safety_precautions": "Aplikasi sore hari. Bahaya bagi ikan dan lebah (kontak langsung).",
-        "resistance_risk": "Sedang (jika digunakan berlebihan tanpa rotasi)",
-        "references": "Casida (1980)"
-    },
-
-    "Nicotine": {
-        "category": "Botanical",
-        "chemical_class": "Alkaloid",
-        "cas_number": "54-11-5",
-        "mode_of_action": "Nicotinic acetylcholine receptor agonist",
-        "moa_detail": "Meniru acetylcholine di sinaps saraf, menyebabkan kejang hebat lalu kelumpuhan.",
-        "target_pests": "Thrips, kutu daun, ulat, serangga penghisap",
-        "crops": "Tembakau, sayuran (hati-hati residu)",
-        "toxicity_class": "WHO Class Ib (Highly Hazardous)",
-        "ld50_oral": "50 mg/kg (tikus) - Sangat Toksik!",
-        "ld50_dermal": "50 mg/kg (mudah terserap kulit)",
-        "phi": "7-14 hari (persisten)",
-        "environmental_fate": "Cukup stabil. Berbahaya bagi mamalia dan burung.",
-        "safety_precautions": "SANGAT BERBAHAYA. Wajib APD lengkap (masker, sarung tangan). Jangan kena kulit.",
-        "resistance_risk": "Sedang",
-        "references": "Tomizawa & Casida (2003)"
-    },
-
-    "Capsaicin": {
-        "category": "Botanical",
-        "chemical_class": "Capsaicinoid",
-        "cas_number": "404-86-4",
-        "mode_of_action": "Repellent, Metabolic disrupter",
-        "moa_detail": "Iritasi kuat pada jaringan lunak dan saraf sensorik. Mengganggu metabolisme serangga.",
-        "target_pests": "Hama vertebrata (tikus, tupai), serangga umum",
-        "crops": "Semua tanaman",
-        "toxicity_class": "WHO Class U (Tapi iritan kuat)",
-        "ld50_oral": "118 mg/kg (tikus)",
-        "ld50_dermal": ">512 mg/kg",
-        "phi": "0-1 hari",
-        "environmental_fate": "Biodegradable.",
-        "safety_precautions": "Hindari kontak mata/kulit. Menyebabkan rasa panas terbakar.",
-        "resistance_risk": "Rendah",
-        "references": "Cater (2009)"
-    },
-
-    "Citronellal": {
-        "category": "Botanical",
-        "chemical_class": "Monoterpenoid (Minyak Atsiri)",
-        "cas_number": "106-23-0",
-        "mode_of_action": "Repellent",
-        "moa_detail": "Mengganggu reseptor penciuman serangga, mencegah mereka menemukan inang.",
-        "target_pests": "Nyamuk, lalat, kutu",
-        "crops": "Hias, pekarangan",
-        "toxicity_class": "WHO Class U",
-        "ld50_oral": "2420 mg/kg",
-        "ld50_dermal": ">2500 mg/kg",
-        "phi": "0 hari",
-        "environmental_fate": "Sangat volatil.",
-        "safety_precautions": "Aman. Bisa menyebabkan iritasi mata.",
-        "resistance_risk": "Rendah",
-        "references": "Trongtokit et al. (2005)"
-    },
-    
-    "Andrographolide": {
-        "category": "Botanical",
-        "chemical_class": "Diterpenoid Lactone",
-        "cas_number": "5508-58-7",
-        "mode_of_action": "Antifeedant, Chemosterilant",
-        "moa_detail": "Sangat pahit, mencegah serangga makan. Dapat mengganggu kesuburan serangga.",
-        "target_pests": "Ulat pemakan daun, penggerek",
-        "crops": "Sayuran",
-        "toxicity_class": "WHO Class U",
-        "ld50_oral": ">1000 mg/kg",
-        "ld50_dermal": "Aman",
-        "phi": "1-3 hari",
-        "environmental_fate": "Cepat terurai.",
-        "safety_precautions": "Rasa sangat pahit.",
-        "resistance_risk": "Rendah",
-        "references": "Hermawan et al. (1997)"
-    },
-
-    # --- SYNTHETICS (EXISTING) ---
-    # INSECTICIDES - ORGANOPHOSPHATES
-    "Klorpirifos": {
-        "category": "Insektisida",
-        "chemical_class": "Organofosfat",
-        "cas_number": "2921-88-2",
-        "mode_of_action": "Acetylcholinesterase inhibitor",
-        "moa_detail": "Menghambat enzim acetylcholinesterase, menyebabkan akumulasi acetylcholine di sinaps saraf",
-        "target_pests": "Wereng, penggerek batang, ulat, trips, kutu daun",
-        "crops": "Padi, jagung, sayuran, buah",
-        "toxicity_class": "WHO Class II (Moderately Hazardous)",
-        "ld50_oral": "135-163 mg/kg (tikus)",
-        "ld50_dermal": ">2000 mg/kg (tikus)",
-        "phi": "14-21 hari",
-        "environmental_fate": "Persistensi sedang di tanah (DT50: 10-120 hari), dapat mencemari air permukaan",
-        "safety_precautions": "Gunakan APD lengkap, hindari kontak kulit, jangan aplikasi dekat sumber air",
-        "resistance_risk": "Tinggi - rotasi dengan bahan aktif berbeda sangat dianjurkan",
-        "references": "WHO (2009), EPA (2020)"
-    },
-    
-    "Profenofos": {
-        "category": "Insektisida",
-        "chemical_class": "Organofosfat",
-        "cas_number": "41198-08-7",
-        "mode_of_action": "Acetylcholinesterase inhibitor",
-        "moa_detail": "Menghambat enzim acetylcholinesterase pada sistem saraf serangga",
-        "target_pests": "Penggerek buah, ulat grayak, trips, kutu daun",
-        "crops": "Cabai, tomat, bawang, kubis",
-        "toxicity_class": "WHO Class II (Moderately Hazardous)",
-        "ld50_oral": "358 mg/kg (tikus)",
-        "ld50_dermal": ">2000 mg/kg (kelinci)",
-        "phi": "7-14 hari",
-        "environmental_fate": "Persistensi rendah-sedang (DT50: 1-7 hari di tanah)",
-        "safety_precautions": "Gunakan masker dan sarung tangan, hindari inhalasi",
-        "resistance_risk": "Tinggi",
-        "references": "FAO/WHO (2011)"
-    },
-    
-    # INSECTICIDES - PYRETHROIDS
-    "Sipermetrin": {
-        "category": "Insektisida",
-        "chemical_class": "Piretroid",
-        "cas_number": "52315-07-8",
-        "mode_of_action": "Sodium channel modulator",
-        "moa_detail": "Mengganggu saluran sodium pada membran sel saraf, menyebabkan paralisis",
-        "target_pests": "Ulat, wereng, trips, lalat buah, kutu",
-        "crops": "Padi, jagung, sayuran, buah, kapas",
-        "toxicity_class": "WHO Class II (Moderately Hazardous)",
-        "ld50_oral": "247-4123 mg/kg (tikus, tergantung isomer)",
-        "ld50_dermal": ">2000 mg/kg",
-        "phi": "3-7 hari",
-        "environmental_fate": "Sangat toksik untuk ikan dan lebah, persistensi rendah (DT50: 8-16 hari)",
-        "safety_precautions": "Jangan aplikasi dekat perairan, hindari saat lebah aktif",
-        "resistance_risk": "Tinggi - sudah banyak kasus resistensi",
-        "references": "WHO (2018), Nauen (2007)"
-    },
-    
-    "Deltametrin": {
-        "category": "Insektisida",
-        "chemical_class": "Piretroid",
-        "cas_number": "52918-63-5",
-        "mode_of_action": "Sodium channel modulator",
-        "moa_detail": "Modulator saluran sodium, mengganggu transmisi impuls saraf",
-        "target_pests": "Ulat, wereng, trips, kutu daun, lalat buah",
-        "crops": "Padi, jagung, sayuran, buah, kapas",
-        "toxicity_class": "WHO Class II (Moderately Hazardous)",
-        "ld50_oral": "135 mg/kg (tikus)",
-        "ld50_dermal": ">2000 mg/kg",
-        "phi": "3-7 hari",
-        "environmental_fate": "Sangat toksik untuk ikan dan organisme akuatik, persistensi rendah",
-        "safety_precautions": "Hindari aplikasi dekat sumber air, gunakan APD",
-        "resistance_risk": "Tinggi",
-        "references": "WHO (2019)"
-    },
-    
-    # INSECTICIDES - NEONICOTINOIDS
-    "Imidakloprid": {
-        "category": "Insektisida",
-        "chemical_class": "Neonikotinoid",
-        "cas_number": "138261-41-3",
-        "mode_of_action": "Nicotinic acetylcholine receptor agonist",
-        "moa_detail": "Berikatan dengan reseptor nikotinik acetylcholine, menyebabkan overstimulasi dan paralisis",
-        "target_pests": "Wereng, kutu daun, trips, penggerek, lalat putih",
-        "crops": "Padi, jagung, sayuran, buah, kapas",
-        "toxicity_class": "WHO Class II (Moderately Hazardous)",
-        "ld50_oral": "450 mg/kg (tikus)",
-        "ld50_dermal": ">5000 mg/kg",
-        "phi": "7-14 hari",
-        "environmental_fate": "Persistensi tinggi di tanah (DT50: 40-997 hari), toksik untuk lebah",
-        "safety_precautions": "Hindari aplikasi saat pembungaan, jangan gunakan dekat sarang lebah",
-        "resistance_risk": "Sedang-Tinggi",
-        "references": "Jeschke et al. (2011), Simon-Delso et al. (2015)"
-    },
-    
-    "Tiametoksam": {
-        "category": "Insektisida",
-        "chemical_class": "Neonikotinoid",
-        "cas_number": "153719-23-4",
-        "mode_of_action": "Nicotinic acetylcholine receptor agonist",
-        "moa_detail": "Agonis reseptor nikotinik, mengganggu transmisi saraf serangga",
-        "target_pests": "Wereng, kutu daun, trips, lalat putih",
-        "crops": "Padi, jagung, sayuran, buah",
-        "toxicity_class": "WHO Class II (Moderately Hazardous)",
-        "ld50_oral": "1563 mg/kg (tikus)",
-        "ld50_dermal": ">2000 mg/kg",
-        "phi": "7-14 hari",
-        "environmental_fate": "Persistensi sedang-tinggi, toksik untuk lebah dan organisme akuatik",
-        "safety_precautions": "Hindari aplikasi saat pembungaan, rotasi dengan bahan aktif lain",
-        "resistance_risk": "Sedang-Tinggi",
-        "references": "Maienfisch et al. (2001)"
-    },
-    
-    # FUNGICIDES - TRIAZOLES
-    "Propikonazol": {
-        "category": "Fungisida",
-        "chemical_class": "Triazol",
-        "cas_number": "60207-90-1",
-        "mode_of_action": "DMI (Demethylation Inhibitor) - Sterol biosynthesis inhibitor",
-        "moa_detail": "Menghambat enzim C14-demethylase dalam biosintesis ergosterol, merusak membran sel jamur",
-        "target_pests": "Blast, bercak daun, karat, embun tepung, antraknosa",
-        "crops": "Padi, jagung, sayuran, buah, kedelai",
-        "toxicity_class": "WHO Class II (Moderately Hazardous)",
-        "ld50_oral": "1517 mg/kg (tikus)",
-        "ld50_dermal": ">4000 mg/kg",
-        "phi": "14-21 hari",
-        "environmental_fate": "Persistensi sedang (DT50: 30-110 hari), mobilitas rendah di tanah",
-        "safety_precautions": "Gunakan APD, hindari kontaminasi air",
-        "resistance_risk": "Tinggi - rotasi dengan fungisida berbeda kelas wajib",
-        "references": "FRAC (2021), Hewitt (1998)"
-    },
-    
-    "Tebukonazol": {
-        "category": "Fungisida",
-        "chemical_class": "Triazol",
-        "cas_number": "107534-96-3",
-        "mode_of_action": "DMI - Sterol biosynthesis inhibitor",
-        "moa_detail": "Inhibitor biosintesis ergosterol, mengganggu integritas membran sel jamur",
-        "target_pests": "Blast, bercak daun, karat, embun tepung",
-        "crops": "Padi, jagung, gandum, sayuran",
-        "toxicity_class": "WHO Class II (Moderately Hazardous)",
-        "ld50_oral": "1700 mg/kg (tikus)",
-        "ld50_dermal": ">5000 mg/kg",
-        "phi": "14-21 hari",
-        "environmental_fate": "Persistensi sedang-tinggi (DT50: 50-365 hari)",
-        "safety_precautions": "Gunakan APD lengkap, rotasi dengan fungisida lain",
-        "resistance_risk": "Tinggi",
-        "references": "FRAC (2021)"
-    },
-    
-    # FUNGICIDES - STROBILURINS
-    "Azoksistrobin": {
-        "category": "Fungisida",
-        "chemical_class": "Strobilurin",
-        "cas_number": "131860-33-8",
-        "mode_of_action": "QoI (Quinone outside Inhibitor) - Respiration inhibitor",
-        "moa_detail": "Menghambat respirasi mitokondria pada kompleks III, menghentikan produksi energi jamur",
-        "target_pests": "Blast, bercak daun, embun tepung, antraknosa, karat",
-        "crops": "Padi, jagung, sayuran, buah, kedelai",
-        "toxicity_class": "WHO Class U (Unlikely to present acute hazard)",
-        "ld50_oral": ">5000 mg/kg (tikus)",
-        "ld50_dermal": ">2000 mg/kg",
-        "phi": "7-14 hari",
-        "environmental_fate": "Persistensi sedang (DT50: 14-79 hari), toksik untuk ikan",
-        "safety_precautions": "Hindari aplikasi dekat perairan, maksimal 2-3 aplikasi per musim",
-        "resistance_risk": "Sangat Tinggi - gunakan hanya dalam program rotasi",
-        "references": "Bartlett et al. (2002), FRAC (2021)"
-    },
-    
-    # HERBICIDES - GLYPHOSATE
-    "Glifosat": {
-        "category": "Herbisida",
-        "chemical_class": "Glisin tersubstitusi",
-        "cas_number": "1071-83-6",
-        "mode_of_action": "EPSP synthase inhibitor",
-        "moa_detail": "Menghambat enzim EPSP synthase dalam jalur shikimat, menghentikan sintesis asam amino aromatik",
-        "target_pests": "Gulma berdaun lebar dan sempit (non-selektif)",
-        "crops": "Perkebunan, lahan bera, pra-tanam",
-        "toxicity_class": "WHO Class U (Unlikely to present acute hazard)",
-        "ld50_oral": ">5000 mg/kg (tikus)",
-        "ld50_dermal": ">5000 mg/kg",
-        "phi": "N/A (aplikasi pra-tanam atau non-crop)",
-        "environmental_fate": "Persistensi rendah-sedang (DT50: 2-197 hari), terikat kuat di tanah",
-        "safety_precautions": "Hindari drift ke tanaman budidaya, gunakan pelindung mata",
-        "resistance_risk": "Tinggi - banyak gulma resisten, rotasi mode of action penting",
-        "references": "Duke & Powles (2008), Heap (2021)"
-    },
-    
-    # HERBICIDES - ALS INHIBITORS
-    "Bispiribak-sodium": {
-        "category": "Herbisida",
-        "chemical_class": "Pyrimidinyl carboxy",
-        "cas_number": "125401-92-5",
-        "mode_of_action": "ALS inhibitor (Acetolactate synthase)",
-        "moa_detail": "Menghambat enzim ALS, menghentikan sintesis asam amino rantai cabang (valine, leucine, isoleucine)",
-        "target_pests": "Gulma berdaun lebar dan teki pada padi",
-        "crops": "Padi sawah",
-        "toxicity_class": "WHO Class U (Unlikely to present acute hazard)",
-        "ld50_oral": ">5000 mg/kg (tikus)",
-        "ld50_dermal": ">2000 mg/kg",
-        "phi": "60 hari",
-        "environmental_fate": "Persistensi rendah (DT50: 1-10 hari di air)",
-        "safety_precautions": "Aplikasi hanya pada padi, hindari drift ke tanaman sensitif",
-        "resistance_risk": "Tinggi - rotasi dengan herbisida berbeda mode of action",
-        "references": "Heap (2021), Senseman (2007)"
-    },
-    
-    # BIOLOGICAL PESTICIDES
-    "Bacillus thuringiensis (Bt)": {
-        "category": "Bioinsektisida",
-        "chemical_class": "Mikroba (Bakteri)",
-        "cas_number": "N/A",
-        "mode_of_action": "Midgut membrane disruption",
-        "moa_detail": "Protein kristal Cry toxin mengikat reseptor di usus serangga, membentuk pori dan menyebabkan lisis sel",
-        "target_pests": "Ulat (Lepidoptera), larva nyamuk (strain tertentu)",
-        "crops": "Sayuran, jagung, padi, buah",
-        "toxicity_class": "WHO Class U (Unlikely to present acute hazard)",
-        "ld50_oral": ">5000 mg/kg",
-        "ld50_dermal": ">5000 mg/kg",
-        "phi": "0 hari (dapat dipanen segera)",
-        "environmental_fate": "Degradasi cepat oleh UV dan mikroba, tidak persisten",
-        "safety_precautions": "Aman untuk manusia dan lingkungan, aplikasi sore hari lebih efektif",
-        "resistance_risk": "Sedang - rotasi strain Bt dianjurkan",
-        "references": "Bravo et al. (2011), Sanahuja et al. (2011)"
-    },
-    
-    "Beauveria bassiana": {
-        "category": "Biofungisida/Bioinsektisida",
-        "chemical_class": "Mikroba (Jamur Entomopatogen)",
-        "cas_number": "N/A",
-        "mode_of_action": "Contact infection and colonization",
-        "moa_detail": "Spora menempel pada kutikula serangga, berkecambah, penetrasi, dan mengkolonisasi hemolimf",
-        "target_pests": "Trips, kutu daun, lalat putih, penggerek, wereng",
-        "crops": "Sayuran, buah, tanaman hias",
-        "toxicity_class": "WHO Class U (Unlikely to present acute hazard)",
-        "ld50_oral": ">5000 mg/kg",
-        "ld50_dermal": ">5000 mg/kg",
-        "phi": "0 hari",
-        "environmental_fate": "Aman untuk lingkungan, dapat bertahan di tanah sebagai saprofit",
-        "safety_precautions": "Aman, hindari inhalasi spora dalam jumlah besar",
-        "resistance_risk": "Rendah",
-        "references": "Faria & Wraight (2007)"
-    },
-    
-    # PLANT GROWTH REGULATORS
-    "Paklobutrazol": {
-        "category": "Plant Growth Regulator",
-        "chemical_class": "Triazol",
-        "cas_number": "76738-62-0",
-        "mode_of_action": "Gibberellin biosynthesis inhibitor",
-        "moa_detail": "Menghambat biosintesis gibberellin, mengurangi pemanjangan sel dan pertumbuhan vegetatif",
-        "target_pests": "N/A (bukan pestisida, pengatur pertumbuhan)",
-        "crops": "Mangga, buah, tanaman hias",
-        "toxicity_class": "WHO Class U (Unlikely to present acute hazard)",
-        "ld50_oral": "1300 mg/kg (tikus)",
-        "ld50_dermal": ">2000 mg/kg",
-        "phi": "Tergantung komoditas",
-        "environmental_fate": "Persistensi tinggi di tanah (DT50: 1-3 tahun)",
-        "safety_precautions": "Gunakan dosis tepat, overdosis dapat merusak tanaman",
-        "resistance_risk": "N/A",
-        "references": "Rademacher (2000)"
-    }
-}
+ACTIVE_INGREDIENTS = get_reference("active_ingredients")
 
 # ========== HELPER FUNCTIONS ==========
 
-def get_categories():
-    return sorted(list(set([v["category"] for v in ACTIVE_INGREDIENTS.values()])))
-
-def get_chemical_classes():
-    return sorted(list(set([v["chemical_class"] for v in ACTIVE_INGREDIENTS.values()])))
+@st.cache_resource
+def get_ingredient_index():
+    # Facet / token index over the directory, built once per process
+    return CatalogIndex(ACTIVE_INGREDIENTS, facets=("category", "chemical_class", "toxicity_class"),
+                        text_fields=("target_pests", "moa_detail"))
 
-def get_toxicity_classes():
-    return sorted(list(set([v["toxicity_class"] for v in ACTIVE_INGREDIENTS.values()])))
-
-def filter_ingredients(category=None, chemical_class=None, toxicity=None, search_term=None):
-    filtered = {}
-    for name, data in ACTIVE_INGREDIENTS.items():
-        if category and category != "Semua" and data["category"] != category:
-            continue
-        if chemical_class and chemical_class != "Semua" and data["chemical_class"] != chemical_class:
-            continue
-        if toxicity and toxicity != "Semua" and data["toxicity_class"] != toxicity:
-            continue
-        if search_term:
-            search_lower = search_term.lower()
-            if not (search_lower in name.lower() or 
-                   search_lower in data["target_pests"].lower() or
-                   search_lower in data["moa_detail"].lower()):
-                continue
-        filtered[name] = data
-    return filtered
+def facet_option_label(counts):
+    return lambda value: value if value == ALL else f"{value} ({counts.get(value, 0)})"
 
 # ========== CUSTOM CSS ==========
 st.markdown("""
@@ -530,14 +107,23 @@ with st.sidebar:
     
     search_term = st.text_input("🔎 Cari Bahan Aktif", placeholder="Nama, hama, atau mode of action...")
     
-    categories = ["Semua"] + get_categories()
-    selected_category = st.selectbox("Kategori", categories)
+    idx = get_ingredient_index()
+    facet_state = {
+        "category": st.session_state.get("ai_category", ALL),
+        "chemical_class": st.session_state.get("ai_class", ALL),
+        "toxicity_class": st.session_state.get("ai_toxicity", ALL),
+    }
+    _, facet_counts = idx.query(facet_state, text=search_term)
+    
+    selected_category = st.selectbox("Kategori", [ALL] + idx.facet_values("category"), key="ai_category",
+                                     format_func=facet_option_label(facet_counts["category"]))
     
-    chemical_classes = ["Semua"] + get_chemical_classes()
-    selected_class = st.selectbox("Kelas Kimia", chemical_classes)
+    selected_class = st.selectbox("Kelas Kimia", [ALL] + idx.facet_values("chemical_class"), key="ai_class",
+                                  format_func=facet_option_label(facet_counts["chemical_class"]))
     
-    toxicity_classes = ["Semua"] + get_toxicity_classes()
-    selected_toxicity = st.selectbox("Kelas Toksisitas WHO", toxicity_classes)
+    selected_toxicity = st.selectbox("Kelas Toksisitas WHO", [ALL] + idx.facet_values("toxicity_class"),
+                                     key="ai_toxicity",
+                                     format_func=facet_option_label(facet_counts["toxicity_class"]))
     
     st.markdown("---")
     st.markdown("### 📊 Statistik")
@@ -555,12 +141,11 @@ with st.sidebar:
 
 # ========== MAIN CONTENT ==========
 
-filtered = filter_ingredients(
-    category=selected_category if selected_category != "Semua" else None,
-    chemical_class=selected_class if selected_class != "Semua" else None,
-    toxicity=selected_toxicity if selected_toxicity != "Semua" else None,
-    search_term=search_term if search_term else None
+mask, _ = idx.query(
+    {"category": selected_category, "chemical_class": selected_class, "toxicity_class": selected_toxicity},
+    text=search_term,
 )
+filtered = idx.select(mask)
 
 st.markdown(f"### Menampilkan {len(filtered)} bahan aktif")
 
@@ -9,8 +9,9 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
-import folium
-from streamlit_folium import st_folium
+from utils.lazy_imports import lazy_attr, lazy_import
+folium = lazy_import("folium")
+st_folium = lazy_attr("streamlit_folium", "st_folium")
 import sys
 import os
 import requests 
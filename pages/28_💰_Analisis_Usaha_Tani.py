@@ -19,7 +19,7 @@ show_user_info_sidebar()
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from services.ai_farm_service import get_ai_model, optimize_solution
+from services.ai_farm_service import get_sop_cache, precompute_sop_grid, recommend_sop
 
 # ==========================================
 # 📊 DATABASE STANDARD OPERATIONAL (RAB)
@@ -35,6 +35,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from services.crop_service import CropService
 from services.project_service import ProjectManager
+from services.budget_engine_service import compile_rab_table, sensitivity_analysis
 
 # 1. Initialize with Legacy/Non-standard Crops
 CROP_TEMPLATES = {
@@ -547,7 +548,6 @@ with st.sidebar:
         tex_map = {"Lempung (Ideal)": 0.7, "Pasir (Boros Air)": 0.2, "Liat (Padat)": 0.5}
         
         with st.spinner("AI sedang menghitung SOP optimal berdasarkan kondisi tanah..."):
-            model = get_ai_model()
             # Advanced assumption mappings
             ai_params = {
                 'rain': 2000, 
@@ -555,8 +555,8 @@ with st.sidebar:
                 'texture': tex_map[real_texture],
                 'pest_strategy': "IPM (Terpadu)"
             }
-            # Optimize for Yield
-            ai_suggestion = optimize_solution(model, 10000, "Yield", ai_params, price_per_kg=6000)
+            # Optimize for Yield (memoized: RAB edits never rerun the search)
+            ai_suggestion = recommend_sop(10000, "Yield", ai_params, price_per_kg=6000)
             
             st.success(f"✅ AI menyesuaikan resep dengan tanah {real_texture} & pH {real_ph}!")
             
@@ -574,6 +574,14 @@ with st.sidebar:
             - Kapur (Dolomit): {kebutuhan_kapur:.0f} kg/ha (utk netralisir pH {real_ph})
             """)
 
+        if user.get('role') in ['admin', 'superadmin']:
+            with st.expander("🗃️ Cache Rekomendasi SOP (Admin)"):
+                st.caption(f"{len(get_sop_cache())} rekomendasi tersimpan (dipakai bersama semua pengguna).")
+                if st.button("⚡ Precompute Grid Tanah & Cuaca Umum"):
+                    with st.spinner("Menghitung grid rekomendasi..."):
+                        n_new = precompute_sop_grid()
+                    st.success(f"{n_new} kombinasi baru ditambahkan ke cache.")
+
     # H. Market Assumptions
     st.subheader("💵 Asumsi Pasar")
     crop_data = CROP_TEMPLATES[selected_crop]['params']
@@ -849,6 +857,62 @@ if roi_percent < 0:
 elif roi_percent > 100:
     st.success("🚀 Potensi ROI Sangat Tinggi (High Risk High Return)")
 
+# ==========================================
+# 🎲 SCENARIO & SENSITIVITY ANALYSIS
+# ==========================================
+with st.expander("🎲 Analisis Skenario & Sensitivitas (What-If)"):
+    st.caption("Ribuan skenario dihitung sekaligus dari tabel RAB di atas (volume per ha × harga, upah HOK & harga pupuk sebagai variabel).")
+    sc1, sc2, sc3 = st.columns(3)
+    var_yield = sc1.slider("Variasi Hasil Panen (±%)", 0, 50, 20)
+    var_price = sc1.slider("Variasi Harga Jual (±%)", 0, 50, 25)
+    var_hok = sc2.slider("Variasi Upah HOK (±%)", 0, 50, 15)
+    var_fert = sc2.slider("Variasi Harga Pupuk (±%)", 0, 50, 30)
+    n_scen = sc3.select_slider("Jumlah Skenario", [1000, 5000, 10000, 50000], value=10000)
+
+    rab_compiled = compile_rab_table(edited_df, luas_lahan_ha, name=selected_crop)
+    base_point = {"area_ha": luas_lahan_ha, "yield_per_ha": target_panen, "price": target_harga,
+                  "hok_wage": std_hok, "fert_mult": 1.0}
+    spread = {"yield_per_ha": var_yield, "price": var_price, "hok_wage": var_hok, "fert_mult": var_fert}
+    sens = sensitivity_analysis(
+        rab_compiled, base_point,
+        ranges={k: (base_point[k] * (1 - v / 100), base_point[k] * (1 + v / 100)) for k, v in spread.items()},
+        n_samples=n_scen,
+    )
+
+    sens_stats = sens["stats"]
+    r1, r2, r3, r4 = st.columns(4)
+    r1.metric("Laba Median", f"Rp {sens_stats['p50']:,.0f}")
+    r2.metric("Laba P5 (Pesimis)", f"Rp {sens_stats['p5']:,.0f}")
+    r3.metric("Laba P95 (Optimis)", f"Rp {sens_stats['p95']:,.0f}")
+    r4.metric("Peluang Rugi", f"{sens_stats['prob_loss'] * 100:.1f}%")
+
+    b1, b2 = st.columns(2)
+    b1.metric(f"Harga Impas (Rp/{unit_hasil})", f"Rp {sens['base']['bep_price']:,.0f}")
+    b2.metric(f"Hasil Impas ({unit_hasil}/ha)", f"{sens['base']['bep_yield']:,.0f}")
+
+    g1, g2 = st.columns(2)
+    with g1:
+        fig_dist = px.histogram(sens["samples"], x="profit", nbins=60, title="Distribusi Laba Skenario")
+        fig_dist.add_vline(x=0, line_dash="dash", line_color="red")
+        st.plotly_chart(fig_dist, use_container_width=True)
+    with g2:
+        torn = sens["tornado"].iloc[::-1]
+        base_profit = sens["base"]["profit"]
+        fig_torn = go.Figure()
+        fig_torn.add_trace(go.Bar(y=torn["label"], x=torn["profit_low"] - base_profit, base=base_profit,
+                                  orientation="h", name="Nilai Rendah", marker_color="#ef4444"))
+        fig_torn.add_trace(go.Bar(y=torn["label"], x=torn["profit_high"] - base_profit, base=base_profit,
+                                  orientation="h", name="Nilai Tinggi", marker_color="#22c55e"))
+        fig_torn.update_layout(barmode="overlay", title="Tornado Sensitivitas Laba", xaxis_title="Laba (Rp)")
+        st.plotly_chart(fig_torn, use_container_width=True)
+
+    bep_p = sens["bep_price"]
+    fig_bep = px.imshow(bep_p.to_numpy(), x=bep_p.columns.round(-3), y=bep_p.index.round(0), aspect="auto",
+                        color_continuous_scale="RdYlGn_r", origin="lower",
+                        labels=dict(x="Upah HOK (Rp)", y=f"Hasil ({unit_hasil}/ha)", color="Harga Impas"),
+                        title=f"Permukaan Harga Impas (Rp/{unit_hasil})")
+    st.plotly_chart(fig_bep, use_container_width=True)
+
 # 7. EXPORT & ACTIONS
 st.subheader("📤 Export & Simpan")
 c_ex1, c_ex2 = st.columns(2)
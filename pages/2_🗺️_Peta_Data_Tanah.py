@@ -2,8 +2,9 @@
 # Interactive soil map with polygon drawing, NPK data, and weather integration
 
 import streamlit as st
-import folium
-from streamlit_folium import st_folium
+from utils.lazy_imports import lazy_attr, lazy_import
+folium = lazy_import("folium")
+st_folium = lazy_attr("streamlit_folium", "st_folium")
 import pandas as pd
 import json
 import os
@@ -13,6 +14,7 @@ import requests
 
 # ========== CONFIGURATION ==========
 from utils.auth import require_auth, show_user_info_sidebar
+from services.soil_interpolation_service import SOIL_PROPERTIES, get_overlay
 
 st.set_page_config(
     page_title="Peta Data Tanah - AgriSensa",
@@ -257,6 +259,20 @@ def main():
             - 🔄 **Sinkronisasi**: Hubungkan data titik NPK langsung ke modul RAB.
             """)
         
+        # Raster layer controls
+        c_l1, c_l2, c_l3 = st.columns([2, 1, 1])
+        with c_l1:
+            raster_prop = st.selectbox(
+                "🌈 Layer Interpolasi",
+                ["Tidak Ada"] + list(SOIL_PROPERTIES.keys()),
+                format_func=lambda k: k if k == "Tidak Ada" else SOIL_PROPERTIES[k]['label']
+            )
+        with c_l2:
+            raster_method = st.radio("Metode", ["idw", "kriging"], horizontal=True,
+                                     format_func=lambda m: "IDW" if m == "idw" else "Kriging")
+        with c_l3:
+            show_markers = st.checkbox("Tampilkan titik sampel", value=raster_prop == "Tidak Ada")
+
         # Map center
         col_m1, col_m2 = st.columns([2, 1])
         with col_m1:
@@ -278,8 +294,31 @@ def main():
                         color='#059669', fill=True, fillColor='#10b981', fillOpacity=0.3
                     ).add_to(m)
             
+            # Interpolated soil raster (one cached PNG overlay)
+            if raster_prop != "Tidak Ada":
+                try:
+                    overlay = get_overlay(npk_data, raster_prop, method=raster_method)
+                except ValueError as e:
+                    overlay = None
+                    st.warning(str(e))
+                if overlay:
+                    folium.raster_layers.ImageOverlay(
+                        image=overlay['path'],
+                        bounds=overlay['bounds'],
+                        name=f"Interpolasi {SOIL_PROPERTIES[raster_prop]['label']}",
+                        interactive=False,
+                        zindex=1
+                    ).add_to(m)
+                    m.fit_bounds(overlay['bounds'])
+                    st.caption(
+                        f"Raster {raster_method.upper()} dari {overlay['n_samples']} sampel · "
+                        f"rentang {overlay['vmin']:.1f} – {overlay['vmax']:.1f} {SOIL_PROPERTIES[raster_prop]['unit']}"
+                    )
+                else:
+                    st.info("Minimal 2 titik sampel diperlukan untuk membuat layer interpolasi.")
+
             # Add NPK markers with status colors
-            for npk in npk_data:
+            for npk in (npk_data if show_markers else []):
                 lat, lon = npk.get('latitude'), npk.get('longitude')
                 if lat and lon:
                     n, p, k = npk.get('n_value', 0), npk.get('p_value', 0), npk.get('k_value', 0)
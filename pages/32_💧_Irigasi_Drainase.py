@@ -4,8 +4,12 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 
+from datetime import date
+
 # Page config
 from utils.auth import require_auth, show_user_info_sidebar
+from services.irrigation_service import KC_CURVES, SOIL_WATER, extend_series, schedule_blocks, season_length
+from services.weather_service import WeatherService
 
 st.set_page_config(
     page_title="Irigasi & Drainase - AgriSensa",
@@ -28,12 +32,13 @@ st.title("💧 Irigasi & Manajemen Air Pertanian")
 st.markdown("**Sistem Irigasi Modern, Perhitungan Kebutuhan Air, dan Teknologi Jepang untuk Indonesia**")
 
 # Main tabs
-tab_systems, tab_calculation, tab_drainage, tab_japanese, tab_tools = st.tabs([
+tab_systems, tab_calculation, tab_drainage, tab_japanese, tab_tools, tab_schedule = st.tabs([
     "🚿 Sistem Irigasi",
     "📊 Perhitungan Kebutuhan Air",
     "🌊 Drainase",
     "🇯🇵 Teknologi Jepang",
-    "🛠️ Tools & Calculator"
+    "🛠️ Tools & Calculator",
+    "📅 Jadwal Irigasi (FAO-56)"
 ])
 
 # ===== TAB 1: SISTEM IRIGASI =====
@@ -1373,3 +1378,135 @@ with tab_tools:
     
     **Disclaimer:** Hasil bersifat estimasi. Untuk desain detail, konsultasikan dengan ahli irigasi.
     """)
+
+# ===== TAB 6: JADWAL IRIGASI (FAO-56 WATER BALANCE) =====
+with tab_schedule:
+    st.header("📅 Penjadwalan Irigasi Multi-Blok (Neraca Air FAO-56)")
+    st.markdown("""
+    Neraca air zona akar harian: **Dr = Dr(kemarin) − Pe − I + Ks·Kc·ET0**.
+    Irigasi diberikan saat deplesi mencapai **RAW = p × TAW**, mengisi kembali ke kapasitas lapang.
+    Semua blok dihitung sekaligus untuk satu musim penuh.
+    """)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        season_start = st.date_input("Awal Musim", value=date.today())
+        efficiency = st.slider("Efisiensi Irigasi (%)", 40, 95, 70, help="Genangan ±40-60%, sprinkler ±75%, tetes ±90%") / 100
+    with col2:
+        weather_source = st.radio("Sumber Cuaca", ["ET0 Tipikal (Simulasi)", "Open-Meteo (Prakiraan 16 Hari)"])
+        if weather_source == "ET0 Tipikal (Simulasi)":
+            et0_base = st.slider("ET0 Rata-rata (mm/hari)", 2.5, 7.0, 4.5, 0.1)
+            rain_regime = st.selectbox("Pola Hujan", ["Kemarau", "Peralihan", "Penghujan"])
+    with col3:
+        if weather_source == "Open-Meteo (Prakiraan 16 Hari)":
+            wb_lat = st.number_input("Latitude", value=-6.5950, format="%.4f", key="wb_lat")
+            wb_lon = st.number_input("Longitude", value=106.8166, format="%.4f", key="wb_lon")
+            if st.button("🌐 Ambil ET0 & Kelembaban Tanah"):
+                with st.spinner("Mengambil data Open-Meteo..."):
+                    st.session_state['wb_weather'] = WeatherService().get_water_balance_inputs(wb_lat, wb_lon)
+        n_generated = st.number_input("Generate Blok Massal (0 = pakai tabel)", 0, 2000, 0, step=50,
+                                      help="Buat banyak blok acak dengan tanggal tanam bertahap untuk simulasi skala daerah irigasi")
+
+    if n_generated > 0:
+        rng = np.random.default_rng(7)
+        blocks = pd.DataFrame({
+            "block": [f"B-{i + 1:04d}" for i in range(n_generated)],
+            "crop": rng.choice(list(KC_CURVES), n_generated),
+            "soil": rng.choice(list(SOIL_WATER), n_generated),
+            "plant_date": pd.Timestamp(season_start) + pd.to_timedelta(rng.integers(0, 45, n_generated), unit="D"),
+            "area_ha": rng.uniform(0.5, 5.0, n_generated).round(2),
+        })
+        st.caption(f"{n_generated} blok dibuat otomatis (tanam bertahap 0-45 hari setelah awal musim).")
+    else:
+        default_blocks = pd.DataFrame({
+            "block": ["Blok A", "Blok B", "Blok C"],
+            "crop": ["Padi", "Jagung", "Cabai"],
+            "soil": ["Liat", "Lempung", "Lempung Berpasir"],
+            "plant_date": [pd.Timestamp(season_start) + pd.Timedelta(days=d) for d in (0, 7, 14)],
+            "area_ha": [2.0, 1.5, 0.5],
+        })
+        blocks = st.data_editor(
+            default_blocks, num_rows="dynamic", use_container_width=True, key="wb_blocks",
+            column_config={
+                "block": st.column_config.TextColumn("Blok"),
+                "crop": st.column_config.SelectboxColumn("Tanaman", options=list(KC_CURVES), required=True),
+                "soil": st.column_config.SelectboxColumn("Tekstur Tanah", options=list(SOIL_WATER), required=True),
+                "plant_date": st.column_config.DateColumn("Tanggal Tanam", required=True),
+                "area_ha": st.column_config.NumberColumn("Luas (ha)", min_value=0.01, required=True),
+            }
+        ).dropna()
+
+    if blocks.empty:
+        st.info("Tambahkan minimal satu blok.")
+    else:
+        offsets = (pd.to_datetime(blocks["plant_date"]) - pd.Timestamp(season_start)).dt.days
+        n_days = int((offsets + blocks["crop"].map(season_length)).max()) + 1
+
+        soil_moisture = None
+        wb_weather = st.session_state.get('wb_weather')
+        if weather_source == "Open-Meteo (Prakiraan 16 Hari)" and wb_weather:
+            et0_series = extend_series(wb_weather['et0'], n_days)
+            rain_series = extend_series(wb_weather['rain'], n_days)
+            soil_moisture = wb_weather.get('soil_moisture')
+            st.caption(f"ET0 & hujan {len(wb_weather['et0'])} hari dari Open-Meteo, sisa musim diisi rata-rata prakiraan. "
+                       f"Kelembaban tanah awal: {soil_moisture if soil_moisture is not None else '-'} m³/m³.")
+        else:
+            if weather_source == "Open-Meteo (Prakiraan 16 Hari)":
+                st.warning("Data Open-Meteo belum diambil, menggunakan ET0 tipikal.")
+                et0_base, rain_regime = 4.5, "Peralihan"
+            rng = np.random.default_rng(11)
+            doy = np.arange(n_days)
+            et0_series = et0_base * (1 + 0.1 * np.sin(2 * np.pi * doy / 30)) + rng.normal(0, 0.3, n_days)
+            rain_prob, rain_mean = {"Kemarau": (0.1, 8), "Peralihan": (0.3, 12), "Penghujan": (0.6, 18)}[rain_regime]
+            rain_series = np.where(rng.random(n_days) < rain_prob, rng.exponential(rain_mean, n_days), 0.0)
+
+        try:
+            wb = schedule_blocks(blocks, et0_series, rain_series, season_start,
+                                 efficiency=efficiency, soil_moisture=soil_moisture)
+        except (ValueError, KeyError) as e:
+            st.error(f"Data blok tidak valid: {e}")
+            wb = None
+
+        if wb is not None:
+            summary, events = wb["summary"], wb["events"]
+
+            c1, c2, c3, c4 = st.columns(4)
+            c1.metric("Jumlah Blok", f"{len(summary):,}")
+            c2.metric("Total Volume Irigasi", f"{summary['volume_m3'].sum():,.0f} m³")
+            c3.metric("Jumlah Pemberian Air", f"{len(events):,}")
+            c4.metric("Hari Stres Air (total)", f"{int(summary['stress_days'].sum()):,}")
+
+            daily_volume = np.zeros(n_days)
+            np.add.at(daily_volume, events["day"].to_numpy(), events["volume_m3"].to_numpy())
+            demand = pd.DataFrame({
+                "Tanggal": pd.Timestamp(season_start) + pd.to_timedelta(np.arange(n_days), unit="D"),
+                "Kebutuhan Air Skema (m³)": daily_volume,
+                "ET0 (mm)": et0_series,
+                "Hujan (mm)": rain_series,
+            })
+            fig_demand = px.bar(demand, x="Tanggal", y="Kebutuhan Air Skema (m³)",
+                                title="Kebutuhan Air Harian Seluruh Skema")
+            st.plotly_chart(fig_demand, use_container_width=True)
+
+            st.subheader("📋 Ringkasan per Blok")
+            st.dataframe(summary.drop(columns=["plot"]).round(1), use_container_width=True, hide_index=True, height=300)
+
+            st.subheader("🔍 Neraca Air per Blok")
+            block_names = summary["block"].tolist() if "block" in summary else summary["plot"].tolist()
+            chosen_block = st.selectbox("Pilih Blok", block_names)
+            i = block_names.index(chosen_block)
+            fig_wb = go.Figure()
+            fig_wb.add_trace(go.Scatter(x=demand["Tanggal"], y=wb["depletion"][i], name="Deplesi Dr (mm)", line=dict(color="#ef4444")))
+            fig_wb.add_trace(go.Scatter(x=demand["Tanggal"], y=wb["raw"][i], name="RAW (mm)", line=dict(dash="dash", color="#f59e0b")))
+            fig_wb.add_trace(go.Scatter(x=demand["Tanggal"], y=wb["taw"][i], name="TAW (mm)", line=dict(dash="dot", color="#64748b")))
+            fig_wb.add_trace(go.Bar(x=demand["Tanggal"], y=wb["irrigation"][i], name="Irigasi Netto (mm)", marker_color="#3b82f6"))
+            fig_wb.update_layout(title=f"Neraca Air Zona Akar - {chosen_block}", yaxis_title="mm", height=400)
+            st.plotly_chart(fig_wb, use_container_width=True)
+
+            st.subheader("🗓️ Jadwal Pemberian Air")
+            events_view = events.drop(columns=["plot"]).round(1)
+            st.dataframe(events_view.head(500), use_container_width=True, hide_index=True, height=300)
+            if len(events_view) > 500:
+                st.caption(f"Menampilkan 500 dari {len(events_view):,} jadwal. Unduh CSV untuk data lengkap.")
+            st.download_button("⬇️ Unduh Jadwal Irigasi (CSV)", events_view.to_csv(index=False).encode("utf-8"),
+                               "jadwal_irigasi.csv", mime="text/csv")
@@ -3,6 +3,11 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
+import json
+import os
+
+from services.soil_interpolation_service import M_PER_DEG_LAT, build_grid, extract_samples, interpolate_samples
+from services.prescription_service import PRODUCT_LABELS, generate_prescription, prescription_from_samples, to_csv, to_geojson
 
 # Page config
 from utils.auth import require_auth, show_user_info_sidebar
@@ -23,6 +28,65 @@ show_user_info_sidebar()
 
 
 
+SOIL_SAMPLES_FILE = "soil_map_npk_data.json"  # shared with Peta Data Tanah
+
+def load_soil_samples():
+    """Load NPK/pH sample points saved by Peta Data Tanah"""
+    if os.path.exists(SOIL_SAMPLES_FILE):
+        with open(SOIL_SAMPLES_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return []
+
+FIELD_POLYGONS_FILE = "soil_map_polygons.json"  # shared with Peta Data Tanah
+
+def load_field_polygons():
+    """Field boundaries drawn on Peta Data Tanah as [{'name', 'coords': [[lat, lon], ...]}]"""
+    if not os.path.exists(FIELD_POLYGONS_FILE):
+        return []
+    with open(FIELD_POLYGONS_FILE, 'r', encoding='utf-8') as f:
+        polygons = json.load(f)
+    fields = []
+    for poly in polygons:
+        coords = poly.get('coordinates', [])
+        if coords and isinstance(coords[0], dict):
+            coords = [[c['lat'], c['lng']] for c in coords]
+        fields.append({'name': poly.get('name', 'Lahan'), 'coords': coords})
+    return fields
+
+@st.cache_data(show_spinner=False)
+def build_sample_prescription(records, boundary_json, resolution, n_zones, target_ph, lime_per_ph):
+    """VRA prescription from interpolated field samples"""
+    return prescription_from_samples(records, boundary=json.loads(boundary_json), resolution=resolution,
+                                     n_zones=n_zones, target_ph=target_ph, lime_ton_per_ph=lime_per_ph)
+
+@st.cache_data(show_spinner=False)
+def build_simulated_prescription(area_ha, resolution, n_zones, target_ph, lime_per_ph, seed=42):
+    """VRA prescription over a synthetic, spatially-correlated soil field (square, centred on Bogor)"""
+    side_deg = np.sqrt(area_ha * 10000) / M_PER_DEG_LAT
+    grid_lat, grid_lon, _ = build_grid((-6.60, 106.80, -6.60 + side_deg, 106.80 + side_deg), resolution, pad=0)
+    rng = np.random.default_rng(seed)
+    u = (grid_lon - grid_lon.min()) / max(np.ptp(grid_lon), 1e-12)
+    v = (grid_lat - grid_lat.min()) / max(np.ptp(grid_lat), 1e-12)
+    # Sum of a few random Gaussian blobs → smooth soil variability
+    def smooth_field(n_blobs=6):
+        field = np.zeros_like(u)
+        for cx, cy, amp, width in zip(rng.random(n_blobs), rng.random(n_blobs), rng.uniform(-1, 1, n_blobs), rng.uniform(0.15, 0.4, n_blobs)):
+            field += amp * np.exp(-((u - cx) ** 2 + (v - cy) ** 2) / (2 * width ** 2))
+        return field / max(np.abs(field).max(), 1e-9)
+    layers = {
+        'ph': 6.0 + 1.2 * smooth_field(),
+        'n_value': 3000 + 1500 * smooth_field(),
+        'p_value': 15 + 8 * smooth_field(),
+        'k_value': 2800 + 1000 * smooth_field(),
+    }
+    return generate_prescription(grid_lat, grid_lon, layers, n_zones=n_zones,
+                                 target_ph=target_ph, lime_ton_per_ph=lime_per_ph)
+
+@st.cache_data(show_spinner=False)
+def interpolate_soil_raster(lats, lons, values, method, resolution=120):
+    """Cached by sample content: reruns reuse the raster until samples change"""
+    return interpolate_samples(lats, lons, values, method=method, resolution=resolution)
+
 # Header
 st.title("🛰️ AgriSensa GIS & Precision Farming")
 st.markdown("""
@@ -63,6 +127,21 @@ with tab_intro:
     *   **IoT Sensors:** Sensor tanah/cuaca real-time.
     """)
     
+    # Real samples from Peta Data Tanah (page 2) → interpolated raster
+    soil_lats, soil_lons, soil_ph = extract_samples(load_soil_samples(), "ph")
+    if len(soil_ph) >= 3:
+        st.write("### 📍 Peta Variabilitas pH Tanah (Interpolasi Sampel Lapangan)")
+        raster_method = st.radio("Metode Interpolasi", ["idw", "kriging"], horizontal=True,
+                                 format_func=lambda m: "IDW" if m == "idw" else "Ordinary Kriging")
+        raster = interpolate_soil_raster(soil_lats, soil_lons, soil_ph, raster_method)
+        fig = px.imshow(raster['grid'],
+                        x=raster['grid_lon'][0], y=raster['grid_lat'][:, 0],
+                        labels=dict(x="Longitude", y="Latitude", color="pH Tanah"),
+                        color_continuous_scale='RdYlGn', origin='upper', aspect='auto',
+                        title=f"Peta pH Tanah dari {len(soil_ph)} Titik Sampel")
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption("Raster dihitung dari data di **Peta Data Tanah** dan hanya dihitung ulang jika sampel berubah.")
+
     # Simulasi Peta (Static for now to avoid dependencies issues)
     st.write("### 📍 Simulasi Peta Lahan (Grid Sampling)")
     
@@ -98,82 +177,100 @@ with tab_vra:
     st.header("🚜 Variable Rate Application (VRA)")
     st.markdown("Teknologi aplikasi input (pupuk/kapur) dengan dosis yang berbeda-beda di setiap titik lahan sesuai kebutuhan.")
     
-    st.subheader("Simulasi Resep Pemupukan Presisi")
+    st.subheader("Resep Pemupukan Presisi (Prescription Map)")
     
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     with col1:
         target_ph = st.number_input("Target pH Tanah", 6.0, 7.5, 6.5)
         kebutuhan_kapur_per_delta = st.number_input("Kebutuhan Kapur (ton) per kenaikan 1 pH", 1.0, 5.0, 2.0, help="Jumlah kapur (dolomit) untuk menaikkan pH sebesar 1 poin per hektar.")
     
     with col2:
-        luas_grid = st.number_input("Luas per Grid (m2)", 100, 10000, 400) # 20x20m default
+        vra_sources = ["Simulasi Lahan"]
+        if len(soil_ph) >= 3:
+            vra_sources.insert(0, "Sampel Peta Data Tanah")
+        vra_source = st.radio("Sumber Data Tanah", vra_sources)
+        n_zones = st.slider("Jumlah Zona Manajemen", 2, 8, 4)
+        
+    with col3:
+        vra_resolution = st.select_slider("Resolusi Grid (sel per sisi)", [50, 100, 200, 300, 400], value=200,
+                                          help="400 → ±160.000 sel. Semakin tinggi semakin detail.")
+        if vra_source == "Simulasi Lahan":
+            sim_area_ha = st.number_input("Luas Lahan Simulasi (Ha)", 1.0, 500.0, 25.0)
         
     st.write("---")
     
-    # Generate random grid data if not exists (using previous df_grid logic simulation)
-    # Re-using df_grid from Tab 1 context isn't clean in Streamlit without session state, so we regen brief logic
-    cols = list("ABCDE")
-    rows = list(range(1, 6))
-    vra_data = []
-    
-    total_area_ha = (len(cols) * len(rows) * luas_grid) / 10000
-    total_lime_needed = 0
-    total_lime_uniform = 0
-    
-    # Calculate Uniform Rate (Konvensional) - asumsikan rata-rata pH 5.5
-    avg_ph_assumed = 5.5
-    delta_uniform = max(0, target_ph - avg_ph_assumed)
-    rate_uniform = delta_uniform * kebutuhan_kapur_per_delta # ton/ha
-    total_lime_uniform = rate_uniform * total_area_ha
-    
-    st.write(f"**Analisis Grid & Resep Dosis:**")
+    field_polygons = [p for p in load_field_polygons() if len(p['coords']) >= 3]
+    boundary = None
+    if vra_source == "Sampel Peta Data Tanah" and field_polygons:
+        poly_names = ["(Seluruh area sampel)"] + [p['name'] for p in field_polygons]
+        chosen = st.selectbox("Batas Lahan (dari Peta Data Tanah)", poly_names)
+        if chosen != poly_names[0]:
+            boundary = next(p['coords'] for p in field_polygons if p['name'] == chosen)
+    
+    with st.spinner("Menghitung resep VRA..."):
+        if vra_source == "Sampel Peta Data Tanah":
+            rx = build_sample_prescription(load_soil_samples(), json.dumps(boundary), vra_resolution,
+                                           n_zones, target_ph, kebutuhan_kapur_per_delta)
+        else:
+            rx = build_simulated_prescription(sim_area_ha, vra_resolution, n_zones, target_ph, kebutuhan_kapur_per_delta)
     
-    # Display table logic
-    for r in rows:
-        for c in cols:
-            # Random pH again for demo (consistent seed ideally)
-            np.random.seed(ord(c) + r) 
-            current_ph = np.random.uniform(4.8, 7.2)
-            
-            # Logic VRA
-            delta_ph = max(0, target_ph - current_ph)
-            dose_ton_ha = delta_ph * kebutuhan_kapur_per_delta
-            dose_kg_grid = (dose_ton_ha * 1000) * (luas_grid / 10000)
-            
-            total_lime_needed += dose_kg_grid
+    if rx is None or rx['cells'].empty:
+        st.warning("Tidak ada sel lahan yang dapat dihitung. Periksa data sampel atau batas lahan.")
+    else:
+        st.write(f"**Peta Zona Manajemen** ({len(rx['cells']):,} sel @ {rx['cell_size_m'][0]:.1f} × {rx['cell_size_m'][1]:.1f} m)")
+        zone_grid = np.full(rx['mask'].shape, np.nan)
+        zone_grid[rx['cells']['row'], rx['cells']['col']] = rx['cells']['zone']
+        fig_zone = px.imshow(zone_grid, color_continuous_scale='RdYlGn_r', origin='upper', aspect='auto',
+                             labels=dict(color="Zona"), title="Zona 1 = kebutuhan input terendah")
+        fig_zone.update_xaxes(showticklabels=False)
+        fig_zone.update_yaxes(showticklabels=False)
+        st.plotly_chart(fig_zone, use_container_width=True)
+        
+        df_zones = rx['zones'].rename(columns={'zone': 'Zona', 'cells': 'Jumlah Sel', 'area_ha': 'Luas (Ha)'})
+        df_zones = df_zones.rename(columns={k: f"{v} (kg/ha)" for k, v in PRODUCT_LABELS.items()})
+        st.dataframe(df_zones.round(2), use_container_width=True, hide_index=True)
+        
+        # Summary
+        st.subheader("💡 Perbandingan Ekonomi")
+        
+        total_area_ha = rx['area_ha']
+        total_ton_vra = rx['totals_kg'].get('lime_kg_ha', 0) / 1000
+        total_lime_uniform = rx['uniform_kg'].get('lime_kg_ha', 0) / 1000
+        
+        col_a, col_b, col_c = st.columns(3)
+        
+        with col_a:
+            st.metric("Total Luas Lahan", f"{total_area_ha:.2f} Ha")
             
-            vra_data.append({
-                "Grid ID": f"{c}{r}",
-                "pH Aktual": round(current_ph, 2),
-                "pH Target": target_ph,
-                "Delta": round(delta_ph, 2),
-                "Dosis (ton/ha)": round(dose_ton_ha, 2),
-                "Kebutuhan Grid (kg)": round(dose_kg_grid, 1)
-            })
+        with col_b:
+            st.metric("Kebutuhan Kapur (Metode VRA)", f"{total_ton_vra:.2f} Ton")
             
-    df_vra = pd.DataFrame(vra_data)
-    st.dataframe(df_vra, height=250)
-    
-    # Summary
-    st.subheader("💡 Perbandingan Ekonomi")
-    
-    col_a, col_b, col_c = st.columns(3)
-    
-    with col_a:
-        st.metric("Total Luas Lahan", f"{total_area_ha} Ha")
+        with col_c:
+            st.metric("Kebutuhan Kapur (Metode Konvensional)", f"{total_lime_uniform:.2f} Ton", help="Satu dosis rata dari sampel komposit (rata-rata lahan)")
         
-    with col_b:
-        total_ton_vra = total_lime_needed / 1000
-        st.metric("Kebutuhan Kapur (Metode VRA)", f"{total_ton_vra:.2f} Ton")
-        
-    with col_c:
-        st.metric("Kebutuhan Kapur (Metode Konvensional)", f"{total_lime_uniform:.2f} Ton", help="Asumsi dosis rata untuk seluruh lahan")
+        df_products = pd.DataFrame([
+            {"Produk": PRODUCT_LABELS[p],
+             "VRA (kg)": round(rx['totals_kg'][p]),
+             "Konvensional (kg)": round(rx['uniform_kg'][p]),
+             "Selisih (kg)": round(rx['uniform_kg'][p] - rx['totals_kg'][p])}
+            for p in rx['products']
+        ])
+        st.dataframe(df_products, use_container_width=True, hide_index=True)
+            
+        saving = total_lime_uniform - total_ton_vra
+        if saving > 0:
+            st.success(f"✅ **EFISIENSI:** Anda menghemat **{saving:.2f} Ton** kapur dengan metode presisi!")
+        else:
+            st.info("ℹ️ Dosis VRA menyalurkan kapur ke zona masam yang kurang terlayani oleh dosis rata.")
         
-    saving = total_lime_uniform - total_ton_vra
-    if saving > 0:
-        st.success(f"✅ **EFISIENSI:** Anda menghemat **{saving:.2f} Ton** pupuk dengan metode presisi!")
-    else:
-        st.warning("Data menunjukkan variabilitas rendah, VRA mungkin belum ekonomis.")
+        st.write("**📥 Ekspor Peta Resep**")
+        c_dl1, c_dl2 = st.columns(2)
+        with c_dl1:
+            st.download_button("⬇️ GeoJSON (Zona)", to_geojson(rx), "prescription_zones.geojson",
+                               mime="application/geo+json", use_container_width=True)
+        with c_dl2:
+            st.download_button("⬇️ CSV (Per Sel)", to_csv(rx), "prescription_cells.csv",
+                               mime="text/csv", use_container_width=True)
 
 # ===== TAB 3: REMOTE SENSING (NDVI) =====
 with tab_ndvi:
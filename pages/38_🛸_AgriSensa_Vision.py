@@ -1,5 +1,6 @@
 import streamlit as st
-import cv2
+from utils.lazy_imports import lazy_import
+cv2 = lazy_import("cv2")
 import numpy as np
 import plotly.express as px
 from PIL import Image
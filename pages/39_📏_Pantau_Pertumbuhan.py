@@ -6,8 +6,6 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import os
 
-from scipy.optimize import curve_fit
-
 # Page config
 from utils.auth import require_auth, show_user_info_sidebar
 
@@ -28,52 +26,23 @@ show_user_info_sidebar()
 
 
 # Constants & Setup
-DATA_FILE = "data/growth_journal.csv"
-
-import folium
-from streamlit_folium import st_folium
+from utils.lazy_imports import lazy_attr, lazy_import
+folium = lazy_import("folium")
+st_folium = lazy_attr("streamlit_folium", "st_folium")
 
 # Add updated path logic for services
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from services.weather_service import WeatherService
+from services.growth_fit_service import DEFAULT_PLOT, GrowthStore, logistic_model
 weather_service = WeatherService()
 
-# Ensure Data Directory and File Exist
-if not os.path.exists('data'):
-    os.makedirs('data')
-
-def init_data():
-    if not os.path.exists(DATA_FILE):
-        # Migrating to include more columns if needed, but keeping core
-        df = pd.DataFrame(columns=['tanggal', 'komoditas', 'usia_hst', 'tinggi_cm', 'jumlah_daun', 'gdd_cumulative'])
-        df.to_csv(DATA_FILE, index=False)
-
-def load_data():
-    if os.path.exists(DATA_FILE):
-        try:
-            df = pd.read_csv(DATA_FILE)
-            if 'gdd_cumulative' not in df.columns:
-                df['gdd_cumulative'] = 0.0
-            return df
-        except:
-            return pd.DataFrame(columns=['tanggal', 'komoditas', 'usia_hst', 'tinggi_cm', 'jumlah_daun', 'gdd_cumulative'])
-    return pd.DataFrame(columns=['tanggal', 'komoditas', 'usia_hst', 'tinggi_cm', 'jumlah_daun', 'gdd_cumulative'])
-
-def save_data(tgl, komoditas, hst, tinggi, daun, gdd=0.0):
-    df = load_data()
-    new_data = pd.DataFrame({
-        'tanggal': [tgl],
-        'komoditas': [komoditas],
-        'usia_hst': [hst],
-        'tinggi_cm': [tinggi],
-        'jumlah_daun': [daun],
-        'gdd_cumulative': [gdd]
-    })
-    df = pd.concat([df, new_data], ignore_index=True)
-    df.to_csv(DATA_FILE, index=False)
+@st.cache_resource
+def get_growth_store():
+    # Indexed measurement store + cached logistic fits (migrates growth_journal.csv once)
+    return GrowthStore()
 
-init_data()
+store = get_growth_store()
 
 # Header
 st.title("📏 Pantau Pertumbuhan Tanaman (Advanced)")
@@ -121,6 +90,12 @@ with st.sidebar:
     st.header("⚙️ Konfigurasi")
     kom_choice = st.selectbox("Pilih Komoditas", list(profiles.keys()), index=0)
     prof = profiles[kom_choice]
+    prof_p0 = [prof['max_h'], prof['growth_rate'], prof['panen_hst']/2]
+
+    known_plots = store.list_plots() or [DEFAULT_PLOT]
+    plot_choice = st.selectbox("Petak / Lahan", known_plots + ["➕ Petak Baru..."])
+    if plot_choice == "➕ Petak Baru...":
+        plot_choice = st.text_input("Nama Petak Baru", value=f"Petak {len(known_plots) + 1}").strip() or DEFAULT_PLOT
     
     st.divider()
     st.header("📍 Lokasi Lahan (Peta Otomatis)")
@@ -167,26 +142,22 @@ with st.sidebar:
             st.warning("Gagal fetch cuaca. Menggunakan estimasi default.")
     
     if st.button("💾 Simpan Data ke Jurnal", type="primary", use_container_width=True):
-        # Calculate cumulative GDD from previous entries if exists
-        df_temp = load_data()
-        df_kom_temp = df_temp[df_temp['komoditas'] == kom_choice]
-        prev_gdd = df_kom_temp['gdd_cumulative'].max() if not df_kom_temp.empty else 0.0
+        # Cumulative GDD from previous entries of this plot (indexed lookup)
+        prev_gdd = store.latest_gdd(plot_choice, kom_choice)
         
-        save_data(tgl_catat.strftime("%Y-%m-%d"), kom_choice, usia_hst, tinggi_in, daun_in, prev_gdd + gdd_today)
-        st.toast(f"Data {kom_choice} berhasil disimpan!", icon="🚀")
+        # Insert + warm-started refit from the cached parameters
+        store.add_measurement(plot_choice, kom_choice, tgl_catat.strftime("%Y-%m-%d"), usia_hst, tinggi_in, daun_in,
+                              prev_gdd + gdd_today, p0=prof_p0)
+        st.toast(f"Data {kom_choice} ({plot_choice}) berhasil disimpan!", icon="🚀")
         st.rerun()
 
 # Main Layout
-st.markdown(f"### 📊 Dashboard Monitoring Scientifik: **{kom_choice}**")
+st.markdown(f"### 📊 Dashboard Monitoring Scientifik: **{kom_choice}** — {plot_choice}")
 col_main, col_side = st.columns([3, 1])
 
 # --- DATA PROCESSING ---
-df = load_data()
-df_filtered = df[df['komoditas'] == kom_choice].sort_values(by='usia_hst')
-
-# LOGISTIC FUNCTION FOR CURVE FITTING
-def logistic_model(t, K, r, t0):
-    return K / (1 + np.exp(-r * (t - t0)))
+df_filtered = store.get_measurements(plot_choice, kom_choice)
+fit = store.get_fit(plot_choice, kom_choice, p0=prof_p0) if not df_filtered.empty else None
 
 # Calculate Standard Curve
 max_days = prof['panen_hst'] + 15
@@ -212,13 +183,9 @@ with col_main:
         
         # 3. SCIENTIFIC PREDICTION (Logistic Fit)
         if len(df_filtered) >= 3:
-            try:
-                # Fit the model to actual data
-                # P0: initial guess [K, r, t0]
-                p0 = [prof['max_h'], prof['growth_rate'], prof['panen_hst']/2]
-                popt, _ = curve_fit(logistic_model, df_filtered['usia_hst'], df_filtered['tinggi_cm'], p0=p0, bounds=(0, [500, 1, 200]))
-                
-                K_fit, r_fit, t0_fit = popt
+            if fit and fit['status'] == 'ok':
+                # Cached fit, refreshed only when a measurement was added
+                K_fit, r_fit, t0_fit = fit['K'], fit['r'], fit['t0']
                 
                 last_hst = df_filtered['usia_hst'].iloc[-1]
                 future_days = np.arange(last_hst, prof['panen_hst'] + 10)
@@ -226,7 +193,7 @@ with col_main:
                 
                 fig.add_trace(go.Scatter(x=future_days, y=predicted_growth, mode='lines', name='AI Logistic Prediction',
                                          line=dict(color='#f59e0b', width=3, dash='dash')))
-            except Exception as e:
+            else:
                 st.warning("⚠️ Fit Matematika Gagal: Memerlukan sebaran data yang lebih representatif.")
                 predicted_growth = []
                 future_days = []
@@ -317,6 +284,17 @@ with col_main:
     with st.expander("📂 Riwayat Log Data (Advanced)"):
         st.dataframe(df_filtered, use_container_width=True)
 
+    with st.expander("🗂️ Ringkasan Fit Semua Petak"):
+        st.caption("Parameter logistik (K, r, t0) tersimpan per petak & komoditas. Fit gagal/tidak konvergen ikut dicatat.")
+        if st.button("🔄 Fit Ulang Petak yang Berubah (Paralel)"):
+            n_fit = store.batch_fit(profiles_p0={k: [v['max_h'], v['growth_rate'], v['panen_hst']/2] for k, v in profiles.items()})
+            st.success(f"{n_fit} fit diperbarui.")
+        df_fits = store.all_fits()
+        if df_fits.empty:
+            st.info("Belum ada fit tersimpan.")
+        else:
+            st.dataframe(df_fits, use_container_width=True, hide_index=True)
+
 with col_side:
     st.subheader("🎯 Prediksi Panen AI")
     
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 import json
 
 from utils.auth import require_auth, show_user_info_sidebar
+from services.fertilizer_blend_service import BlendOptimizer, products_from_db
 
 st.set_page_config(page_title="Kalkulator Pupuk Holistik", page_icon="🧮", layout="wide")
 
@@ -212,7 +213,7 @@ if st.button("🔍 Hitung Kebutuhan Pupuk", type="primary", use_container_width=
     st.markdown("---")
     st.subheader("💊 Rekomendasi Pupuk")
     
-    tab1, tab2, tab3 = st.tabs(["Pupuk Tunggal (Ekonomis)", "Pupuk Majemuk (Praktis)", "Mix Organik + Anorganik (Sehat)"])
+    tab1, tab2, tab3, tab4 = st.tabs(["Pupuk Tunggal (Ekonomis)", "Pupuk Majemuk (Praktis)", "Mix Organik + Anorganik (Sehat)", "Campuran Termurah (Optimasi)"])
     
     with tab1:
         st.markdown("**Menggunakan kombinasi Urea, SP-36, dan KCl**")
@@ -353,6 +354,24 @@ if st.button("🔍 Hitung Kebutuhan Pupuk", type="primary", use_container_width=
         - Lebih ramah lingkungan
         """)
     
+    with tab4:
+        st.markdown("**Kombinasi termurah dari semua pupuk yang memenuhi N, P dan K sekaligus (karung utuh 50 kg)**")
+        
+        optimizer = BlendOptimizer(products_from_db(FERTILIZER_CONTENT))
+        col1, col2 = st.columns(2)
+        for col, share, label in [(col1, 0.0, "Tanpa Syarat Organik"), (col2, organic_ratio, f"Min. {organic_ratio:.0%} Hara dari Organik")]:
+            with col:
+                st.markdown(f"**{label}:**")
+                blend = optimizer.solve(npk_needs, organic_share=share)
+                if blend["status"] != "ok":
+                    st.error(blend["message"])
+                    continue
+                for _, row in blend["plan"].iterrows():
+                    st.markdown(f"- **{row['Pupuk']}:** {row['Karung (50kg)']} karung ({row['Berat (kg)']:.0f} kg) — Rp {row['Biaya (Rp)']:,.0f}")
+                st.success(f"💰 **Total Biaya: Rp {blend['cost']:,.0f}**")
+        
+        st.info("💡 Optimasi program linear: biaya dihitung per karung utuh, sehingga bisa berbeda dari perhitungan per kg di tab lain.")
+    
     # Visualization
     st.markdown("---")
     st.subheader("📈 Visualisasi Kebutuhan NPK")
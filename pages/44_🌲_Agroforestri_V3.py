@@ -1,11 +1,20 @@
 import streamlit as st
 import pandas as pd
 import requests
-import folium
-from streamlit_folium import st_folium
+from utils.lazy_imports import lazy_attr, lazy_import
+folium = lazy_import("folium")
+st_folium = lazy_attr("streamlit_folium", "st_folium")
+
+import numpy as np
+import plotly.express as px
 
 # Page Config
 from utils.auth import require_auth, show_user_info_sidebar
+from services.fire_danger_service import FIRE_LEVELS, FUEL_FACTORS, danger_level, fire_danger_index, forecast_fire_danger
+from services.weather_service import WeatherService
+
+FC_HISTORY_DAYS = 30
+FC_DAYS = 7
 
 st.set_page_config(
     page_title="Sistem Agroforestri",
@@ -499,75 +508,109 @@ with tab8:
                               ["Daun Lebar (Jati/Mahoni)", "Semak Belukar", "Serasah Pinus (Mudah Terbakar)"])
         
     # --- LOGIC HITUNG (FDRS Simplified Model) ---
-    # Skor Dasar Cuaca (0-100 Scale concept mapped to simplified points)
-    
-    score_temp = 0
-    if f_temp > 35: score_temp = 30
-    elif f_temp > 30: score_temp = 20
-    elif f_temp > 25: score_temp = 10
-    
-    score_hum = 0
-    if f_hum < 40: score_hum = 30
-    elif f_hum < 60: score_hum = 20
-    elif f_hum < 80: score_hum = 10
-    
-    score_wind = 0
-    if f_wind > 30: score_wind = 30   # Badai
-    elif f_wind > 15: score_wind = 20 # Kencang
-    elif f_wind > 5: score_wind = 10
-    
-    score_hth = 0
-    if f_hth > 14: score_hth = 30     # Kering Kerontang
-    elif f_hth > 7: score_hth = 20    # Kering
-    elif f_hth > 3: score_hth = 10
-    
-    base_index = score_temp + score_hum + score_wind + score_hth
-    
-    # Fuel Factor Multiplier
-    fuel_factor = 1.0
-    if "Semak" in f_fuel: fuel_factor = 1.2
-    elif "Pinus" in f_fuel: fuel_factor = 1.5 # Resin = Flammable
-    
-    final_fdrs = base_index * fuel_factor
+    final_fdrs = float(fire_danger_index(f_temp, f_hum, f_wind, f_hth, FUEL_FACTORS[f_fuel]))
     
     # --- OUTPUT ---
     with col_f3:
         st.markdown("#### 3. Status Bahaya")
         
-        # Color coding & Level
-        level_text = ""
-        level_color = ""
-        action_msg = ""
-        
+        _, level_text, level_color, action_msg = FIRE_LEVELS[int(danger_level(final_fdrs))]
         if final_fdrs >= 100:
-            level_text = "EXTREME (SANGAT EKSTREM)"
-            level_color = "#000000" # Black
-            action_msg = "⛔ AKTIVITAS HUTAN DITUTUP TOTAL."
             st.markdown(f"<h1 style='color:red; text-align:center;'>🔥 {final_fdrs:.0f}</h1>", unsafe_allow_html=True)
-        elif final_fdrs >= 70:
-            level_text = "VERY HIGH (SANGAT TINGGI)"
-            level_color = "#d32f2f" # Red
-            action_msg = "🚫 Dilarang menyalakan api. Siaga 1."
-            st.markdown(f"<h1 style='color:#d32f2f; text-align:center;'>{final_fdrs:.0f}</h1>", unsafe_allow_html=True)
-        elif final_fdrs >= 40:
-            level_text = "HIGH (TINGGI)"
-            level_color = "#f57c00" # Orange
-            action_msg = "⚠️ Waspada puntung rokok & loncatan api."
-            st.markdown(f"<h1 style='color:#f57c00; text-align:center;'>{final_fdrs:.0f}</h1>", unsafe_allow_html=True)
-        elif final_fdrs >= 20:
-            level_text = "MODERATE (SEDANG)"
-            level_color = "#fbc02d" # Yellow
-            action_msg = "✅ Patroli rutin."
-            st.markdown(f"<h1 style='color:#fbc02d; text-align:center;'>{final_fdrs:.0f}</h1>", unsafe_allow_html=True)
         else:
-            level_text = "LOW (RENDAH)"
-            level_color = "#388e3c" # Green
-            action_msg = "✅ Kondisi Aman."
-            st.markdown(f"<h1 style='color:#388e3c; text-align:center;'>{final_fdrs:.0f}</h1>", unsafe_allow_html=True)
+            st.markdown(f"<h1 style='color:{level_color}; text-align:center;'>{final_fdrs:.0f}</h1>", unsafe_allow_html=True)
             
         st.markdown(f"<div style='background-color:{level_color}; color:white; padding:10px; text-align:center; border-radius:5px;'><b>{level_text}</b></div>", unsafe_allow_html=True)
         st.info(f"💡 **SOP:** {action_msg}")
 
+    # --- FORECAST MODE (MULTI-BLOK) ---
+    st.markdown("---")
+    st.subheader("📅 Prakiraan Bahaya Kebakaran 7 Hari (Multi-Blok)")
+    st.caption("Hari Tanpa Hujan dihitung otomatis dari riwayat curah hujan 30 hari terakhir setiap blok.")
+    
+    col_b1, col_b2 = st.columns([2, 1])
+    with col_b2:
+        fc_source = st.radio("Sumber Cuaca", ["Open-Meteo (Live)", "Simulasi (Offline)"], key="fc_source")
+        n_gen_blocks = st.number_input("Generate Petak Contoh (0 = pakai tabel)", 0, 1000, 0, step=50, key="fc_gen")
+        alert_min = st.selectbox("Ambang Peringatan", [lvl[1] for lvl in FIRE_LEVELS[2:]], index=1)
+        alert_level = [lvl[1] for lvl in FIRE_LEVELS].index(alert_min)
+    
+    with col_b1:
+        if n_gen_blocks > 0:
+            rng_b = np.random.default_rng(3)
+            fc_blocks = pd.DataFrame({
+                "Petak": [f"Petak {i + 1:03d}" for i in range(n_gen_blocks)],
+                "Lat": (-7.15 + rng_b.normal(0, 0.15, n_gen_blocks)).round(4),
+                "Lon": (110.14 + rng_b.normal(0, 0.25, n_gen_blocks)).round(4),
+                "Bahan Bakar": rng_b.choice(list(FUEL_FACTORS), n_gen_blocks),
+            })
+            st.caption(f"{n_gen_blocks} petak contoh di sekitar KPH Kedu Utara.")
+        else:
+            fc_blocks = st.data_editor(
+                pd.DataFrame({
+                    "Petak": ["Petak 12A", "Petak 14B", "Petak 21C"],
+                    "Lat": [-7.15, -7.22, -7.08],
+                    "Lon": [110.14, 110.25, 110.05],
+                    "Bahan Bakar": ["Serasah Pinus (Mudah Terbakar)", "Daun Lebar (Jati/Mahoni)", "Semak Belukar"],
+                }),
+                num_rows="dynamic", use_container_width=True, key="fc_blocks",
+                column_config={"Bahan Bakar": st.column_config.SelectboxColumn("Bahan Bakar", options=list(FUEL_FACTORS), required=True)}
+            ).dropna()
+    
+    if st.button("🔥 Hitung Prakiraan Bahaya", type="primary") and not fc_blocks.empty:
+        if fc_source == "Open-Meteo (Live)":
+            with st.spinner(f"Mengambil prakiraan untuk {len(fc_blocks)} petak..."):
+                wx = WeatherService().get_daily_fire_weather(fc_blocks["Lat"].tolist(), fc_blocks["Lon"].tolist(),
+                                                             past_days=FC_HISTORY_DAYS, forecast_days=FC_DAYS)
+        else:
+            rng_w = np.random.default_rng(5)
+            shape = (len(fc_blocks), FC_HISTORY_DAYS + FC_DAYS)
+            wx = {
+                "temperature_2m_max": rng_w.normal(33, 2.5, shape),
+                "relative_humidity_2m_min": rng_w.normal(50, 12, shape).clip(10, 100),
+                "wind_speed_10m_max": rng_w.gamma(3, 5, shape),
+                "precipitation_sum": np.where(rng_w.random(shape) < 0.12, rng_w.exponential(8, shape), 0.0),
+                "dates": list(pd.date_range(pd.Timestamp.today().normalize() - pd.Timedelta(days=FC_HISTORY_DAYS),
+                                            periods=shape[1]).strftime("%Y-%m-%d")),
+            }
+        
+        if wx is None:
+            st.error("Gagal mengambil data cuaca. Coba lagi atau gunakan mode simulasi.")
+        else:
+            st.session_state["fc_result"] = forecast_fire_danger(
+                wx["temperature_2m_max"], wx["relative_humidity_2m_min"], wx["wind_speed_10m_max"], wx["precipitation_sum"],
+                fc_blocks["Bahan Bakar"].map(FUEL_FACTORS).to_numpy(), forecast_start=FC_HISTORY_DAYS,
+                dates=wx["dates"], block_names=fc_blocks["Petak"].tolist(), alert_level=alert_level
+            )
+    
+    fc = st.session_state.get("fc_result")
+    if fc:
+        level_counts = np.bincount(fc["level"].max(axis=1), minlength=len(FIRE_LEVELS))
+        k_cols = st.columns(len(FIRE_LEVELS))
+        for col, (_, name, _, _), count in zip(k_cols, FIRE_LEVELS, level_counts):
+            col.metric(name.split(" (")[0], f"{count} petak", help=f"Petak dengan puncak bahaya 7 hari: {name}")
+        
+        matrix = fc["matrix"]
+        if len(matrix) > 60:
+            st.caption(f"Menampilkan 60 petak dengan puncak indeks tertinggi dari {len(matrix)} petak.")
+            matrix = matrix.loc[matrix.max(axis=1).sort_values(ascending=False).index[:60]]
+        fig_fc = px.imshow(matrix, aspect="auto", zmin=0, zmax=180,
+                           color_continuous_scale=[[0, "#388e3c"], [0.22, "#fbc02d"], [0.39, "#f57c00"], [0.56, "#d32f2f"], [1, "#000000"]],
+                           labels=dict(x="Tanggal", y="Petak", color="Indeks FDRS"),
+                           title="Matriks Bahaya Kebakaran (Petak × Hari)")
+        fig_fc.update_layout(height=max(300, 18 * len(matrix) + 120))
+        st.plotly_chart(fig_fc, use_container_width=True)
+        
+        st.markdown(f"**🚨 Daftar Peringatan ({len(fc['alerts'])} petak-hari)**")
+        if fc["alerts"].empty:
+            st.success("Tidak ada petak yang melewati ambang peringatan dalam 7 hari ke depan.")
+        else:
+            alerts_view = fc["alerts"].rename(columns={"block": "Petak", "date": "Tanggal", "index": "Indeks",
+                                                         "level": "Level", "hth": "HTH", "sop": "SOP"})
+            st.dataframe(alerts_view, use_container_width=True, hide_index=True, height=300)
+            st.download_button("⬇️ Unduh Daftar Peringatan (CSV)", alerts_view.to_csv(index=False).encode("utf-8"),
+                               "peringatan_kebakaran.csv", mime="text/csv")
+
     st.markdown("---")
     st.caption("**Parameter Kunci:** Kecepatan Angin & Serasah Pinus adalah faktor pengali risiko terbesar.")
 
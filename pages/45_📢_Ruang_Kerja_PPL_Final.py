@@ -1,7 +1,6 @@
 
 import streamlit as st
 import pandas as pd
-import json
 import os
 import random
 import plotly.express as px
@@ -11,6 +10,15 @@ from io import BytesIO
 
 # Page Config
 from utils.auth import require_auth, show_user_info_sidebar
+from services.ubinan_service import (
+    LEVEL_KEYS, aggregate_ubinan, berita_acara_zip, convert_ubinan, process_ubinan,
+    render_berita_acara, template_csv,
+)
+from services.ppl_store_service import PPLStore
+from services.rdkk_service import (
+    COMMODITIES, LEVEL_KEYS as RDKK_LEVELS, MAX_LUAS_HA, SEASONS, aggregate_rdkk, allocate_rdkk, process_roster,
+    quota_per_ha, rdkk_submission, submission_excel, template_roster_csv,
+)
 
 st.set_page_config(
     page_title="Ruang Kerja PPL",
@@ -21,6 +29,7 @@ st.set_page_config(
 # ===== AUTHENTICATION CHECK =====
 user = require_auth()
 show_user_info_sidebar()
+officer = user.get('username', '')
 # ================================
 
 # ========== DATA PERSISTENCE ==========
@@ -29,37 +38,23 @@ TASKS_FILE = os.path.join(DATA_DIR, "ppl_tasks.json")
 VISITS_FILE = os.path.join(DATA_DIR, "ppl_visits.json")
 POKTAN_FILE = os.path.join(DATA_DIR, "ppl_poktan.json")
 
-def ensure_data_dir():
-    """Create data directory if not exists"""
-    os.makedirs(DATA_DIR, exist_ok=True)
-
-def load_tasks():
-    """Load tasks from JSON file"""
-    ensure_data_dir()
-    if os.path.exists(TASKS_FILE):
-        with open(TASKS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return []
-
-def save_tasks(tasks):
-    """Save tasks to JSON file"""
-    ensure_data_dir()
-    with open(TASKS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(tasks, f, ensure_ascii=False, indent=2, default=str)
-
-def load_visits():
-    """Load visit logs from JSON file"""
-    ensure_data_dir()
-    if os.path.exists(VISITS_FILE):
-        with open(VISITS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return []
-
-def save_visits(visits):
-    """Save visits to JSON file"""
-    ensure_data_dir()
-    with open(VISITS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(visits, f, ensure_ascii=False, indent=2, default=str)
+@st.cache_resource
+def get_ppl_store():
+    # Indexed tasks/visits with rollups (imports the JSON files above once)
+    return PPLStore(os.path.join(DATA_DIR, "ppl.db"), legacy_files={
+        "tasks_file": TASKS_FILE, "visits_file": VISITS_FILE, "poktan_file": POKTAN_FILE,
+    })
+
+@st.cache_data(show_spinner=False)
+def load_ubinan_upload(data):
+    """Parse and convert an uploaded crop-cut CSV (cached per file content)"""
+    return process_ubinan(pd.read_csv(BytesIO(data)))
+
+@st.cache_data(show_spinner=False)
+def load_rdkk_upload(data):
+    """Validate a member roster CSV and compute every member × season quota (cached per file content)"""
+    valid, rejected = process_roster(pd.read_csv(BytesIO(data), dtype=str))
+    return allocate_rdkk(valid), rejected
 
 # ========== CUSTOM CSS ==========
 st.markdown("""
@@ -174,19 +169,17 @@ tab_dashboard, tab_tasks, tab_reports, tab_ubinan, tab_rdkk, tab_materi = st.tab
 with tab_dashboard:
     st.markdown("### 📊 Dashboard PPL")
     
-    # Load data
-    tasks = load_tasks()
-    visits = load_visits()
+    store = get_ppl_store()
     
-    # Calculate stats
-    total_tasks = len(tasks)
-    pending_tasks = len([t for t in tasks if t.get('status') == 'pending'])
-    in_progress = len([t for t in tasks if t.get('status') == 'in_progress'])
-    done_tasks = len([t for t in tasks if t.get('status') == 'done'])
+    # Calculate stats (status counts + weekly rollup, no full scan)
+    status_counts = store.task_status_counts()
+    total_tasks = sum(status_counts.values())
+    pending_tasks = status_counts['pending']
+    in_progress = status_counts['in_progress']
+    done_tasks = status_counts['done']
     
     today = date.today()
-    week_start = today - timedelta(days=today.weekday())
-    visits_this_week = len([v for v in visits if v.get('date', '') >= str(week_start)])
+    visits_this_week = store.rollup("week", today)["visits"]
     
     # Quick Stats
     col1, col2, col3, col4, col5 = st.columns(5)
@@ -272,8 +265,7 @@ with tab_dashboard:
         st.subheader("🗓️ Tugas Mendatang")
         
         # Get upcoming tasks (pending/in_progress, sorted by due date)
-        upcoming = [t for t in tasks if t.get('status') in ['pending', 'in_progress']]
-        upcoming = sorted(upcoming, key=lambda x: x.get('due_date', '9999-12-31'))[:5]
+        upcoming = store.tasks(status=["pending", "in_progress"], sort_by="due_date", limit=5)
         
         if upcoming:
             for task in upcoming:
@@ -294,7 +286,7 @@ with tab_dashboard:
     st.markdown("---")
     st.subheader("📝 Kunjungan Terakhir")
     
-    recent_visits = sorted(visits, key=lambda x: x.get('date', ''), reverse=True)[:5]
+    recent_visits = store.visits(limit=5, newest_first=True)
     
     if recent_visits:
         for visit in recent_visits:
@@ -320,7 +312,7 @@ with tab_tasks:
     if 'task_edit_id' not in st.session_state:
         st.session_state.task_edit_id = None
     
-    tasks = load_tasks()
+    store = get_ppl_store()
     
     # Subtabs
     subtab_list, subtab_create = st.tabs(["📋 Daftar Tugas", "➕ Buat Tugas Baru"])
@@ -350,7 +342,7 @@ with tab_tasks:
             
             if submitted:
                 if task_title:
-                    new_task = {
+                    store.add_task({
                         "id": str(datetime.now().timestamp()),
                         "title": task_title,
                         "description": task_desc,
@@ -359,10 +351,9 @@ with tab_tasks:
                         "due_date": str(task_due),
                         "priority": task_priority,
                         "status": task_status,
-                        "created_date": str(date.today())
-                    }
-                    tasks.append(new_task)
-                    save_tasks(tasks)
+                        "created_date": str(date.today()),
+                        "officer": officer,
+                    })
                     st.success("✅ Tugas berhasil disimpan!")
                     st.rerun()
                 else:
@@ -385,19 +376,8 @@ with tab_tasks:
                                   format_func=lambda x: {"due_date": "📅 Tenggat", "created_date": "🕐 Dibuat", 
                                                          "priority": "🚦 Prioritas"}[x])
         
-        # Filter tasks
-        filtered_tasks = tasks.copy()
-        if filter_status != "all":
-            filtered_tasks = [t for t in filtered_tasks if t.get('status') == filter_status]
-        if filter_priority != "all":
-            filtered_tasks = [t for t in filtered_tasks if t.get('priority') == filter_priority]
-        
-        # Sort
-        priority_order = {"high": 0, "medium": 1, "low": 2}
-        if sort_by == "priority":
-            filtered_tasks = sorted(filtered_tasks, key=lambda x: priority_order.get(x.get('priority', 'medium'), 1))
-        else:
-            filtered_tasks = sorted(filtered_tasks, key=lambda x: x.get(sort_by, ''), reverse=(sort_by == 'created_date'))
+        # Filter + sort in the store
+        filtered_tasks = store.tasks(status=filter_status, priority=filter_priority, sort_by=sort_by)
         
         st.markdown(f"**{len(filtered_tasks)} tugas ditemukan**")
         st.markdown("---")
@@ -445,17 +425,11 @@ with tab_tasks:
                     )
                     
                     if new_status != task.get('status'):
-                        # Update task status
-                        for t in tasks:
-                            if t.get('id') == task.get('id'):
-                                t['status'] = new_status
-                                break
-                        save_tasks(tasks)
+                        store.set_task_status(task.get('id'), new_status)
                         st.rerun()
                     
                     if st.button("🗑️", key=f"del_{task.get('id')}", help="Hapus tugas"):
-                        tasks = [t for t in tasks if t.get('id') != task.get('id')]
-                        save_tasks(tasks)
+                        store.delete_task(task.get('id'))
                         st.rerun()
         else:
             st.info("📭 Tidak ada tugas yang ditemukan.")
@@ -466,7 +440,7 @@ with tab_tasks:
 with tab_reports:
     st.markdown("### 📝 Sistem Pelaporan")
     
-    visits = load_visits()
+    store = get_ppl_store()
     
     subtab_log, subtab_weekly, subtab_monthly, subtab_history = st.tabs([
         "📝 Catat Kunjungan", "📊 Laporan Mingguan", "📈 Rekapitulasi Bulanan", "📋 Riwayat"
@@ -510,9 +484,10 @@ with tab_reports:
             
             if submitted_visit:
                 if visit_poktan:
-                    new_visit = {
+                    store.add_visit({
                         "id": str(datetime.now().timestamp()),
                         "date": str(visit_date),
+                        "officer": officer,
                         "poktan": visit_poktan,
                         "desa": visit_desa,
                         "kecamatan": visit_kec,
@@ -523,9 +498,7 @@ with tab_reports:
                         "catatan": visit_catatan,
                         "tindak_lanjut": visit_tindak,
                         "created_at": str(datetime.now())
-                    }
-                    visits.append(new_visit)
-                    save_visits(visits)
+                    })
                     st.success("✅ Laporan kunjungan berhasil disimpan!")
                     st.balloons()
                     st.rerun()
@@ -546,12 +519,13 @@ with tab_reports:
         wilayah = st.text_input("Wilayah Binaan", placeholder="Kec. Caringin, Kab. Bogor")
         
         if st.button("📄 Generate Laporan Mingguan", type="primary"):
-            # Filter visits for the week
-            week_visits = [v for v in visits if str(week_start) <= v.get('date', '') <= str(week_end)]
+            # Totals from the weekly rollup (indexed range scan for custom ranges)
+            week_summary = store.range_summary(week_start, week_end)
+            week_visits = store.visits(start=week_start, end=week_end)
             
-            total_visits = len(week_visits)
-            total_peserta = sum(v.get('jumlah_hadir', 0) for v in week_visits)
-            total_poktan = len(set(v.get('poktan', '') for v in week_visits))
+            total_visits = week_summary['visits']
+            total_peserta = week_summary['jumlah_hadir']
+            total_poktan = week_summary['poktan']
             
             report_text = f"""
 ╔══════════════════════════════════════════════════════════════╗
@@ -610,30 +584,23 @@ Demikian laporan mingguan ini dibuat dengan sebenarnya.
         with col_m1:
             month_year = st.date_input("Pilih Bulan", value=date.today().replace(day=1))
         
-        # Filter for the selected month
-        month_start = month_year.replace(day=1)
-        if month_year.month == 12:
-            month_end = month_year.replace(year=month_year.year + 1, month=1, day=1)
-        else:
-            month_end = month_year.replace(month=month_year.month + 1, day=1)
-        
-        month_visits = [v for v in visits if str(month_start) <= v.get('date', '') < str(month_end)]
+        # Monthly rollup rows (maintained on every visit write)
+        month_summary = store.rollup("month", month_year)
         
         # Stats
         col_s1, col_s2, col_s3, col_s4 = st.columns(4)
-        col_s1.metric("Total Kunjungan", len(month_visits))
-        col_s2.metric("Total Peserta", sum(v.get('jumlah_hadir', 0) for v in month_visits))
-        col_s3.metric("Poktan Terjangkau", len(set(v.get('poktan', '') for v in month_visits)))
+        col_s1.metric("Total Kunjungan", month_summary['visits'])
+        col_s2.metric("Total Peserta", month_summary['jumlah_hadir'])
+        col_s3.metric("Poktan Terjangkau", month_summary['poktan'])
         col_s4.metric("Peserta/Kunjungan", 
-                     f"{sum(v.get('jumlah_hadir', 0) for v in month_visits) / max(len(month_visits), 1):.1f}")
+                     f"{month_summary['jumlah_hadir'] / max(month_summary['visits'], 1):.1f}")
         
         st.markdown("---")
         
         # Chart by activity type
-        if month_visits:
-            df_kegiatan = pd.DataFrame(month_visits)
-            kegiatan_counts = df_kegiatan['kegiatan'].value_counts().reset_index()
-            kegiatan_counts.columns = ['Jenis Kegiatan', 'Jumlah']
+        if month_summary['visits']:
+            kegiatan_counts = pd.DataFrame(list(month_summary['kegiatan'].items()),
+                                           columns=['Jenis Kegiatan', 'Jumlah'])
             
             fig = px.pie(kegiatan_counts, values='Jumlah', names='Jenis Kegiatan',
                         title="Distribusi Jenis Kegiatan",
@@ -641,8 +608,8 @@ Demikian laporan mingguan ini dibuat dengan sebenarnya.
             st.plotly_chart(fig, use_container_width=True)
             
             # Gender distribution
-            total_l = sum(v.get('laki_laki', 0) for v in month_visits)
-            total_p = sum(v.get('perempuan', 0) for v in month_visits)
+            total_l = month_summary['laki_laki']
+            total_p = month_summary['perempuan']
             
             fig2 = px.pie(
                 values=[total_l, total_p],
@@ -658,9 +625,12 @@ Demikian laporan mingguan ini dibuat dengan sebenarnya.
     with subtab_history:
         st.subheader("📋 Riwayat Kunjungan")
         
-        if visits:
-            df_visits = pd.DataFrame(visits)
-            df_visits = df_visits.sort_values('date', ascending=False)
+        df_visits = store.visits_frame()
+        skipped_visits = store.skipped_legacy_visits()
+        if skipped_visits:
+            with st.expander(f"⚠️ {len(skipped_visits)} kunjungan lama tidak dapat diimpor"):
+                st.dataframe(pd.DataFrame(skipped_visits), use_container_width=True, hide_index=True)
+        if not df_visits.empty:
             
             # Display columns
             display_cols = ['date', 'poktan', 'desa', 'kegiatan', 'jumlah_hadir']
@@ -710,12 +680,13 @@ with tab_ubinan:
     with col_u2:
         st.subheader("📊 Hasil Analisa")
         
-        luas_ubin = panjang * lebar
-        faktor_konversi = 10000 / luas_ubin
-        hasil_gkp_ha = (berat_ubin * faktor_konversi) / 1000
-        hasil_gkg = hasil_gkp_ha * 0.8602
-        hasil_beras = hasil_gkg * 0.6402
-        populasi_ha = jml_rumpun * faktor_konversi
+        ubinan = convert_ubinan(panjang, lebar, berat_ubin, jml_rumpun)
+        luas_ubin = float(ubinan["luas_m2"])
+        faktor_konversi = float(ubinan["faktor_konversi"])
+        hasil_gkp_ha = float(ubinan["gkp_ton_ha"])
+        hasil_gkg = float(ubinan["gkg_ton_ha"])
+        hasil_beras = float(ubinan["beras_ton_ha"])
+        populasi_ha = float(ubinan["populasi_ha"])
         
         col_m1, col_m2 = st.columns(2)
         col_m1.metric("Estimasi GKP", f"{hasil_gkp_ha:.2f} Ton/Ha")
@@ -741,72 +712,116 @@ with tab_ubinan:
             ba_tanggal = st.date_input("Tanggal Ubinan", date.today(), key="ba_tanggal")
             ba_ka = st.number_input("Kadar Air Saat Panen (%)", 20.0, key="ba_ka")
 
-        ba_text = f"""BERITA ACARA PENGAMBILAN UBINAN
------------------------------------------
-Pada hari ini {ba_tanggal.strftime('%A, %d %B %Y')}, telah dilakukan pengambilan ubinan padi sawah di:
+        ba_text = render_berita_acara({
+            "tanggal": ba_tanggal, "poktan": ba_poktan, "desa": ba_desa, "kecamatan": ba_kec,
+            "varietas": ba_var, "panjang": panjang, "lebar": lebar, "luas_m2": luas_ubin,
+            "rumpun": jml_rumpun, "berat_gkp": berat_ubin, "kadar_air": ba_ka,
+            "gkp_ton_ha": hasil_gkp_ha, "populasi_ha": populasi_ha,
+        })
+        st.text_area("Salin Teks Ini:", value=ba_text, height=350, key="ba_text")
+        st.download_button("📥 Download Berita Acara", data=ba_text, 
+                          file_name=f"Berita_Acara_Ubinan_{ba_tanggal}.txt")
 
-📍 LOKASI
-Kelompok Tani : {ba_poktan}
-Desa/Kel.     : {ba_desa}
-Kecamatan     : {ba_kec}
+    # Bulk mode
+    st.markdown("---")
+    st.subheader("📦 Ubinan Massal (Upload CSV)")
+    st.caption("Satu file untuk seluruh ubinan musim ini: konversi per petak, estimasi per poktan/desa/kecamatan "
+               "dengan selang kepercayaan 95%, dan berita acara untuk setiap petak.")
 
-🌾 DATA TEKNIS
-Varietas      : {ba_var}
-Luas Petak    : {panjang} m x {lebar} m ({luas_ubin} m²)
-Jumlah Rumpun : {jml_rumpun} rumpun (Sampel)
+    col_b1, col_b2 = st.columns([3, 1])
+    with col_b1:
+        ub_file = st.file_uploader("Upload CSV Ubinan", type=["csv"], key="ub_bulk_file",
+                                   help="Kolom wajib: poktan, desa, kecamatan, panjang, lebar, berat_gkp, rumpun. "
+                                        "Opsional: petani, varietas, tanggal, kadar_air.")
+    with col_b2:
+        st.download_button("📄 Template CSV", data=template_csv(), file_name="template_ubinan.csv",
+                           mime="text/csv", key="ub_template")
 
-⚖️ HASIL UBINAN
-Berat Ubinan  : {berat_ubin} kg
-Kadar Air     : {ba_ka} %
------------------------------------------
-✅ KONVERSI HASIL (ESTIMASI)
-Produktivitas : {hasil_gkp_ha:.2f} Ton/Ha (GKP)
-Populasi      : {populasi_ha:,.0f} Rumpun/Ha
+    if ub_file is not None:
+        try:
+            ub_valid, ub_rejected = load_ubinan_upload(ub_file.getvalue())
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            ub_valid = None
 
-Demikian berita acara ini dibuat untuk dipergunakan sebagaimana mestinya.
+        if ub_valid is not None:
+            if len(ub_rejected):
+                with st.expander(f"⚠️ {len(ub_rejected)} baris ditolak"):
+                    st.dataframe(ub_rejected, use_container_width=True, hide_index=True)
 
-Mengetahui,
-Penyuluh Pertanian (PPL)             Ketua Kelompok Tani
+            if ub_valid.empty:
+                st.warning("Tidak ada baris ubinan yang valid.")
+            else:
+                k1, k2, k3, k4 = st.columns(4)
+                k1.metric("Petak Ubinan", f"{len(ub_valid):,}")
+                k2.metric("Rata-rata GKP", f"{ub_valid['gkp_ton_ha'].mean():.2f} Ton/Ha")
+                k3.metric("Rata-rata Beras", f"{ub_valid['beras_ton_ha'].mean():.2f} Ton/Ha")
+                k4.metric("Kecamatan / Desa", f"{ub_valid['kecamatan'].nunique()} / "
+                                              f"{ub_valid[['kecamatan', 'desa']].drop_duplicates().shape[0]}")
 
-( .................... )             ( .................... )
-"""
-        st.text_area("Salin Teks Ini:", value=ba_text, height=350, key="ba_text")
-        st.download_button("📥 Download Berita Acara", data=ba_text, 
-                          file_name=f"Berita_Acara_Ubinan_{ba_tanggal}.txt")
+                level = st.radio("Agregasi per", list(LEVEL_KEYS), index=1, horizontal=True,
+                                 format_func=str.title, key="ub_level")
+                agg = aggregate_ubinan(ub_valid, level=level)
+                # Full kecamatan / desa / poktan path so same-named units in different parents stay separate bars
+                agg_labels = agg[LEVEL_KEYS[level]].astype(str).agg(" / ".join, axis=1)
+                st.dataframe(
+                    agg.rename(columns={
+                        "n_ubinan": "Jumlah Ubinan", "rata_rata": "GKP (Ton/Ha)", "std": "Simpangan Baku",
+                        "se": "SE", "ci_low": "SK 95% Bawah", "ci_high": "SK 95% Atas",
+                        "rata_rata_gkg": "GKG (Ton/Ha)", "rata_rata_beras": "Beras (Ton/Ha)",
+                        "populasi_ha": "Populasi (Rumpun/Ha)",
+                    }).round(3),
+                    use_container_width=True, hide_index=True
+                )
+
+                fig_ub = go.Figure(go.Bar(
+                    x=agg_labels, y=agg["rata_rata"], marker_color="#3b82f6",
+                    error_y=dict(type="data", symmetric=False,
+                                 array=(agg["ci_high"] - agg["rata_rata"]).fillna(0),
+                                 arrayminus=(agg["rata_rata"] - agg["ci_low"]).fillna(0)),
+                ))
+                fig_ub.update_layout(title=f"Produktivitas GKP per {level.title()} (SK 95%)",
+                                     yaxis_title="GKP (Ton/Ha)", height=400)
+                st.plotly_chart(fig_ub, use_container_width=True)
+
+                d1, d2, d3 = st.columns(3)
+                d1.download_button("📥 Hasil per Petak (CSV)", ub_valid.to_csv(index=False).encode("utf-8"),
+                                   file_name="ubinan_per_petak.csv", mime="text/csv", key="ub_dl_rows")
+                d2.download_button(f"📥 Rekap per {level.title()} (CSV)", agg.to_csv(index=False).encode("utf-8"),
+                                   file_name=f"ubinan_rekap_{level}.csv", mime="text/csv", key="ub_dl_agg")
+                if d3.button(f"📄 Siapkan {len(ub_valid):,} Berita Acara", key="ub_ba_prepare"):
+                    st.session_state["ub_ba_zip"] = (ub_file.file_id, berita_acara_zip(ub_valid))
+                ba_zip = st.session_state.get("ub_ba_zip")
+                if ba_zip and ba_zip[0] == ub_file.file_id:
+                    d3.download_button("📥 Download Berita Acara (ZIP)", ba_zip[1],
+                                       file_name="berita_acara_ubinan.zip", mime="application/zip",
+                                       key="ub_dl_ba")
 
 # ========================================
 # TAB 5: E-RDKK (EXISTING)
 # ========================================
 with tab_rdkk:
     st.markdown("### 📋 Cek Kuota Pupuk Subsidi (Simulasi)")
-    st.info("Berdasarkan aturan Permentan (Maksimal 2 Ha per NIK).")
+    st.info(f"Berdasarkan aturan Permentan (Maksimal {MAX_LUAS_HA:g} Ha per NIK).")
     
     col_r1, col_r2 = st.columns([1, 2])
     
     with col_r1:
         luas_lahan = st.number_input("Luas Lahan (Ha)", value=1.0, max_value=10.0, step=0.1, key="rdkk_luas")
-        komoditas = st.selectbox("Komoditas Prioritas", 
-                                 ["Padi", "Jagung", "Kedelai", "Cabai", "Bawang Merah", "Bawang Putih", 
-                                  "Tebu Rakyat", "Kopi", "Kakao"], key="rdkk_komoditas")
-        mt = st.selectbox("Musim Tanam", ["MT 1", "MT 2", "MT 3"], key="rdkk_mt")
+        komoditas = st.selectbox("Komoditas Prioritas", list(COMMODITIES), key="rdkk_komoditas")
+        mt = st.selectbox("Musim Tanam", list(SEASONS), key="rdkk_mt")
         
     with col_r2:
-        quota_ref = {
-            "Padi": {"urea": 200, "npk": 250},
-            "Jagung": {"urea": 250, "npk": 300},
-            "Kedelai": {"urea": 50, "npk": 150},
-            "Cabai": {"urea": 200, "npk": 200},
-        }
-        ref = quota_ref.get(komoditas, {"urea": 150, "npk": 150})
+        ref = quota_per_ha(komoditas)
         
-        luas_valid = min(luas_lahan, 2.0)
-        is_capped = luas_lahan > 2.0
+        luas_valid = min(luas_lahan, MAX_LUAS_HA)
+        is_capped = luas_lahan > MAX_LUAS_HA
         
         quota_urea = ref['urea'] * luas_valid
         quota_npk = ref['npk'] * luas_valid
         
         if is_capped:
-            st.warning(f"⚠️ Input {luas_lahan} Ha melebihi batas subsidi. Perhitungan dibatasi max 2.0 Ha.")
+            st.warning(f"⚠️ Input {luas_lahan} Ha melebihi batas subsidi. Perhitungan dibatasi max {MAX_LUAS_HA} Ha.")
         
         st.success(f"✅ **Alokasi Subsidi untuk {komoditas} ({mt}):**")
         
@@ -832,6 +847,86 @@ with tab_rdkk:
                      color_discrete_map={'Subsidi (Jatah)':'#10b981', 'Mandiri (Kekurangan)':'#f59e0b'})
         st.plotly_chart(fig, use_container_width=True)
 
+    # Batch mode
+    st.markdown("---")
+    st.subheader("📦 RDKK Kelompok (Upload Daftar Anggota)")
+    st.caption(f"Satu file untuk seluruh anggota poktan: kuota per anggota untuk MT 1–3, batas {MAX_LUAS_HA:g} Ha "
+               "per NIK per musim, rekap per poktan/desa, dan file pengajuan e-RDKK.")
+
+    col_rb1, col_rb2 = st.columns([3, 1])
+    with col_rb1:
+        rdkk_file = st.file_uploader("Upload CSV Anggota", type=["csv"], key="rdkk_bulk_file",
+                                     help="Kolom wajib: nik, poktan, desa, luas_lahan, komoditas. "
+                                          "Opsional: nama, kecamatan, mt (kosong/Semua = MT 1–3).")
+    with col_rb2:
+        st.download_button("📄 Template CSV", data=template_roster_csv(), file_name="template_rdkk.csv",
+                           mime="text/csv", key="rdkk_template")
+
+    if rdkk_file is not None:
+        try:
+            rdkk_alloc, rdkk_rejected = load_rdkk_upload(rdkk_file.getvalue())
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            rdkk_alloc = None
+
+        if rdkk_alloc is not None:
+            if len(rdkk_rejected):
+                with st.expander(f"⚠️ {len(rdkk_rejected)} baris ditolak"):
+                    st.dataframe(rdkk_rejected, use_container_width=True, hide_index=True)
+
+            if rdkk_alloc.empty:
+                st.warning("Tidak ada anggota yang valid.")
+            else:
+                capped_nik = rdkk_alloc.loc[rdkk_alloc["dibatasi"], "nik"].nunique()
+                r1, r2, r3, r4 = st.columns(4)
+                r1.metric("Anggota (NIK)", f"{rdkk_alloc['nik'].nunique():,}")
+                r2.metric("Total Urea", f"{rdkk_alloc['urea_kg'].sum():,.0f} Kg")
+                r3.metric("Total NPK", f"{rdkk_alloc['npk_kg'].sum():,.0f} Kg")
+                r4.metric(f"NIK > {MAX_LUAS_HA:g} Ha", f"{capped_nik:,}")
+                if capped_nik:
+                    st.warning(f"⚠️ {capped_nik} NIK melebihi {MAX_LUAS_HA:g} Ha dalam satu musim; "
+                               "luas subsidi dibagi proporsional antar lahan.")
+                default_dose = sorted(rdkk_alloc.loc[rdkk_alloc["dosis_default"], "komoditas"].unique())
+                if default_dose:
+                    st.info(f"ℹ️ Dosis umum dipakai untuk: {', '.join(default_dose)}")
+
+                rdkk_level = st.radio("Rekap per", list(RDKK_LEVELS), horizontal=True,
+                                      format_func=str.title, key="rdkk_level")
+                rdkk_totals = aggregate_rdkk(rdkk_alloc, level=rdkk_level)
+                st.dataframe(
+                    rdkk_totals.rename(columns={
+                        "desa": "Desa", "poktan": "Kelompok Tani", "mt": "Musim Tanam", "anggota": "Anggota",
+                        "luas_lahan": "Luas Lahan (Ha)", "luas_subsidi": "Luas Subsidi (Ha)",
+                        "dibatasi": "Baris Dibatasi", "urea_kg": "Urea (Kg)", "npk_kg": "NPK (Kg)",
+                    }).round(2),
+                    use_container_width=True, hide_index=True
+                )
+
+                # Full desa / poktan path so same-named groups in different villages stay separate bars
+                rdkk_chart = rdkk_totals.assign(
+                    label=rdkk_totals[RDKK_LEVELS[rdkk_level]].astype(str).agg(" / ".join, axis=1))
+                fig_rdkk = px.bar(rdkk_chart, x="label", y=["urea_kg", "npk_kg"],
+                                  facet_col="mt", barmode="group", height=400,
+                                  labels={"value": "Kg", "variable": "Pupuk", "label": rdkk_level.title()},
+                                  title=f"Kebutuhan Pupuk Subsidi per {rdkk_level.title()}")
+                st.plotly_chart(fig_rdkk, use_container_width=True)
+
+                rdkk_sheet = rdkk_submission(rdkk_alloc)
+                e1, e2, e3 = st.columns(3)
+                e1.download_button("📥 File Pengajuan e-RDKK (CSV)", rdkk_sheet.to_csv(index=False).encode("utf-8"),
+                                   file_name="pengajuan_erdkk.csv", mime="text/csv", key="rdkk_dl_csv")
+                e2.download_button(f"📥 Rekap per {rdkk_level.title()} (CSV)",
+                                   rdkk_totals.to_csv(index=False).encode("utf-8"),
+                                   file_name=f"rekap_rdkk_{rdkk_level}.csv", mime="text/csv", key="rdkk_dl_agg")
+                if e3.button("📊 Siapkan File Excel", key="rdkk_xlsx_prepare"):
+                    st.session_state["rdkk_xlsx"] = ((rdkk_file.file_id, rdkk_level),
+                                                     submission_excel(rdkk_sheet, rdkk_totals))
+                rdkk_xlsx = st.session_state.get("rdkk_xlsx")
+                if rdkk_xlsx and rdkk_xlsx[0] == (rdkk_file.file_id, rdkk_level):
+                    e3.download_button("📥 Download Pengajuan (XLSX)", rdkk_xlsx[1], file_name="pengajuan_erdkk.xlsx",
+                                       mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                                       key="rdkk_dl_xlsx")
+
 # ========================================
 # TAB 6: GENERATOR MATERI (EXISTING - Enhanced)
 # ========================================
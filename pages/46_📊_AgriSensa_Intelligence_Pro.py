@@ -4,12 +4,14 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from sklearn.linear_model import LinearRegression
-from scipy import stats
-import datetime
 
 # Page Config
 from utils.auth import require_auth, show_user_info_sidebar
+from services.data_ingest_service import (
+    MAX_CHART_POINTS, binned_counts, content_hash, detect_date_columns, downsample, load_dataset,
+)
+from services.batch_forecast_service import batch_forecast, build_series, forecast_series
+from services.anomaly_service import detect_anomalies
 
 st.set_page_config(
     page_title="AgriSensa Intelligence Pro",
@@ -28,29 +30,20 @@ show_user_info_sidebar()
 
 
 # HELPER FUNCTIONS
-@st.cache_data
+@st.cache_resource(max_entries=2, show_spinner="📥 Memuat data (konversi ke Parquet sekali per file)...")
+def load_cached_dataset(file_hash, name, _file):
+    # Shared read-only frame keyed by content hash; callers copy before mutating
+    return load_dataset(_file, name)
+
 def load_data(file):
     try:
-        if file.name.endswith(".csv"):
-            return pd.read_csv(file)
-        else:
-            return pd.read_excel(file)
+        return load_cached_dataset(content_hash(file), file.name, file)
     except Exception as e:
         st.error(f"Gagal memuat file: {e}")
         return None
 
-def detect_date_columns(df):
-    date_cols = []
-    for col in df.columns:
-        if pd.api.types.is_datetime64_any_dtype(df[col]):
-            date_cols.append(col)
-        elif df[col].astype(str).str.match(r'^\d{4}-\d{2}-\d{2}').all(): # Simple check YYYY-MM-DD
-            try:
-                df[col] = pd.to_datetime(df[col])
-                date_cols.append(col)
-            except:
-                pass
-    return date_cols
+def is_sortable_axis(series):
+    return pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series)
 
 # CUSTOM CSS
 st.markdown("""
@@ -93,7 +86,9 @@ if uploaded_file is not None:
     if df is not None:
         # DATA PREVIEW (EXPANDER)
         with st.expander("🔍 Preview Data Mentah", expanded=False):
-            st.dataframe(df, use_container_width=True)
+            st.dataframe(df.head(1000), use_container_width=True)
+            st.caption(f"Menampilkan 1.000 baris pertama dari {len(df):,} baris · "
+                       f"Memori: {df.memory_usage(deep=True).sum() / 1e6:,.1f} MB")
             
         # TABS NAVIGATION
         tab1, tab2, tab3 = st.tabs(["📊 Visualisasi Data", "🔮 Auto-Forecasting", "⚠️ Deteksi Anomali"])
@@ -146,13 +141,20 @@ if uploaded_file is not None:
                 else:
                     plot_df = df
                 
+                # Keep the browser payload bounded: downsample long series, pre-bin histograms
+                if len(plot_df) > MAX_CHART_POINTS and chart_type in ("Line Chart", "Area Chart", "Scatter Plot"):
+                    if is_sortable_axis(plot_df[x_axis]):
+                        method = "minmax" if chart_type == "Scatter Plot" else "lttb"
+                        plot_df = downsample(plot_df, x_axis, y_axis, MAX_CHART_POINTS, method=method, group=color_dim)
+                        st.caption(f"⚡ {len(plot_df):,} titik representatif ({method.upper()}) ditampilkan.")
+                
                 try:
                     if chart_type == "Bar Chart": fig = px.bar(plot_df, x=x_axis, y=y_axis, color=color_dim, barmode='group')
                     elif chart_type == "Line Chart": fig = px.line(plot_df, x=x_axis, y=y_axis, color=color_dim, markers=True)
                     elif chart_type == "Area Chart": fig = px.area(plot_df, x=x_axis, y=y_axis, color=color_dim)
                     elif chart_type == "Scatter Plot": fig = px.scatter(plot_df, x=x_axis, y=y_axis, color=color_dim, size=y_axis)
                     elif chart_type == "Pie Chart": fig = px.pie(plot_df, names=x_axis, values=y_axis, color=color_dim, hole=0.4)
-                    elif chart_type == "Histogram": fig = px.histogram(df, x=x_axis, color=color_dim)
+                    elif chart_type == "Histogram": fig = px.bar(binned_counts(df, x_axis, color_dim), x=x_axis, y="count", color=color_dim)
                     fig.update_layout(height=450, template="plotly_white")
                     st.plotly_chart(fig, use_container_width=True)
                 except Exception as e:
@@ -163,7 +165,9 @@ if uploaded_file is not None:
             st.markdown("### 🔮 Peramal Masa Depan (Auto-Forecasting)")
             st.info("Otomatis mendeteksi tren waktu dan memprediksi 3-6 periode ke depan.")
             
-            # Detect Date Column
+            # Detect Date Column (converts date text in place, so not on the shared cached frame;
+            # a shallow copy is enough since columns are replaced, not written into)
+            df = df.copy(deep=False)
             date_cols = detect_date_columns(df)
             
             if not date_cols:
@@ -171,95 +175,175 @@ if uploaded_file is not None:
             elif not num_cols:
                 st.warning("⚠️ Tidak ada kolom angka untuk diprediksi.")
             else:
+                fc_mode = st.radio("Mode Peramalan:", ["Satu Kolom", "Semua Kolom Angka", "Per Kelompok Kategori"], horizontal=True)
                 col_f1, col_f2 = st.columns(2)
                 with col_f1:
                     date_col = st.selectbox("Pilih Kolom Waktu:", date_cols)
                 with col_f2:
-                    target_col = st.selectbox("Pilih Target Prediksi:", num_cols)
+                    if fc_mode == "Semua Kolom Angka":
+                        target_cols = st.multiselect("Kolom yang Diramal:", num_cols, default=num_cols)
+                    else:
+                        target_col = st.selectbox("Pilih Target Prediksi:", num_cols)
+                if fc_mode == "Per Kelompok Kategori":
+                    group_col = st.selectbox("Kelompokkan Berdasarkan:", cat_cols) if cat_cols else None
+                    if not group_col:
+                        st.warning("⚠️ Tidak ada kolom kategori untuk pengelompokan.")
                     
                 periods = st.slider("Jumlah Periode Prediksi:", 3, 12, 6)
                 
                 if st.button("🚀 Ramal Sekarang"):
-                    # Process Data
-                    df_fc = df.copy()
-                    df_fc[date_col] = pd.to_datetime(df_fc[date_col])
-                    # Aggregate by month/period logic - Simplified to ordinal sorting
-                    df_fc = df_fc.groupby(date_col)[target_col].sum().reset_index().sort_values(date_col)
-                    
-                    df_fc['ordinal_date'] = df_fc[date_col].map(datetime.datetime.toordinal)
-                    
-                    X = df_fc[['ordinal_date']]
-                    y = df_fc[target_col]
-                    
-                    model = LinearRegression()
-                    model.fit(X, y)
-                    r2 = model.score(X, y)
-                    
-                    # Future Dates
-                    last_date = df_fc[date_col].max()
-                    # Determine avg freq roughly
-                    if len(df_fc) > 1:
-                        avg_diff = (df_fc[date_col].iloc[-1] - df_fc[date_col].iloc[0]).days / len(df_fc)
-                    else:
-                        avg_diff = 30 # Default monthly
-                    
-                    future_dates = [last_date + datetime.timedelta(days=int(avg_diff)*i) for i in range(1, periods+1)]
-                    future_ordinals = [[d.toordinal()] for d in future_dates]
-                    
-                    predictions = model.predict(future_ordinals)
-                    
-                    # Plot
-                    fig_fc = px.line(df_fc, x=date_col, y=target_col, markers=True, title=f"Prediksi {target_col} (R²: {r2:.2f})")
-                    fig_fc.add_scatter(x=future_dates, y=predictions, mode='lines+markers', name='Prediksi AI', line=dict(dash='dash', color='red'))
-                    
-                    st.plotly_chart(fig_fc, use_container_width=True)
-                    st.success(f"Model berhasil memprediksi tren dengan akurasi arah trend: {r2*100:.1f}%.")
-                    
-                    if avg_diff < 40:
-                        st.caption("ℹ️ Frekuensi data terdeteksi: Bulanan/Harian")
+                    if fc_mode == "Satu Kolom":
+                        # Aggregate per date, then fit the linear trend on the date axis
+                        (fc_dates, fc_values), = build_series(df, date_col, value_cols=[target_col]).values()
+                        res = forecast_series(fc_dates, fc_values, periods)
+                        if res['status'] != "ok":
+                            st.warning("⚠️ Butuh minimal 2 titik waktu untuk meramal.")
+                        else:
+                            r2 = res['r2']
+                            df_fc = pd.DataFrame({date_col: fc_dates, target_col: fc_values})
+                            
+                            # Plot
+                            fig_fc = px.line(downsample(df_fc, date_col, target_col), x=date_col, y=target_col, markers=True, title=f"Prediksi {target_col} (R²: {r2:.2f})")
+                            fig_fc.add_scatter(x=pd.to_datetime(res['future_dates']), y=res['predictions'], mode='lines+markers', name='Prediksi AI', line=dict(dash='dash', color='red'))
+                            
+                            st.plotly_chart(fig_fc, use_container_width=True)
+                            st.success(f"Model berhasil memprediksi tren dengan akurasi arah trend: {r2*100:.1f}%.")
+                            
+                            if res['step_days'] < 40:
+                                st.caption("ℹ️ Frekuensi data terdeteksi: Bulanan/Harian")
+                            else:
+                                st.caption("ℹ️ Frekuensi data terdeteksi: Jarang/Acak")
                     else:
-                        st.caption("ℹ️ Frekuensi data terdeteksi: Jarang/Acak")
+                        if fc_mode == "Semua Kolom Angka":
+                            series = build_series(df, date_col, value_cols=target_cols) if target_cols else {}
+                        else:
+                            series = build_series(df, date_col, group_col=group_col, target=target_col) if group_col else {}
+                        
+                        if not series:
+                            st.warning("⚠️ Tidak ada seri untuk diramal.")
+                        else:
+                            with st.spinner(f"Meramal {len(series)} seri..."):
+                                fc_table, fc_summary = batch_forecast(series, periods)
+                            
+                            ok = (fc_summary['status'] == "ok").sum()
+                            c_b1, c_b2, c_b3 = st.columns(3)
+                            c_b1.metric("Seri Diramal", f"{ok}/{len(fc_summary)}")
+                            c_b2.metric("Median R²", f"{fc_summary['r2'].median():.2f}")
+                            c_b3.metric("Seri Tren Naik", int((fc_summary['tren_per_hari'] > 0).sum()))
+                            
+                            # Small multiples (first 24 series, each downsampled)
+                            shown = fc_summary['series'].head(24).tolist()
+                            plot_fc = pd.concat([downsample(g, "date", "value", 300)
+                                                 for _, g in fc_table[fc_table['series'].isin(shown)].groupby(['series', 'jenis'])])
+                            fig_sm = px.line(plot_fc, x="date", y="value", color="jenis", facet_col="series", facet_col_wrap=3,
+                                             color_discrete_map={"Aktual": "#6366f1", "Prediksi": "red"},
+                                             height=max(300, 220 * -(-len(shown) // 3)))
+                            fig_sm.update_yaxes(matches=None, showticklabels=True)
+                            fig_sm.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+                            st.plotly_chart(fig_sm, use_container_width=True)
+                            if len(fc_summary) > len(shown):
+                                st.caption(f"ℹ️ Grafik menampilkan {len(shown)} dari {len(fc_summary)} seri; semua seri ada di tabel.")
+                            
+                            st.markdown("#### 📋 Ringkasan Peramalan")
+                            st.dataframe(fc_summary, use_container_width=True, hide_index=True)
+                            
+                            forecast_only = fc_table[fc_table['jenis'] == "Prediksi"]
+                            st.download_button("📥 Download Tabel Prediksi (CSV)", forecast_only.to_csv(index=False).encode('utf-8'),
+                                               "prediksi_batch.csv", "text/csv")
 
         # --- TAB 3: ANOMALY ---
         with tab3:
-            st.markdown("### ⚠️ Detektif Anomali (Z-Score)")
-            st.info("Mendeteksi data 'aneh' (Outlier) yang menyimpang jauh dari rata-rata statistik.")
+            st.markdown("### ⚠️ Detektif Anomali")
+            st.info("Mendeteksi data 'aneh' (Outlier) per kelompok: Z-Score robust bergulir (median/MAD), "
+                    "Isolation Forest multi-kolom, atau residual musiman. Hanya baris yang ditandai yang ditampilkan.")
             
-            anom_target = st.selectbox("Pilih Kolom untuk Audit:", num_cols, key="anom_target")
-            threshold = st.slider("Sensitivitas (Standar Deviasi)", 1.5, 3.5, 2.0, help="Semakin kecil angka, semakin sensitif mendeteksi anomali.")
+            anom_methods = {
+                "Z-Score Robust (Bergulir)": "rolling_z",
+                "Isolation Forest (Multi-Kolom)": "isolation_forest",
+                "Residual Musiman": "seasonal",
+            }
+            anom_label = st.radio("Metode Deteksi:", list(anom_methods), horizontal=True, key="anom_method")
+            anom_method = anom_methods[anom_label]
             
-            if st.button("🔍 Scan Anomali"):
-                # Z-Score Logic
-                df_anom = df.copy()
-                col_data = df_anom[anom_target]
-                z_scores = np.abs(stats.zscore(col_data))
-                
-                df_anom['Is_Anomaly'] = z_scores > threshold
-                anomalies = df_anom[df_anom['Is_Anomaly'] == True]
+            col_p1, col_p2, col_p3 = st.columns(3)
+            with col_p1:
+                if anom_method == "isolation_forest":
+                    anom_cols = st.multiselect("Kolom untuk Audit:", num_cols, default=num_cols[:3], key="anom_cols")
+                else:
+                    anom_cols = [st.selectbox("Pilih Kolom untuk Audit:", num_cols, key="anom_target")] if num_cols else []
+            with col_p2:
+                anom_date_cols = [c for c in df.columns if pd.api.types.is_datetime64_any_dtype(df[c])]
+                anom_date = st.selectbox("Urutkan berdasarkan Waktu:", ["(Urutan Baris)"] + anom_date_cols, key="anom_date")
+                anom_group = st.selectbox("Pisahkan per Kelompok:", ["(Tanpa Kelompok)"] + cat_cols, key="anom_group")
+            with col_p3:
+                if anom_method == "isolation_forest":
+                    contamination = st.slider("Perkiraan Proporsi Anomali (%)", 0.1, 10.0, 1.0,
+                                              help="Porsi data yang dianggap anomali oleh model.") / 100
+                    threshold, window = None, None
+                else:
+                    threshold = st.slider("Sensitivitas (Skor Z Robust)", 2.0, 6.0, 3.5,
+                                          help="Semakin kecil angka, semakin sensitif mendeteksi anomali.")
+                    contamination = 0.01
+                    window = st.number_input("Lebar Jendela (baris)", 5, 1001, 51, step=2) if anom_method == "rolling_z" else None
+            
+            if st.button("🔍 Scan Anomali", disabled=not anom_cols):
+                date_arg = None if anom_date == "(Urutan Baris)" else anom_date
+                group_arg = None if anom_group == "(Tanpa Kelompok)" else anom_group
+                with st.spinner(f"Memindai {len(df):,} baris..."):
+                    anomalies, anom_summary = detect_anomalies(
+                        df, anom_cols, anom_method, group_col=group_arg, date_col=date_arg,
+                        threshold=threshold, window=window or 51, contamination=contamination)
                 
                 cnt = len(anomalies)
                 pct = (cnt / len(df)) * 100
+                anom_target = anom_cols[0]
                 
                 col_a1, col_a2 = st.columns([3, 1])
                 
                 with col_a1:
-                    # Scatter Plot with Color Highlight
-                    x_axis_anom = df_anom.columns[0] # Default to first col (ID/Date usually)
-                    fig_anom = px.scatter(df_anom, x=x_axis_anom, y=anom_target, color='Is_Anomaly', 
-                                          title=f"Sebaran Data: {cnt} Anomali Terdeteksi",
-                                          color_discrete_map={False: "blue", True: "red"})
+                    # Downsampled background + every flagged point (capped) on top
+                    # Without a date column the x axis is the row order (index), never another data column,
+                    # which could be the audited column itself
+                    x_axis_anom = date_arg or "Urutan Baris"
+                    if date_arg:
+                        base, top = df[[date_arg, anom_target]].dropna(), anomalies.head(MAX_CHART_POINTS)
+                    else:
+                        base = df[[anom_target]].dropna().rename_axis(x_axis_anom).reset_index()
+                        top = anomalies.head(MAX_CHART_POINTS)[[anom_target]].rename_axis(x_axis_anom).reset_index()
+                    if is_sortable_axis(base[x_axis_anom]):
+                        base = downsample(base, x_axis_anom, anom_target, n_out=MAX_CHART_POINTS, method="minmax")
+                    else:
+                        base = base.head(MAX_CHART_POINTS)
+                    fig_anom = go.Figure()
+                    fig_anom.add_trace(go.Scattergl(x=base[x_axis_anom], y=base[anom_target], mode="markers",
+                                                    name="Normal", marker=dict(color="blue", size=4, opacity=0.5)))
+                    fig_anom.add_trace(go.Scattergl(x=top[x_axis_anom], y=top[anom_target], mode="markers",
+                                                    name="Anomali", marker=dict(color="red", size=8)))
+                    fig_anom.update_layout(title=f"Sebaran Data: {cnt:,} Anomali Terdeteksi",
+                                           xaxis_title=x_axis_anom, yaxis_title=anom_target)
                     st.plotly_chart(fig_anom, use_container_width=True)
                     
                 with col_a2:
-                    st.metric("Total Anomali", f"{cnt} Baris", f"{pct:.1f}% dari data")
+                    st.metric("Total Anomali", f"{cnt:,} Baris", f"{pct:.2f}% dari data")
+                    st.metric("Kelompok Bermasalah", f"{int((anom_summary['n_anomali'] > 0).sum())}/{len(anom_summary)}")
                     if cnt > 0:
                         st.error("Ditemukan data mencurigakan!")
                     else:
                         st.success("Data bersih. Tidak ada penyimpangan ekstrem.")
                 
+                if group_arg:
+                    st.write("#### 📊 Ringkasan per Kelompok")
+                    st.dataframe(anom_summary.sort_values("n_anomali", ascending=False),
+                                 use_container_width=True, hide_index=True)
+                
                 if cnt > 0:
                     st.write("#### 📝 Daftar Data Aneh:")
-                    st.dataframe(anomalies.style.applymap(lambda x: 'background-color: #fca5a5', subset=[anom_target]))
+                    shown = anomalies.head(1000)
+                    st.dataframe(shown.style.map(lambda x: 'background-color: #fca5a5', subset=anom_cols))
+                    if cnt > len(shown):
+                        st.caption(f"Menampilkan 1.000 dari {cnt:,} baris dengan skor tertinggi.")
+                    st.download_button("📥 Download Semua Anomali (CSV)", anomalies.to_csv(index=False).encode('utf-8'),
+                                       "anomali.csv", "text/csv")
 
 else:
     # EMPTY STATE
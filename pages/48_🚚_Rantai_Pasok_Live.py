@@ -4,9 +4,11 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import datetime
+import html
 
 # Page Config
 from utils.auth import require_auth, show_user_info_sidebar
+from services.route_optimizer_service import ROAD_FACTOR, haversine_km, plan_fleet, sample_pickups
 
 st.set_page_config(
     page_title="Rantai Pasok & Logistik",
@@ -80,17 +82,6 @@ with tab1:
     
     col_l1, col_l2 = st.columns(2)
     
-    # Calculate Distance via Coordinates (Haversine)
-    def haversine(lat1, lon1, lat2, lon2):
-        import math
-        R = 6371 # Earth radius in km
-        phi1, phi2 = math.radians(lat1), math.radians(lat2)
-        dphi = math.radians(lat2 - lat1)
-        dlambda = math.radians(lon2 - lon1)
-        a = math.sin(dphi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dlambda/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        return R * c
-        
     with col_l1:
         st.subheader("1. Data Pengiriman")
         
@@ -104,8 +95,8 @@ with tab1:
             
             if st.button("📏 Hitung Jarak"):
                 p_data = PASAR_INDUK[dest_pasar]
-                air_dist = haversine(kebun_lat, kebun_lon, p_data['lat'], p_data['lon'])
-                road_dist = air_dist * 1.4 # Road factor
+                air_dist = float(haversine_km(kebun_lat, kebun_lon, p_data['lat'], p_data['lon']))
+                road_dist = air_dist * ROAD_FACTOR
                 st.session_state['calc_dist'] = int(road_dist)
                 st.success(f"Jarak Udara: {air_dist:.1f} km. Estimasi Jalan Raya (Faktor 1.4x): {road_dist:.1f} km.")
 
@@ -198,6 +189,72 @@ with tab1:
         fig_pie = px.pie(cost_data.iloc[:-1], values='Nilai', names='Komponen', title="Komposisi Biaya Distribusi", hole=0.4)
         st.plotly_chart(fig_pie, use_container_width=True)
 
+    # --- FLEET PLANNER (MULTI PICKUP) ---
+    st.markdown("---")
+    st.markdown("### 🗺️ Perencanaan Armada Harian (Multi-Pickup)")
+    st.caption("Susun rute jemput dari gudang pengepul ke banyak kebun lalu ke Pasar Induk. "
+               "Rute disusun dengan heuristik savings + 2-opt, armada dipilih otomatis sesuai muatan, "
+               "dan susut dihitung per komoditas berdasarkan jarak tempuh tiap muatan.")
+
+    col_f1, col_f2 = st.columns([1, 2])
+    with col_f1:
+        depot_lat = st.number_input("Latitude Gudang", -11.0, 6.0, -6.59, format="%.5f", key="depot_lat")
+        depot_lon = st.number_input("Longitude Gudang", 95.0, 141.0, 106.79, format="%.5f", key="depot_lon")
+        tujuan_plan = st.selectbox("Tujuan Pasar", ["Otomatis (Biaya Terendah)"] + list(PASAR_INDUK.keys()), key="dest_plan")
+        armada_plan = st.multiselect("Armada Tersedia", list(VEHICLES.keys()), default=list(VEHICLES.keys()))
+        n_demo = st.slider("Jumlah Pickup Contoh", 10, 500, 60, step=10)
+    with col_f2:
+        pickup_csv = st.file_uploader("Upload Daftar Pickup (CSV: id, lat, lon, kg, komoditas, harga_kg)", type=['csv'], key="pickup_csv")
+        if pickup_csv is not None:
+            pickups_df = pd.read_csv(pickup_csv)
+        else:
+            pickups_df = sample_pickups((depot_lat, depot_lon), n=n_demo)
+        pickups_df = st.data_editor(pickups_df, num_rows="dynamic", use_container_width=True, height=250, key="pickup_editor")
+
+    if st.button("🧮 Susun Rencana Armada", type="primary"):
+        try:
+            st.session_state['fleet_plan'] = plan_fleet(
+                pickups_df.dropna(), (depot_lat, depot_lon), PASAR_INDUK,
+                {k: VEHICLES[k] for k in armada_plan} or VEHICLES,
+                harga_bbm=harga_bbm, biaya_sopir=biaya_sopir, biaya_tol=biaya_tol,
+                market=None if tujuan_plan.startswith("Otomatis") else tujuan_plan,
+            )
+        except (ValueError, KeyError) as e:
+            st.error(f"Gagal menyusun rencana: {e}")
+
+    plan = st.session_state.get('fleet_plan')
+    if plan:
+        summ = plan['summary']
+        c_p1, c_p2, c_p3, c_p4 = st.columns(4)
+        c_p1.metric("Jumlah Truk", summ['trucks'], f"{summ['pickups']} pickup")
+        c_p2.metric("Total Jarak", f"{summ['total_km']:,.0f} km")
+        c_p3.metric("Biaya + Susut", f"Rp {summ['biaya_total'] + summ['nilai_susut']:,.0f}")
+        c_p4.metric("HPP Logistik Real", f"Rp {summ['hpp_per_kg']:,.0f}/kg")
+
+        st.dataframe(plan['routes'][["route_id", "pasar", "armada", "jumlah_pickup", "muatan_kg", "utilisasi_pct",
+                                     "jarak_km", "biaya_total", "susut_kg", "nilai_susut", "hpp_per_kg"]]
+                     .style.format({"muatan_kg": "{:,.0f}", "utilisasi_pct": "{:.0f}%", "jarak_km": "{:,.1f}",
+                                    "biaya_total": "Rp {:,.0f}", "susut_kg": "{:,.1f}", "nilai_susut": "Rp {:,.0f}",
+                                    "hpp_per_kg": "Rp {:,.0f}"}),
+                     use_container_width=True, hide_index=True)
+
+        fig_routes = go.Figure()
+        for rid, stops in plan['stops'].groupby("route_id"):
+            route = plan['routes'].set_index("route_id").loc[rid]
+            pasar = PASAR_INDUK[route['pasar']]
+            fig_routes.add_trace(go.Scattermap(
+                lat=[depot_lat, *stops['lat'], pasar['lat']], lon=[depot_lon, *stops['lon'], pasar['lon']],
+                mode="lines+markers", name=f"Truk {rid} ({route['armada']})",
+                text=["Gudang", *stops['id'], route['pasar']],
+            ))
+        fig_routes.update_layout(map_style="open-street-map", map_zoom=8,
+                                 map_center={"lat": depot_lat, "lon": depot_lon},
+                                 height=500, margin=dict(l=0, r=0, t=0, b=0))
+        st.plotly_chart(fig_routes, use_container_width=True)
+
+        with st.expander("📋 Detail Urutan Jemput per Truk"):
+            st.dataframe(plan['stops'], use_container_width=True, hide_index=True)
+
 # --- TAB 2: MARGIN ANALYSIS ---
 with tab2:
     st.markdown("### 💰 Analisis & Distribusi Margin")
@@ -339,12 +396,21 @@ with tab4:
     st.markdown("### 🔗 Blockchain Supply Chain Ledger (Simulation)")
     st.info("Catatan transaksi yang tidak dapat diubah (Immutable) untuk menjamin transparansi.")
     
-    import hashlib
     import qrcode
     from io import BytesIO
-    
-    def generate_hash(text):
-        return hashlib.sha256(text.encode()).hexdigest()
+    from services.ledger_service import SupplyLedger
+
+    @st.cache_resource
+    def get_ledger():
+        ledger = SupplyLedger()
+        if ledger.count() == 0:
+            ledger.append_many([
+                {"actor": "🚜 Petani (Pemanenan)", "timestamp": "2025-12-18 06:00", "action": "Validasi Panen: 500kg Cabai Red Beauty"},
+                {"actor": "🚛 Pengepul (Sortir)", "timestamp": "2025-12-18 10:00", "action": "Quality Control: Lulus Seleksi Grade A"}
+            ])
+        return ledger
+
+    ledger = get_ledger()
 
     # SECTION 1: FORM HANDOVER
     st.subheader("📝 Form Serah Terima (Proof of Handover)")
@@ -361,25 +427,17 @@ with tab4:
         
         submit_handover = st.form_submit_button("✅ Konfirmasi Serah Terima (Simpan ke Ledger)")
 
-    # Simulated Ledger Storage in Session State
-    if 'ledger_db' not in st.session_state:
-        st.session_state['ledger_db'] = [
-            {"actor": "🚜 Petani (Pemanenan)", "timestamp": "2025-12-18 06:00", "action": "Validasi Panen: 500kg Cabai Red Beauty"},
-            {"actor": "🚛 Pengepul (Sortir)", "timestamp": "2025-12-18 10:00", "action": "Quality Control: Lulus Seleksi Grade A"}
-        ]
-
     if submit_handover:
-        new_entry = {
-            "actor": f"🚛 Handover: {farmer_id}",
-            "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
-            "action": f"Serah Terima: {berat_kg}kg {komoditas_name} ({grade_produk}) di {lokasi_serah}"
-        }
-        st.session_state['ledger_db'].append(new_entry)
-        st.success(f"Transaksi untuk {farmer_id} berhasil dicatat ke dalam Ledger!")
+        new_entry = ledger.append(
+            actor=f"🚛 Handover: {farmer_id}",
+            action=f"Serah Terima: {berat_kg}kg {komoditas_name} ({grade_produk}) di {lokasi_serah}",
+            timestamp=datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+        )
+        st.success(f"Transaksi untuk {farmer_id} berhasil dicatat ke dalam Ledger! (Blok #{new_entry['seq']})")
 
         # GENERATE QR PASSPORT
         st.markdown("### 🎫 QR Passport (Digital Certificate)")
-        qr_data = f"AgriSensa Traceability\nID: {farmer_id}\nItem: {komoditas_name}\nBerat: {berat_kg}kg\nGrade: {grade_produk}\nHash: {generate_hash(str(new_entry))[:16]}"
+        qr_data = f"AgriSensa Traceability\nID: {farmer_id}\nItem: {komoditas_name}\nBerat: {berat_kg}kg\nGrade: {grade_produk}\nHash: {new_entry['hash'][:16]}"
         
         qr = qrcode.QRCode(version=1, box_size=10, border=4)
         qr.add_data(qr_data)
@@ -398,32 +456,50 @@ with tab4:
                 <h4 style='margin:0;'>🎫 AgriPass Verified</h4>
                 <p style='margin:5px 0; font-size: 0.9em;'>Produk ini telah melalui verifikasi serah terima digital.</p>
                 <hr/>
-                <p style='margin:5px 0;'><b>Komoditas:</b> {komoditas_name}</p>
+                <p style='margin:5px 0;'><b>Komoditas:</b> {html.escape(komoditas_name)}</p>
                 <p style='margin:5px 0;'><b>Berat:</b> {berat_kg} kg</p>
                 <p style='margin:5px 0;'><b>Grade:</b> {grade_produk}</p>
-                <p style='margin:5px 0; font-size: 0.7em; color: gray;'>Immutable Hash: {generate_hash(str(new_entry))}</p>
+                <p style='margin:5px 0; font-size: 0.7em; color: gray;'>Immutable Hash: {new_entry['hash']}</p>
             </div>
             """, unsafe_allow_html=True)
 
     st.divider()
     st.markdown("#### 📜 Riwayat Ledger (Blockchain Timeline)")
-    
-    prev_hash = "00000000000000000000000000000000"
-    
-    for i, item in enumerate(st.session_state['ledger_db']):
-        curr_text = f"{item['actor']}{item['timestamp']}{item['action']}{prev_hash}"
-        curr_hash = generate_hash(curr_text)
-        
+
+    total_entries = ledger.count()
+    page_size = 20
+    n_pages = max(1, -(-total_entries // page_size))
+
+    c_l1, c_l2, c_l3 = st.columns(3)
+    c_l1.metric("Total Blok", f"{total_entries:,}")
+    c_l2.metric("Checkpoint Merkle", len(ledger.checkpoints()))
+    with c_l3:
+        timeline_page = st.number_input(f"Halaman (dari {n_pages})", 1, n_pages, 1)
+
+    with st.expander("🛡️ Verifikasi Integritas Ledger"):
+        st.caption("Cek cepat memvalidasi jangkar checkpoint dan blok setelah checkpoint terakhir. "
+                   "Audit penuh menghitung ulang seluruh rantai dan akar Merkle tiap segmen.")
+        c_v1, c_v2 = st.columns(2)
+        run_quick = c_v1.button("⚡ Cek Cepat")
+        run_full = c_v2.button("🔍 Audit Penuh")
+        if run_quick or run_full:
+            result = ledger.verify(full=run_full)
+            if result['ok']:
+                st.success(f"✅ Ledger utuh — {result['checked']:,} blok dihitung ulang, {result['checkpoints']} checkpoint valid.")
+            else:
+                st.error(f"❌ Rantai rusak mulai blok #{result['first_bad_seq']}")
+
+    for item in ledger.timeline(page=timeline_page, page_size=page_size):
         with st.container():
             st.markdown(f"""
             <div style='border-left: 5px solid #10b981; padding: 10px; background: #f0fdf4; margin-bottom: 10px;'>
-                <p style='margin:0; font-weight:bold; color:#065f46;'>{item['actor']}</p>
-                <p style='margin:0; font-size:0.8em; color:gray;'>{item['timestamp']}</p>
-                <p style='margin:5px 0;'>{item['action']}</p>
-                <code style='font-size:0.7em;'>Hash: {curr_hash[:32]}...</code>
+                <p style='margin:0; font-weight:bold; color:#065f46;'>#{item['seq']} · {html.escape(str(item['actor']))}</p>
+                <p style='margin:0; font-size:0.8em; color:gray;'>{html.escape(str(item['timestamp']))}</p>
+                <p style='margin:5px 0;'>{html.escape(str(item['action']))}</p>
+                <code style='font-size:0.7em;'>Hash: {item['hash'][:32]}...</code><br/>
+                <code style='font-size:0.7em; color:gray;'>Prev: {item['prev_hash'][:32]}...</code>
             </div>
             """, unsafe_allow_html=True)
-            prev_hash = curr_hash
 
     # Logic for manual simulated transactions removed in favor of the form
 
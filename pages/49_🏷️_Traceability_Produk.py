@@ -2,8 +2,6 @@
 import streamlit as st
 import pandas as pd
 import datetime
-import qrcode
-from PIL import Image, ImageDraw, ImageFont
 import io
 import base64
 
@@ -69,412 +67,18 @@ if 'batch_data' not in st.session_state:
     st.session_state['batch_data'] = {}
 
 # ===== HELPER FUNCTIONS =====
+from services.label_render_service import (
+    build_qr_url, labels_pdf_bytes, labels_per_sheet, make_qr, pil_to_pdf_bytes, render_label, render_qr_only,
+)
+from services.batch_registry_service import BatchRegistry
+
+
+@st.cache_resource
+def get_batch_registry():
+    return BatchRegistry()
 
-def generate_printable_label(data, size="medium", qr_img=None):
-    """
-    Generate print-ready label image with MODERN PREMIUM layout
-    Args:
-        data: batch data dictionary
-        size: "small" (5x5cm), "medium" (10x10cm), "large" (15x10cm)
-        qr_img: PIL Image of QR code
-    Returns:
-        PIL Image object
-    """
-    # Size mapping at 300 DPI for print quality
-    # Format: (width, height)
-    sizes = {
-        # Square/Portrait formats
-        "small": (590, 590),          # 5x5 cm
-        "medium": (1181, 1181),       # 10x10 cm
-        "large": (1772, 1181),        # 15x10 cm
-        
-        # Landscape formats (RECOMMENDED for products)
-        "small_landscape": (1181, 590),      # 10x5 cm - compact
-        "medium_landscape": (1772, 1181),    # 15x10 cm - standard
-        "large_landscape": (2362, 1181),     # 20x10 cm - premium
-    }
-    
-    width, height = sizes[size]
-    is_landscape = "landscape" in size
-    is_small = size == "small"  # Special handling for 5x5 cm
-    
-    # Create blank canvas with gradient background
-    label = Image.new('RGB', (width, height), 'white')
-    draw = ImageDraw.Draw(label)
-    
-    # === MODERN GRADIENT BACKGROUND ===
-    # Create subtle gradient from light teal to white
-    for i in range(height):
-        # Gradient from top (light teal) to bottom (white)
-        ratio = i / height
-        r = int(240 + (255 - 240) * ratio)
-        g = int(253 + (255 - 253) * ratio)
-        b = int(250 + (255 - 250) * ratio)
-        draw.rectangle([(0, i), (width, i+1)], fill=(r, g, b))
-    
-    # === ADAPTIVE FONT SIZES based on label size ===
-    try:
-        if is_small:
-            # Smaller, more compact fonts for 5x5 cm
-            font_brand = ImageFont.truetype("arialbd.ttf", 22)      # Brand/header
-            font_title = ImageFont.truetype("arialbd.ttf", 48)      # Product name (bold)
-            font_subtitle = ImageFont.truetype("arialbd.ttf", 32)   # Varietas (bold for emphasis)
-            font_body = ImageFont.truetype("arial.ttf", 26)         # Body text
-            font_small = ImageFont.truetype("arial.ttf", 22)        # Small text
-            font_tiny = ImageFont.truetype("arial.ttf", 18)         # Tiny text
-        else:
-            # Standard fonts for larger labels
-            font_brand = ImageFont.truetype("arialbd.ttf", 45)      # Brand/header
-            font_title = ImageFont.truetype("arialbd.ttf", 70)      # Product name (bold)
-            font_subtitle = ImageFont.truetype("arial.ttf", 42)     # Varietas
-            font_body = ImageFont.truetype("arial.ttf", 38)         # Body text
-            font_small = ImageFont.truetype("arial.ttf", 32)        # Small text
-            font_tiny = ImageFont.truetype("arial.ttf", 28)         # Tiny text
-    except:
-        font_brand = ImageFont.load_default()
-        font_title = ImageFont.load_default()
-        font_subtitle = ImageFont.load_default()
-        font_body = ImageFont.load_default()
-        font_small = ImageFont.load_default()
-        font_tiny = ImageFont.load_default()
-    
-    # === MODERN COLOR PALETTE ===
-    color_primary = (16, 185, 129)      # Emerald-500
-    color_primary_dark = (5, 150, 105)  # Emerald-600
-    color_accent = (251, 191, 36)       # Amber-400
-    color_text = (31, 41, 55)           # Gray-800
-    color_text_light = (107, 114, 128)  # Gray-500
-    color_white = (255, 255, 255)
-    color_badge_organic = (34, 197, 94)     # Green-500
-    color_badge_halal = (59, 130, 246)      # Blue-500
-    color_badge_premium = (168, 85, 247)    # Purple-500
-    
-    # Adaptive margins and spacing
-    margin = 25 if is_small else 50
-    
-    # === HEADER CARD (Top Banner) ===
-    header_height = 50 if is_small else 100
-    # Draw header with gradient
-    for i in range(header_height):
-        ratio = i / header_height
-        r = int(16 + (5 - 16) * ratio)
-        g = int(185 + (150 - 185) * ratio)
-        b = int(129 + (105 - 129) * ratio)
-        draw.rectangle([(0, i), (width, i+1)], fill=(r, g, b))
-    
-    # AgriSensa branding in header
-    header_text_y = 15 if is_small else 30
-    draw.text((margin, header_text_y), "🌾 AgriSensa", fill=color_white, font=font_brand)
-    
-    # === MAIN CONTENT CARD ===
-    card_top = header_height + (10 if is_small else 20)
-    card_margin = 15 if is_small else 30
-    
-    # White card with shadow effect (multiple rectangles for shadow)
-    shadow_offset = 4 if is_small else 8
-    for i in range(shadow_offset, 0, -1):
-        alpha = int(20 * (shadow_offset - i) / shadow_offset)
-        shadow_color = (200 - alpha, 200 - alpha, 200 - alpha)
-        draw.rounded_rectangle(
-            [(card_margin + i, card_top + i), (width - card_margin + i, height - (15 if is_small else 30) + i)],
-            radius=15 if is_small else 25,
-            fill=shadow_color
-        )
-    
-    # Main white card
-    draw.rounded_rectangle(
-        [(card_margin, card_top), (width - card_margin, height - (15 if is_small else 30))],
-        radius=15 if is_small else 25,
-        fill=color_white,
-        outline=color_primary,
-        width=2 if is_small else 3
-    )
-    
-    # === LAYOUT: QR CODE + INFO ===
-    content_x = card_margin + (20 if is_small else 40)
-    content_y = card_top + (20 if is_small else 40)
-    
-    if qr_img:
-        # QR Code with rounded corners effect
-        # Adjust QR size based on label size and orientation
-        if is_small:
-            qr_size = 180  # Smaller QR for 5x5 cm
-        elif is_landscape:
-            qr_size = min(280, height - card_top - 100)  # Fit within height
-        else:
-            qr_size = 280 if "large" in size else 240
-        
-        qr_resized = qr_img.resize((qr_size, qr_size))
-        
-        # QR background card
-        qr_bg_padding = 8 if is_small else 15
-        draw.rounded_rectangle(
-            [(content_x - qr_bg_padding, content_y - qr_bg_padding),
-             (content_x + qr_size + qr_bg_padding, content_y + qr_size + qr_bg_padding)],
-            radius=12 if is_small else 20,
-            fill=(248, 250, 252),  # Light gray background
-            outline=color_primary,
-            width=2
-        )
-        
-        label.paste(qr_resized, (content_x, content_y))
-        
-        # "Scan Me" text below QR (skip for very small labels)
-        if not is_small:
-            scan_text_y = content_y + qr_size + 10
-            draw.text((content_x + qr_size//2 - 50, scan_text_y), "📱 Scan Me", 
-                     fill=color_primary_dark, font=font_small)
-        else:
-            scan_text_y = content_y + qr_size + 5
-        
-        # For landscape: always put text to the right of QR
-        # For square/portrait: text below QR
-        if is_landscape:
-            text_x = content_x + qr_size + 50
-            text_y = content_y
-        else:
-            # Original logic for square labels
-            if "large" in size and not is_landscape:
-                text_x = content_x + qr_size + 50
-                text_y = content_y
-            else:
-                text_x = content_x
-                text_y = scan_text_y + (30 if is_small else 60)
-    else:
-        text_x = content_x
-        text_y = content_y
-    
-    # === PRODUCT INFO (ADAPTIVE CONTENT) ===
-    # Product Name (Bold, Large)
-    product_name = data['produk'][:20] if is_small else (data['produk'][:28] if len(data['produk']) > 28 else data['produk'])
-    draw.text((text_x, text_y), product_name, fill=color_text, font=font_title)
-    text_y += 55 if is_small else 85
-    
-    # Varietas with accent color
-    varietas_text = data['varietas'][:22] if is_small else data['varietas'][:32]
-    draw.text((text_x, text_y), varietas_text, fill=color_primary_dark, font=font_subtitle)
-    text_y += 38 if is_small else 55
-    
-    # Divider line
-    divider_width = 180 if is_small else 300
-    draw.rectangle([(text_x, text_y), (text_x + divider_width, text_y + 2)], fill=color_primary)
-    text_y += 12 if is_small else 20
-    
-    # === CONDITIONAL CONTENT based on size ===
-    if is_small:
-        # For 5x5 cm: Show only ESSENTIAL info with larger spacing
-        
-        # Price (PRIORITY for small labels)
-        if data.get('harga'):
-            price_card_y = text_y
-            draw.rounded_rectangle(
-                [(text_x, price_card_y), (text_x + 200, price_card_y + 42)],
-                radius=10,
-                fill=color_accent,
-                outline=None
-            )
-            draw.text((text_x + 10, price_card_y + 8), f"💰 Rp {data['harga']:,}/kg", 
-                     fill=color_text, font=font_subtitle)
-            text_y += 50
-        
-        # Date (compact)
-        draw.text((text_x, text_y), f"📅 {data['tgl']}", fill=color_text_light, font=font_small)
-        text_y += 28
-        
-        # Location only (skip farmer name to save space)
-        location_short = data['lokasi'][:18] if len(data['lokasi']) > 18 else data['lokasi']
-        draw.text((text_x, text_y), f"📍 {location_short}", fill=color_text, font=font_small)
-        text_y += 35
-        
-        # Quality badges (compact, max 2)
-        if data.get('klaim'):
-            badge_colors = {
-                'Organik': color_badge_organic,
-                'Halal': color_badge_halal,
-                'Premium': color_badge_premium
-            }
-            
-            badge_x = text_x
-            for badge in data['klaim'][:2]:  # Max 2 badges for small labels
-                badge_color = badge_colors.get(badge, color_primary)
-                badge_width = 90
-                
-                # Compact badge
-                draw.rounded_rectangle(
-                    [(badge_x, text_y), (badge_x + badge_width, text_y + 28)],
-                    radius=14,
-                    fill=badge_color,
-                    outline=None
-                )
-                draw.text((badge_x + 10, text_y + 5), f"✓ {badge[:3]}", fill=color_white, font=font_tiny)
-                badge_x += badge_width + 8
-    else:
-        # For larger labels: Show ALL information
-        
-        # Date with icon
-        draw.text((text_x, text_y), f"📅 {data['tgl']}", fill=color_text_light, font=font_body)
-        text_y += 50
-        
-        # Farmer info
-        draw.text((text_x, text_y), f"👨‍🌾 {data['petani'][:28]}", fill=color_text, font=font_body)
-        text_y += 45
-        
-        # Location
-        draw.text((text_x, text_y), f"📍 {data['lokasi'][:30]}", fill=color_text, font=font_body)
-        text_y += 55
-        
-        # Price (if available) - HIGHLIGHTED
-        if data.get('harga'):
-            # Price card
-            price_card_y = text_y
-            draw.rounded_rectangle(
-                [(text_x, price_card_y), (text_x + 350, price_card_y + 55)],
-                radius=12,
-                fill=color_accent,
-                outline=None
-            )
-            draw.text((text_x + 15, price_card_y + 12), f"💰 Rp {data['harga']:,}/kg", 
-                     fill=color_text, font=font_subtitle)
-            text_y += 70
-        
-        # Contact (if available)
-        if data.get('kontak'):
-            draw.text((text_x, text_y), f"📞 {data['kontak']}", fill=color_text, font=font_body)
-            text_y += 55
-        
-        # === QUALITY BADGES (Modern Pills) ===
-        if data.get('klaim'):
-            text_y += 10
-            badge_colors = {
-                'Organik': color_badge_organic,
-                'Halal': color_badge_halal,
-                'Premium': color_badge_premium
-            }
-            
-            badge_x = text_x
-            for badge in data['klaim']:
-                badge_color = badge_colors.get(badge, color_primary)
-                badge_width = 160
-                
-                # Modern pill-shaped badge with shadow
-                draw.rounded_rectangle(
-                    [(badge_x + 2, text_y + 2), (badge_x + badge_width + 2, text_y + 47)],
-                    radius=25,
-                    fill=(200, 200, 200)  # Shadow
-                )
-                draw.rounded_rectangle(
-                    [(badge_x, text_y), (badge_x + badge_width, text_y + 45)],
-                    radius=25,
-                    fill=badge_color,
-                    outline=None
-                )
-                draw.text((badge_x + 20, text_y + 10), f"✓ {badge}", fill=color_white, font=font_small)
-                badge_x += badge_width + 15
-    
-    # === FOOTER: Batch ID ===
-    footer_y = height - (30 if is_small else 60)
-    footer_id_text = f"ID: {data['id'][-8:]}" if is_small else f"Batch ID: {data['id']}"
-    draw.text((margin + (10 if is_small else 20), footer_y), footer_id_text, 
-             fill=color_text_light, font=font_tiny)
-    
-    # Verification badge (skip for very small labels)
-    if not is_small:
-        verify_text = "✓ Verified Product"
-        draw.text((width - margin - 250, footer_y), verify_text, 
-                 fill=color_primary, font=font_tiny)
-    
-    return label
-
-def generate_qr_only(data, qr_img, size="medium"):
-    """
-    Generate QR code only with minimal branding
-    Args:
-        data: batch data dictionary
-        qr_img: PIL Image of QR code
-        size: "small" (5x5cm), "medium" (8x8cm), "large" (10x10cm)
-    Returns:
-        PIL Image object
-    """
-    # Size mapping for QR-only prints
-    sizes = {
-        "small": (590, 590),      # 5x5 cm
-        "medium": (945, 945),     # 8x8 cm
-        "large": (1181, 1181),    # 10x10 cm
-    }
-    
-    width, height = sizes[size]
-    
-    # Create white canvas
-    label = Image.new('RGB', (width, height), 'white')
-    draw = ImageDraw.Draw(label)
-    
-    # Colors
-    color_primary = (16, 185, 129)
-    color_text = (31, 41, 55)
-    color_white = (255, 255, 255)
-    
-    # Fonts
-    try:
-        if size == "small":
-            font_brand = ImageFont.truetype("arialbd.ttf", 28)
-            font_small = ImageFont.truetype("arial.ttf", 22)
-        elif size == "medium":
-            font_brand = ImageFont.truetype("arialbd.ttf", 36)
-            font_small = ImageFont.truetype("arial.ttf", 28)
-        else:
-            font_brand = ImageFont.truetype("arialbd.ttf", 42)
-            font_small = ImageFont.truetype("arial.ttf", 32)
-    except:
-        font_brand = ImageFont.load_default()
-        font_small = ImageFont.load_default()
-    
-    # Calculate QR size (80% of canvas)
-    qr_size = int(width * 0.7)
-    qr_resized = qr_img.resize((qr_size, qr_size))
-    
-    # Center QR code
-    qr_x = (width - qr_size) // 2
-    qr_y = (height - qr_size) // 2 - 30
-    
-    # Draw subtle border
-    border_padding = 20
-    draw.rounded_rectangle(
-        [(qr_x - border_padding, qr_y - border_padding),
-         (qr_x + qr_size + border_padding, qr_y + qr_size + border_padding)],
-        radius=15,
-        outline=color_primary,
-        width=3
-    )
-    
-    # Paste QR
-    label.paste(qr_resized, (qr_x, qr_y))
-    
-    # Top branding
-    brand_text = "🌾 AgriSensa"
-    bbox = draw.textbbox((0, 0), brand_text, font=font_brand)
-    text_width = bbox[2] - bbox[0]
-    draw.text(((width - text_width) // 2, 30), brand_text, fill=color_primary, font=font_brand)
-    
-    # Bottom text
-    scan_text = "Scan untuk info produk"
-    bbox = draw.textbbox((0, 0), scan_text, font=font_small)
-    text_width = bbox[2] - bbox[0]
-    draw.text(((width - text_width) // 2, qr_y + qr_size + 35), scan_text, fill=color_text, font=font_small)
-    
-    # Batch ID at bottom
-    id_text = f"ID: {data['id']}"
-    bbox = draw.textbbox((0, 0), id_text, font=font_small)
-    text_width = bbox[2] - bbox[0]
-    draw.text(((width - text_width) // 2, height - 50), id_text, fill=color_text, font=font_small)
-    
-    return label
 
-def pil_to_pdf_bytes(pil_image):
-    """Convert PIL Image to PDF bytes"""
-    pdf_buffer = io.BytesIO()
-    pil_image.save(pdf_buffer, format='PDF', resolution=300.0)
-    pdf_buffer.seek(0)
-    return pdf_buffer.getvalue()
+registry = get_batch_registry()
 
 # TABS
 tab1, tab2, tab3 = st.tabs(["📝 Input Data Batch (Produksi)", "🖨️ Cetak Label", "📱 Simulasi Scan Konsumen"])
@@ -563,9 +167,26 @@ with tab1:
                 "riwayat": riwayat_log,
                 "klaim": [k for k, v in [("Organik", is_organik), ("Halal", is_halal), ("Premium", is_premium)] if v]
             }
+            registry.upsert(st.session_state['batch_data'])
             st.success(f"✅ Batch {batch_id} berhasil dibuat!")
             st.info("📌 Silakan ke tab **'🖨️ Cetak Label'** untuk mencetak label produk Anda!")
 
+    with st.expander("📥 Impor Batch Massal (CSV)"):
+        st.caption("Kolom wajib: `id, produk, tgl, petani`. Opsional: `varietas, lokasi, harga, kontak, riwayat, hash, klaim` (klaim dipisah `;`).")
+        batch_csv = st.file_uploader("Upload CSV Batch", type=['csv'], key="registry_csv")
+        if batch_csv is not None and st.button("📥 Impor ke Registry"):
+            prog = st.progress(0.0, text="Mengimpor...")
+            rejected = []
+            try:
+                n_rows = registry.import_csv(batch_csv, rejected=rejected, progress=lambda n, frac: prog.progress(
+                    frac, text="Selesai" if frac >= 1 else f"{n:,} batch diimpor..."))
+                st.success(f"✅ {n_rows:,} batch tersimpan di registry.")
+                if rejected:
+                    st.warning(f"⚠️ {len(rejected):,} baris dilewati karena tanggal tidak valid.")
+                    st.dataframe(pd.DataFrame(rejected).head(100), use_container_width=True, hide_index=True)
+            except ValueError as e:
+                st.error(f"Gagal impor: {e}")
+
 # --- TAB 2: PRINT LABEL ---
 with tab2:
     st.subheader("🖨️ Generator Label Siap Cetak")
@@ -640,37 +261,15 @@ with tab2:
                 st.info("💡 QR Code akan dicetak dengan branding minimal AgriSensa")
         
         # Generate QR Code - NOW USES VERCEL URL!
-        qr = qrcode.QRCode(version=1, box_size=10, border=4)
-        
-        # Build Vercel Product Passport URL
-        import urllib.parse
-        base_url = "https://vercel-scan2.vercel.app/product"
-        params = {
-            'name': data['produk'],
-            'variety': data['varietas'],
-            'farmer': data['petani'],
-            'location': data['lokasi'],
-            'harvest_date': str(data['tgl']),
-            'weight': f"{data.get('berat', 1)} kg",
-            'emoji': '🌾'
-        }
-        if data.get('harga'):
-            params['price'] = str(data['harga'])
-        
-        query_string = urllib.parse.urlencode(params)
-        qr_url = f"{base_url}/{data['id']}?{query_string}"
-        
-        qr.add_data(qr_url)
-        qr.make(fit=True)
-        img_qr = qr.make_image(fill_color="black", back_color="white")
+        qr_url = build_qr_url(data)
+        img_qr = make_qr(qr_url)
 
-        
         # Generate Image based on print type
         if print_type == "label_lengkap":
-            label_image = generate_printable_label(data, label_size, img_qr)
+            label_image = render_label(data, label_size, img_qr)
             filename_prefix = f"Label_{data['id']}_{label_size}"
         else:
-            label_image = generate_qr_only(data, img_qr, qr_size)
+            label_image = render_qr_only(data, img_qr, qr_size)
             filename_prefix = f"QR_{data['id']}_{qr_size}"
         
         # Convert to bytes for display and download
@@ -740,6 +339,52 @@ with tab2:
         
         st.markdown("---")
         st.success("✅ **Label siap cetak!** Gunakan kertas stiker atau print di kertas biasa lalu tempel dengan lem.")
+
+        # Batch printing for packhouses
+        st.markdown("---")
+        st.markdown("### 5️⃣ Cetak Massal (Lembar A4)")
+        batch_kind = print_type
+        batch_size = label_size if print_type == "label_lengkap" else qr_size
+        per_sheet = labels_per_sheet(batch_kind, batch_size)
+        st.caption(f"Label ditata {per_sheet} per lembar A4 dan dirender paralel. Gunakan CSV untuk banyak batch sekaligus.")
+
+        col_bm1, col_bm2 = st.columns(2)
+        with col_bm1:
+            n_copies = st.number_input("Jumlah Label (Nomor Seri Otomatis)", min_value=1, max_value=5000, value=per_sheet * 5, step=per_sheet)
+        with col_bm2:
+            batch_csv = st.file_uploader("Atau Upload CSV Batch (kolom: id, produk, varietas, tgl, petani, lokasi, harga, kontak, klaim)", type=['csv'])
+
+        if st.button("🖨️ Generate PDF Massal", use_container_width=True):
+            if batch_csv is not None:
+                df_batch = pd.read_csv(batch_csv)
+                if 'harga' in df_batch.columns:
+                    harga = pd.to_numeric(df_batch['harga'], errors="coerce")
+                    n_bad_harga = int((harga.isna() & df_batch['harga'].notna()).sum())
+                    if n_bad_harga:
+                        st.warning(f"⚠️ {n_bad_harga} nilai harga tidak valid diabaikan.")
+                    df_batch['harga'] = harga.round().astype("Int64").astype(object)
+                df_batch = df_batch.fillna("")
+                records = []
+                for row in df_batch.to_dict("records"):
+                    rec = {**{k: v for k, v in data.items() if k != 'foto'}, **{k: v for k, v in row.items() if v != ""}}
+                    rec['id'] = str(rec['id'])
+                    rec['harga'] = int(rec['harga']) if rec.get('harga') else None
+                    rec['klaim'] = [k.strip() for k in str(row.get('klaim', '')).split(';') if k.strip()] if 'klaim' in row else data['klaim']
+                    records.append(rec)
+            else:
+                records = [{**{k: v for k, v in data.items() if k != 'foto'}, 'id': f"{data['id']}-{i:04d}"}
+                           for i in range(1, int(n_copies) + 1)]
+
+            # Only the records are kept per session; the PDF is rendered when the download is clicked
+            st.session_state['batch_label_job'] = (records, batch_kind, batch_size)
+
+        if st.session_state.get('batch_label_job'):
+            job_records, job_kind, job_size = st.session_state['batch_label_job']
+            n_pages = -(-len(job_records) // labels_per_sheet(job_kind, job_size))
+            st.success(f"✅ {len(job_records)} label dalam {n_pages} lembar A4 siap dicetak.")
+            st.download_button("📄 Download PDF Massal", lambda: labels_pdf_bytes(job_records, job_kind, job_size),
+                               f"Label_Massal_{data['id']}.pdf", "application/pdf", on_click="ignore",
+                               use_container_width=True)
         
     else:
         st.warning("⚠️ Belum ada data batch. Silakan input data di **Tab 1** terlebih dahulu.")
@@ -748,9 +393,31 @@ with tab2:
 with tab3:
     st.markdown("### 📱 Tampilan di HP Konsumen")
     st.info("Ini yang dilihat pembeli saat men-scan QR Code Anda.")
-    
-    if st.session_state['batch_data']:
-        data = st.session_state['batch_data']
+
+    c_scan1, c_scan2 = st.columns([3, 1])
+    with c_scan1:
+        scan_input = st.text_input("🔍 Scan QR / Masukkan Batch ID",
+                                   st.session_state['batch_data'].get('id', ''),
+                                   help="Tempel URL hasil scan QR atau ketik Batch ID")
+    with c_scan2:
+        st.metric("Batch Terdaftar", f"{registry.count():,}")
+
+    data = registry.get(scan_input) if scan_input else None
+    if data is None and scan_input:
+        st.error(f"❌ Batch `{scan_input}` tidak ditemukan di registry.")
+
+    with st.expander("🗂️ Cari Batch di Registry"):
+        c_f1, c_f2, c_f3 = st.columns(3)
+        f_petani = c_f1.selectbox("Petani", ["Semua"] + registry.distinct("petani"))
+        f_produk = c_f2.selectbox("Komoditas", ["Semua"] + registry.distinct("produk"))
+        f_dari = c_f3.date_input("Panen Sejak", datetime.date.today() - datetime.timedelta(days=365))
+        st.dataframe(registry.search(
+            date_from=f_dari,
+            petani=None if f_petani == "Semua" else f_petani,
+            produk=None if f_produk == "Semua" else f_produk,
+        ), use_container_width=True, hide_index=True)
+
+    if data:
         
         # Simulation of Mobile View (Narrow container)
         c_mob1, c_mob2, c_mob3 = st.columns([1.5, 2, 1.5])
@@ -782,7 +449,7 @@ with tab3:
             
             # Add photo if available
             if data.get('foto'):
-                foto_base64 = base64.b64encode(data['foto'].getvalue()).decode()
+                foto_base64 = base64.b64encode(data['foto']).decode()
                 html_content += f"""
     <div style='text-align:center; margin:15px 0;'>
         <img src='data:image/png;base64,{foto_base64}' style='max-width:100%; border-radius:10px;'>
@@ -867,7 +534,7 @@ with tab3:
             st.components.v1.html(html_content, height=700, scrolling=True)
             
     else:
-        st.warning("⚠️ Belum ada data batch yang dibuat. Silakan input di Tab 1 dulu.")
+        st.warning("⚠️ Belum ada data batch. Silakan input di Tab 1 atau scan Batch ID yang terdaftar.")
 
 # Footer
 st.markdown("---")
@@ -1,7 +1,8 @@
 
 import streamlit as st
-import folium
-from streamlit_folium import st_folium
+from utils.lazy_imports import lazy_attr, lazy_import
+folium = lazy_import("folium")
+st_folium = lazy_attr("streamlit_folium", "st_folium")
 import numpy as np
 import time
 import random
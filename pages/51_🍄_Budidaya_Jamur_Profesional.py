@@ -3,12 +3,14 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
-import folium
-from streamlit_folium import st_folium
+from utils.lazy_imports import lazy_attr, lazy_import
+folium = lazy_import("folium")
+st_folium = lazy_attr("streamlit_folium", "st_folium")
 import requests
 
 # Page Config
 from utils.auth import require_auth, show_user_info_sidebar
+from services.reference_data_service import get_reference
 
 st.set_page_config(
     page_title="Budidaya Jamur Profesional",
@@ -99,108 +101,7 @@ st.markdown("""
 st.markdown('<div class="main-header"><h1>🍄 AgriSensa Mushroom Cultivation Pro</h1><p>Panduan Budidaya 5 Jenis Jamur Komersial Berbasis Riset Ilmiah</p></div>', unsafe_allow_html=True)
 
 # MUSHROOM DATABASE
-MUSHROOM_DATA = {
-    "Jamur Tiram (Pleurotus)": {
-        "emoji": "🍄",
-        "latin": "Pleurotus ostreatus / P. florida",
-        "difficulty": "⭐⭐☆☆☆",
-        "difficulty_text": "Mudah - Cocok Pemula",
-        "temp_mycelium": (25, 30, 28),
-        "temp_fruiting": (15, 28, 22),
-        "humidity_mycelium": (70, 75),
-        "humidity_fruiting": (85, 95),
-        "light_lux": (500, 1000),
-        "light_hours": (8, 12),
-        "co2_ppm": 1000,
-        "timeline_days": (45, 60),
-        "be_percent": (80, 120),
-        "price_min": 25000,
-        "price_max": 35000,
-        "substrate": "Serbuk gergaji + bekatul (20:1) + kapur 2%",
-        "special_req": "Tidak ada - paling mudah",
-        "description": "Jamur paling populer untuk pemula. Tumbuh cepat, toleran terhadap variasi suhu, dan mudah dipasarkan."
-    },
-    "Jamur Kuping (Auricularia)": {
-        "emoji": "🍂",
-        "latin": "Auricularia auricula-judae / A. polytricha",
-        "difficulty": "⭐⭐☆☆☆",
-        "difficulty_text": "Mudah - Tahan Panas",
-        "temp_mycelium": (22, 30, 25),
-        "temp_fruiting": (15, 28, 22),
-        "humidity_mycelium": (80, 90),
-        "humidity_fruiting": (85, 95),
-        "light_lux": (20, 50),
-        "light_hours": (8, 10),
-        "co2_ppm": 1000,
-        "timeline_days": (60, 90),
-        "be_percent": (60, 100),
-        "price_min": 30000,
-        "price_max": 40000,
-        "substrate": "Serbuk gergaji + bekatul (C/N 20:1 miselium, 30-40:1 fruiting)",
-        "special_req": "pH substrat 5.0-7.0",
-        "description": "Cocok untuk dataran rendah dan daerah panas. Tekstur kenyal, populer untuk masakan Asia."
-    },
-    "Jamur Shiitake (Lentinus)": {
-        "emoji": "🍄",
-        "latin": "Lentinus edodes",
-        "difficulty": "⭐⭐⭐☆☆",
-        "difficulty_text": "Menengah - Premium Quality",
-        "temp_mycelium": (20, 25, 22),
-        "temp_fruiting": (10, 18, 14),
-        "humidity_mycelium": (70, 80),
-        "humidity_fruiting": (85, 95),
-        "light_lux": (200, 500),
-        "light_hours": (10, 12),
-        "co2_ppm": 1000,
-        "timeline_days": (90, 180),
-        "be_percent": (50, 80),
-        "price_min": 80000,
-        "price_max": 150000,
-        "substrate": "Kayu keras (oak/beech) atau serbuk gergaji + suplemen",
-        "special_req": "BUTUH COLD SHOCK (48-72 jam dari 25°C ke 10°C)",
-        "description": "Jamur premium dengan harga tinggi. Butuh kesabaran dan kontrol suhu ketat, tapi sangat menguntungkan."
-    },
-    "Jamur Kancing (Agaricus)": {
-        "emoji": "🔘",
-        "latin": "Agaricus bisporus",
-        "difficulty": "⭐⭐⭐⭐☆",
-        "difficulty_text": "Sulit - Butuh Casing Layer",
-        "temp_mycelium": (22, 28, 24),
-        "temp_fruiting": (12, 20, 16),
-        "humidity_mycelium": (80, 90),
-        "humidity_fruiting": (85, 95),
-        "light_lux": (0, 50),
-        "light_hours": (0, 0),
-        "co2_ppm": 2000,
-        "timeline_days": (60, 90),
-        "be_percent": (60, 100),
-        "price_min": 40000,
-        "price_max": 60000,
-        "substrate": "Kompos khusus (manure + jerami) + CASING LAYER (tanah steril 3-4cm)",
-        "special_req": "WAJIB casing layer, kompos khusus, pasteurisasi",
-        "description": "Teknis dan rumit. Butuh kompos khusus dan casing layer. Cocok untuk yang sudah berpengalaman."
-    },
-    "Jamur Enoki (Flammulina)": {
-        "emoji": "🍜",
-        "latin": "Flammulina velutipes",
-        "difficulty": "⭐⭐⭐⭐⭐",
-        "difficulty_text": "Sangat Sulit - Butuh Cold Room",
-        "temp_mycelium": (22, 26, 24),
-        "temp_fruiting": (3, 16, 10),
-        "humidity_mycelium": (85, 95),
-        "humidity_fruiting": (85, 95),
-        "light_lux": (0, 20),
-        "light_hours": (0, 2),
-        "co2_ppm": 5000,
-        "timeline_days": (45, 70),
-        "be_percent": (70, 100),
-        "price_min": 50000,
-        "price_max": 80000,
-        "substrate": "Serbuk gergaji + bekatul + suplemen",
-        "special_req": "WAJIB COLD ROOM (3-16°C), CO2 tinggi untuk batang panjang",
-        "description": "Paling sulit! Butuh investasi cold room/AC 24/7. Batang putih panjang hanya muncul di suhu sangat dingin."
-    }
-}
+MUSHROOM_DATA = get_reference("mushroom_data")
 
 # TABS
 tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab_extra, tab_commercial = st.tabs([
@@ -7,6 +7,7 @@ import plotly.graph_objects as go
 from datetime import datetime
 
 from utils.auth import require_auth, show_user_info_sidebar
+from services.fertilizer_blend_service import BlendOptimizer, products_from_db
 
 st.set_page_config(page_title="Konversi & Logistik Pupuk", page_icon="🔄", layout="wide")
 
@@ -119,6 +120,64 @@ def main():
             fig.update_layout(title="Perbandingan Berat Pupuk ke Target Hara", height=400)
             st.plotly_chart(fig, use_container_width=True)
 
+        # --- LEAST-COST BLEND (N, P, K SEKALIGUS) ---
+        st.divider()
+        st.subheader("🧪 Campuran Termurah (Optimasi N-P-K Sekaligus)")
+        st.caption("Mencari kombinasi pupuk dengan biaya terendah yang memenuhi semua target hara, dalam karung utuh 50 kg.")
+        optimizer = BlendOptimizer(products_from_db(custom_db))
+        buffer_mult = 1 + global_buffer / 100
+
+        col_o1, col_o2 = st.columns([1, 2])
+        with col_o1:
+            organic_share = st.slider("Porsi Minimal Hara dari Organik (%)", 0, 80, 0, step=5) / 100
+        with col_o2:
+            stock_df = st.data_editor(
+                pd.DataFrame({"Pupuk": optimizer.names, "Stok (kg)": pd.Series([None] * len(optimizer.names), dtype=float)}),
+                column_config={"Stok (kg)": st.column_config.NumberColumn(min_value=0, help="Kosongkan = tidak terbatas")},
+                disabled=["Pupuk"], hide_index=True, use_container_width=True, height=200, key="blend_stock")
+        stock = {r["Pupuk"]: r["Stok (kg)"] for _, r in stock_df.iterrows() if pd.notna(r["Stok (kg)"])}
+
+        blend = optimizer.solve({"N": req_n * buffer_mult, "P": req_p * buffer_mult, "K": req_k * buffer_mult},
+                                organic_share=organic_share, stock=stock)
+        if blend["status"] != "ok":
+            st.error(f"❌ {blend['message']}")
+        elif blend["plan"].empty:
+            st.info("Target hara nol — tidak perlu pupuk.")
+        else:
+            c1, c2, c3 = st.columns(3)
+            with c1: st.metric("Total Biaya Campuran", f"Rp {blend['cost']:,.0f}")
+            with c2: st.metric("Total Karung", f"{int(blend['plan']['Karung (50kg)'].sum())}")
+            with c3: st.metric("Hara Terpenuhi (N-P-K)", " / ".join(f"{blend['supplied'][n]:.0f}" for n in ("N", "P", "K")))
+            st.dataframe(blend["plan"].style.format({"Biaya (Rp)": "Rp {:,.0f}"}), use_container_width=True, hide_index=True)
+
+        with st.expander("📋 Rencana Pengadaan Musim (Banyak Lahan Sekaligus)"):
+            st.caption("Upload CSV berkolom **Lahan, N, P, K** (kg per lahan). Stok dan porsi organik di atas berlaku untuk seluruh rencana.")
+            season_file = st.file_uploader("CSV Target Lahan", type=["csv"], key="blend_csv")
+            if season_file is not None:
+                fields_df = pd.read_csv(season_file)
+                missing = [c for c in ("N", "P", "K") if c not in fields_df.columns]
+                if missing:
+                    st.error(f"Kolom wajib tidak ada: {', '.join(missing)}")
+                else:
+                    plan = optimizer.optimize(fields_df[["N", "P", "K"]].fillna(0) * buffer_mult,
+                                              organic_share=organic_share, stock=stock)
+                    if plan["status"] != "ok":
+                        st.error(f"❌ {plan['message']}")
+                    else:
+                        sacks = plan["sacks"][plan["sacks"] > 0]
+                        c1, c2, c3 = st.columns(3)
+                        with c1: st.metric("Jumlah Lahan", f"{len(fields_df):,}")
+                        with c2: st.metric("Total Biaya Pengadaan", f"Rp {plan['cost']:,.0f}")
+                        with c3: st.metric("Total Karung", f"{int(sacks.sum()):,}")
+                        if not plan["exact"]:
+                            st.caption(f"Batas bawah biaya (LP): Rp {plan['lower_bound']:,.0f} — selisih maks. 1 karung per produk.")
+                        st.dataframe(pd.DataFrame({"Pupuk": sacks.index, "Karung (50kg)": sacks.to_numpy(),
+                                                   "Berat (kg)": sacks.to_numpy() * 50}), use_container_width=True, hide_index=True)
+                        alloc = pd.concat([fields_df.reset_index(drop=True), plan["fields"].round(1).loc[:, plan["sacks"] > 0]], axis=1)
+                        st.dataframe(alloc.head(1000), use_container_width=True, hide_index=True)
+                        st.download_button("📥 Download Alokasi per Lahan (CSV)", alloc.to_csv(index=False).encode("utf-8"),
+                                           "alokasi_pupuk_musim.csv", "text/csv")
+
     elif menu == "🚚 Logistik & Armada":
         st.subheader("🚚 Perencanaan Logistik")
         col_l, col_r = st.columns(2)
@@ -7,8 +7,9 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestRegressor
+from utils.lazy_imports import lazy_attr
+LinearRegression = lazy_attr("sklearn.linear_model", "LinearRegression")
+RandomForestRegressor = lazy_attr("sklearn.ensemble", "RandomForestRegressor")
 
 # Import Services
 import sys
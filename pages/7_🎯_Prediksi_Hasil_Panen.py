@@ -5,8 +5,9 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
+from utils.lazy_imports import lazy_attr
+RandomForestRegressor = lazy_attr("sklearn.ensemble", "RandomForestRegressor")
+StandardScaler = lazy_attr("sklearn.preprocessing", "StandardScaler")
 import json
 
 from utils.auth import require_auth, show_user_info_sidebar
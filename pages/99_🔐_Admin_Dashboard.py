@@ -8,6 +8,7 @@ import json
 
 # Auth imports 
 from utils.auth import require_auth, show_user_info_sidebar, get_current_user, is_authenticated, get_activity_log, get_users
+from services.admin_store_service import AdminStore
 
 # ========== PAGE CONFIG ==========
 st.set_page_config(
@@ -57,45 +58,54 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# ========== SESSION STATE FOR DATA ==========
-if 'commodities_db' not in st.session_state:
-    st.session_state.commodities_db = [
-        {'id': 1, 'name': 'Beras Premium', 'category': 'Pangan', 'unit': 'kg', 'price': 15000, 'active': True},
-        {'id': 2, 'name': 'Cabai Rawit', 'category': 'Sayuran', 'unit': 'kg', 'price': 80000, 'active': True},
-        {'id': 3, 'name': 'Bawang Merah', 'category': 'Sayuran', 'unit': 'kg', 'price': 45000, 'active': True},
-        {'id': 4, 'name': 'Jagung Pipil', 'category': 'Pangan', 'unit': 'kg', 'price': 8000, 'active': True},
-        {'id': 5, 'name': 'Kedelai', 'category': 'Pangan', 'unit': 'kg', 'price': 12000, 'active': True},
-        {'id': 6, 'name': 'Gula Pasir', 'category': 'Pangan', 'unit': 'kg', 'price': 16000, 'active': True},
-        {'id': 7, 'name': 'Bayam', 'category': 'Sayuran', 'unit': 'ikat', 'price': 5000, 'active': True},
-        {'id': 8, 'name': 'Kangkung', 'category': 'Sayuran', 'unit': 'ikat', 'price': 4000, 'active': True},
-        {'id': 9, 'name': 'Tomat', 'category': 'Sayuran', 'unit': 'kg', 'price': 15000, 'active': True},
-        {'id': 10, 'name': 'Jeruk', 'category': 'Buah', 'unit': 'kg', 'price': 25000, 'active': True},
-    ]
+# ========== SHARED DATA STORE ==========
+@st.cache_resource
+def get_admin_store():
+    return AdminStore()
 
-if 'manual_prices_db' not in st.session_state:
-    st.session_state.manual_prices_db = []
 
-if 'audit_log_db' not in st.session_state:
-    st.session_state.audit_log_db = []
+store = get_admin_store()
+PAGE_SIZE = 50
 
 
 def log_action(action, table, record_id=None, details=""):
     """Log admin action."""
-    st.session_state.audit_log_db.append({
-        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'user': user['username'],
-        'action': action,
-        'table': table,
-        'record_id': record_id,
-        'details': details
-    })
+    store.log_action(user['username'], action, table, record_id, details)
+
+
+def show_paged_table(table, key, filters=None, search=None, sort_columns=("id",), descending=False, formatter=None):
+    """Render one server-side page of a table with sort and page controls. Returns the raw page."""
+    col_s1, col_s2, col_s3 = st.columns([2, 1, 1])
+    with col_s1:
+        sort_by = st.selectbox("Urutkan", list(sort_columns), key=f"{key}_sort")
+    with col_s2:
+        order = st.selectbox("Arah", ["Terbaru/Z-A", "Terlama/A-Z"] if descending else ["Terlama/A-Z", "Terbaru/Z-A"], key=f"{key}_order")
+    total = store.count(table, filters, search)
+    n_pages = max(1, -(-total // PAGE_SIZE))
+    with col_s3:
+        page = st.number_input(f"Halaman (dari {n_pages})", 1, n_pages, 1, key=f"{key}_page")
 
+    df, total = store.query(table, filters, search, sort_by=sort_by, descending=order.startswith("Terbaru"),
+                            page=page, page_size=PAGE_SIZE)
+    if df.empty:
+        st.info("Tidak ada data yang cocok")
+        return df
+    st.dataframe(formatter(df.copy()) if formatter else df, use_container_width=True, hide_index=True)
+    first = (page - 1) * PAGE_SIZE + 1
+    st.caption(f"Menampilkan {first:,}–{first + len(df) - 1:,} dari {total:,} baris")
+    return df
 
-def get_next_id(db_list):
-    """Get next ID for a database."""
-    if not db_list:
-        return 1
-    return max(item['id'] for item in db_list) + 1
+
+def export_button(table, filename, filters=None, search=None):
+    """Build the CSV export only when requested (not on every rerun)."""
+    export_key = f"export_{table}"
+    view = (filters, search)
+    if st.button("📦 Siapkan Export CSV", key=f"{export_key}_btn"):
+        st.session_state[export_key] = (view, store.export_csv(table, filters, search))
+    prepared = st.session_state.get(export_key)
+    # Only offer the file for the view it was built from; changed filters / search need a new export
+    if prepared and prepared[0] == view:
+        st.download_button("📥 Download CSV", prepared[1], filename, "text/csv", key=f"{export_key}_dl")
 
 
 # ========== HEADER ==========
@@ -130,23 +140,22 @@ if menu == "📊 Dashboard":
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("📦 Total Komoditas", len(st.session_state.commodities_db))
+        st.metric("📦 Total Komoditas", store.count('commodities'))
     with col2:
-        active = len([c for c in st.session_state.commodities_db if c['active']])
+        active = store.count('commodities', {'active': 1})
         st.metric("✅ Komoditas Aktif", active)
     with col3:
-        st.metric("💰 Harga Manual", len(st.session_state.manual_prices_db))
+        st.metric("💰 Harga Manual", store.count('manual_prices'))
     with col4:
-        st.metric("📝 Total Log", len(st.session_state.audit_log_db))
+        st.metric("📝 Total Log", store.count('audit_log'))
     
     st.markdown("---")
     
     # Recent activity
     st.subheader("📋 Aktivitas Terbaru")
-    if st.session_state.audit_log_db:
-        recent = st.session_state.audit_log_db[-10:][::-1]  # Last 10, reversed
-        df = pd.DataFrame(recent)
-        st.dataframe(df, use_container_width=True, hide_index=True)
+    recent, _ = store.query('audit_log', sort_by='id', descending=True, page_size=10)  # Last 10, newest first
+    if not recent.empty:
+        st.dataframe(recent, use_container_width=True, hide_index=True)
     else:
         st.info("Belum ada aktivitas tercatat")
 
@@ -164,30 +173,26 @@ elif menu == "🌾 Komoditas":
         with col2:
             category_filter = st.selectbox("Kategori", ["Semua", "Sayuran", "Buah", "Pangan", "Rempah", "Perkebunan"])
         
-        # Filter data
-        commodities = st.session_state.commodities_db
-        if search:
-            commodities = [c for c in commodities if search.lower() in c['name'].lower()]
-        if category_filter != "Semua":
-            commodities = [c for c in commodities if c['category'] == category_filter]
-        
-        if commodities:
-            df = pd.DataFrame(commodities)
+        # Filter, sort and paginate in the store
+        def format_commodities(df):
             df['active'] = df['active'].apply(lambda x: '✅' if x else '❌')
             df['price'] = df['price'].apply(lambda x: f"Rp {x:,}")
             df.columns = ['ID', 'Nama', 'Kategori', 'Unit', 'Harga', 'Aktif']
-            
-            st.dataframe(df, use_container_width=True, hide_index=True)
-            
+            return df
+
+        commodities = show_paged_table('commodities', 'commodities_list', {'category': category_filter}, search,
+                                       sort_columns=("name", "id", "category", "price"), formatter=format_commodities)
+        
+        if not commodities.empty:
             # Edit section
             st.markdown("---")
             st.subheader("✏️ Edit / Hapus Komoditas")
             
-            commodity_options = {c['name']: c['id'] for c in commodities}
+            commodity_options = dict(zip(commodities['name'], commodities['id']))
             if commodity_options:
                 selected_name = st.selectbox("Pilih komoditas", list(commodity_options.keys()))
-                selected_id = commodity_options[selected_name]
-                selected = next(c for c in st.session_state.commodities_db if c['id'] == selected_id)
+                selected_id = int(commodity_options[selected_name])
+                selected = store.get('commodities', selected_id)
                 
                 with st.form("edit_form"):
                     col1, col2 = st.columns(2)
@@ -201,26 +206,28 @@ elif menu == "🌾 Komoditas":
                         new_unit = st.text_input("Unit", value=selected['unit'])
                         new_price = st.number_input("Harga", value=selected['price'])
                     
-                    new_active = st.checkbox("Aktif", value=selected['active'])
+                    new_active = st.checkbox("Aktif", value=bool(selected['active']))
                     
                     col_btn1, col_btn2 = st.columns(2)
                     with col_btn1:
                         if st.form_submit_button("💾 Simpan", type="primary", use_container_width=True):
-                            for c in st.session_state.commodities_db:
-                                if c['id'] == selected_id:
-                                    c['name'] = new_name
-                                    c['category'] = new_category
-                                    c['unit'] = new_unit
-                                    c['price'] = new_price
-                                    c['active'] = new_active
-                                    break
-                            log_action('UPDATE', 'commodities', selected_id, f"Updated {new_name}")
-                            st.success("✅ Berhasil diupdate!")
-                            st.rerun()
+                            try:
+                                store.update('commodities', selected_id, {
+                                    'name': new_name,
+                                    'category': new_category,
+                                    'unit': new_unit,
+                                    'price': new_price,
+                                    'active': new_active
+                                })
+                                log_action('UPDATE', 'commodities', selected_id, f"Updated {new_name}")
+                                st.success("✅ Berhasil diupdate!")
+                                st.rerun()
+                            except ValueError:
+                                st.warning(f"Nama '{new_name}' sudah dipakai komoditas lain!")
                     
                     with col_btn2:
                         if st.form_submit_button("🗑️ Hapus", use_container_width=True):
-                            st.session_state.commodities_db = [c for c in st.session_state.commodities_db if c['id'] != selected_id]
+                            store.delete('commodities', selected_id)
                             log_action('DELETE', 'commodities', selected_id, f"Deleted {selected['name']}")
                             st.success("✅ Berhasil dihapus!")
                             st.rerun()
@@ -241,18 +248,19 @@ elif menu == "🌾 Komoditas":
             
             if st.form_submit_button("💾 Simpan", type="primary", use_container_width=True):
                 if name:
-                    new_id = get_next_id(st.session_state.commodities_db)
-                    st.session_state.commodities_db.append({
-                        'id': new_id,
-                        'name': name,
-                        'category': category,
-                        'unit': unit,
-                        'price': price,
-                        'active': True
-                    })
-                    log_action('CREATE', 'commodities', new_id, f"Created {name}")
-                    st.success(f"✅ Komoditas '{name}' berhasil ditambahkan!")
-                    st.rerun()
+                    try:
+                        new_id = store.insert('commodities', {
+                            'name': name,
+                            'category': category,
+                            'unit': unit,
+                            'price': price,
+                            'active': True
+                        })
+                        log_action('CREATE', 'commodities', new_id, f"Created {name}")
+                        st.success(f"✅ Komoditas '{name}' berhasil ditambahkan!")
+                        st.rerun()
+                    except ValueError:
+                        st.warning(f"Komoditas '{name}' sudah ada!")
                 else:
                     st.warning("Nama komoditas wajib diisi!")
     
@@ -272,18 +280,28 @@ elif menu == "🌾 Komoditas":
             st.dataframe(df.head(10), use_container_width=True)
             
             if st.button("📤 Import", type="primary"):
-                count = 0
-                for _, row in df.iterrows():
-                    new_id = get_next_id(st.session_state.commodities_db)
-                    st.session_state.commodities_db.append({
-                        'id': new_id,
-                        'name': row.get('name', ''),
-                        'category': row.get('category', 'Lainnya'),
-                        'unit': row.get('unit', 'kg'),
-                        'price': row.get('price', 0),
-                        'active': True
-                    })
-                    count += 1
+                # "Rp 15.000" / "15.000" → 15000; anything else non-numeric is rejected, blank means 0
+                raw_price = df.get('price', pd.Series(0, index=df.index))
+                price_text = (raw_price.astype("string").str.strip()
+                              .str.replace(r"^Rp\.?\s*", "", case=False, regex=True))
+                grouped = price_text.str.fullmatch(r"\d{1,3}(\.\d{3})+").fillna(False)
+                price_text = price_text.mask(grouped, price_text.str.replace(".", "", regex=False))
+                price = pd.to_numeric(price_text, errors="coerce")
+                bad_price = price.isna() & raw_price.notna()
+                if bad_price.any():
+                    st.warning(f"⚠️ {int(bad_price.sum())} baris dilewati karena harga tidak valid:")
+                    st.dataframe(df[bad_price].head(20), use_container_width=True)
+
+                # Upsert by name in one transaction (existing names are updated)
+                import_df = pd.DataFrame({
+                    'name': df.get('name', pd.Series('', index=df.index)).fillna('').astype(str),
+                    'category': df.get('category', pd.Series('Lainnya', index=df.index)).fillna('Lainnya'),
+                    'unit': df.get('unit', pd.Series('kg', index=df.index)).fillna('kg'),
+                    'price': price.fillna(0).round().astype(int),
+                    'active': True
+                })[~bad_price]
+                import_df = import_df[import_df['name'] != ''].drop_duplicates('name', keep='last')
+                count = store.bulk_upsert('commodities', import_df)
                 log_action('BULK_IMPORT', 'commodities', None, f"Imported {count} items")
                 st.success(f"✅ {count} komoditas berhasil diimport!")
                 st.rerun()
@@ -295,22 +313,36 @@ elif menu == "💰 Harga Manual":
     tab1, tab2 = st.tabs(["📋 Daftar", "➕ Tambah Harga"])
     
     with tab1:
-        if st.session_state.manual_prices_db:
-            df = pd.DataFrame(st.session_state.manual_prices_db)
-            df['price'] = df['price'].apply(lambda x: f"Rp {x:,}")
-            st.dataframe(df, use_container_width=True, hide_index=True)
+        if store.count('manual_prices'):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                price_commodity = st.selectbox("Komoditas", ["Semua"] + store.options('manual_prices', 'commodity'))
+            with col2:
+                price_type_filter = st.selectbox("Tipe", ["Semua", "retail", "wholesale", "farm_gate"])
+            with col3:
+                price_from = st.date_input("Sejak Tanggal", value=None)
+
+            def format_prices(df):
+                df['price'] = df['price'].apply(lambda x: f"Rp {x:,}")
+                return df
+
+            price_filters = {'commodity': price_commodity, 'type': price_type_filter,
+                             'date': (price_from.isoformat() if price_from else None, None)}
+            show_paged_table('manual_prices', 'prices_list', price_filters,
+                             sort_columns=("date", "id", "commodity", "price"), descending=True, formatter=format_prices)
+            export_button('manual_prices', "manual_prices.csv", price_filters)
         else:
             st.info("Belum ada harga manual. Tambahkan di tab 'Tambah Harga'.")
     
     with tab2:
         st.subheader("➕ Tambah Harga Baru")
         
-        commodity_options = {c['name']: c['id'] for c in st.session_state.commodities_db if c['active']}
+        commodity_options = store.options('commodities', 'name', where_active=True)
         
         with st.form("add_price"):
             col1, col2 = st.columns(2)
             with col1:
-                selected_commodity = st.selectbox("Komoditas", list(commodity_options.keys()) if commodity_options else ["Tidak ada"])
+                selected_commodity = st.selectbox("Komoditas", commodity_options if commodity_options else ["Tidak ada"])
                 price = st.number_input("Harga (Rp)", min_value=0)
                 price_date = st.date_input("Tanggal", value=date.today())
             with col2:
@@ -320,9 +352,7 @@ elif menu == "💰 Harga Manual":
             
             if st.form_submit_button("💾 Simpan", type="primary", use_container_width=True):
                 if selected_commodity and price > 0:
-                    new_id = get_next_id(st.session_state.manual_prices_db)
-                    st.session_state.manual_prices_db.append({
-                        'id': new_id,
+                    new_id = store.insert('manual_prices', {
                         'commodity': selected_commodity,
                         'price': price,
                         'date': price_date.isoformat(),
@@ -341,7 +371,7 @@ elif menu == "💰 Harga Manual":
 elif menu == "📝 Audit Log":
     st.subheader("📝 Audit Log")
     
-    if st.session_state.audit_log_db:
+    if store.count('audit_log'):
         # Filters
         col1, col2 = st.columns(2)
         with col1:
@@ -349,18 +379,10 @@ elif menu == "📝 Audit Log":
         with col2:
             table_filter = st.selectbox("Filter Tabel", ["Semua", "commodities", "manual_prices"])
         
-        logs = st.session_state.audit_log_db[::-1]  # Reverse to show newest first
-        
-        if action_filter != "Semua":
-            logs = [l for l in logs if l['action'] == action_filter]
-        if table_filter != "Semua":
-            logs = [l for l in logs if l['table'] == table_filter]
-        
-        if logs:
-            df = pd.DataFrame(logs)
-            st.dataframe(df, use_container_width=True, hide_index=True)
-        else:
-            st.info("Tidak ada log yang cocok dengan filter")
+        # Newest first, filtered and paged in the store
+        log_filters = {'action': action_filter, 'table': table_filter}
+        show_paged_table('audit_log', 'audit_list', log_filters, sort_columns=("id", "timestamp", "user"), descending=True)
+        export_button('audit_log', "audit_log.csv", log_filters)
     else:
         st.info("Belum ada aktivitas tercatat")
 
@@ -559,9 +581,9 @@ elif menu == "🗄️ Database Explorer":
     
     col1, col2, col3, col4, col5, col6 = st.columns(6)
     with col1:
-        st.metric("🌾 Komoditas", len(st.session_state.get('commodities_db', [])))
+        st.metric("🌾 Komoditas", store.count('commodities'))
     with col2:
-        st.metric("💰 Harga Manual", len(st.session_state.get('manual_prices_db', [])))
+        st.metric("💰 Harga Manual", store.count('manual_prices'))
     with col3:
         st.metric("🗺️ NPK Tanah", len(npk_soil_data))
     with col4:
@@ -582,17 +604,20 @@ elif menu == "🗄️ Database Explorer":
     
     if db_choice == "📋 Semua Database":
         # Show all databases
+        # Store-backed tables show their first page only
         st.markdown("### 🌾 Commodities Database")
-        if st.session_state.get('commodities_db'):
-            df = pd.DataFrame(st.session_state.commodities_db)
+        df, total = store.query('commodities', page_size=PAGE_SIZE)
+        if total:
             st.dataframe(df, use_container_width=True, hide_index=True)
+            st.caption(f"{len(df):,} dari {total:,} baris")
         else:
             st.info("Kosong")
         
         st.markdown("### 💰 Manual Prices Database")
-        if st.session_state.get('manual_prices_db'):
-            df = pd.DataFrame(st.session_state.manual_prices_db)
+        df, total = store.query('manual_prices', sort_by='id', descending=True, page_size=PAGE_SIZE)
+        if total:
             st.dataframe(df, use_container_width=True, hide_index=True)
+            st.caption(f"{len(df):,} dari {total:,} baris")
         else:
             st.info("Kosong")
         
@@ -611,9 +636,10 @@ elif menu == "🗄️ Database Explorer":
             st.info("Kosong")
         
         st.markdown("### 📝 Audit Log Database")
-        if st.session_state.get('audit_log_db'):
-            df = pd.DataFrame(st.session_state.audit_log_db)
+        df, total = store.query('audit_log', sort_by='id', descending=True, page_size=PAGE_SIZE)
+        if total:
             st.dataframe(df, use_container_width=True, hide_index=True)
+            st.caption(f"{len(df):,} dari {total:,} baris")
         else:
             st.info("Kosong")
         
@@ -645,31 +671,22 @@ elif menu == "🗄️ Database Explorer":
     
     elif db_choice == "🌾 Commodities":
         st.markdown("### 🌾 Commodities Database")
-        if st.session_state.get('commodities_db'):
-            df = pd.DataFrame(st.session_state.commodities_db)
-            st.dataframe(df, use_container_width=True, hide_index=True)
+        if store.count('commodities'):
+            show_paged_table('commodities', 'explorer_commodities', sort_columns=("id", "name", "category", "price"))
             
             # Export
             st.markdown("---")
-            col1, col2 = st.columns(2)
-            with col1:
-                json_str = json.dumps(st.session_state.commodities_db, indent=2, default=str)
-                st.download_button("📥 Download JSON", json_str, "commodities.json", "application/json")
-            with col2:
-                csv = df.to_csv(index=False)
-                st.download_button("📥 Download CSV", csv, "commodities.csv", "text/csv")
+            export_button('commodities', "commodities.csv")
         else:
             st.info("Database kosong")
     
     elif db_choice == "💰 Manual Prices":
         st.markdown("### 💰 Manual Prices Database")
-        if st.session_state.get('manual_prices_db'):
-            df = pd.DataFrame(st.session_state.manual_prices_db)
-            st.dataframe(df, use_container_width=True, hide_index=True)
+        if store.count('manual_prices'):
+            show_paged_table('manual_prices', 'explorer_prices', sort_columns=("id", "date", "commodity", "price"), descending=True)
             
             st.markdown("---")
-            json_str = json.dumps(st.session_state.manual_prices_db, indent=2, default=str)
-            st.download_button("📥 Download JSON", json_str, "manual_prices.json", "application/json")
+            export_button('manual_prices', "manual_prices.csv")
         else:
             st.info("Database kosong")
     
@@ -731,13 +748,11 @@ elif menu == "🗄️ Database Explorer":
     
     elif db_choice == "📝 Audit Log":
         st.markdown("### 📝 Audit Log Database")
-        if st.session_state.get('audit_log_db'):
-            df = pd.DataFrame(st.session_state.audit_log_db)
-            st.dataframe(df, use_container_width=True, hide_index=True)
+        if store.count('audit_log'):
+            show_paged_table('audit_log', 'explorer_audit', sort_columns=("id", "timestamp", "action"), descending=True)
             
             st.markdown("---")
-            json_str = json.dumps(st.session_state.audit_log_db, indent=2, default=str)
-            st.download_button("📥 Download JSON", json_str, "audit_log.json", "application/json")
+            export_button('audit_log', "audit_log.csv")
         else:
             st.info("Database kosong")
     
@@ -827,7 +842,7 @@ elif menu == "📈 Analytics":
     st.markdown("### 📊 Data Overview")
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        commodities_count = len(st.session_state.get('commodities_db', []))
+        commodities_count = store.count('commodities')
         st.metric("🌾 Komoditas", commodities_count)
     with col2:
         npk_count = len(npk_soil_data)
@@ -848,12 +863,8 @@ elif menu == "📈 Analytics":
     
     with col1:
         # Commodity Categories Pie
-        commodities = st.session_state.get('commodities_db', [])
-        if commodities:
-            categories = {}
-            for c in commodities:
-                cat = c.get('category', 'Lainnya')
-                categories[cat] = categories.get(cat, 0) + 1
+        categories = store.group_counts('commodities', 'category')
+        if categories:
             
             fig = px.pie(
                 values=list(categories.values()),
@@ -1022,11 +1033,11 @@ elif menu == "📈 Analytics":
     st.markdown("### 📋 Ringkasan Data")
     
     summary_data = [
-        {"Database": "🌾 Komoditas", "Total Records": len(st.session_state.get('commodities_db', [])), "Status": "✅ Active"},
-        {"Database": "💰 Harga Manual", "Total Records": len(st.session_state.get('manual_prices_db', [])), "Status": "✅ Active"},
+        {"Database": "🌾 Komoditas", "Total Records": store.count('commodities'), "Status": "✅ Active"},
+        {"Database": "💰 Harga Manual", "Total Records": store.count('manual_prices'), "Status": "✅ Active"},
         {"Database": "🗺️ NPK Soil Map", "Total Records": len(npk_soil_data), "Status": "✅ Active"},
         {"Database": "📓 Journal", "Total Records": len(journal_data), "Status": "✅ Active"},
-        {"Database": "📝 Audit Log", "Total Records": len(st.session_state.get('audit_log_db', [])), "Status": "✅ Active"},
+        {"Database": "📝 Audit Log", "Total Records": store.count('audit_log'), "Status": "✅ Active"},
         {"Database": "👥 User Activity", "Total Records": len(get_activity_log()), "Status": "✅ Active"},
         {"Database": "👤 Users", "Total Records": len(get_users()), "Status": "✅ Active"},
     ]
@@ -0,0 +1,257 @@
+import io
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+# ==========================================
+# 🗄️ ADMIN DATA STORE
+# ==========================================
+# Shared SQLite store behind the Admin Dashboard (commodities, manual prices,
+# audit log). Keys are auto-increment, lookups hit indexes on name / category
+# / timestamp, and list views are paged, filtered and sorted in SQL so a rerun
+# only ever materializes one page.
+
+ADMIN_DB = os.path.join("data", "admin.db")
+DEFAULT_PAGE_SIZE = 50
+EXPORT_CHUNK = 50000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commodities (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL COLLATE NOCASE UNIQUE,
+    category TEXT NOT NULL DEFAULT 'Lainnya',
+    unit TEXT NOT NULL DEFAULT 'kg',
+    price INTEGER NOT NULL DEFAULT 0,
+    active INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_commodities_category ON commodities (category, name);
+
+CREATE TABLE IF NOT EXISTS manual_prices (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    commodity TEXT NOT NULL,
+    price INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    province TEXT,
+    city TEXT,
+    type TEXT,
+    reporter TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_prices_commodity ON manual_prices (commodity, date);
+CREATE INDEX IF NOT EXISTS idx_prices_date ON manual_prices (date);
+
+CREATE TABLE IF NOT EXISTS audit_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    user TEXT,
+    action TEXT NOT NULL,
+    "table" TEXT,
+    record_id INTEGER,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON audit_log (timestamp);
+CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_log (action, timestamp);
+CREATE INDEX IF NOT EXISTS idx_audit_table ON audit_log ("table", timestamp);
+"""
+
+# Per table: writable columns, free-text search column, natural upsert key
+TABLES = {
+    "commodities": {
+        "columns": ("name", "category", "unit", "price", "active"),
+        "search": "name",
+        "key": "name",
+    },
+    "manual_prices": {
+        "columns": ("commodity", "price", "date", "province", "city", "type", "reporter"),
+        "search": "commodity",
+        "key": None,
+    },
+    "audit_log": {
+        "columns": ("timestamp", "user", "action", "table", "record_id", "details"),
+        "search": "details",
+        "key": None,
+    },
+}
+
+DEFAULT_COMMODITIES = [
+    {'name': 'Beras Premium', 'category': 'Pangan', 'unit': 'kg', 'price': 15000},
+    {'name': 'Cabai Rawit', 'category': 'Sayuran', 'unit': 'kg', 'price': 80000},
+    {'name': 'Bawang Merah', 'category': 'Sayuran', 'unit': 'kg', 'price': 45000},
+    {'name': 'Jagung Pipil', 'category': 'Pangan', 'unit': 'kg', 'price': 8000},
+    {'name': 'Kedelai', 'category': 'Pangan', 'unit': 'kg', 'price': 12000},
+    {'name': 'Gula Pasir', 'category': 'Pangan', 'unit': 'kg', 'price': 16000},
+    {'name': 'Bayam', 'category': 'Sayuran', 'unit': 'ikat', 'price': 5000},
+    {'name': 'Kangkung', 'category': 'Sayuran', 'unit': 'ikat', 'price': 4000},
+    {'name': 'Tomat', 'category': 'Sayuran', 'unit': 'kg', 'price': 15000},
+    {'name': 'Jeruk', 'category': 'Buah', 'unit': 'kg', 'price': 25000},
+]
+
+
+def _q(column):
+    return f'"{column}"'
+
+
+class AdminStore:
+    """Shared admin tables with paged queries and bulk upsert."""
+
+    def __init__(self, db_file=ADMIN_DB, seed=True):
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            empty = conn.execute("SELECT COUNT(*) FROM commodities").fetchone()[0] == 0
+        if seed and empty:
+            self.bulk_upsert("commodities", pd.DataFrame(DEFAULT_COMMODITIES))
+
+    @contextmanager
+    def _connect(self):
+        """One unit of work: committed (or rolled back) and always closed."""
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        try:
+            conn.row_factory = sqlite3.Row
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _spec(table):
+        if table not in TABLES:
+            raise ValueError(f"Tabel tidak dikenal: {table}")
+        return TABLES[table]
+
+    def _where(self, table, filters=None, search=None):
+        spec = self._spec(table)
+        allowed = ("id", *spec["columns"])
+        clauses, args = [], []
+        for col, value in (filters or {}).items():
+            if value is None or value == "Semua":
+                continue
+            if col not in allowed:
+                raise ValueError(f"Kolom filter tidak dikenal: {col}")
+            if isinstance(value, (tuple, list)) and len(value) == 2:
+                lo, hi = value
+                if lo is not None:
+                    clauses.append(f"{_q(col)} >= ?")
+                    args.append(str(lo))
+                if hi is not None:
+                    clauses.append(f"{_q(col)} <= ?")
+                    args.append(str(hi))
+            else:
+                clauses.append(f"{_q(col)} = ?")
+                args.append(value)
+        if search:
+            clauses.append(f"{_q(spec['search'])} LIKE ?")
+            args.append(f"%{search}%")
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ""), args
+
+    # ---------- Writes ----------
+    def insert(self, table, record):
+        cols = [c for c in self._spec(table)["columns"] if c in record]
+        try:
+            with self._connect() as conn:
+                cur = conn.execute(
+                    f"INSERT INTO {table} ({', '.join(map(_q, cols))}) VALUES ({', '.join('?' * len(cols))})",
+                    [record[c] for c in cols])
+                return cur.lastrowid
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"Data sudah ada: {e}") from e
+
+    def update(self, table, record_id, fields):
+        cols = [c for c in self._spec(table)["columns"] if c in fields]
+        try:
+            with self._connect() as conn:
+                conn.execute(f"UPDATE {table} SET {', '.join(f'{_q(c)} = ?' for c in cols)} WHERE id = ?",
+                             [fields[c] for c in cols] + [record_id])
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"Data sudah ada: {e}") from e
+
+    def delete(self, table, record_id):
+        self._spec(table)
+        with self._connect() as conn:
+            conn.execute(f"DELETE FROM {table} WHERE id = ?", (record_id,))
+
+    def bulk_upsert(self, table, df):
+        """
+        Insert (or update by natural key, e.g. commodity name) all rows of `df`
+        in one transaction. Missing columns fall back to the table defaults.
+        Returns the number of rows written.
+        """
+        spec = self._spec(table)
+        cols = [c for c in spec["columns"] if c in df.columns]
+        if spec["key"] and spec["key"] not in cols:
+            raise ValueError(f"Kolom wajib tidak ada: {spec['key']}")
+        data = df[cols].astype(object).where(df[cols].notna(), None)
+        sql = f"INSERT INTO {table} ({', '.join(map(_q, cols))}) VALUES ({', '.join('?' * len(cols))})"
+        if spec["key"]:
+            updates = [c for c in cols if c != spec["key"]]
+            sql += f" ON CONFLICT({_q(spec['key'])}) DO " + (
+                f"UPDATE SET {', '.join(f'{_q(c)} = excluded.{_q(c)}' for c in updates)}" if updates else "NOTHING")
+        with self._connect() as conn:
+            conn.executemany(sql, data.itertuples(index=False, name=None))
+        return len(data)
+
+    def log_action(self, user, action, table, record_id=None, details=""):
+        return self.insert("audit_log", {
+            "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "user": user, "action": action, "table": table,
+            "record_id": record_id, "details": details,
+        })
+
+    # ---------- Reads ----------
+    def get(self, table, record_id):
+        self._spec(table)
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT * FROM {table} WHERE id = ?", (record_id,)).fetchone()
+        return dict(row) if row else None
+
+    def count(self, table, filters=None, search=None):
+        where, args = self._where(table, filters, search)
+        with self._connect() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}{where}", args).fetchone()[0]
+
+    def query(self, table, filters=None, search=None, sort_by="id", descending=False,
+              page=1, page_size=DEFAULT_PAGE_SIZE):
+        """One page of rows as a DataFrame plus the total matching count."""
+        spec = self._spec(table)
+        if sort_by not in ("id", *spec["columns"]):
+            raise ValueError(f"Kolom urut tidak dikenal: {sort_by}")
+        where, args = self._where(table, filters, search)
+        direction = "DESC" if descending else "ASC"
+        page = max(1, int(page))
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM {table}{where}", args).fetchone()[0]
+            df = pd.read_sql_query(
+                f"SELECT * FROM {table}{where} ORDER BY {_q(sort_by)} {direction}, id {direction} LIMIT ? OFFSET ?",
+                conn, params=[*args, int(page_size), (page - 1) * int(page_size)])
+        return df, total
+
+    def options(self, table, column, where_active=False):
+        """Distinct values of a column (for filter widgets)."""
+        if column not in self._spec(table)["columns"]:
+            raise ValueError(f"Kolom tidak dikenal: {column}")
+        cond = " WHERE active = 1" if where_active else ""
+        with self._connect() as conn:
+            return [r[0] for r in conn.execute(
+                f"SELECT DISTINCT {_q(column)} FROM {table}{cond} ORDER BY {_q(column)}")]
+
+    def group_counts(self, table, column):
+        """{value: count} aggregated in SQL."""
+        if column not in self._spec(table)["columns"]:
+            raise ValueError(f"Kolom tidak dikenal: {column}")
+        with self._connect() as conn:
+            return dict(conn.execute(f"SELECT {_q(column)}, COUNT(*) FROM {table} GROUP BY {_q(column)}").fetchall())
+
+    def export_csv(self, table, filters=None, search=None, chunk_size=EXPORT_CHUNK):
+        """CSV bytes of the filtered table, read in chunks."""
+        where, args = self._where(table, filters, search)
+        buf = io.StringIO()
+        with self._connect() as conn:
+            chunks = pd.read_sql_query(f"SELECT * FROM {table}{where} ORDER BY id", conn,
+                                       params=args, chunksize=chunk_size)
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(buf, index=False, header=(i == 0))
+        return buf.getvalue().encode("utf-8")
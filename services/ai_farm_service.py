@@ -1,7 +1,15 @@
+import itertools
+import json
+import os
+
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
 import streamlit as st
 
+from utils.lazy_imports import lazy_attr
+from utils.lru_cache import LRUCache
+
+RandomForestRegressor = lazy_attr("sklearn.ensemble", "RandomForestRegressor")
+
 # ==========================================
 # 🧠 AI ENGINE & LOGIC LAYER
 # ==========================================
@@ -70,11 +78,12 @@ def get_ai_model():
     model.fit(X, y)
     return model
 
-def optimize_solution(model, target_yield, optimization_mode="Yield", fixed_params={}, price_per_kg=6000):
+def optimize_solution(model, target_yield, optimization_mode="Yield", fixed_params={}, price_per_kg=6000, seed=None):
     """
     Finds the optimal agronomic inputs (SOP) to achieve target yield or max profit.
-    Fixed params allow constraining weather/soil.
+    Fixed params allow constraining weather/soil. A fixed `seed` makes the search reproducible.
     """
+    rng = np.random.default_rng(seed)
     
     # Cost Assumptions (Global Standard)
     COST_N = 15000 
@@ -115,7 +124,7 @@ def optimize_solution(model, target_yield, optimization_mode="Yield", fixed_para
     for i in range(iterations):
         test_cond = current_cond.copy()
         # Mutation: N, P, K, pH, Rain, Temp, Org, Tex, Water
-        mutation = np.random.normal(0, [25, 10, 15, 0.1, 0, 0, 1.0, 0, 0], 9)
+        mutation = rng.normal(0, [25, 10, 15, 0.1, 0, 0, 1.0, 0, 0], 9)
         test_cond += mutation
         test_cond = np.clip(test_cond, 
                            [0,0,0,4,500,15,0,0,0], 
@@ -161,3 +170,107 @@ def optimize_solution(model, target_yield, optimization_mode="Yield", fixed_para
         "predicted_yield": final_yield,
         "pest_cost": pest_cost_total
     }
+
+
+# ==========================================
+# 🗃️ SOP RECOMMENDATION CACHE
+# ==========================================
+# optimize_solution() costs seconds (250 forest predictions) plus model training,
+# so recommendations are memoized on a quantized input vector, shared by all
+# sessions and persisted to disk.
+
+SOP_CACHE_FILE = os.path.join("data", "sop_cache.json")
+SOP_CACHE_MAX = 512
+SOP_SEED = 42
+
+# Quantization steps for the cache key
+SOP_QUANT = {"texture": 0.05, "rain": 50.0, "temp": 0.5, "target": 100.0, "price": 100.0}
+
+# Common soil/weather combinations for the precomputed lookup grid
+SOP_GRID = {
+    "texture": [0.2, 0.5, 0.7],
+    "rain": [1500.0, 2000.0, 2500.0],
+    "temp": [25.0, 27.0, 29.0],
+    "pest_strategy": ["IPM (Terpadu)", "Organic (Nabati)", "Konvensional"],
+}
+
+
+def _quantize(value, step):
+    return round(round(float(value) / step) * step, 4)
+
+
+def sop_cache_key(target_yield, optimization_mode, fixed_params, price_per_kg):
+    """Quantized input vector → string key (JSON-safe)."""
+    parts = [
+        _quantize(fixed_params.get("texture", 0.7), SOP_QUANT["texture"]),
+        _quantize(fixed_params.get("rain", 2000.0), SOP_QUANT["rain"]),
+        _quantize(fixed_params.get("temp", 27.0), SOP_QUANT["temp"]),
+        fixed_params.get("pest_strategy", "IPM (Terpadu)"),
+        _quantize(target_yield, SOP_QUANT["target"]),
+        optimization_mode,
+        _quantize(price_per_kg, SOP_QUANT["price"]),
+        fixed_params.get("org_start"),
+        fixed_params.get("fixed_org"),
+    ]
+    return json.dumps(parts, ensure_ascii=False)
+
+
+class SOPRecommendationCache(LRUCache):
+    """LRU of optimize_solution() results (plain float dicts), mirrored to a JSON file."""
+
+    def __init__(self, path=SOP_CACHE_FILE, max_entries=SOP_CACHE_MAX):
+        super().__init__(path, max_entries)
+
+    def get(self, key):
+        hit = super().get(key)
+        return dict(hit) if hit is not None else None
+
+    def put(self, key, value, persist=True):
+        super().put(key, {k: float(v) for k, v in value.items()}, persist=persist)
+
+
+@st.cache_resource
+def get_sop_cache():
+    """Process-wide cache instance (shared across sessions)."""
+    return SOPRecommendationCache()
+
+
+def recommend_sop(target_yield, optimization_mode="Yield", fixed_params={}, price_per_kg=6000, cache=None):
+    """
+    Cached optimize_solution(). The model is only loaded on a cache miss, and the
+    search runs on the quantized inputs with a fixed seed so a key always maps to
+    the same recommendation.
+    """
+    cache = cache if cache is not None else get_sop_cache()
+    key = sop_cache_key(target_yield, optimization_mode, fixed_params, price_per_kg)
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
+
+    q_params = dict(fixed_params)
+    for name in ("texture", "rain", "temp"):
+        if name in q_params:
+            q_params[name] = _quantize(q_params[name], SOP_QUANT[name])
+    result = optimize_solution(get_ai_model(), _quantize(target_yield, SOP_QUANT["target"]), optimization_mode,
+                               q_params, price_per_kg=_quantize(price_per_kg, SOP_QUANT["price"]), seed=SOP_SEED)
+    cache.put(key, result)
+    return dict(cache.get(key))
+
+
+def precompute_sop_grid(target_yield=10000, optimization_mode="Yield", price_per_kg=6000, grid=None, cache=None):
+    """Fill the cache for every combination in `grid` (default SOP_GRID). Returns the number computed."""
+    cache = cache if cache is not None else get_sop_cache()
+    grid = grid or SOP_GRID
+    names = list(grid)
+    computed = 0
+    for combo in itertools.product(*(grid[n] for n in names)):
+        params = dict(zip(names, combo))
+        key = sop_cache_key(target_yield, optimization_mode, params, price_per_kg)
+        if key in cache:
+            continue
+        result = optimize_solution(get_ai_model(), target_yield, optimization_mode, params,
+                                   price_per_kg=price_per_kg, seed=SOP_SEED)
+        cache.put(key, result, persist=False)
+        computed += 1
+    cache.flush()
+    return computed
@@ -0,0 +1,204 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.lazy_imports import lazy_attr
+
+IsolationForest = lazy_attr("sklearn.ensemble", "IsolationForest")
+
+# ==========================================
+# ⚠️ ANOMALY DETECTION ENGINE (INTELLIGENCE PRO)
+# ==========================================
+# Three detectors over an uploaded table:
+# - rolling robust z-score (median / MAD of a centered window),
+# - IsolationForest over several numeric columns,
+# - seasonal residual (value minus rolling trend minus per-phase median).
+# Each categorical group is screened independently (in a process pool for
+# many groups) and only the flagged rows plus per-group counts come back.
+
+METHODS = ("rolling_z", "isolation_forest", "seasonal")
+MAD_SCALE = 0.6745            # makes |x - median| / MAD comparable to a normal z-score
+DEFAULT_WINDOW = 51
+DEFAULT_THRESHOLD = 3.5
+DEFAULT_CONTAMINATION = 0.01
+IF_FIT_SAMPLE = 100_000       # IsolationForest is fitted on a sample and scores every row
+IF_TREES = 64                 # scoring cost grows with trees; 64 keeps 1M rows within seconds
+WINDOW_CHUNK = 50_000         # rows per sliding-window block (bounds memory to chunk * window)
+
+
+# ---------- Robust scores ----------
+def robust_z(values, center=None, mad=None):
+    """|0.6745 (x - median) / MAD|; zero MAD falls back to the global MAD, then to 0 / inf."""
+    x = np.asarray(values, dtype=float)
+    if center is None:
+        center = np.nanmedian(x)
+    if mad is None:
+        mad = np.nanmedian(np.abs(x - center))
+    mad = np.asarray(mad, dtype=float)
+    dev = np.abs(x - center)
+    if np.ndim(mad) and (mad == 0).any():
+        global_mad = np.nanmedian(np.abs(x - np.nanmedian(x)))
+        mad = np.where(mad == 0, global_mad, mad)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = MAD_SCALE * dev / mad
+    z = np.where(dev == 0, 0.0, z)
+    return np.nan_to_num(z, nan=0.0, posinf=np.inf)
+
+
+def rolling_median_mad(values, window=DEFAULT_WINDOW):
+    """
+    Median and MAD of a centered window around every point, computed on
+    strided window views in blocks. Edge points reuse the nearest full window.
+    """
+    x = np.asarray(values, dtype=float)
+    n = len(x)
+    window = int(window) | 1                      # odd, so the window is centered
+    if n < window:
+        med = np.nanmedian(x) if n else np.nan
+        return np.full(n, med), np.full(n, np.nanmedian(np.abs(x - med)) if n else np.nan)
+
+    n_win = n - window + 1
+    med, mad = np.empty(n_win), np.empty(n_win)
+    for start in range(0, n_win, WINDOW_CHUNK):
+        view = sliding_window_view(x[start:start + WINDOW_CHUNK + window - 1], window)
+        m = np.nanmedian(view, axis=1)
+        med[start:start + len(m)] = m
+        mad[start:start + len(m)] = np.nanmedian(np.abs(view - m[:, None]), axis=1)
+
+    half = window // 2
+    pad = (half, n - n_win - half)
+    return np.pad(med, pad, mode="edge"), np.pad(mad, pad, mode="edge")
+
+
+def rolling_robust_z(values, window=DEFAULT_WINDOW):
+    med, mad = rolling_median_mad(values, window)
+    return robust_z(values, med, mad)
+
+
+def infer_period(dates):
+    """Seasonal period (in samples) from the median spacing of sorted dates."""
+    d = np.asarray(dates, dtype="datetime64[s]")
+    if len(d) < 3:
+        return 1
+    step = np.median(np.diff(d).astype(np.int64))
+    if step <= 3600:
+        return 24                                  # hourly → daily cycle
+    if step <= 86400:
+        return 7                                   # daily → weekly cycle
+    if step <= 7 * 86400:
+        return 52                                  # weekly → yearly cycle
+    return 12                                      # monthly → yearly cycle
+
+
+def seasonal_residual_z(values, period, trend_window=None):
+    """
+    Robust z of the residual after removing a rolling-median trend and the
+    median of each seasonal phase (position modulo `period`). Series shorter
+    than the trend window use one global median as trend.
+    """
+    x = np.asarray(values, dtype=float)
+    period = max(int(period), 1)
+    trend_window = trend_window or max(2 * period + 1, 5)
+    # Full windows only (partial windows see part of a cycle); edges reuse the nearest trend value
+    trend = pd.Series(x).rolling(trend_window, center=True, min_periods=min(trend_window, len(x)) or 1).median()
+    trend = trend.ffill().bfill().to_numpy()
+    detrended = x - trend
+    phase = np.arange(len(x)) % period
+    seasonal = pd.Series(detrended).groupby(phase).transform("median").to_numpy()
+    return robust_z(detrended - seasonal)
+
+
+def isolation_scores(X, contamination=DEFAULT_CONTAMINATION, random_state=42, fit_sample=IF_FIT_SAMPLE,
+                     n_estimators=IF_TREES):
+    """
+    Anomaly score (higher = more anomalous) and flags from an IsolationForest
+    fitted on a sample of standardized rows. NaNs are filled with column medians.
+    """
+    X = np.asarray(X, dtype=float)
+    if X.ndim == 1:
+        X = X.reshape(-1, 1)
+    if len(X) < 2:
+        return np.zeros(len(X)), np.zeros(len(X), dtype=bool)
+    med = np.nanmedian(X, axis=0)
+    X = np.where(np.isnan(X), med, X)
+    std = X.std(axis=0)
+    X = (X - X.mean(axis=0)) / np.where(std == 0, 1, std)
+
+    rng = np.random.default_rng(random_state)
+    fit_rows = X if len(X) <= fit_sample else X[rng.choice(len(X), fit_sample, replace=False)]
+    model = IsolationForest(n_estimators=n_estimators, contamination=contamination,
+                            random_state=random_state).fit(fit_rows)
+    scores = -model.score_samples(X)
+    return scores, scores > -model.offset_
+
+
+# ---------- Group-wise engine ----------
+def _score_group(job):
+    """Worker: (key, row positions, values [n, k], dates, params) → (key, flagged positions, scores)."""
+    key, positions, values, dates, params = job
+    method = params["method"]
+    if dates is not None:
+        order = np.argsort(dates, kind="stable")
+        positions, values, dates = positions[order], values[order], dates[order]
+
+    if method == "isolation_forest":
+        scores, flags = isolation_scores(values, params["contamination"], params["random_state"])
+    else:
+        if method == "rolling_z":
+            per_col = [rolling_robust_z(values[:, j], params["window"]) for j in range(values.shape[1])]
+        else:
+            period = params["period"] or (infer_period(dates) if dates is not None else 12)
+            per_col = [seasonal_residual_z(values[:, j], period) for j in range(values.shape[1])]
+        scores = np.max(per_col, axis=0) if per_col else np.zeros(len(positions))
+        flags = scores > params["threshold"]
+    return key, positions[flags], scores[flags]
+
+
+def detect_anomalies(df, value_cols, method="rolling_z", group_col=None, date_col=None,
+                     threshold=DEFAULT_THRESHOLD, window=DEFAULT_WINDOW, period=None,
+                     contamination=DEFAULT_CONTAMINATION, random_state=42,
+                     max_workers=None, parallel_threshold=8):
+    """
+    Screen `df` for anomalies, per group of `group_col` when given.
+    Rows are ordered by `date_col` (if any) before rolling / seasonal scoring.
+    Returns (flagged rows with 'Skor_Anomali' sorted by score, summary per group).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Metode tidak dikenal: {method}")
+    value_cols = list(value_cols)
+    if not value_cols:
+        raise ValueError("Pilih minimal satu kolom angka")
+
+    values = df[value_cols].to_numpy(dtype=float, na_value=np.nan)
+    dates = pd.to_datetime(df[date_col]).to_numpy(dtype="datetime64[ns]") if date_col else None
+    params = {"method": method, "threshold": threshold, "window": window, "period": period,
+              "contamination": contamination, "random_state": random_state}
+
+    if group_col:
+        codes, labels = pd.factorize(df[group_col], use_na_sentinel=False)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.flatnonzero(np.diff(codes[order])) + 1
+        groups = [(str(labels[codes[pos[0]]]), pos) for pos in np.split(order, bounds) if len(pos)]
+    else:
+        groups = [("Semua Data", np.arange(len(df)))]
+    jobs = [(key, pos, values[pos], dates[pos] if dates is not None else None, params) for key, pos in groups]
+
+    if len(jobs) >= parallel_threshold:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_score_group, jobs, chunksize=max(1, len(jobs) // 32)))
+    else:
+        results = [_score_group(job) for job in jobs]
+
+    sizes = {key: len(pos) for key, pos in groups}
+    summary = pd.DataFrame([
+        {"kelompok": key, "n_baris": sizes[key], "n_anomali": len(flagged),
+         "persen": len(flagged) / sizes[key] * 100 if sizes[key] else 0.0,
+         "skor_maks": float(scores.max()) if len(scores) else np.nan}
+        for key, flagged, scores in results
+    ])
+    flagged_pos = np.concatenate([r[1] for r in results]) if results else np.array([], dtype=np.int64)
+    flagged_scores = np.concatenate([r[2] for r in results]) if results else np.array([])
+    flagged = df.iloc[flagged_pos].assign(Skor_Anomali=flagged_scores)
+    return flagged.sort_values("Skor_Anomali", ascending=False), summary
@@ -0,0 +1,133 @@
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.lazy_imports import lazy_attr
+from utils.lru_cache import LRUCache
+
+LinearRegression = lazy_attr("sklearn.linear_model", "LinearRegression")
+
+# ==========================================
+# 🔮 BATCH AUTO-FORECASTING (INTELLIGENCE PRO)
+# ==========================================
+# Same trend model as the single-series forecaster (linear regression on the
+# ordinal date, step = average spacing), applied to every numeric column or
+# every group of a categorical column. Features are built with NumPy date
+# arithmetic, fits run in a process pool for large batches, and results are
+# memoized per series content hash.
+
+DEFAULT_STEP_DAYS = 30
+FORECAST_CACHE_MAX = 1024
+MIN_POINTS = 2
+
+
+def series_hash(dates, values, periods):
+    """Content hash of one series + horizon (model cache key)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.asarray(dates, dtype="datetime64[D]").astype(np.int64).tobytes())
+    h.update(np.asarray(values, dtype=np.float64).tobytes())
+    h.update(str(periods).encode())
+    return h.hexdigest()
+
+
+def forecast_series(dates, values, periods):
+    """
+    Linear trend forecast of one series.
+    `dates` must be sorted and unique. Returns dict with future dates/predictions,
+    r2, slope per day and step_days, or status 'insufficient' when < 2 points.
+    """
+    days = np.asarray(dates, dtype="datetime64[D]")
+    y = np.asarray(values, dtype=float)
+    if len(days) < MIN_POINTS:
+        return {"status": "insufficient", "future_dates": np.array([], dtype="datetime64[D]"),
+                "predictions": np.array([]), "r2": np.nan, "slope_per_day": np.nan, "step_days": DEFAULT_STEP_DAYS}
+
+    X = days.astype(np.int64).reshape(-1, 1).astype(float)
+    model = LinearRegression().fit(X, y)
+    r2 = model.score(X, y)
+
+    # Average spacing (same rule as the single-series forecaster), at least one day
+    step = max(int((days[-1] - days[0]).astype(int) / len(days)), 1)
+    future = days[-1] + np.arange(1, periods + 1) * np.timedelta64(step, "D")
+    predictions = model.predict(future.astype(np.int64).reshape(-1, 1).astype(float))
+    return {"status": "ok", "future_dates": future, "predictions": predictions, "r2": float(r2),
+            "slope_per_day": float(model.coef_[0]), "step_days": step}
+
+
+def _forecast_job(job):
+    key, dates, values, periods = job
+    return key, forecast_series(dates, values, periods)
+
+
+class ForecastCache(LRUCache):
+    """In-memory LRU of forecast results keyed by series hash."""
+
+    def __init__(self, max_entries=FORECAST_CACHE_MAX):
+        super().__init__(path=None, max_entries=max_entries)
+
+
+_default_cache = ForecastCache()
+
+
+def build_series(df, date_col, value_cols=None, group_col=None, target=None):
+    """
+    Series to forecast, aggregated (sum) per date and sorted.
+    Wide mode: one series per column of `value_cols`.
+    Grouped mode: `target` summed per (group_col value, date).
+    Returns {name: (dates ndarray, values ndarray)}.
+    """
+    dates = pd.to_datetime(df[date_col])
+    if group_col:
+        agg = (df.assign(**{date_col: dates})
+               .groupby([group_col, date_col], observed=True)[target].sum()
+               .sort_index())
+        return {str(name): (part.index.get_level_values(date_col).to_numpy(), part.to_numpy(float))
+                for name, part in agg.groupby(level=0, observed=True)}
+    agg = df.assign(**{date_col: dates}).groupby(date_col)[list(value_cols)].sum().sort_index()
+    idx = agg.index.to_numpy()
+    return {str(col): (idx, agg[col].to_numpy(float)) for col in agg.columns}
+
+
+def batch_forecast(series, periods, max_workers=None, parallel_threshold=8, cache=None):
+    """
+    Forecast many series at once.
+    Returns (combined DataFrame [series, date, value, jenis], summary DataFrame).
+    """
+    cache = _default_cache if cache is None else cache
+    results, jobs = {}, []
+    for name, (dates, values) in series.items():
+        key = series_hash(dates, values, periods)
+        hit = cache.get(key)
+        if hit is not None:
+            results[name] = hit
+        else:
+            jobs.append(((name, key), dates, values, periods))
+
+    if len(jobs) >= parallel_threshold:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            fitted = list(pool.map(_forecast_job, jobs, chunksize=max(1, len(jobs) // 32)))
+    else:
+        fitted = [_forecast_job(job) for job in jobs]
+    for (name, key), res in fitted:
+        cache.put(key, res)
+        results[name] = res
+
+    frames, rows = [], []
+    for name, (dates, values) in series.items():
+        res = results[name]
+        frames.append(pd.DataFrame({"series": name, "date": pd.to_datetime(dates), "value": values, "jenis": "Aktual"}))
+        if res["status"] == "ok":
+            frames.append(pd.DataFrame({"series": name, "date": pd.to_datetime(res["future_dates"]),
+                                        "value": res["predictions"], "jenis": "Prediksi"}))
+        last = float(values[-1]) if len(values) else np.nan
+        end = float(res["predictions"][-1]) if len(res["predictions"]) else np.nan
+        rows.append({
+            "series": name, "status": res["status"], "n_points": len(values), "r2": res["r2"],
+            "tren_per_hari": res["slope_per_day"], "langkah_hari": res["step_days"],
+            "nilai_terakhir": last, "prediksi_akhir": end,
+            "perubahan_pct": (end - last) / abs(last) * 100 if last else np.nan,
+        })
+    combined = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["series", "date", "value", "jenis"])
+    return combined, pd.DataFrame(rows)
@@ -0,0 +1,263 @@
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import urllib.parse
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import pandas as pd
+
+# ==========================================
+# 🏷️ BATCH REGISTRY (TRACEABILITY)
+# ==========================================
+# Persistent product batches keyed by batch ID. Consumer scans go through a
+# small in-memory LRU in front of a WITHOUT ROWID primary-key lookup, so a
+# scan resolves in well under a millisecond regardless of registry size.
+# Secondary indexes serve producer-side searches (harvest date, farmer, commodity).
+
+REGISTRY_DB = os.path.join("data", "batch_registry.db")
+SCAN_CACHE_MAX = 4096
+IMPORT_CHUNK = 50000
+
+COLUMNS = ("id", "hash", "produk", "varietas", "tgl", "petani", "lokasi", "harga", "kontak", "riwayat", "klaim", "foto")
+REQUIRED_CSV = ("id", "produk", "tgl", "petani")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id TEXT PRIMARY KEY,
+    hash TEXT,
+    produk TEXT NOT NULL,
+    varietas TEXT,
+    tgl TEXT NOT NULL,
+    petani TEXT NOT NULL,
+    lokasi TEXT,
+    harga INTEGER,
+    kontak TEXT,
+    riwayat TEXT,
+    klaim TEXT,
+    foto BLOB,
+    created_at TEXT
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_batches_tgl ON batches (tgl);
+CREATE INDEX IF NOT EXISTS idx_batches_petani ON batches (petani, tgl);
+CREATE INDEX IF NOT EXISTS idx_batches_produk ON batches (produk, tgl);
+"""
+
+
+def batch_hash(batch_id, riwayat, petani):
+    """Same fingerprint the Traceability page derives for a new batch."""
+    return hashlib.sha256(f"{batch_id}{riwayat}{petani}".encode()).hexdigest()
+
+
+def parse_scan(text):
+    """Batch ID from a scanned QR payload (passport URL) or a typed ID."""
+    text = (text or "").strip()
+    if "://" in text:
+        path = urllib.parse.urlparse(text).path
+        return urllib.parse.unquote(path.rstrip("/").rsplit("/", 1)[-1])
+    return text
+
+
+def _to_row(batch):
+    tgl = batch.get("tgl")
+    if isinstance(tgl, (datetime.date, datetime.datetime, pd.Timestamp)):
+        tgl = tgl.strftime("%Y-%m-%d")
+    foto = batch.get("foto")
+    if foto is not None and hasattr(foto, "getvalue"):
+        foto = foto.getvalue()
+    harga = batch.get("harga")
+    harga = int(harga) if harga not in (None, "") and not pd.isna(harga) else None
+    klaim = batch.get("klaim") or []
+    if isinstance(klaim, str):
+        klaim = [k.strip() for k in klaim.split(";") if k.strip()]
+    riwayat = batch.get("riwayat") or ""
+    return (
+        str(batch["id"]),
+        batch.get("hash") or batch_hash(batch["id"], riwayat, batch["petani"]),
+        batch["produk"], batch.get("varietas") or "", str(tgl), batch["petani"],
+        batch.get("lokasi") or "", harga, batch.get("kontak") or None, riwayat,
+        json.dumps(klaim), foto, datetime.datetime.now().isoformat(),
+    )
+
+
+def _csv_rows(chunk, created_at):
+    """
+    Vectorized _to_row for an import chunk of string columns.
+    Returns (rows, rejected) where rejected lists {id, tgl, alasan} for unparseable dates.
+    """
+    df = chunk.reindex(columns=[c for c in COLUMNS if c != "foto"], fill_value="")
+    tgl = pd.to_datetime(df["tgl"], errors="coerce")
+    bad = tgl.isna()
+    rejected = [{"id": i, "tgl": t, "alasan": "tanggal tidak valid"}
+                for i, t in df.loc[bad, ["id", "tgl"]].itertuples(index=False)]
+    df = df[~bad].copy()
+    df["tgl"] = tgl[~bad].dt.strftime("%Y-%m-%d")
+    no_hash = df["hash"] == ""
+    if no_hash.any():
+        df.loc[no_hash, "hash"] = [batch_hash(i, r, p) for i, r, p in
+                                   df.loc[no_hash, ["id", "riwayat", "petani"]].itertuples(index=False)]
+    harga = pd.to_numeric(df["harga"], errors="coerce")
+    klaim = df["klaim"].map({k: json.dumps([x.strip() for x in k.split(";") if x.strip()])
+                             for k in df["klaim"].unique()})
+    n = len(df)
+    rows = list(zip(
+        df["id"].tolist(), df["hash"].tolist(), df["produk"].tolist(), df["varietas"].tolist(),
+        df["tgl"].tolist(), df["petani"].tolist(), df["lokasi"].tolist(),
+        [None if pd.isna(h) else int(h) for h in harga.tolist()],
+        [k or None for k in df["kontak"].tolist()], df["riwayat"].tolist(), klaim.tolist(),
+        [None] * n, [created_at] * n,
+    ))
+    return rows, rejected
+
+
+def _from_row(row):
+    batch = dict(zip(COLUMNS, row))
+    batch["tgl"] = datetime.date.fromisoformat(batch["tgl"]) if batch["tgl"] else None
+    batch["klaim"] = json.loads(batch["klaim"]) if batch["klaim"] else []
+    return batch
+
+
+def _count_data_lines(source):
+    """Approximate data rows of a CSV path or seekable file (for progress); None if unknown."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return _count_data_lines(f)
+    if not (hasattr(source, "seek") and hasattr(source, "tell")):
+        return None
+    start = source.tell()
+    n = 0
+    while block := source.read(1 << 20):
+        n += block.count("\n" if isinstance(block, str) else b"\n")
+    source.seek(start)
+    return max(n, 1)
+
+
+class BatchRegistry:
+    """SQLite batch store with an LRU read path for consumer scans."""
+
+    def __init__(self, db_file=REGISTRY_DB, cache_size=SCAN_CACHE_MAX):
+        self.db_file = db_file
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """One write transaction: committed (or rolled back) and always closed."""
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _reader(self):
+        """Per-thread read connection reused across scans."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    def _invalidate(self, ids):
+        with self._lock:
+            for batch_id in ids:
+                self._cache.pop(batch_id, None)
+
+    # ---------- Writes ----------
+    def upsert(self, batch):
+        row = _to_row(batch)
+        with self._connect() as conn:
+            conn.execute(f"INSERT OR REPLACE INTO batches ({', '.join(COLUMNS)}, created_at) "
+                         f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))})", row)
+        self._invalidate([row[0]])
+        return row[0]
+
+    def import_csv(self, source, chunk_size=IMPORT_CHUNK, progress=None, rejected=None):
+        """
+        Bulk import batches from CSV (columns as in COLUMNS; `klaim` separated by ';').
+        Reads in chunks, all written in one transaction: a failure leaves the registry
+        unchanged. Rows with an unparseable `tgl` raise ValueError, or are skipped and
+        appended to `rejected` ({id, tgl, alasan}) when a list is given.
+        `progress(rows_done, fraction)` is called after each chunk, ending at 1.0.
+        Returns rows imported.
+        """
+        expected = _count_data_lines(source)
+        total, ids = 0, []
+        with self._connect() as conn:
+            for chunk in pd.read_csv(source, dtype=str, keep_default_na=False, chunksize=chunk_size):
+                chunk.columns = [c.strip().lower() for c in chunk.columns]
+                missing = [c for c in REQUIRED_CSV if c not in chunk.columns]
+                if missing:
+                    raise ValueError(f"Kolom wajib tidak ada: {', '.join(missing)}")
+                rows, bad = _csv_rows(chunk, datetime.datetime.now().isoformat())
+                if bad:
+                    if rejected is None:
+                        raise ValueError(f"Tanggal tidak valid untuk batch {bad[0]['id']}: {bad[0]['tgl']!r}")
+                    rejected.extend(bad)
+                conn.executemany(f"INSERT OR REPLACE INTO batches ({', '.join(COLUMNS)}, created_at) "
+                                 f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))})", rows)
+                ids.extend(r[0] for r in rows)
+                total += len(rows)
+                if progress:
+                    progress(total, min(total / expected, 0.99) if expected else 0.0)
+        self._invalidate(ids)
+        if progress:
+            progress(total, 1.0)
+        return total
+
+    # ---------- Reads ----------
+    def get(self, batch_id):
+        """Scan lookup: LRU hit or one primary-key probe. Returns dict or None."""
+        batch_id = parse_scan(batch_id)
+        with self._lock:
+            if batch_id in self._cache:
+                self._cache.move_to_end(batch_id)
+                return dict(self._cache[batch_id])
+        row = self._reader().execute(
+            f"SELECT {', '.join(COLUMNS)} FROM batches WHERE id = ?", (batch_id,)).fetchone()
+        if row is None:
+            return None
+        batch = _from_row(row)
+        with self._lock:
+            self._cache[batch_id] = batch
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return dict(batch)
+
+    def count(self):
+        return self._reader().execute("SELECT COUNT(*) FROM batches").fetchone()[0]
+
+    def search(self, date_from=None, date_to=None, petani=None, produk=None, limit=100, offset=0):
+        """Producer-side search over the secondary indexes (newest harvest first)."""
+        where, args = [], []
+        if petani:
+            where.append("petani = ?")
+            args.append(petani)
+        if produk:
+            where.append("produk = ?")
+            args.append(produk)
+        if date_from:
+            where.append("tgl >= ?")
+            args.append(str(date_from))
+        if date_to:
+            where.append("tgl <= ?")
+            args.append(str(date_to))
+        sql = ("SELECT id, produk, varietas, tgl, petani, lokasi, harga FROM batches"
+               + (f" WHERE {' AND '.join(where)}" if where else "")
+               + " ORDER BY tgl DESC, id LIMIT ? OFFSET ?")
+        return pd.read_sql_query(sql, self._reader(), params=[*args, int(limit), int(offset)])
+
+    def distinct(self, column):
+        """Distinct farmers / commodities for filter widgets (index-only scan)."""
+        if column not in ("petani", "produk"):
+            raise ValueError(f"Kolom tidak didukung: {column}")
+        return [r[0] for r in self._reader().execute(f"SELECT DISTINCT {column} FROM batches ORDER BY {column}")]
@@ -0,0 +1,206 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from services.crop_service import CropService
+
+# ==========================================
+# 💰 RAB BUDGET ENGINE (SCENARIO & SENSITIVITY)
+# ==========================================
+# A RAB template is compiled once into per-hectare arrays. Each item's cost is
+# split into drivers (other / HOK volume / fertilizer cost) so a whole batch of
+# what-if scenarios is a single (scenarios × drivers) · (drivers,) product.
+
+DRIVERS = ("other", "hok", "fert")
+SEED_OPTIONS = ("semai", "bibit")
+
+# Scenario variables → label used in charts
+SCENARIO_VARS = {
+    "area_ha": "Luas Lahan (Ha)",
+    "yield_per_ha": "Hasil Panen (/ha)",
+    "price": "Harga Jual",
+    "hok_wage": "Upah HOK",
+    "fert_mult": "Harga Pupuk (x)",
+}
+
+
+def _is_fertilizer(kategori):
+    return "Pupuk" in kategori or "Nutrisi" in kategori
+
+
+class CompiledRAB:
+    """Per-hectare RAB arrays plus option masks and the driver matrix."""
+
+    def __init__(self, items, name=""):
+        self.name = name
+        self.items = pd.DataFrame([{
+            "kategori": it.get("kategori", "Lainnya"),
+            "item": it.get("item", "-"),
+            "satuan": it.get("satuan", "-"),
+            "volume": float(it.get("volume", 0) or 0),
+            "harga": float(it.get("harga", 0) or 0),
+            "opsi": it.get("opsi"),
+        } for it in items])
+        if self.items.empty:
+            self.items = pd.DataFrame(columns=["kategori", "item", "satuan", "volume", "harga", "opsi"])
+
+        self.volume = self.items["volume"].to_numpy(float)
+        self.price = self.items["harga"].to_numpy(float)
+        self.is_hok = (self.items["satuan"] == "HOK").to_numpy()
+        self.is_fert = self.items["kategori"].map(_is_fertilizer).to_numpy(bool) & ~self.is_hok
+        opsi = self.items["opsi"]
+        self.option_masks = {opt: (opsi == opt).to_numpy() for opt in ("semai", "bibit", "premium")}
+
+        # items × drivers: contribution of each item per unit of driver multiplier
+        cost = self.volume * self.price
+        self.driver_matrix = np.column_stack([
+            np.where(~self.is_hok & ~self.is_fert, cost, 0.0),
+            np.where(self.is_hok, self.volume, 0.0),
+            np.where(self.is_fert, cost, 0.0),
+        ])
+
+    def active_mask(self, seed_method="semai", booster=True):
+        """Items kept for a seeding method / booster choice (same rule as the page)."""
+        mask = np.ones(len(self.volume), dtype=bool)
+        for opt in SEED_OPTIONS:
+            if opt != seed_method:
+                mask &= ~self.option_masks[opt]
+        if not booster:
+            mask &= ~self.option_masks["premium"]
+        return mask
+
+    def drivers(self, options=(("semai", True),)):
+        """(option combos × drivers) totals per hectare."""
+        masks = np.array([self.active_mask(m, b) for m, b in options], dtype=float)
+        return masks @ self.driver_matrix
+
+    def cost_per_ha(self, hok_wage, fert_mult=1.0, seed_method="semai", booster=True):
+        d = self.drivers([(seed_method, booster)])[0]
+        return d[0] + d[1] * hok_wage + d[2] * fert_mult
+
+
+def compile_rab_table(df, area_ha, name=""):
+    """Compile an edited RAB table (page columns, volumes for the whole area) per hectare."""
+    area_ha = max(float(area_ha), 1e-9)
+    items = [{
+        "kategori": str(r.get("Kategori") or "Lainnya"),
+        "item": str(r.get("Uraian") or "-"),
+        "satuan": str(r.get("Satuan") or "-"),
+        "volume": float(r.get("Volume") or 0) / area_ha,
+        "harga": float(r.get("Harga Satuan (Rp)") or 0),
+    } for r in df.to_dict("records")]
+    return CompiledRAB(items, name=name)
+
+
+@lru_cache(maxsize=None)
+def get_compiled_template(crop_name):
+    """CropService RAB template compiled once per process."""
+    template = CropService.get_rab_template(crop_name)
+    if not template:
+        raise ValueError(f"Template RAB tidak ditemukan: {crop_name}")
+    return CompiledRAB(template["items"], name=crop_name)
+
+
+def compile_all_templates():
+    return {name: get_compiled_template(name) for name in CropService.get_all_crops()
+            if CropService.get_rab_template(name)}
+
+
+def evaluate_scenarios(rab, area_ha, yield_per_ha, price, hok_wage, fert_mult=1.0,
+                       options=(("semai", True),), option_index=0):
+    """
+    Vectorized budget for many scenarios. All numeric inputs broadcast together;
+    `option_index` selects a row of `options` per scenario.
+    Returns dict of arrays: cost, revenue, profit, roi, bep_price, bep_yield.
+    """
+    area, yld, prc, wage, fert, opt_idx = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (area_ha, yield_per_ha, price, hok_wage, fert_mult)),
+        np.asarray(option_index, dtype=int))
+    drivers = rab.drivers(options)[opt_idx]                    # (..., 3)
+    multipliers = np.stack([np.ones_like(wage), wage, fert], axis=-1)
+    cost_ha = np.einsum("...k,...k->...", multipliers, drivers)
+
+    cost = cost_ha * area
+    revenue = yld * prc * area
+    profit = revenue - cost
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = np.where(cost > 0, profit / cost * 100, 0.0)
+        bep_price = np.where(yld > 0, cost_ha / yld, np.inf)
+        bep_yield = np.where(prc > 0, cost_ha / prc, np.inf)
+    return {"cost": cost, "cost_per_ha": cost_ha, "revenue": revenue, "profit": profit,
+            "roi": roi, "bep_price": bep_price, "bep_yield": bep_yield}
+
+
+def sensitivity_analysis(rab, base, ranges=None, n_samples=5000, surface_steps=25, seed=42):
+    """
+    One-call what-if report around `base` (dict with SCENARIO_VARS keys).
+    `ranges` maps a variable to (low, high); default ±20% for all but area.
+
+    Returns dict:
+      base       — evaluate_scenarios() at the base point (scalars)
+      samples    — Monte Carlo scenarios (uniform in ranges) with profit, DataFrame
+      stats      — mean / p5 / p50 / p95 profit and probability of loss
+      tornado    — profit at each variable's low/high with others at base, sorted by swing
+      bep_price  — break-even price surface over yield × HOK wage, DataFrame
+      bep_yield  — break-even yield surface over price × fertilizer multiplier, DataFrame
+    """
+    base = {"fert_mult": 1.0, **base}
+    if ranges is None:
+        ranges = {k: (base[k] * 0.8, base[k] * 1.2) for k in SCENARIO_VARS if k != "area_ha"}
+    rng = np.random.default_rng(seed)
+
+    def run(**overrides):
+        p = {**base, **overrides}
+        return evaluate_scenarios(rab, p["area_ha"], p["yield_per_ha"], p["price"], p["hok_wage"], p["fert_mult"])
+
+    base_res = {k: float(v) for k, v in run().items()}
+
+    # Monte Carlo distribution
+    draws = {k: rng.uniform(lo, hi, n_samples) for k, (lo, hi) in ranges.items()}
+    mc = run(**draws)
+    samples = pd.DataFrame({**{k: np.broadcast_to(v, n_samples) for k, v in draws.items()},
+                            "profit": mc["profit"], "roi": mc["roi"]})
+    profit = samples["profit"].to_numpy()
+    stats = {
+        "mean": float(profit.mean()),
+        "p5": float(np.percentile(profit, 5)),
+        "p50": float(np.percentile(profit, 50)),
+        "p95": float(np.percentile(profit, 95)),
+        "prob_loss": float((profit < 0).mean()),
+    }
+
+    # Tornado: one variable at a time, evaluated as one batch
+    names = list(ranges)
+    lows = run(**{k: np.array([ranges[k][0] if k == n else base[k] for n in names]) for k in names})["profit"]
+    highs = run(**{k: np.array([ranges[k][1] if k == n else base[k] for n in names]) for k in names})["profit"]
+    tornado = pd.DataFrame({
+        "variable": names,
+        "label": [SCENARIO_VARS.get(n, n) for n in names],
+        "low_value": [ranges[n][0] for n in names],
+        "high_value": [ranges[n][1] for n in names],
+        "profit_low": lows,
+        "profit_high": highs,
+    })
+    tornado["swing"] = (tornado["profit_high"] - tornado["profit_low"]).abs()
+    tornado = tornado.sort_values("swing", ascending=False, ignore_index=True)
+
+    # Break-even surfaces
+    def axis(name):
+        lo, hi = ranges.get(name, (base[name] * 0.8, base[name] * 1.2))
+        return np.linspace(lo, hi, surface_steps)
+
+    y_ax, w_ax = axis("yield_per_ha"), axis("hok_wage")
+    bep_p = run(yield_per_ha=y_ax[:, None], hok_wage=w_ax[None, :])["bep_price"]
+    p_ax, f_ax = axis("price"), axis("fert_mult")
+    bep_y = run(price=p_ax[:, None], fert_mult=f_ax[None, :])["bep_yield"]
+
+    return {
+        "base": base_res,
+        "samples": samples,
+        "stats": stats,
+        "tornado": tornado,
+        "bep_price": pd.DataFrame(bep_p, index=pd.Index(y_ax, name="yield_per_ha"), columns=pd.Index(w_ax, name="hok_wage")),
+        "bep_yield": pd.DataFrame(bep_y, index=pd.Index(p_ax, name="price"), columns=pd.Index(f_ax, name="fert_mult")),
+    }
+
@@ -0,0 +1,156 @@
+import re
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+# ==========================================
+# 🗂️ FACETED CATALOG INDEX
+# ==========================================
+# Read-only index over a product catalog ({name: record}). Items are stored in
+# price order, so a price range is one contiguous run of bits. Every facet
+# value and every common text token has a posting list kept as a Python int
+# bitset (rare tokens keep a position array until queried); filters are ANDs
+# of bitsets and facet counts are popcounts. Built once per
+# catalog version, queried on every rerun.
+
+TOKEN_PATTERN = re.compile(r"\w+")
+ALL = "Semua"
+DENSE_RATIO = 64             # postings shorter than size/64 stay as position arrays (rare tokens, SKU codes)
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+def _bits(positions, size):
+    """Bitset (int) with the given positions set, packed in one pass."""
+    flags = np.zeros(size, dtype=bool)
+    flags[positions] = True
+    return int.from_bytes(np.packbits(flags, bitorder="little").tobytes(), "little")
+
+
+class CatalogIndex:
+    """Facet / price / text index over {name: record}."""
+
+    def __init__(self, items, facets=(), price_field=None, text_fields=(), sort_fields=()):
+        names = list(items)
+        records = [items[n] for n in names]
+        if price_field:
+            order = sorted(range(len(names)), key=lambda i: (records[i].get(price_field) or 0, names[i]))
+            names, records = [names[i] for i in order], [records[i] for i in order]
+        self.names = names
+        self.records = records
+        self.size = len(names)
+        self.full = (1 << self.size) - 1
+        self.price_field = price_field
+        self.prices = [r.get(price_field) or 0 for r in records] if price_field else []
+
+        # Facet posting lists
+        self.facets = {}
+        for field in facets:
+            postings = {}
+            for pos, rec in enumerate(records):
+                postings.setdefault(rec.get(field), []).append(pos)
+            self.facets[field] = {value: _bits(p, self.size) for value, p in postings.items() if value is not None}
+
+        # Token posting lists over name + text fields; sorted vocabulary for prefix lookups
+        token_pos = {}
+        for pos, (name, rec) in enumerate(zip(names, records)):
+            text = " ".join([name, *(str(rec.get(f, "")) for f in text_fields)])
+            for token in set(tokenize(text)):
+                token_pos.setdefault(token, []).append(pos)
+        self.vocabulary = sorted(token_pos)
+        dense_min = max(self.size // DENSE_RATIO, 1)
+        self.tokens = {t: _bits(p, self.size) if len(p) >= dense_min else np.array(p, dtype=np.int64)
+                       for t, p in token_pos.items()}
+
+        # Precomputed orderings (positions) for result sorting
+        self._orders = {"name": np.argsort(np.array(names, dtype=object), kind="stable")}
+        for field in sort_fields:
+            values = np.array([r.get(field) or 0 for r in records], dtype=float)
+            self._orders[field] = np.argsort(values, kind="stable")
+
+    # ---------- Building blocks ----------
+    def facet_values(self, field):
+        return sorted(self.facets[field], key=str)
+
+    def price_mask(self, lo=None, hi=None):
+        """Items with lo <= price <= hi: a contiguous bit range thanks to price ordering."""
+        start = 0 if lo is None else bisect_left(self.prices, lo)
+        end = self.size if hi is None else bisect_right(self.prices, hi)
+        if end <= start:
+            return 0
+        return ((1 << end) - 1) ^ ((1 << start) - 1)
+
+    def text_mask(self, query):
+        """Every query token must prefix-match some token of the item (name + text fields)."""
+        mask = self.full
+        for term in tokenize(query):
+            lo = bisect_left(self.vocabulary, term)
+            hi = bisect_left(self.vocabulary, term + "\uffff")
+            term_mask, sparse = 0, []
+            for token in self.vocabulary[lo:hi]:
+                posting = self.tokens[token]
+                if isinstance(posting, int):
+                    term_mask |= posting
+                else:
+                    sparse.append(posting)
+            if sparse:
+                term_mask |= _bits(np.concatenate(sparse), self.size)
+            mask &= term_mask
+            if not mask:
+                break
+        return mask
+
+    def facet_mask(self, field, value):
+        if value is None or value == ALL:
+            return self.full
+        return self.facets[field].get(value, 0)
+
+    # ---------- Queries ----------
+    def query(self, filters=None, text=None, price_range=None):
+        """
+        Filter by facet values ({field: value}; None / "Semua" = any), text and
+        price range. Returns (mask, facet_counts) where each facet's counts apply
+        every other filter (drill-sideways), so the widgets show live counts.
+        """
+        filters = {f: v for f, v in (filters or {}).items() if v is not None and v != ALL}
+        base = self.full
+        if text:
+            base &= self.text_mask(text)
+        if price_range:
+            base &= self.price_mask(*price_range)
+        facet_masks = {f: self.facet_mask(f, v) for f, v in filters.items()}
+
+        mask = base
+        for m in facet_masks.values():
+            mask &= m
+
+        counts = {}
+        for field, postings in self.facets.items():
+            others = base
+            for f, m in facet_masks.items():
+                if f != field:
+                    others &= m
+            counts[field] = {value: (bits & others).bit_count() for value, bits in postings.items()}
+        return mask, counts
+
+    def positions(self, mask, sort_by=None, descending=False):
+        """Positions of set bits, ordered by name / price / a sort field."""
+        if not mask:
+            return np.array([], dtype=np.int64)
+        nbytes = (self.size + 7) // 8
+        selected = np.unpackbits(np.frombuffer(mask.to_bytes(nbytes, "little"), dtype=np.uint8),
+                                 bitorder="little")[:self.size].astype(bool)
+        if sort_by in (None, "price", self.price_field):
+            order = np.arange(self.size)             # storage order is price order
+        else:
+            order = self._orders[sort_by]
+        out = order[selected[order]]
+        return out[::-1] if descending else out
+
+    def select(self, mask, sort_by=None, descending=False, offset=0, limit=None):
+        """{name: record} for the set bits, sorted, optionally one page."""
+        pos = self.positions(mask, sort_by, descending)
+        pos = pos[offset:None if limit is None else offset + limit]
+        return {self.names[p]: self.records[p] for p in pos}
@@ -0,0 +1,264 @@
+import hashlib
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# ==========================================
+# 📥 DATA INGESTION & DOWNSAMPLING (INTELLIGENCE PRO)
+# ==========================================
+# Uploads are converted once into a Parquet file keyed by content hash.
+# CSVs are streamed in chunks with a schema inferred from a sample, so the
+# conversion never holds the raw text frame in memory; the cached frame is
+# downcast (smaller numerics, categoricals). Charts receive LTTB / min-max
+# downsampled series instead of every row. The cache folder is capped in
+# size, least recently used files first.
+
+INGEST_CACHE_DIR = os.path.join("data", "ingest_cache")
+INGEST_CACHE_MAX_BYTES = 2 * 1024 ** 3   # least recently used Parquet files beyond this are removed
+SAMPLE_ROWS = 10_000
+CSV_CHUNK_ROWS = 250_000
+HASH_BLOCK = 8 * 1024 * 1024
+MAX_CHART_POINTS = 2_000
+CATEGORY_MAX_RATIO = 0.5     # object column → category if unique/rows below this
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+# ---------- Hashing & schema ----------
+def content_hash(fileobj):
+    """BLAKE2 digest of an uploaded file, read in blocks (position restored)."""
+    h = hashlib.blake2b(digest_size=16)
+    pos = fileobj.tell() if hasattr(fileobj, "tell") else 0
+    fileobj.seek(0)
+    for block in iter(lambda: fileobj.read(HASH_BLOCK), b""):
+        h.update(block)
+    fileobj.seek(pos)
+    return h.hexdigest()
+
+
+def infer_schema(sample):
+    """
+    Column roles from a sample frame.
+    Returns dict(dates=[...], numeric=[...], text=[...]).
+    """
+    dates, numeric, text = [], [], []
+    for col in sample.columns:
+        s = sample[col]
+        if pd.api.types.is_datetime64_any_dtype(s):
+            dates.append(col)
+        elif pd.api.types.is_bool_dtype(s) or not pd.api.types.is_numeric_dtype(s):
+            non_null = s.dropna().astype(str)
+            if len(non_null) and non_null.str.match(DATE_PATTERN).all():
+                dates.append(col)
+            else:
+                text.append(col)
+        else:
+            numeric.append(col)
+    return {"dates": dates, "numeric": numeric, "text": text}
+
+
+def downcast_frame(df, category_max_ratio=CATEGORY_MAX_RATIO):
+    """Shrink numeric dtypes and turn repetitive text into categoricals (in place)."""
+    n = max(len(df), 1)
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_float_dtype(s):
+            values = s.to_numpy()
+            if np.isfinite(values).all() and np.array_equal(values, np.round(values)):
+                df[col] = pd.to_numeric(s.astype(np.int64), downcast="integer")
+            else:
+                df[col] = pd.to_numeric(s, downcast="float")
+        elif pd.api.types.is_integer_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            df[col] = pd.to_numeric(s, downcast="integer")
+        elif pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s):
+            if s.nunique(dropna=True) / n < category_max_ratio:
+                df[col] = s.astype("category")
+    return df
+
+
+def detect_date_columns(df, sample_rows=SAMPLE_ROWS):
+    """Datetime columns of `df`; YYYY-MM-DD text columns are checked on a sample, then converted in place."""
+    date_cols = []
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_datetime64_any_dtype(s):
+            date_cols.append(col)
+            continue
+        if pd.api.types.is_numeric_dtype(s) or pd.api.types.is_bool_dtype(s):
+            continue
+        head = s.dropna().head(sample_rows).astype(str)
+        if len(head) and head.str.match(DATE_PATTERN).all():
+            try:
+                df[col] = pd.to_datetime(s, format="ISO8601")
+                date_cols.append(col)
+            except (ValueError, TypeError):
+                pass
+    return date_cols
+
+
+# ---------- Loading ----------
+def _prepare_chunk(chunk, schema):
+    for col in schema["dates"]:
+        chunk[col] = pd.to_datetime(chunk[col], format="ISO8601", errors="coerce")
+    for col in schema["numeric"]:
+        chunk[col] = chunk[col].astype("float64")
+    return chunk
+
+
+def csv_to_parquet(fileobj, out_path, chunk_rows=CSV_CHUNK_ROWS, sample_rows=SAMPLE_ROWS, progress=None):
+    """Stream a CSV into a Parquet file chunk by chunk. Returns rows written."""
+    fileobj.seek(0)
+    sample = pd.read_csv(fileobj, nrows=sample_rows)
+    schema = infer_schema(sample)
+    fileobj.seek(0)
+    dtypes = {**{c: "float64" for c in schema["numeric"]}, **{c: "string" for c in schema["text"] + schema["dates"]}}
+
+    tmp = f"{out_path}.tmp"
+    writer, arrow_schema, rows = None, None, 0
+    try:
+        for chunk in pd.read_csv(fileobj, dtype=dtypes, chunksize=chunk_rows):
+            table = pa.Table.from_pandas(_prepare_chunk(chunk, schema), preserve_index=False)
+            if writer is None:
+                arrow_schema = table.schema
+                writer = pq.ParquetWriter(tmp, arrow_schema)
+            writer.write_table(table.cast(arrow_schema))
+            rows += len(chunk)
+            if progress:
+                progress(rows)
+    except BaseException:
+        # A failed conversion leaves no partial file behind; the caller falls back to a full read
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    if writer is not None:
+        writer.close()
+    if writer is None:
+        pa_empty = pa.Table.from_pandas(sample.head(0), preserve_index=False)
+        pq.write_table(pa_empty, tmp)
+    os.replace(tmp, out_path)
+    return rows
+
+
+def prune_cache(cache_dir=INGEST_CACHE_DIR, max_bytes=INGEST_CACHE_MAX_BYTES, keep=None):
+    """Remove the least recently used Parquet files until the folder fits `max_bytes`. Returns files removed."""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and entry.name.endswith(".parquet") and entry.path != keep:
+            info = entry.stat()
+            entries.append((info.st_mtime, info.st_size, entry.path))
+    total = sum(size for _, size, _ in entries) + (os.path.getsize(keep) if keep and os.path.exists(keep) else 0)
+    removed = []
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed.append(path)
+    return removed
+
+
+def load_dataset(fileobj, name, cache_dir=INGEST_CACHE_DIR, progress=None, max_cache_bytes=INGEST_CACHE_MAX_BYTES):
+    """
+    Load an upload through the Parquet cache.
+    CSV is streamed; Excel is read once. Returns a downcast DataFrame.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{content_hash(fileobj)}.parquet")
+    if os.path.exists(path):
+        os.utime(path)      # mark as recently used for pruning
+    else:
+        if name.lower().endswith(".csv"):
+            try:
+                csv_to_parquet(fileobj, path, progress=progress)
+            except (ValueError, TypeError):
+                # Column types change after the sample: fall back to one full read
+                fileobj.seek(0)
+                df = pd.read_csv(fileobj)
+                detect_date_columns(df)
+                df.to_parquet(path, index=False)
+        else:
+            fileobj.seek(0)
+            df = pd.read_excel(fileobj)
+            detect_date_columns(df)
+            df.to_parquet(path, index=False)
+        prune_cache(cache_dir, max_cache_bytes, keep=path)
+    return downcast_frame(pd.read_parquet(path))
+
+
+# ---------- Downsampling for charts ----------
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indices of `n_out` visually representative points."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x, y = _as_float(x), np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_lo, nxt_hi = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[nxt_lo:nxt_hi].mean(), y[nxt_lo:nxt_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+
+def minmax_indices(y, n_out):
+    """Min and max of each of n_out/2 equal buckets (keeps spikes), vectorized."""
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    buckets = max(n_out // 2, 1)
+    size = n // buckets
+    usable = size * buckets
+    view = np.asarray(y[:usable], dtype=float).reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    idx = np.concatenate([offsets + np.nanargmin(view, axis=1), offsets + np.nanargmax(view, axis=1),
+                          np.arange(usable, n)])
+    return np.unique(idx)
+
+
+def downsample(df, x, y, n_out=MAX_CHART_POINTS, method="lttb", group=None):
+    """Rows of `df` (sorted by x) reduced to ≈n_out points per group for plotting."""
+    if len(df) <= n_out:
+        return df.sort_values(x) if x in df.columns else df
+    parts = []
+    groups = df.groupby(group, observed=True, sort=False) if group else [(None, df)]
+    for _, part in groups:
+        part = part.dropna(subset=[y]).sort_values(x)
+        if method == "minmax":
+            idx = minmax_indices(part[y].to_numpy(), n_out)
+        else:
+            idx = lttb_indices(part[x].to_numpy(), part[y].to_numpy(), n_out)
+        parts.append(part.iloc[idx])
+    return pd.concat(parts) if parts else df.head(0)
+
+
+def binned_counts(df, x, color=None, bins=50):
+    """Pre-binned histogram counts so the browser never receives every row."""
+    keys = [color] if color else []
+    if pd.api.types.is_numeric_dtype(df[x]) or pd.api.types.is_datetime64_any_dtype(df[x]):
+        binned = pd.cut(df[x], bins=bins)
+        out = df.groupby([binned, *keys], observed=True).size().reset_index(name="count")
+        out[x] = out[x].map(lambda iv: iv.mid).astype(str) if pd.api.types.is_datetime64_any_dtype(df[x]) \
+            else out[x].map(lambda iv: iv.mid).astype(float)
+        return out
+    return df.groupby([x, *keys], observed=True).size().reset_index(name="count")
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+from utils.lazy_imports import lazy_attr, lazy_import
+
+sparse = lazy_import("scipy.sparse")
+linprog = lazy_attr("scipy.optimize", "linprog")
+
+# ==========================================
+# 🧪 LEAST-COST FERTILIZER BLEND
+# ==========================================
+# Cheapest product mix that meets N, P and K targets at the same time, with
+# whole 50 kg sacks, a minimum organic share of every nutrient and stock
+# limits. Many field targets are solved as one sparse problem: the per-field
+# nutrient matrix is tiled block-diagonally and fields share the sack totals
+# (what the cooperative actually buys) and the stock limits.
+
+NUTRIENTS = ("N", "P", "K")
+BAG_KG = 50
+EXACT_MAX_FIELDS = 200        # above this, sack totals are the LP totals rounded up (≤ 1 sack/product off)
+APPLY_COST_EPS = 1e-6         # tiny cost on applied kg so fields don't receive surplus from the shared sacks
+
+
+def products_from_db(db, price_key=None):
+    """
+    Normalize a fertilizer dict ({name: {N, P, K, price|price_per_kg, type}})
+    into a DataFrame [name, N, P, K (%), price (Rp/kg), organic].
+    """
+    rows = []
+    for name, info in db.items():
+        key = price_key or ("price" if "price" in info else "price_per_kg")
+        rows.append({
+            "name": name, **{n: float(info.get(n, 0)) for n in NUTRIENTS},
+            "price": float(info[key]), "organic": info.get("type") == "organik",
+        })
+    return pd.DataFrame(rows)
+
+
+class BlendOptimizer:
+    """Least-cost blends for one or many nutrient targets over a fixed product list."""
+
+    def __init__(self, products, bag_kg=BAG_KG):
+        self.products = products.reset_index(drop=True)
+        self.bag_kg = bag_kg
+        self.names = self.products["name"].tolist()
+        self.A = self.products[list(NUTRIENTS)].to_numpy(float).T / 100     # 3 × m, kg nutrient per kg product
+        self.price = self.products["price"].to_numpy(float)
+        self.organic = self.products["organic"].to_numpy(bool)
+        self.A_org = self.A * self.organic
+
+    def _assemble(self, weights, organic_share):
+        """Sparse A_ub for unique fields with multiplicities `weights`: [x_1..x_u, sacks]."""
+        u, m = len(weights), len(self.names)
+        eye = sparse.identity(u, format="csr")
+        blocks = [sparse.kron(eye, -self.A)]
+        if organic_share > 0:
+            blocks.append(sparse.kron(eye, -self.A_org))
+        fields = sparse.vstack(blocks)
+        link = sparse.hstack([sparse.kron(weights.reshape(1, -1), sparse.identity(m)),
+                              -self.bag_kg * sparse.identity(m)])
+        return sparse.vstack([sparse.hstack([fields, sparse.csr_matrix((fields.shape[0], m))]), link], format="csr")
+
+    def optimize(self, targets, organic_share=0.0, stock=None, exact_max_fields=EXACT_MAX_FIELDS):
+        """
+        Plan all `targets` (n × 3 kg N/P/K, array or DataFrame with N/P/K columns).
+        `organic_share`: minimum fraction of each nutrient from organic products.
+        `stock`: {product: kg available} for the whole plan (missing = unlimited).
+        Returns dict(status, message, fields [n × product kg], sacks, cost, lower_bound, exact, supplied).
+        """
+        T = targets[list(NUTRIENTS)].to_numpy(float) if isinstance(targets, pd.DataFrame) else np.asarray(targets, float)
+        T = np.atleast_2d(T)
+        m = len(self.names)
+        unique, inverse, counts = np.unique(np.round(T, 6), axis=0, return_inverse=True, return_counts=True)
+        inverse = inverse.ravel()
+        u = len(unique)
+
+        A_ub = self._assemble(counts.astype(float), organic_share)
+        b_ub = [-unique.ravel()]
+        if organic_share > 0:
+            b_ub.append(-organic_share * unique.ravel())
+        b_ub = np.concatenate([*b_ub, np.zeros(m)])
+        c = np.concatenate([np.tile(self.price * APPLY_COST_EPS, u) * np.repeat(counts, m),
+                            self.price * self.bag_kg])
+        max_sacks = [np.floor(stock[n] / self.bag_kg) if stock and stock.get(n) is not None else None
+                     for n in self.names]
+        bounds = [(0, None)] * (u * m) + [(0, s) for s in max_sacks]
+
+        exact = len(T) <= exact_max_fields
+        integrality = np.concatenate([np.zeros(u * m), np.ones(m)]) if exact else None
+        res = linprog(c, A_ub=A_ub, b_ub=b_ub, bounds=bounds, integrality=integrality, method="highs")
+        if res.status != 0:
+            msg = "Target tidak dapat dipenuhi dengan stok / batas organik saat ini" if res.status == 2 else res.message
+            return {"status": "infeasible" if res.status == 2 else "error", "message": msg}
+
+        x = np.clip(res.x[:u * m].reshape(u, m), 0, None)
+        sacks_lp = res.x[u * m:]
+        sacks = np.round(sacks_lp) if exact else np.ceil(sacks_lp - 1e-9)
+        fields = pd.DataFrame(x[inverse], columns=self.names)
+        cost = float(sacks @ self.price) * self.bag_kg
+        return {
+            "status": "ok", "message": "",
+            "fields": fields,
+            "sacks": pd.Series(sacks.astype(int), index=self.names),
+            "cost": cost,
+            "lower_bound": float(sacks_lp @ self.price) * self.bag_kg,
+            "exact": exact,
+            "supplied": pd.DataFrame(x[inverse] @ self.A.T, columns=list(NUTRIENTS)),
+        }
+
+    def solve(self, target, organic_share=0.0, stock=None):
+        """
+        One field: whole sacks per product. Returns dict(status, message, plan
+        DataFrame [Pupuk, Berat (kg), Karung (50kg), Biaya (Rp), Organik], cost, supplied).
+        """
+        res = self.optimize([[target.get(n, 0.0) for n in NUTRIENTS]], organic_share, stock, exact_max_fields=1)
+        if res["status"] != "ok":
+            return res
+        sacks = res["sacks"]
+        used = sacks[sacks > 0]
+        idx = [self.names.index(n) for n in used.index]
+        plan = pd.DataFrame({
+            "Pupuk": used.index,
+            "Berat (kg)": used.to_numpy() * self.bag_kg,
+            f"Karung ({self.bag_kg}kg)": used.to_numpy(),
+            "Biaya (Rp)": used.to_numpy() * self.bag_kg * self.price[idx],
+            "Organik": self.organic[idx],
+        })
+        supplied = dict(zip(NUTRIENTS, (sacks.to_numpy() * self.bag_kg) @ self.A.T))
+        return {"status": "ok", "message": "", "plan": plan, "cost": res["cost"], "supplied": supplied}
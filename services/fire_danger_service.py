@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# 🔥 FIRE DANGER RATING (FDRS SIMPLIFIED)
+# ==========================================
+# Same point scheme as the Agroforestri calculator (page 44), expressed as
+# threshold tables so whole (blocks × days) matrices are scored at once.
+
+# Each factor scores 0/10/20/30 points. `higher` → bigger value = more danger.
+SCORE_BINS = {
+    "temp": {"bins": (25, 30, 35), "higher": True},      # °C
+    "humidity": {"bins": (40, 60, 80), "higher": False},  # %
+    "wind": {"bins": (5, 15, 30), "higher": True},       # km/h
+    "hth": {"bins": (3, 7, 14), "higher": True},         # hari tanpa hujan
+}
+
+FUEL_FACTORS = {
+    "Daun Lebar (Jati/Mahoni)": 1.0,
+    "Semak Belukar": 1.2,
+    "Serasah Pinus (Mudah Terbakar)": 1.5,
+}
+
+# (min index, level, color, SOP) — ascending
+FIRE_LEVELS = [
+    (0, "LOW (RENDAH)", "#388e3c", "✅ Kondisi Aman."),
+    (20, "MODERATE (SEDANG)", "#fbc02d", "✅ Patroli rutin."),
+    (40, "HIGH (TINGGI)", "#f57c00", "⚠️ Waspada puntung rokok & loncatan api."),
+    (70, "VERY HIGH (SANGAT TINGGI)", "#d32f2f", "🚫 Dilarang menyalakan api. Siaga 1."),
+    (100, "EXTREME (SANGAT EKSTREM)", "#000000", "⛔ AKTIVITAS HUTAN DITUTUP TOTAL."),
+]
+
+RAIN_THRESHOLD_MM = 1.0
+
+
+def factor_score(values, factor):
+    """0/10/20/30 points for any array of values."""
+    cfg = SCORE_BINS[factor]
+    values = np.asarray(values, dtype=float)
+    if cfg["higher"]:
+        # strictly greater than each threshold
+        return 10 * np.digitize(values, cfg["bins"], right=True)
+    # strictly lower than each threshold
+    return 10 * (len(cfg["bins"]) - np.digitize(values, cfg["bins"], right=False))
+
+
+def fire_danger_index(temp, humidity, wind, hth, fuel_factor=1.0):
+    """Vectorized FDRS index; inputs broadcast against each other."""
+    base = (factor_score(temp, "temp") + factor_score(humidity, "humidity")
+            + factor_score(wind, "wind") + factor_score(hth, "hth"))
+    return base * np.asarray(fuel_factor, dtype=float)
+
+
+def danger_level(index):
+    """Level number (0-4) for index arrays; look up text via FIRE_LEVELS[level]."""
+    return np.digitize(np.asarray(index, dtype=float), [lvl[0] for lvl in FIRE_LEVELS[1:]], right=False)
+
+
+def days_without_rain(precip, threshold=RAIN_THRESHOLD_MM, prior_dry_days=0):
+    """
+    Consecutive dry days ending on each day (rain day = 0), along the last axis.
+    Days before the first observed rain continue counting from `prior_dry_days`.
+    """
+    precip = np.nan_to_num(np.asarray(precip, dtype=float))
+    n = precip.shape[-1]
+    idx = np.broadcast_to(np.arange(n), precip.shape)
+    prior = np.broadcast_to(np.asarray(prior_dry_days), precip.shape[:-1])[..., None]
+    last_rain = np.where(precip >= threshold, idx, -1 - prior)
+    last_rain = np.maximum.accumulate(last_rain, axis=-1)
+    return idx - last_rain
+
+
+def forecast_fire_danger(tmax, rh_min, wind_max, precip, fuel_factors, forecast_start=0,
+                         dates=None, block_names=None, alert_level=3):
+    """
+    Blocks × days danger matrix from daily weather arrays (blocks, days).
+    `precip` should include the history before `forecast_start` so the dry-day
+    count is derived from observations; only days from `forecast_start` are scored.
+    Returns dict(index, level, hth, matrix DataFrame, alerts DataFrame).
+    """
+    tmax, rh_min, wind_max, precip = (np.nan_to_num(np.atleast_2d(np.asarray(a, dtype=float)))
+                                      for a in (tmax, rh_min, wind_max, precip))
+    hth = days_without_rain(precip)[:, forecast_start:]
+    fuel = np.asarray(fuel_factors, dtype=float).reshape(-1, 1)
+
+    index = fire_danger_index(tmax[:, forecast_start:], rh_min[:, forecast_start:],
+                              wind_max[:, forecast_start:], hth, fuel)
+    level = danger_level(index)
+
+    n_blocks, n_days = index.shape
+    names = list(block_names) if block_names is not None else [f"Blok {i + 1}" for i in range(n_blocks)]
+    cols = list(dates[forecast_start:forecast_start + n_days]) if dates is not None else [f"H+{d}" for d in range(n_days)]
+    matrix = pd.DataFrame(index, index=names, columns=cols)
+
+    b_idx, d_idx = np.nonzero(level >= alert_level)
+    alerts = pd.DataFrame({
+        "block": np.asarray(names, dtype=object)[b_idx],
+        "date": np.asarray(cols, dtype=object)[d_idx],
+        "index": index[b_idx, d_idx],
+        "level": [FIRE_LEVELS[lv][1] for lv in level[b_idx, d_idx]],
+        "hth": hth[b_idx, d_idx],
+        "sop": [FIRE_LEVELS[lv][3] for lv in level[b_idx, d_idx]],
+    }).sort_values(["index", "date"], ascending=[False, True], ignore_index=True)
+
+    return {"index": index, "level": level, "hth": hth, "matrix": matrix, "alerts": alerts}
@@ -0,0 +1,275 @@
+import os
+import sqlite3
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.lazy_imports import lazy_import
+
+optimize = lazy_import("scipy.optimize")
+
+# ==========================================
+# 📏 GROWTH ANALYTICS STORE (LOGISTIC FITS)
+# ==========================================
+# Measurements live in an indexed SQLite table per (plot, commodity).
+# Fitted (K, r, t0) are cached next to them and warm-started from the
+# previous fit whenever a new measurement arrives.
+
+DB_FILE = os.path.join("data", "growth.db")
+LEGACY_CSV = os.path.join("data", "growth_journal.csv")
+DEFAULT_PLOT = "Lahan Utama"
+
+FIT_BOUNDS = (0, [500, 1, 200])
+MIN_POINTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS measurements (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    plot TEXT NOT NULL,
+    komoditas TEXT NOT NULL,
+    tanggal TEXT,
+    usia_hst REAL NOT NULL,
+    tinggi_cm REAL NOT NULL,
+    jumlah_daun REAL DEFAULT 0,
+    gdd_cumulative REAL DEFAULT 0,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_meas_plot ON measurements (plot, komoditas, usia_hst);
+
+CREATE TABLE IF NOT EXISTS fits (
+    plot TEXT NOT NULL,
+    komoditas TEXT NOT NULL,
+    K REAL, r REAL, t0 REAL,
+    rmse REAL,
+    n_points INTEGER NOT NULL,
+    last_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    message TEXT,
+    updated_at TEXT,
+    PRIMARY KEY (plot, komoditas)
+);
+"""
+
+
+def logistic_model(t, K, r, t0):
+    return K / (1 + np.exp(-r * (t - t0)))
+
+
+def fit_logistic(t, h, p0, bounds=FIT_BOUNDS, maxfev=2000):
+    """
+    Fit the Verhulst curve. Never raises: returns dict with
+    status 'ok' | 'not_converged' | 'failed' | 'insufficient'.
+    """
+    t = np.asarray(t, dtype=float)
+    h = np.asarray(h, dtype=float)
+    if len(t) < MIN_POINTS:
+        return {"status": "insufficient", "message": f"Minimal {MIN_POINTS} data", "K": None, "r": None, "t0": None, "rmse": None}
+
+    lo, hi = np.broadcast_to(bounds[0], 3), np.broadcast_to(bounds[1], 3)
+    p0 = np.clip(np.asarray(p0, dtype=float), lo + 1e-9, hi - 1e-9)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", optimize.OptimizeWarning)
+            popt, pcov = optimize.curve_fit(logistic_model, t, h, p0=p0, bounds=bounds, maxfev=maxfev)
+    except optimize.OptimizeWarning as e:
+        return {"status": "not_converged", "message": str(e), "K": None, "r": None, "t0": None, "rmse": None}
+    except (RuntimeError, ValueError) as e:
+        return {"status": "failed", "message": str(e), "K": None, "r": None, "t0": None, "rmse": None}
+
+    rmse = float(np.sqrt(np.mean((logistic_model(t, *popt) - h) ** 2)))
+    status = "ok" if np.all(np.isfinite(pcov)) else "not_converged"
+    return {"status": status, "message": "", "K": float(popt[0]), "r": float(popt[1]), "t0": float(popt[2]), "rmse": rmse}
+
+
+def _fit_job(job):
+    """Process-pool worker: (key, t, h, p0) -> (key, result)."""
+    key, t, h, p0 = job
+    return key, fit_logistic(t, h, p0)
+
+
+class GrowthStore:
+    """Measurement + fit-cache store for Pantau Pertumbuhan."""
+
+    def __init__(self, db_file=DB_FILE, legacy_csv=LEGACY_CSV):
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        if legacy_csv and os.path.exists(legacy_csv):
+            self._import_legacy_csv(legacy_csv)
+
+    @contextmanager
+    def _connect(self):
+        """One unit of work: committed (or rolled back) and always closed."""
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _import_legacy_csv(self, path):
+        """One-off migration of the old growth_journal.csv (only into an empty store)."""
+        with self._connect() as conn:
+            if conn.execute("SELECT COUNT(*) FROM measurements").fetchone()[0] > 0:
+                return
+            try:
+                df = pd.read_csv(path)
+            except Exception:
+                return
+            if df.empty:
+                return
+            df = df.reindex(columns=['tanggal', 'komoditas', 'usia_hst', 'tinggi_cm', 'jumlah_daun', 'gdd_cumulative'])
+            df['plot'] = DEFAULT_PLOT
+            df['created_at'] = datetime.now().isoformat()
+            conn.executemany(
+                "INSERT INTO measurements (plot, komoditas, tanggal, usia_hst, tinggi_cm, jumlah_daun, gdd_cumulative, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                df[['plot', 'komoditas', 'tanggal', 'usia_hst', 'tinggi_cm', 'jumlah_daun', 'gdd_cumulative', 'created_at']]
+                .fillna(0).itertuples(index=False, name=None),
+            )
+
+    # ---------- Measurements ----------
+    def add_measurement(self, plot, komoditas, tanggal, usia_hst, tinggi_cm, jumlah_daun=0, gdd_cumulative=0.0,
+                        p0=None, refit=True):
+        """Append one measurement, then refit that plot warm-started from its cached parameters."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO measurements (plot, komoditas, tanggal, usia_hst, tinggi_cm, jumlah_daun, gdd_cumulative, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (plot, komoditas, tanggal, float(usia_hst), float(tinggi_cm), float(jumlah_daun),
+                 float(gdd_cumulative), datetime.now().isoformat()),
+            )
+        if refit:
+            return self.refit(plot, komoditas, p0=p0)
+        return None
+
+    def get_measurements(self, plot, komoditas):
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                "SELECT tanggal, komoditas, usia_hst, tinggi_cm, jumlah_daun, gdd_cumulative FROM measurements "
+                "WHERE plot = ? AND komoditas = ? ORDER BY usia_hst, id",
+                conn, params=(plot, komoditas),
+            )
+
+    def latest_gdd(self, plot, komoditas):
+        with self._connect() as conn:
+            val = conn.execute("SELECT MAX(gdd_cumulative) FROM measurements WHERE plot = ? AND komoditas = ?",
+                               (plot, komoditas)).fetchone()[0]
+        return float(val or 0.0)
+
+    def list_plots(self):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT DISTINCT plot FROM measurements ORDER BY plot").fetchall()
+        return [r[0] for r in rows]
+
+    # ---------- Fits ----------
+    def _state(self, conn, plot, komoditas):
+        return conn.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM measurements WHERE plot = ? AND komoditas = ?",
+                            (plot, komoditas)).fetchone()
+
+    def _cached_fit(self, conn, plot, komoditas):
+        row = conn.execute("SELECT K, r, t0, rmse, n_points, last_id, status, message, updated_at FROM fits "
+                           "WHERE plot = ? AND komoditas = ?", (plot, komoditas)).fetchone()
+        if row is None:
+            return None
+        keys = ["K", "r", "t0", "rmse", "n_points", "last_id", "status", "message", "updated_at"]
+        return dict(zip(keys, row))
+
+    def _save_fit(self, conn, plot, komoditas, result, n_points, last_id):
+        conn.execute(
+            "INSERT OR REPLACE INTO fits (plot, komoditas, K, r, t0, rmse, n_points, last_id, status, message, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (plot, komoditas, result["K"], result["r"], result["t0"], result["rmse"], int(n_points), int(last_id),
+             result["status"], result["message"], datetime.now().isoformat()),
+        )
+
+    def _warm_p0(self, cached, p0, h):
+        """Previous good fit first, then the commodity profile, then a data-driven guess."""
+        if cached and cached["status"] == "ok":
+            return [cached["K"], cached["r"], cached["t0"]]
+        if p0 is not None:
+            return p0
+        return [max(float(np.max(h)) * 1.2, 1.0), 0.1, 30.0]
+
+    def refit(self, plot, komoditas, p0=None):
+        """Refit one plot now and store the outcome (including failures)."""
+        with self._connect() as conn:
+            n, last_id = self._state(conn, plot, komoditas)
+            cached = self._cached_fit(conn, plot, komoditas)
+            data = conn.execute("SELECT usia_hst, tinggi_cm FROM measurements WHERE plot = ? AND komoditas = ?",
+                                (plot, komoditas)).fetchall()
+            t, h = (np.array(col, dtype=float) for col in zip(*data)) if data else (np.array([]), np.array([]))
+            result = fit_logistic(t, h, self._warm_p0(cached, p0, h))
+            self._save_fit(conn, plot, komoditas, result, n, last_id)
+            return self._cached_fit(conn, plot, komoditas)
+
+    def get_fit(self, plot, komoditas, p0=None):
+        """Cached fit; refits only if measurements changed since it was stored."""
+        with self._connect() as conn:
+            n, last_id = self._state(conn, plot, komoditas)
+            cached = self._cached_fit(conn, plot, komoditas)
+        if cached and cached["last_id"] == last_id and cached["n_points"] == n:
+            return cached
+        return self.refit(plot, komoditas, p0=p0)
+
+    def stale_keys(self):
+        """(plot, komoditas) pairs whose cached fit is missing or out of date."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT m.plot, m.komoditas FROM measurements m "
+                "LEFT JOIN fits f ON f.plot = m.plot AND f.komoditas = m.komoditas "
+                "GROUP BY m.plot, m.komoditas "
+                "HAVING f.last_id IS NULL OR f.last_id != MAX(m.id) OR f.n_points != COUNT(m.id)"
+            ).fetchall()
+        return [tuple(r) for r in rows]
+
+    def batch_fit(self, profiles_p0=None, keys=None, max_workers=None, parallel_threshold=16):
+        """
+        Refit many plots at once (default: every stale one) across a process pool.
+        `profiles_p0` maps komoditas → (K, r, t0) fallback guess.
+        Returns the number of fits written.
+        """
+        keys = self.stale_keys() if keys is None else list(keys)
+        if not keys:
+            return 0
+        profiles_p0 = profiles_p0 or {}
+
+        with self._connect() as conn:
+            df = pd.read_sql_query("SELECT id, plot, komoditas, usia_hst, tinggi_cm FROM measurements", conn)
+            cached = pd.read_sql_query("SELECT * FROM fits", conn).set_index(["plot", "komoditas"])
+        groups = df.groupby(["plot", "komoditas"])
+
+        jobs, states = [], {}
+        for key in keys:
+            if key not in groups.groups:
+                continue
+            g = groups.get_group(key)
+            prev = cached.loc[key].to_dict() if key in cached.index else None
+            p0 = self._warm_p0(prev, profiles_p0.get(key[1]), g["tinggi_cm"].to_numpy())
+            jobs.append((key, g["usia_hst"].to_numpy(float), g["tinggi_cm"].to_numpy(float), p0))
+            states[key] = (len(g), int(g["id"].max()))
+
+        if len(jobs) >= parallel_threshold:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(_fit_job, jobs, chunksize=max(1, len(jobs) // 32)))
+        else:
+            results = [_fit_job(job) for job in jobs]
+
+        with self._connect() as conn:
+            for key, result in results:
+                self._save_fit(conn, key[0], key[1], result, *states[key])
+        return len(results)
+
+    def all_fits(self):
+        """Fit table for dashboards (no refitting)."""
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                "SELECT plot, komoditas, K, r, t0, rmse, n_points, status, message, updated_at FROM fits ORDER BY plot, komoditas",
+                conn,
+            )
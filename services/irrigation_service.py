@@ -0,0 +1,215 @@
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# 💧 FAO-56 WATER BALANCE & IRRIGATION SCHEDULER
+# ==========================================
+# Single crop coefficient approach (FAO Irrigation and Drainage Paper 56, ch. 6 & 8).
+# All plots are simulated together: arrays are (plots × days), the only loop is over days.
+
+# Stage lengths (days) and Kc values follow the tables on Irigasi & Drainase (page 32).
+# zr = rooting depth (m) at planting / full cover, p = allowable depletion fraction (FAO-56 Table 22).
+KC_CURVES = {
+    "Padi":    {"stages": (20, 20, 50, 30), "kc": (1.05, 1.20, 0.90), "zr": (0.30, 0.50), "p": 0.20},
+    "Jagung":  {"stages": (20, 30, 40, 20), "kc": (0.30, 1.20, 0.60), "zr": (0.30, 1.00), "p": 0.55},
+    "Tomat":   {"stages": (25, 15, 40, 30), "kc": (0.60, 1.15, 0.80), "zr": (0.25, 0.70), "p": 0.40},
+    "Cabai":   {"stages": (30, 20, 50, 20), "kc": (0.60, 1.05, 0.90), "zr": (0.25, 0.60), "p": 0.30},
+    "Kedelai": {"stages": (20, 15, 40, 20), "kc": (0.40, 1.15, 0.50), "zr": (0.30, 0.80), "p": 0.50},
+    "Melon":   {"stages": (20, 25, 30, 15), "kc": (0.50, 1.05, 0.75), "zr": (0.25, 0.80), "p": 0.40},
+}
+
+# Volumetric water content (m³/m³) at field capacity / wilting point
+SOIL_WATER = {
+    "Pasir":           {"fc": 0.12, "wp": 0.05},
+    "Lempung Berpasir": {"fc": 0.23, "wp": 0.11},
+    "Lempung":         {"fc": 0.30, "wp": 0.14},
+    "Liat":            {"fc": 0.40, "wp": 0.22},
+}
+
+
+def effective_rainfall(rain):
+    """Effective rainfall (mm/day), same rule as the page 32 calculator, vectorized."""
+    rain = np.asarray(rain, dtype=float)
+    return np.where(rain < 2.5, 0.6 * rain, 0.8 * rain - 0.8).clip(0)
+
+
+def season_length(crop):
+    """Total growing season (days) for a crop."""
+    return int(sum(KC_CURVES[crop]["stages"]))
+
+
+def _crop_params(crops):
+    """Per-plot parameter arrays gathered from KC_CURVES."""
+    unknown = set(crops) - set(KC_CURVES)
+    if unknown:
+        raise ValueError(f"Kc tidak tersedia untuk: {', '.join(sorted(unknown))}")
+    stages = np.array([KC_CURVES[c]["stages"] for c in crops], dtype=float)
+    kc = np.array([KC_CURVES[c]["kc"] for c in crops], dtype=float)
+    zr = np.array([KC_CURVES[c]["zr"] for c in crops], dtype=float)
+    p = np.array([KC_CURVES[c]["p"] for c in crops], dtype=float)
+    return stages, kc, zr, p
+
+
+def kc_matrix(crops, dap):
+    """
+    Daily Kc for every plot. `dap` is days-after-planting, shape (plots, days);
+    days outside the season get Kc = 0.
+    """
+    stages, kc, _, _ = _crop_params(crops)
+    ends = np.cumsum(stages, axis=1)  # end of init, dev, mid, late
+    e_ini, e_dev, e_mid, e_late = (ends[:, i:i + 1] for i in range(4))
+    k_ini, k_mid, k_end = (kc[:, i:i + 1] for i in range(3))
+
+    dev_frac = (dap - e_ini) / np.maximum(e_dev - e_ini, 1)
+    late_frac = (dap - e_mid) / np.maximum(e_late - e_mid, 1)
+    return np.select(
+        [dap < 0, dap < e_ini, dap < e_dev, dap < e_mid, dap < e_late],
+        [0.0, k_ini, k_ini + dev_frac * (k_mid - k_ini), k_mid, k_mid + late_frac * (k_end - k_mid)],
+        default=0.0,
+    )
+
+
+def root_depth_matrix(crops, dap):
+    """Rooting depth (m): grows linearly from planting to full cover (end of development)."""
+    stages, _, zr, _ = _crop_params(crops)
+    full_cover = stages[:, 0:1] + stages[:, 1:2]
+    frac = np.clip(dap / full_cover, 0, 1)
+    return zr[:, 0:1] + frac * (zr[:, 1:2] - zr[:, 0:1])
+
+
+def initial_depletion_from_moisture(theta, soil, zr):
+    """Root-zone depletion (mm) from a measured volumetric soil moisture (e.g. Open-Meteo)."""
+    fc = np.array([SOIL_WATER[s]["fc"] for s in soil])
+    wp = np.array([SOIL_WATER[s]["wp"] for s in soil])
+    frac = np.clip((fc - np.asarray(theta, dtype=float)) / (fc - wp), 0, 1)
+    return frac * 1000 * (fc - wp) * zr
+
+
+def schedule_irrigation(et0, rain, crops, plant_offsets, soils, area_ha=1.0,
+                        efficiency=0.7, initial_depletion=None, start_date=None):
+    """
+    Daily root-zone water balance (FAO-56 eq. 85) and refill-to-field-capacity schedule.
+
+    et0, rain      : (days,) shared by all plots, or (plots, days)
+    crops, soils   : per-plot names (keys of KC_CURVES / SOIL_WATER)
+    plant_offsets  : per-plot planting day index relative to day 0
+    area_ha        : scalar or per-plot area, for irrigation volumes
+    efficiency     : application efficiency (gross = net / efficiency)
+
+    Irrigation is triggered when depletion reaches RAW = p·TAW.
+    Returns dict of (plots, days) arrays plus `summary` and `events` DataFrames.
+    """
+    crops = list(crops)
+    n_plots = len(crops)
+    et0 = np.broadcast_to(np.atleast_2d(np.asarray(et0, dtype=float)), (n_plots, np.shape(et0)[-1]))
+    n_days = et0.shape[1]
+    rain = np.broadcast_to(np.atleast_2d(np.asarray(rain, dtype=float)), (n_plots, n_days))
+    pe = effective_rainfall(rain)
+    offsets = np.asarray(plant_offsets, dtype=int).reshape(-1, 1)
+    area = np.broadcast_to(np.asarray(area_ha, dtype=float), (n_plots,))
+    soils = list(soils)
+
+    dap = np.arange(n_days)[None, :] - offsets
+    kc = kc_matrix(crops, dap)
+    zr = root_depth_matrix(crops, dap)
+    _, _, _, p = _crop_params(crops)
+    fc = np.array([SOIL_WATER[s]["fc"] for s in soils])
+    wp = np.array([SOIL_WATER[s]["wp"] for s in soils])
+    taw = 1000 * (fc - wp)[:, None] * zr
+    raw = p[:, None] * taw
+    active = kc > 0
+
+    etc = kc * et0
+    dr = np.zeros(n_plots) if initial_depletion is None else np.asarray(initial_depletion, dtype=float).copy()
+    depletion = np.zeros((n_plots, n_days))
+    etc_adj = np.zeros((n_plots, n_days))
+    irrigation = np.zeros((n_plots, n_days))
+    deep_perc = np.zeros((n_plots, n_days))
+
+    for d in range(n_days):
+        taw_d, raw_d = taw[:, d], raw[:, d]
+        # Water stress coefficient Ks (FAO-56 eq. 84)
+        ks = np.where(dr > raw_d, (taw_d - dr) / np.maximum((1 - p) * taw_d, 1e-9), 1.0).clip(0, 1)
+        et_act = ks * etc[:, d]
+        dr = dr - pe[:, d] + et_act
+        deep_perc[:, d] = np.maximum(-dr, 0)
+        dr = np.clip(dr, 0, taw_d)
+        irr = np.where(active[:, d] & (dr >= raw_d), dr, 0.0)
+        dr = dr - irr
+
+        etc_adj[:, d] = et_act
+        irrigation[:, d] = irr
+        depletion[:, d] = dr
+
+    gross = irrigation / efficiency
+    stress_days = ((etc_adj < etc - 1e-9) & active).sum(axis=1)
+
+    summary = pd.DataFrame({
+        "plot": np.arange(n_plots),
+        "crop": crops,
+        "soil": soils,
+        "area_ha": area,
+        "etc_mm": etc.sum(axis=1),
+        "eff_rain_mm": (pe * active).sum(axis=1),
+        "irrigations": (irrigation > 0).sum(axis=1),
+        "net_irrigation_mm": irrigation.sum(axis=1),
+        "gross_irrigation_mm": gross.sum(axis=1),
+        "volume_m3": gross.sum(axis=1) * 10 * area,
+        "stress_days": stress_days,
+    })
+
+    plot_idx, day_idx = np.nonzero(irrigation)
+    events = pd.DataFrame({
+        "plot": plot_idx,
+        "day": day_idx,
+        "dap": dap[plot_idx, day_idx],
+        "net_mm": irrigation[plot_idx, day_idx],
+        "gross_mm": gross[plot_idx, day_idx],
+        "volume_m3": gross[plot_idx, day_idx] * 10 * area[plot_idx],
+    })
+    if start_date is not None:
+        start = pd.Timestamp(start_date)
+        events.insert(2, "date", start + pd.to_timedelta(events["day"], unit="D"))
+
+    return {
+        "kc": kc, "etc": etc, "etc_adj": etc_adj, "depletion": depletion,
+        "taw": taw, "raw": raw, "irrigation": irrigation, "deep_percolation": deep_perc,
+        "summary": summary, "events": events,
+    }
+
+
+def schedule_blocks(blocks, et0, rain, season_start, efficiency=0.7, soil_moisture=None):
+    """
+    Convenience wrapper for a table of blocks.
+    `blocks` DataFrame needs columns: crop, soil, plant_date, area_ha.
+    et0 / rain are daily series starting at `season_start`; `soil_moisture`
+    (volumetric, optional) sets the starting depletion of every block.
+    """
+    blocks = blocks.reset_index(drop=True)
+    start = pd.Timestamp(season_start)
+    offsets = (pd.to_datetime(blocks["plant_date"]) - start).dt.days.to_numpy()
+    crops = blocks["crop"].tolist()
+    soils = blocks["soil"].tolist()
+
+    init = None
+    if soil_moisture is not None:
+        zr0 = np.array([KC_CURVES[c]["zr"][0] for c in crops])
+        init = initial_depletion_from_moisture(np.full(len(blocks), soil_moisture), soils, zr0)
+
+    result = schedule_irrigation(et0, rain, crops, offsets, soils, area_ha=blocks["area_ha"].to_numpy(),
+                                 efficiency=efficiency, initial_depletion=init, start_date=start)
+    if "block" in blocks.columns:
+        names = blocks["block"].to_numpy()
+        result["summary"].insert(1, "block", names)
+        result["events"].insert(1, "block", names[result["events"]["plot"].to_numpy()])
+    return result
+
+
+def extend_series(values, n_days, fill="mean"):
+    """Pad a short forecast series to a full season with its mean (or zeros)."""
+    values = np.asarray([v for v in values if v is not None], dtype=float)
+    if len(values) >= n_days:
+        return values[:n_days]
+    pad_value = float(np.mean(values)) if (fill == "mean" and len(values)) else 0.0
+    return np.concatenate([values, np.full(n_days - len(values), pad_value)])
+
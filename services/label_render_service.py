@@ -0,0 +1,451 @@
+import io
+import os
+import urllib.parse
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import qrcode
+from PIL import Image, ImageDraw, ImageFont
+
+# ==========================================
+# 🏷️ LABEL & QR RENDERER (TRACEABILITY)
+# ==========================================
+# Static artwork (gradients, header, card, shadows, badge pills) is rendered
+# once per size and cached; each label only pastes its QR and draws its text.
+# Batches are rendered sheet-by-sheet in a process pool and streamed into a
+# multi-up A4 PDF, so only one sheet is held in memory at a time.
+
+DPI = 300
+
+# (width, height) at 300 DPI
+LABEL_SIZES = {
+    "small": (590, 590),                 # 5x5 cm
+    "medium": (1181, 1181),              # 10x10 cm
+    "large": (1772, 1181),               # 15x10 cm
+    "small_landscape": (1181, 590),      # 10x5 cm
+    "medium_landscape": (1772, 1181),    # 15x10 cm
+    "large_landscape": (2362, 1181),     # 20x10 cm
+}
+
+QR_ONLY_SIZES = {
+    "small": (590, 590),      # 5x5 cm
+    "medium": (945, 945),     # 8x8 cm
+    "large": (1181, 1181),    # 10x10 cm
+}
+
+A4_PX = (2480, 3508)      # 210 x 297 mm at 300 DPI
+A4_PT = (595.28, 841.89)
+
+QR_BASE_URL = "https://vercel-scan2.vercel.app/product"
+BATCH_QR_MASK = 0
+
+COLOR_PRIMARY = (16, 185, 129)       # Emerald-500
+COLOR_PRIMARY_DARK = (5, 150, 105)   # Emerald-600
+COLOR_ACCENT = (251, 191, 36)        # Amber-400
+COLOR_TEXT = (31, 41, 55)            # Gray-800
+COLOR_TEXT_LIGHT = (107, 114, 128)   # Gray-500
+COLOR_WHITE = (255, 255, 255)
+BADGE_COLORS = {
+    "Organik": (34, 197, 94),    # Green-500
+    "Halal": (59, 130, 246),     # Blue-500
+    "Premium": (168, 85, 247),   # Purple-500
+}
+
+
+# ---------- Cached resources ----------
+@lru_cache(maxsize=None)
+def _font(name, size):
+    try:
+        return ImageFont.truetype(name, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=None)
+def get_fonts(is_small):
+    """Font set for full labels (loaded once per process)."""
+    if is_small:
+        return {
+            "brand": _font("arialbd.ttf", 22), "title": _font("arialbd.ttf", 48),
+            "subtitle": _font("arialbd.ttf", 32), "body": _font("arial.ttf", 26),
+            "small": _font("arial.ttf", 22), "tiny": _font("arial.ttf", 18),
+        }
+    return {
+        "brand": _font("arialbd.ttf", 45), "title": _font("arialbd.ttf", 70),
+        "subtitle": _font("arial.ttf", 42), "body": _font("arial.ttf", 38),
+        "small": _font("arial.ttf", 32), "tiny": _font("arial.ttf", 28),
+    }
+
+
+def linear_gradient(width, height, top, bottom):
+    """Vertical RGB gradient built with NumPy (top → bottom)."""
+    ratio = (np.arange(height) / height)[:, None]
+    rows = np.asarray(top, dtype=float) + (np.asarray(bottom, dtype=float) - np.asarray(top, dtype=float)) * ratio
+    arr = np.broadcast_to(rows.astype(np.uint8)[:, None, :], (height, width, 3))
+    return Image.fromarray(np.ascontiguousarray(arr), "RGB")
+
+
+def _label_geometry(size, has_qr):
+    """All fixed positions of a full label; shared by the template and the text pass."""
+    width, height = LABEL_SIZES[size]
+    is_landscape = "landscape" in size
+    is_small = size == "small"
+    g = {"width": width, "height": height, "is_small": is_small, "is_landscape": is_landscape}
+
+    g["margin"] = 25 if is_small else 50
+    g["header_height"] = 50 if is_small else 100
+    g["card_top"] = g["header_height"] + (10 if is_small else 20)
+    g["card_margin"] = 15 if is_small else 30
+    g["card_bottom"] = height - (15 if is_small else 30)
+    g["radius"] = 15 if is_small else 25
+    content_x = g["card_margin"] + (20 if is_small else 40)
+    content_y = g["card_top"] + (20 if is_small else 40)
+    g["content"] = (content_x, content_y)
+
+    if has_qr:
+        if is_small:
+            qr_size = 180
+        elif is_landscape:
+            qr_size = min(280, height - g["card_top"] - 100)
+        else:
+            qr_size = 280 if "large" in size else 240
+        g["qr_size"] = qr_size
+        scan_text_y = content_y + qr_size + (5 if is_small else 10)
+        g["scan_text_y"] = scan_text_y
+        if is_landscape or "large" in size:
+            text_x, text_y = content_x + qr_size + 50, content_y
+        else:
+            text_x, text_y = content_x, scan_text_y + (30 if is_small else 60)
+    else:
+        g["qr_size"] = 0
+        text_x, text_y = content_x, content_y
+
+    g["text_x"] = text_x
+    g["title_y"] = text_y
+    g["subtitle_y"] = text_y + (55 if is_small else 85)
+    g["divider_y"] = g["subtitle_y"] + (38 if is_small else 55)
+    g["body_y"] = g["divider_y"] + (12 if is_small else 20)
+    g["footer_y"] = height - (30 if is_small else 60)
+    return g
+
+
+@lru_cache(maxsize=None)
+def get_label_template(size, has_qr=True):
+    """Pre-rendered static artwork for a full label (cached per size)."""
+    g = _label_geometry(size, has_qr)
+    width, height, is_small = g["width"], g["height"], g["is_small"]
+    fonts = get_fonts(is_small)
+
+    label = linear_gradient(width, height, (240, 253, 250), (255, 255, 255))
+    header = linear_gradient(width, g["header_height"], COLOR_PRIMARY, COLOR_PRIMARY_DARK)
+    label.paste(header, (0, 0))
+    # The row-by-row original left one extra row of the last header colour
+    label.paste(header.crop((0, g["header_height"] - 1, width, g["header_height"])), (0, g["header_height"]))
+    draw = ImageDraw.Draw(label)
+    draw.text((g["margin"], 15 if is_small else 30), "🌾 AgriSensa", fill=COLOR_WHITE, font=fonts["brand"])
+
+    # Card shadow + card
+    cm, top, bottom = g["card_margin"], g["card_top"], g["card_bottom"]
+    shadow_offset = 4 if is_small else 8
+    for i in range(shadow_offset, 0, -1):
+        alpha = int(20 * (shadow_offset - i) / shadow_offset)
+        draw.rounded_rectangle([(cm + i, top + i), (width - cm + i, bottom + i)], radius=g["radius"],
+                               fill=(200 - alpha, 200 - alpha, 200 - alpha))
+    draw.rounded_rectangle([(cm, top), (width - cm, bottom)], radius=g["radius"], fill=COLOR_WHITE,
+                           outline=COLOR_PRIMARY, width=2 if is_small else 3)
+
+    if has_qr:
+        cx, cy = g["content"]
+        qs = g["qr_size"]
+        pad = 8 if is_small else 15
+        draw.rounded_rectangle([(cx - pad, cy - pad), (cx + qs + pad, cy + qs + pad)],
+                               radius=12 if is_small else 20, fill=(248, 250, 252), outline=COLOR_PRIMARY, width=2)
+        if not is_small:
+            draw.text((cx + qs // 2 - 50, g["scan_text_y"]), "📱 Scan Me", fill=COLOR_PRIMARY_DARK, font=fonts["small"])
+
+    tx = g["text_x"]
+    divider_width = 180 if is_small else 300
+    draw.rectangle([(tx, g["divider_y"]), (tx + divider_width, g["divider_y"] + 2)], fill=COLOR_PRIMARY)
+
+    if not is_small:
+        draw.text((width - g["margin"] - 250, g["footer_y"]), "✓ Verified Product", fill=COLOR_PRIMARY, font=fonts["tiny"])
+    return label
+
+
+@lru_cache(maxsize=None)
+def get_badge(badge, is_small):
+    """Pre-rendered quality badge pill (RGBA, includes shadow for large labels)."""
+    color = BADGE_COLORS.get(badge, COLOR_PRIMARY)
+    fonts = get_fonts(is_small)
+    if is_small:
+        w, h = 90, 28
+        img = Image.new("RGBA", (w + 1, h + 1), (0, 0, 0, 0))
+        d = ImageDraw.Draw(img)
+        d.rounded_rectangle([(0, 0), (w, h)], radius=14, fill=color)
+        d.text((10, 5), f"✓ {badge[:3]}", fill=COLOR_WHITE, font=fonts["tiny"])
+        return img
+    w, h = 160, 45
+    img = Image.new("RGBA", (w + 3, h + 3), (0, 0, 0, 0))
+    d = ImageDraw.Draw(img)
+    d.rounded_rectangle([(2, 2), (w + 2, h + 2)], radius=25, fill=(200, 200, 200))
+    d.rounded_rectangle([(0, 0), (w, h)], radius=25, fill=color)
+    d.text((20, 10), f"✓ {badge}", fill=COLOR_WHITE, font=fonts["small"])
+    return img
+
+
+# ---------- QR ----------
+def build_qr_url(data, base_url=QR_BASE_URL):
+    """Product passport URL encoded in the QR code."""
+    params = {
+        'name': data['produk'],
+        'variety': data['varietas'],
+        'farmer': data['petani'],
+        'location': data['lokasi'],
+        'harvest_date': str(data['tgl']),
+        'weight': f"{data.get('berat', 1)} kg",
+        'emoji': '🌾'
+    }
+    if data.get('harga'):
+        params['price'] = str(data['harga'])
+    return f"{base_url}/{data['id']}?{urllib.parse.urlencode(params)}"
+
+
+def make_qr(url, mask_pattern=None, box_size=10):
+    """
+    QR image (black on white). `mask_pattern` skips qrcode's search over all
+    eight masks, the slowest step; any mask gives a valid, scannable code.
+    """
+    qr = qrcode.QRCode(version=1, box_size=box_size, border=4, mask_pattern=mask_pattern)
+    qr.add_data(url)
+    qr.make(fit=True)
+    modules = np.array(qr.get_matrix(), dtype=bool)
+    pixels = np.where(modules, 0, 255).astype(np.uint8).repeat(box_size, axis=0).repeat(box_size, axis=1)
+    return Image.fromarray(pixels, "L")
+
+
+# ---------- Single label ----------
+def render_label(data, size="medium_landscape", qr_img=None):
+    """Full product label: cached template + QR + variable text."""
+    g = _label_geometry(size, qr_img is not None)
+    is_small = g["is_small"]
+    fonts = get_fonts(is_small)
+    label = get_label_template(size, qr_img is not None).copy()
+    draw = ImageDraw.Draw(label)
+
+    if qr_img is not None:
+        qs = g["qr_size"]
+        label.paste(qr_img.resize((qs, qs), Image.NEAREST), g["content"])
+
+    tx = g["text_x"]
+    produk = data['produk'][:20] if is_small else data['produk'][:28]
+    draw.text((tx, g["title_y"]), produk, fill=COLOR_TEXT, font=fonts["title"])
+    draw.text((tx, g["subtitle_y"]), data['varietas'][:22] if is_small else data['varietas'][:32],
+              fill=COLOR_PRIMARY_DARK, font=fonts["subtitle"])
+    y = g["body_y"]
+
+    if is_small:
+        if data.get('harga'):
+            draw.rounded_rectangle([(tx, y), (tx + 200, y + 42)], radius=10, fill=COLOR_ACCENT)
+            draw.text((tx + 10, y + 8), f"💰 Rp {data['harga']:,}/kg", fill=COLOR_TEXT, font=fonts["subtitle"])
+            y += 50
+        draw.text((tx, y), f"📅 {data['tgl']}", fill=COLOR_TEXT_LIGHT, font=fonts["small"])
+        y += 28
+        draw.text((tx, y), f"📍 {data['lokasi'][:18]}", fill=COLOR_TEXT, font=fonts["small"])
+        y += 35
+        badges, step = (data.get('klaim') or [])[:2], 98
+    else:
+        draw.text((tx, y), f"📅 {data['tgl']}", fill=COLOR_TEXT_LIGHT, font=fonts["body"])
+        y += 50
+        draw.text((tx, y), f"👨‍🌾 {data['petani'][:28]}", fill=COLOR_TEXT, font=fonts["body"])
+        y += 45
+        draw.text((tx, y), f"📍 {data['lokasi'][:30]}", fill=COLOR_TEXT, font=fonts["body"])
+        y += 55
+        if data.get('harga'):
+            draw.rounded_rectangle([(tx, y), (tx + 350, y + 55)], radius=12, fill=COLOR_ACCENT)
+            draw.text((tx + 15, y + 12), f"💰 Rp {data['harga']:,}/kg", fill=COLOR_TEXT, font=fonts["subtitle"])
+            y += 70
+        if data.get('kontak'):
+            draw.text((tx, y), f"📞 {data['kontak']}", fill=COLOR_TEXT, font=fonts["body"])
+            y += 55
+        badges, step = data.get('klaim') or [], 175
+        y += 10
+
+    for i, badge in enumerate(badges):
+        sprite = get_badge(badge, is_small)
+        label.paste(sprite, (tx + i * step, y), sprite)
+
+    footer_id = f"ID: {data['id'][-8:]}" if is_small else f"Batch ID: {data['id']}"
+    draw.text((g["margin"] + (10 if is_small else 20), g["footer_y"]), footer_id, fill=COLOR_TEXT_LIGHT, font=fonts["tiny"])
+    return label
+
+
+@lru_cache(maxsize=None)
+def get_qr_only_template(size):
+    width, height = QR_ONLY_SIZES[size]
+    font_brand = _font("arialbd.ttf", {"small": 28, "medium": 36}.get(size, 42))
+    font_small = _font("arial.ttf", {"small": 22, "medium": 28}.get(size, 32))
+    qr_size = int(width * 0.7)
+    qr_x, qr_y = (width - qr_size) // 2, (height - qr_size) // 2 - 30
+
+    label = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(label)
+    draw.rounded_rectangle([(qr_x - 20, qr_y - 20), (qr_x + qr_size + 20, qr_y + qr_size + 20)],
+                           radius=15, outline=COLOR_PRIMARY, width=3)
+    for text, font, y, color in (("🌾 AgriSensa", font_brand, 30, COLOR_PRIMARY),
+                                 ("Scan untuk info produk", font_small, qr_y + qr_size + 35, COLOR_TEXT)):
+        bbox = draw.textbbox((0, 0), text, font=font)
+        draw.text(((width - (bbox[2] - bbox[0])) // 2, y), text, fill=color, font=font)
+    return label, (qr_x, qr_y, qr_size), font_small
+
+
+def render_qr_only(data, qr_img, size="medium"):
+    """Minimal QR print: cached frame + QR + batch ID."""
+    template, (qr_x, qr_y, qr_size), font_small = get_qr_only_template(size)
+    width, height = QR_ONLY_SIZES[size]
+    label = template.copy()
+    label.paste(qr_img.resize((qr_size, qr_size), Image.NEAREST), (qr_x, qr_y))
+    draw = ImageDraw.Draw(label)
+    id_text = f"ID: {data['id']}"
+    bbox = draw.textbbox((0, 0), id_text, font=font_small)
+    draw.text(((width - (bbox[2] - bbox[0])) // 2, height - 50), id_text, fill=COLOR_TEXT, font=font_small)
+    return label
+
+
+def render_any(data, kind="label_lengkap", size="medium_landscape", mask_pattern=BATCH_QR_MASK):
+    """Label for one record, QR included (used by the batch workers)."""
+    qr_img = make_qr(build_qr_url(data), mask_pattern=mask_pattern)
+    if kind == "qr_only":
+        return render_qr_only(data, qr_img, size)
+    return render_label(data, size, qr_img)
+
+
+# ---------- Sheets & streaming PDF ----------
+def sheet_layout(label_px, page_px=A4_PX, margin_px=94, gap_px=35):
+    """Top-left positions of labels on one sheet (defaults: 8 mm margin, 3 mm gap)."""
+    lw, lh = label_px
+    pw, ph = page_px
+    cols = max(1, (pw - 2 * margin_px + gap_px) // (lw + gap_px))
+    rows = max(1, (ph - 2 * margin_px + gap_px) // (lh + gap_px))
+    # Center the grid on the page
+    x0 = (pw - (cols * lw + (cols - 1) * gap_px)) // 2
+    y0 = (ph - (rows * lh + (rows - 1) * gap_px)) // 2
+    return [(x0 + c * (lw + gap_px), y0 + r * (lh + gap_px)) for r in range(rows) for c in range(cols)]
+
+
+def _label_px(kind, size):
+    return QR_ONLY_SIZES[size] if kind == "qr_only" else LABEL_SIZES[size]
+
+
+def render_sheet(job):
+    """Process-pool worker: render one A4 sheet of labels → JPEG bytes."""
+    records, kind, size, quality = job
+    sheet = Image.new("RGB", A4_PX, "white")
+    positions = sheet_layout(_label_px(kind, size))
+    for record, pos in zip(records, positions):
+        sheet.paste(render_any(record, kind, size), pos)
+    buf = io.BytesIO()
+    sheet.save(buf, format="JPEG", quality=quality, dpi=(DPI, DPI))
+    return buf.getvalue()
+
+
+class StreamingPDFWriter:
+    """
+    Minimal PDF writer that emits each page (one JPEG image) as soon as it is
+    added; only byte offsets are kept until close().
+    """
+
+    def __init__(self, fileobj, page_size_pt=A4_PT):
+        self.f = fileobj
+        self.page_size = page_size_pt
+        self.offsets = {}
+        self.page_ids = []
+        self.next_id = 3   # 1 = catalog, 2 = page tree
+        self.pos = 0
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data):
+        self.f.write(data)
+        self.pos += len(data)
+
+    def _obj(self, obj_id, body, stream=None):
+        self.offsets[obj_id] = self.pos
+        self._write(f"{obj_id} 0 obj\n".encode() + body)
+        if stream is not None:
+            self._write(b"\nstream\n" + stream + b"\nendstream")
+        self._write(b"\nendobj\n")
+
+    def add_jpeg_page(self, jpeg_bytes, px_size):
+        img_id, content_id, page_id = self.next_id, self.next_id + 1, self.next_id + 2
+        self.next_id += 3
+        w_pt, h_pt = self.page_size
+        self._obj(img_id, (f"<< /Type /XObject /Subtype /Image /Width {px_size[0]} /Height {px_size[1]} "
+                           f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /DCTDecode "
+                           f"/Length {len(jpeg_bytes)} >>").encode(), jpeg_bytes)
+        content = zlib.compress(f"q {w_pt:.2f} 0 0 {h_pt:.2f} 0 0 cm /Im0 Do Q".encode())
+        self._obj(content_id, f"<< /Length {len(content)} /Filter /FlateDecode >>".encode(), content)
+        self._obj(page_id, (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {w_pt:.2f} {h_pt:.2f}] "
+                            f"/Resources << /XObject << /Im0 {img_id} 0 R >> >> /Contents {content_id} 0 R >>").encode())
+        self.page_ids.append(page_id)
+
+    def close(self):
+        kids = " ".join(f"{pid} 0 R" for pid in self.page_ids)
+        self._obj(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode())
+        self._obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        xref_pos = self.pos
+        n = self.next_id
+        lines = [f"xref\n0 {n}\n", "0000000000 65535 f \n"]
+        lines += [f"{self.offsets.get(i, 0):010d} 00000 n \n" for i in range(1, n)]
+        self._write("".join(lines).encode())
+        self._write(f"trailer\n<< /Size {n} /Root 1 0 R >>\nstartxref\n{xref_pos}\n%%EOF\n".encode())
+        self.f.flush()
+
+
+def labels_per_sheet(kind="label_lengkap", size="medium_landscape"):
+    return len(sheet_layout(_label_px(kind, size)))
+
+
+def iter_label_sheets(records, kind="label_lengkap", size="medium_landscape", max_workers=None,
+                      quality=90, parallel_threshold=2):
+    """Yield JPEG sheets in order; sheets are rendered across a process pool."""
+    per_sheet = labels_per_sheet(kind, size)
+    clean = [{k: v for k, v in r.items() if k != 'foto'} for r in records]
+    jobs = [(clean[i:i + per_sheet], kind, size, quality) for i in range(0, len(clean), per_sheet)]
+    if len(jobs) < parallel_threshold:
+        for job in jobs:
+            yield render_sheet(job)
+        return
+    workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(render_sheet, jobs)
+
+
+def write_labels_pdf(records, out, kind="label_lengkap", size="medium_landscape", max_workers=None,
+                     progress=None):
+    """
+    Stream a multi-up A4 PDF of labels for `records` into the binary file `out`.
+    `progress(done_sheets, total_sheets)` is called after each page. Returns page count.
+    """
+    total = -(-len(records) // labels_per_sheet(kind, size))
+    writer = StreamingPDFWriter(out)
+    for i, jpeg in enumerate(iter_label_sheets(records, kind, size, max_workers=max_workers), start=1):
+        writer.add_jpeg_page(jpeg, A4_PX)
+        if progress:
+            progress(i, total)
+    writer.close()
+    return len(writer.page_ids)
+
+
+def labels_pdf_bytes(records, kind="label_lengkap", size="medium_landscape", max_workers=None):
+    """The multi-up PDF of `write_labels_pdf` as bytes (for deferred downloads)."""
+    buf = io.BytesIO()
+    write_labels_pdf(records, buf, kind=kind, size=size, max_workers=max_workers)
+    return buf.getvalue()
+
+
+def pil_to_pdf_bytes(pil_image):
+    """Convert PIL Image to PDF bytes"""
+    pdf_buffer = io.BytesIO()
+    pil_image.save(pdf_buffer, format='PDF', resolution=300.0)
+    return pdf_buffer.getvalue()
@@ -0,0 +1,199 @@
+import hashlib
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+# ==========================================
+# 🔗 SUPPLY CHAIN LEDGER (HASH CHAIN + MERKLE CHECKPOINTS)
+# ==========================================
+# Append-only SQLite ledger shared by all users. Each entry stores its own hash
+# and the previous hash at write time, so reading the timeline never rehashes.
+# Every CHECKPOINT_INTERVAL entries a Merkle root of that segment is sealed;
+# routine verification only replays the open tail after the last checkpoint,
+# sealed segments can be audited one at a time.
+
+LEDGER_DB = os.path.join("data", "supply_ledger.db")
+GENESIS_HASH = "0" * 32
+CHECKPOINT_INTERVAL = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger (
+    seq INTEGER PRIMARY KEY,
+    actor TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    action TEXT NOT NULL,
+    prev_hash TEXT NOT NULL,
+    hash TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    upto_seq INTEGER PRIMARY KEY,
+    from_seq INTEGER NOT NULL,
+    merkle_root TEXT NOT NULL,
+    last_hash TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+
+def entry_hash(actor, timestamp, action, prev_hash):
+    """Same chaining rule the Rantai Pasok timeline always used."""
+    return hashlib.sha256(f"{actor}{timestamp}{action}{prev_hash}".encode()).hexdigest()
+
+
+def merkle_root(hashes):
+    """Binary Merkle root over hex digests (odd node is paired with itself)."""
+    level = [bytes.fromhex(h) for h in hashes]
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
+    return level[0].hex()
+
+
+class SupplyLedger:
+    """Persistent hash-chained ledger with Merkle checkpoints."""
+
+    def __init__(self, db_file=LEDGER_DB, checkpoint_interval=CHECKPOINT_INTERVAL):
+        self.db_file = db_file
+        self.interval = checkpoint_interval
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Autocommit connection, always closed on exit (writers use explicit BEGIN / COMMIT)."""
+        conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+            yield conn
+        finally:
+            conn.close()
+
+    # ---------- Writes ----------
+    def append(self, actor, action, timestamp=None):
+        """Append one entry; returns it with seq and hashes."""
+        return self.append_many([{"actor": actor, "action": action, "timestamp": timestamp}])[-1]
+
+    def append_many(self, entries):
+        """Append entries atomically (one write lock for the whole batch)."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                last = conn.execute("SELECT seq, hash FROM ledger ORDER BY seq DESC LIMIT 1").fetchone()
+                seq, prev = (last["seq"], last["hash"]) if last else (0, GENESIS_HASH)
+                rows = []
+                for e in entries:
+                    seq += 1
+                    ts = e.get("timestamp") or datetime.now().strftime("%Y-%m-%d %H:%M")
+                    h = entry_hash(e["actor"], ts, e["action"], prev)
+                    rows.append((seq, e["actor"], ts, e["action"], prev, h))
+                    prev = h
+                conn.executemany("INSERT INTO ledger (seq, actor, timestamp, action, prev_hash, hash) VALUES (?, ?, ?, ?, ?, ?)", rows)
+                self._seal_checkpoints(conn, seq)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        keys = ("seq", "actor", "timestamp", "action", "prev_hash", "hash")
+        return [dict(zip(keys, r)) for r in rows]
+
+    def _seal_checkpoints(self, conn, last_seq):
+        row = conn.execute("SELECT COALESCE(MAX(upto_seq), 0) FROM checkpoints").fetchone()
+        sealed = row[0]
+        while last_seq - sealed >= self.interval:
+            upto = sealed + self.interval
+            hashes = [r[0] for r in conn.execute(
+                "SELECT hash FROM ledger WHERE seq > ? AND seq <= ? ORDER BY seq", (sealed, upto))]
+            conn.execute(
+                "INSERT INTO checkpoints (upto_seq, from_seq, merkle_root, last_hash, created_at) VALUES (?, ?, ?, ?, ?)",
+                (upto, sealed + 1, merkle_root(hashes), hashes[-1], datetime.now().isoformat()))
+            sealed = upto
+
+    # ---------- Reads ----------
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM ledger").fetchone()[0]
+
+    def head(self):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM ledger ORDER BY seq DESC LIMIT 1").fetchone()
+        return dict(row) if row else None
+
+    def timeline(self, page=1, page_size=20, newest_first=True):
+        """One page of entries (primary-key range scan, independent of ledger size)."""
+        total = self.count()
+        page = max(1, int(page))
+        with self._connect() as conn:
+            if newest_first:
+                hi = total - (page - 1) * page_size
+                rows = conn.execute("SELECT * FROM ledger WHERE seq <= ? AND seq > ? ORDER BY seq DESC",
+                                    (hi, hi - page_size)).fetchall()
+            else:
+                lo = (page - 1) * page_size
+                rows = conn.execute("SELECT * FROM ledger WHERE seq > ? AND seq <= ? ORDER BY seq",
+                                    (lo, lo + page_size)).fetchall()
+        return [dict(r) for r in rows]
+
+    def checkpoints(self):
+        with self._connect() as conn:
+            return [dict(r) for r in conn.execute("SELECT * FROM checkpoints ORDER BY upto_seq")]
+
+    # ---------- Verification ----------
+    def _replay(self, conn, from_seq, to_seq, prev):
+        """Recompute the chain for (from_seq..to_seq]; returns (first_bad_seq or None, hashes, last_hash)."""
+        hashes = []
+        for r in conn.execute("SELECT * FROM ledger WHERE seq > ? AND seq <= ? ORDER BY seq", (from_seq, to_seq)):
+            if r["prev_hash"] != prev or entry_hash(r["actor"], r["timestamp"], r["action"], prev) != r["hash"]:
+                return r["seq"], hashes, prev
+            hashes.append(r["hash"])
+            prev = r["hash"]
+        return None, hashes, prev
+
+    def verify_segment(self, upto_seq):
+        """Audit one sealed checkpoint segment: chain replay + Merkle root."""
+        with self._connect() as conn:
+            cp = conn.execute("SELECT * FROM checkpoints WHERE upto_seq = ?", (upto_seq,)).fetchone()
+            if cp is None:
+                raise ValueError(f"Checkpoint {upto_seq} tidak ditemukan")
+            start = cp["from_seq"] - 1
+            prev = GENESIS_HASH
+            if start > 0:
+                prev = conn.execute("SELECT last_hash FROM checkpoints WHERE upto_seq = ?", (start,)).fetchone()[0]
+            bad, hashes, _ = self._replay(conn, start, upto_seq, prev)
+        if bad is None and merkle_root(hashes) != cp["merkle_root"]:
+            bad = cp["from_seq"]
+        return {"ok": bad is None, "first_bad_seq": bad, "checked": len(hashes)}
+
+    def verify(self, full=False):
+        """
+        Incremental check: checkpoint anchors + replay of the open tail.
+        `full=True` additionally audits every sealed segment.
+        Returns dict(ok, first_bad_seq, checked, checkpoints).
+        """
+        with self._connect() as conn:
+            cps = [dict(r) for r in conn.execute("SELECT * FROM checkpoints ORDER BY upto_seq")]
+            # Anchors: each sealed last_hash must still be the stored hash at that seq,
+            # and the next entry must chain from it.
+            for cp in cps:
+                row = conn.execute("SELECT hash FROM ledger WHERE seq = ?", (cp["upto_seq"],)).fetchone()
+                nxt = conn.execute("SELECT prev_hash FROM ledger WHERE seq = ?", (cp["upto_seq"] + 1,)).fetchone()
+                if row is None or row[0] != cp["last_hash"] or (nxt is not None and nxt[0] != cp["last_hash"]):
+                    return {"ok": False, "first_bad_seq": cp["upto_seq"], "checked": 0, "checkpoints": len(cps)}
+            start = cps[-1]["upto_seq"] if cps else 0
+            prev = cps[-1]["last_hash"] if cps else GENESIS_HASH
+            last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM ledger").fetchone()[0]
+            bad, hashes, _ = self._replay(conn, start, last_seq, prev)
+        checked = len(hashes)
+        if bad is None and full:
+            for cp in cps:
+                seg = self.verify_segment(cp["upto_seq"])
+                checked += seg["checked"]
+                if not seg["ok"]:
+                    bad = seg["first_bad_seq"]
+                    break
+        return {"ok": bad is None, "first_bad_seq": bad, "checked": checked, "checkpoints": len(cps)}
@@ -0,0 +1,346 @@
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+from PIL import Image, ImageOps
+
+from utils.lazy_imports import lazy_import
+from utils.lru_cache import LRUCache
+
+genai = lazy_import("google.generativeai")
+glm = lazy_import("google.ai.generativelanguage")
+
+# ==========================================
+# 🌿 PLANT DIAGNOSIS CLIENT (GEMINI)
+# ==========================================
+# One client per API key, shared across sessions. Uploads are downscaled and
+# re-encoded as JPEG under a fixed payload size before they are sent. Responses
+# are cached by image content hash + prompt version + model and mirrored to
+# disk. The model list is cached with a TTL. Batches run in a small thread pool
+# behind a requests-per-minute limiter.
+
+DIAGNOSIS_PROMPT_VERSION = "diagnosis-v1"
+DIAGNOSIS_PROMPT = """
+You are an expert agricultural plant pathologist. Analyze this image of a plant.
+Identify if there is any disease, pest, or nutrient deficiency.
+
+IMPORTANT: Provide the response strictly in INDONESIAN language (Bahasa Indonesia).
+
+Return the result strictly in this JSON format:
+{
+    "is_healthy": boolean,
+    "diagnosis": "Nama penyakit/hama/defisiensi atau 'Sehat' jika tidak ada (Dalam Bahasa Indonesia)",
+    "confidence": float (0.0 to 1.0),
+    "severity": "None" | "Low" | "Medium" | "High" | "Critical",
+    "symptoms_observed": ["Daftar", "gejala", "visual", "yang", "terlihat"],
+    "explanation": "Penjelasan singkat mengapa Anda membuat diagnosis ini berdasarkan bukti visual (Dalam Bahasa Indonesia).",
+    "treatment_recommendations": {
+        "immediate": ["Tindakan 1", "Tindakan 2"],
+        "short_term": ["Tindakan 1", "Tindakan 2"],
+        "prevention": ["Tindakan 1", "Tindakan 2"]
+    }
+}
+Do not allow markdown formatting in the response, just raw JSON.
+"""
+
+DEFAULT_MODEL = "models/gemini-1.5-flash"
+DEFAULT_MODELS = ["models/gemini-1.5-flash", "models/gemini-1.5-pro", "models/gemini-pro-vision"]
+
+# Image payload: longest side and encoded size limits
+MAX_IMAGE_SIDE = 1024
+MIN_IMAGE_SIDE = 256
+MAX_PAYLOAD_BYTES = 400_000
+JPEG_QUALITY_STEPS = (85, 75, 65, 50)
+
+MODEL_LIST_TTL_S = 3600
+MODEL_LIST_ERROR_TTL_S = 60
+RATE_LIMIT_PER_MINUTE = 15      # free tier of Google AI Studio
+MAX_CONCURRENT_REQUESTS = 4
+
+DIAGNOSIS_CACHE_FILE = os.path.join("data", "diagnosis_cache.json")
+DIAGNOSIS_CACHE_MAX = 512
+DIAGNOSIS_CLIENT_MAX_KEYS = 8   # user-typed keys kept in memory at most
+
+
+# ---------- Image payload ----------
+
+def _open_image(image):
+    if isinstance(image, (bytes, bytearray)):
+        image = Image.open(io.BytesIO(image))
+    return image
+
+
+def image_content_hash(image):
+    """Hash of the uploaded file bytes (or decoded pixels for a PIL image)."""
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(image, (bytes, bytearray)):
+        h.update(bytes(image))
+    else:
+        h.update(f"{image.mode}:{image.size}".encode())
+        h.update(image.tobytes())
+    return h.hexdigest()
+
+
+def prepare_image(image, max_side=MAX_IMAGE_SIDE, max_bytes=MAX_PAYLOAD_BYTES):
+    """
+    Downscale and re-encode an upload as RGB JPEG of at most `max_bytes`.
+    Quality is lowered first, then the image is shrunk further (not below
+    MIN_IMAGE_SIDE). Returns (jpeg bytes, (width, height)).
+    """
+    img = ImageOps.exif_transpose(_open_image(image))
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel("A"))
+        img = background
+    elif img.mode != "RGB":
+        img = img.convert("RGB")
+    img.thumbnail((max_side, max_side), Image.LANCZOS)
+
+    while True:
+        for quality in JPEG_QUALITY_STEPS:
+            buf = io.BytesIO()
+            img.save(buf, format="JPEG", quality=quality, optimize=True)
+            if buf.tell() <= max_bytes:
+                return buf.getvalue(), img.size
+        if max(img.size) <= MIN_IMAGE_SIDE:
+            return buf.getvalue(), img.size
+        img = img.resize((max(1, int(img.width * 0.75)), max(1, int(img.height * 0.75))), Image.LANCZOS)
+
+
+def parse_diagnosis(text):
+    """Model text -> diagnosis dict (markdown code fences removed)."""
+    cleaned = text.replace("```json", "").replace("```", "").strip()
+    data = json.loads(cleaned)
+    if not isinstance(data, dict):
+        raise ValueError("Respons AI bukan objek JSON")
+    return data
+
+
+# ---------- Caches & rate limiting ----------
+
+def response_cache_key(kind, version, model_name, content_hash):
+    return f"{kind}:{version}:{model_name}:{content_hash}"
+
+
+class ResponseCache(LRUCache):
+    """LRU of successful model responses, mirrored to a JSON file."""
+
+    def __init__(self, path=DIAGNOSIS_CACHE_FILE, max_entries=DIAGNOSIS_CACHE_MAX):
+        super().__init__(path, max_entries)
+
+
+class RateLimiter:
+    """Sliding-window limiter: at most `max_calls` acquisitions per `period` seconds."""
+
+    def __init__(self, max_calls=RATE_LIMIT_PER_MINUTE, period=60.0, clock=time.monotonic, sleep=time.sleep):
+        self.max_calls = max_calls
+        self.period = period
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._calls = deque()
+
+    def acquire(self):
+        """Block until a call is allowed; returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return waited
+                wait = self._calls[0] + self.period - now
+            self._sleep(wait)
+            waited += wait
+
+
+# ---------- Backends ----------
+
+class GeminiBackend:
+    """
+    google-generativeai calls for one API key. The service clients are built
+    with this key instead of going through genai.configure(), which is
+    process-global: sessions with different keys never share a client.
+    """
+
+    def __init__(self, api_key):
+        self.api_key = api_key
+        self._lock = threading.Lock()
+        self._models = {}
+        self._model_client = None
+
+    def _client_options(self):
+        return {"api_key": self.api_key}
+
+    def _model(self, model_name):
+        with self._lock:
+            if model_name not in self._models:
+                model = genai.GenerativeModel(model_name)
+                model._client = glm.GenerativeServiceClient(client_options=self._client_options())
+                self._models[model_name] = model
+            return self._models[model_name]
+
+    def list_models(self):
+        with self._lock:
+            if self._model_client is None:
+                self._model_client = glm.ModelServiceClient(client_options=self._client_options())
+        return [m.name for m in genai.list_models(client=self._model_client)
+                if "generateContent" in m.supported_generation_methods]
+
+    def generate(self, model_name, prompt, image_bytes=None):
+        parts = [prompt]
+        if image_bytes is not None:
+            parts.append({"mime_type": "image/jpeg", "data": image_bytes})
+        return self._model(model_name).generate_content(parts).text
+
+
+class OfflineDiagnosisBackend:
+    """
+    Local stand-in for GeminiBackend (tests / offline demo).
+    Returns a fixed diagnosis JSON, records every call and the peak number of
+    concurrent requests.
+    """
+
+    RESPONSE = {
+        "is_healthy": False,
+        "diagnosis": "Bercak Daun (uji lokal)",
+        "confidence": 0.8,
+        "severity": "Medium",
+        "symptoms_observed": ["bercak coklat", "tepi daun menguning"],
+        "explanation": "Respons tiruan dari backend lokal.",
+        "treatment_recommendations": {"immediate": ["Buang daun terinfeksi"], "short_term": ["Aplikasi fungisida"],
+                                      "prevention": ["Atur jarak tanam"]},
+    }
+
+    def __init__(self, delay=0.0, models=None, response_text=None):
+        self.delay = delay
+        self.models = list(models or DEFAULT_MODELS)
+        self.response_text = response_text
+        self.calls = []
+        self.list_calls = 0
+        self.peak_concurrency = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def list_models(self):
+        with self._lock:
+            self.list_calls += 1
+        return list(self.models)
+
+    def generate(self, model_name, prompt, image_bytes=None):
+        with self._lock:
+            self._active += 1
+            self.peak_concurrency = max(self.peak_concurrency, self._active)
+            self.calls.append({"model": model_name, "prompt_chars": len(prompt),
+                               "image_bytes": len(image_bytes) if image_bytes is not None else 0})
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            if self.response_text is not None:
+                return self.response_text
+            if image_bytes is None:
+                return f"Penjelasan lokal untuk: {prompt.strip()[:60]}"
+            return json.dumps(self.RESPONSE, ensure_ascii=False)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+
+# ---------- Client ----------
+
+class DiagnosisClient:
+    """Cached, rate-limited access to one backend."""
+
+    def __init__(self, backend, cache=None, limiter=None, max_workers=MAX_CONCURRENT_REQUESTS,
+                 model_list_ttl=MODEL_LIST_TTL_S, clock=time.monotonic):
+        self.backend = backend
+        self.cache = cache if cache is not None else ResponseCache(path=None)
+        self.limiter = limiter if limiter is not None else RateLimiter()
+        self.max_workers = max_workers
+        self.model_list_ttl = model_list_ttl
+        self._clock = clock
+        self._models = None         # (expires_at, [names])
+        self._models_lock = threading.Lock()
+
+    def list_models(self):
+        """Models supporting generateContent, cached for `model_list_ttl` seconds ([] on error)."""
+        with self._models_lock:
+            now = self._clock()
+            if self._models and now < self._models[0]:
+                return list(self._models[1])
+            try:
+                models, ttl = self.backend.list_models(), self.model_list_ttl
+            except Exception:
+                models, ttl = [], MODEL_LIST_ERROR_TTL_S
+            self._models = (now + ttl, models)
+            return list(models)
+
+    def _call(self, model_name, prompt, image_bytes=None):
+        self.limiter.acquire()
+        return self.backend.generate(model_name, prompt, image_bytes)
+
+    def diagnose(self, image, model_name=DEFAULT_MODEL):
+        """
+        Diagnose one image (upload bytes or PIL image).
+        Returns (diagnosis dict, None) or (None, error message); errors are not cached.
+        """
+        key = response_cache_key("diagnosis", DIAGNOSIS_PROMPT_VERSION, model_name, image_content_hash(image))
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit, None
+        try:
+            payload, _ = prepare_image(image)
+            text = self._call(model_name, DIAGNOSIS_PROMPT, payload)
+        except Exception as e:
+            return None, str(e)
+        try:
+            data = parse_diagnosis(text)
+        except ValueError:
+            return None, f"Gagal memproses respons AI: {text}"
+        self.cache.put(key, data)
+        return data, None
+
+    def diagnose_batch(self, images, model_name=DEFAULT_MODEL):
+        """Diagnose many images concurrently; results in input order. Identical images are sent once."""
+        keys = [image_content_hash(img) for img in images]
+        unique = {}
+        for key, img in zip(keys, images):
+            unique.setdefault(key, img)
+        if len(unique) <= 1 or self.max_workers <= 1:
+            results = {key: self.diagnose(img, model_name) for key, img in unique.items()}
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique))) as pool:
+                futures = {key: pool.submit(self.diagnose, img, model_name) for key, img in unique.items()}
+                results = {key: f.result() for key, f in futures.items()}
+        return [results[key] for key in keys]
+
+    def explain(self, prompt, model_name=DEFAULT_MODEL):
+        """Text-only generation, cached by prompt content. Raises on backend errors."""
+        digest = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+        key = response_cache_key("text", "v1", model_name, digest)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit
+        text = self._call(model_name, prompt)
+        self.cache.put(key, text)
+        return text
+
+
+@st.cache_resource(show_spinner=False, max_entries=DIAGNOSIS_CLIENT_MAX_KEYS)
+def get_diagnosis_client(api_key):
+    """Process-wide client per API key (the least recently used keys are dropped), sharing one disk cache."""
+    return DiagnosisClient(GeminiBackend(api_key), cache=get_response_cache())
+
+
+@st.cache_resource(show_spinner=False)
+def get_response_cache():
+    return ResponseCache()
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# 🌾 PLANTING-PATTERN SWEEP (PADI)
+# ==========================================
+# Every planting pattern × variety × spacing × loss scenario evaluated at once
+# with NumPy broadcasting, using the same yield chain as the single-scenario
+# calculator (hills/ha → panicles → grains → GKP → GKG → beras). Each layout ×
+# variety decision also gets a seed and transplanting labour cost, and the
+# decisions that are Pareto-optimal for yield vs. seed cost vs. labour cost are
+# flagged. The calculator's chain grows without limit as spacing tightens, so
+# panicles per m² can optionally be capped (tiller compensation); without the
+# cap the densest grid point wins every yield ranking.
+
+GKP_PRICE_PER_KG = 6000        # same GKP price as the calculator
+GKP_TO_GKG = 0.8602            # BPS conversion
+GKG_TO_RICE = 0.64             # milling yield
+
+SEED_PRICE_PER_KG = 15000      # certified seed
+SEED_RATE_FACTOR = 2.0         # germination, nursery and replanting reserve
+HILLS_PER_WORKDAY = 7000       # transplanting output per worker-day (≈ 23 HOK/ha at 25×25)
+WAGE_PER_WORKDAY = 100000
+DEFAULT_PANICLE_CAP_M2 = 600   # suggested tiller-compensation limit (optional)
+
+# Custom spacing grid (cm)
+DEFAULT_ROW_SPACINGS = np.arange(15.0, 40.01, 2.5)
+DEFAULT_PLANT_SPACINGS = np.arange(10.0, 40.01, 2.5)
+DEFAULT_LOSS_SCENARIOS = (10, 15, 20, 25)
+
+RANK_COLUMNS = {
+    "gkp_net_ton": False,      # column -> ascending
+    "margin": False,
+    "total_cost": True,
+}
+
+
+def build_layouts(patterns, row_spacings=DEFAULT_ROW_SPACINGS, plant_spacings=DEFAULT_PLANT_SPACINGS):
+    """
+    Layout table [pattern, spacing_row, spacing_plant, population_factor].
+    Named patterns keep their own spacing; "Custom" is expanded over the
+    row × in-row spacing grid.
+    """
+    rows = []
+    for name, info in patterns.items():
+        if name == "Custom":
+            grid_r, grid_p = np.meshgrid(np.asarray(row_spacings, float), np.asarray(plant_spacings, float),
+                                         indexing="ij")
+            rows += [(name, r, p, info["population_factor"]) for r, p in zip(grid_r.ravel(), grid_p.ravel())]
+        else:
+            rows.append((name, float(info["spacing_row"]), float(info["spacing_plant"]), info["population_factor"]))
+    return pd.DataFrame(rows, columns=["pattern", "spacing_row", "spacing_plant", "population_factor"])
+
+
+def pareto_mask(benefit, *costs):
+    """True for points not dominated by another point (maximize `benefit`, minimize `costs`)."""
+    pts = np.column_stack([-np.asarray(benefit, float)] + [np.asarray(c, float) for c in costs])
+    efficient = np.ones(len(pts), dtype=bool)
+    for i in np.lexsort(pts.T[::-1]):
+        if not efficient[i]:
+            continue
+        dominated = np.all(pts >= pts[i], axis=1) & np.any(pts > pts[i], axis=1)
+        efficient &= ~dominated
+    return efficient
+
+
+def sweep_planting(patterns, varieties, plants_per_hill=2, loss_scenarios=DEFAULT_LOSS_SCENARIOS,
+                   row_spacings=DEFAULT_ROW_SPACINGS, plant_spacings=DEFAULT_PLANT_SPACINGS,
+                   rank_by="gkp_net_ton", max_panicles_per_m2=None):
+    """
+    Evaluate layouts × varieties × loss scenarios (per hectare).
+    `varieties` is {name: {tillers, grains, weight}}. Returns a DataFrame with
+    one row per combination, ranked by `rank_by`, with a `pareto` flag for
+    decisions on the yield / seed cost / labour cost frontier. Without
+    `max_panicles_per_m2` the yields equal the calculator's.
+    """
+    if rank_by not in RANK_COLUMNS:
+        raise ValueError(f"Kolom peringkat tidak dikenal: {rank_by}")
+    if not varieties:
+        raise ValueError("Minimal satu varietas diperlukan")
+    layouts = build_layouts(patterns, row_spacings, plant_spacings)
+    var_names = list(varieties)
+    tillers = np.array([varieties[v]["tillers"] for v in var_names], float)
+    grains = np.array([varieties[v]["grains"] for v in var_names], float)
+    weight = np.array([varieties[v]["weight"] for v in var_names], float)
+    loss = np.asarray(loss_scenarios, float)
+
+    # Layout (L) × variety (V) × loss (S)
+    area_per_hill = (layouts["spacing_row"].to_numpy() / 100) * (layouts["spacing_plant"].to_numpy() / 100)
+    population = np.floor(10000 / area_per_hill * layouts["population_factor"].to_numpy())     # (L,)
+    panicles = population[:, None] * tillers[None, :]                                         # (L, V) per ha
+    if max_panicles_per_m2:
+        panicles = np.minimum(panicles, max_panicles_per_m2 * 10000)
+    gkp_gross_kg = panicles * (grains * weight)[None, :] / 1_000_000                          # (L, V)
+    gkp_net_kg = gkp_gross_kg[:, :, None] * (1 - loss / 100)[None, None, :]                  # (L, V, S)
+
+    seed_kg = population[:, None] * plants_per_hill * weight[None, :] / 1_000_000 * SEED_RATE_FACTOR
+    seed_cost = seed_kg * SEED_PRICE_PER_KG                                                   # (L, V)
+    labor_days = np.broadcast_to((population / HILLS_PER_WORKDAY)[:, None], seed_cost.shape)
+    labor_cost = labor_days * WAGE_PER_WORKDAY
+    pareto = pareto_mask(gkp_gross_kg.ravel(), seed_cost.ravel(), labor_cost.ravel()).reshape(seed_cost.shape)
+
+    L, V, S = gkp_net_kg.shape
+    li, vi, si = (ix.ravel() for ix in np.indices((L, V, S)))
+    net = gkp_net_kg.ravel()
+    revenue = net * GKP_PRICE_PER_KG
+    total_cost = (seed_cost + labor_cost)[li, vi]
+    df = pd.DataFrame({
+        "pattern": layouts["pattern"].to_numpy()[li],
+        "spacing_row": layouts["spacing_row"].to_numpy()[li],
+        "spacing_plant": layouts["spacing_plant"].to_numpy()[li],
+        "variety": np.asarray(var_names, dtype=object)[vi],
+        "loss_pct": loss[si],
+        "population": population[li].astype(np.int64),
+        "panicles_m2": panicles[li, vi] / 10000,
+        "gkp_net_ton": net / 1000,
+        "gkg_ton": net * GKP_TO_GKG / 1000,
+        "rice_ton": net * GKP_TO_GKG * GKG_TO_RICE / 1000,
+        "seed_kg": seed_kg[li, vi],
+        "seed_cost": seed_cost[li, vi],
+        "labor_days": labor_days[li, vi],
+        "labor_cost": labor_cost[li, vi],
+        "total_cost": total_cost,
+        "revenue": revenue,
+        "margin": revenue - total_cost,
+        "pareto": pareto[li, vi],
+    })
+    df = df.sort_values(rank_by, ascending=RANK_COLUMNS[rank_by], kind="stable", ignore_index=True)
+    df.insert(0, "rank", np.arange(1, len(df) + 1))
+    return df
+
+
+def pareto_frontier(sweep, loss_pct=None):
+    """Pareto decisions at one loss scenario (default: the lowest), sorted by total cost."""
+    loss_pct = sweep["loss_pct"].min() if loss_pct is None else loss_pct
+    front = sweep[sweep["pareto"] & (sweep["loss_pct"] == loss_pct)]
+    return front.sort_values(["total_cost", "gkp_net_ton"], ignore_index=True)
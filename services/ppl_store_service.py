@@ -0,0 +1,493 @@
+import json
+import os
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+# ==========================================
+# 📢 PPL DATA STORE (RUANG KERJA PPL)
+# ==========================================
+# Tasks, field visits and poktan of the extension workspace in one SQLite
+# file, indexed on date, officer, status and desa. Weekly and monthly visit
+# rollups (totals, per activity, per poktan) are kept up to date by triggers
+# on every insert / update / delete, so dashboards and report tabs read a
+# handful of rollup rows however many years of visits are stored. The old
+# JSON files are imported once on first open.
+
+PPL_DB = os.path.join("data", "ppl", "ppl.db")
+TASK_STATUSES = ("pending", "in_progress", "done")
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+TASK_COLUMNS = ("id", "title", "description", "poktan", "desa", "due_date", "priority", "status",
+                "created_date", "officer")
+VISIT_COLUMNS = ("id", "date", "officer", "poktan", "desa", "kecamatan", "kegiatan", "jumlah_hadir",
+                 "laki_laki", "perempuan", "catatan", "tindak_lanjut", "created_at")
+VISIT_COUNTS = ("jumlah_hadir", "laki_laki", "perempuan")
+TASK_SORTS = {
+    "due_date": "due_date ASC",
+    "created_date": "created_date DESC",
+    "priority": "CASE priority WHEN 'high' THEN 0 WHEN 'medium' THEN 1 WHEN 'low' THEN 2 ELSE 1 END",
+}
+
+# period type -> SQL expression of the period key for a date column
+ROLLUP_PERIODS = {
+    "week": "date({d}, '-6 days', 'weekday 1')",     # Monday of the week
+    "month": "strftime('%Y-%m', {d})",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    poktan TEXT NOT NULL DEFAULT '',
+    desa TEXT NOT NULL DEFAULT '',
+    due_date TEXT,
+    priority TEXT NOT NULL DEFAULT 'medium',
+    status TEXT NOT NULL DEFAULT 'pending',
+    created_date TEXT,
+    officer TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_officer ON tasks (officer, status, due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_desa ON tasks (desa, status);
+CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks (due_date);
+
+CREATE TABLE IF NOT EXISTS visits (
+    id TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    officer TEXT NOT NULL DEFAULT '',
+    poktan TEXT NOT NULL,
+    desa TEXT NOT NULL DEFAULT '',
+    kecamatan TEXT NOT NULL DEFAULT '',
+    kegiatan TEXT NOT NULL DEFAULT 'Lainnya',
+    jumlah_hadir INTEGER NOT NULL DEFAULT 0,
+    laki_laki INTEGER NOT NULL DEFAULT 0,
+    perempuan INTEGER NOT NULL DEFAULT 0,
+    catatan TEXT NOT NULL DEFAULT '',
+    tindak_lanjut TEXT NOT NULL DEFAULT '',
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_visits_date ON visits (date);
+CREATE INDEX IF NOT EXISTS idx_visits_officer ON visits (officer, date);
+CREATE INDEX IF NOT EXISTS idx_visits_desa ON visits (desa, date);
+CREATE INDEX IF NOT EXISTS idx_visits_poktan ON visits (poktan, date);
+
+CREATE TABLE IF NOT EXISTS poktan (
+    name TEXT PRIMARY KEY COLLATE NOCASE,
+    desa TEXT NOT NULL DEFAULT '',
+    kecamatan TEXT NOT NULL DEFAULT '',
+    officer TEXT NOT NULL DEFAULT '',
+    visits INTEGER NOT NULL DEFAULT 0,
+    last_visit TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_poktan_desa ON poktan (desa);
+CREATE INDEX IF NOT EXISTS idx_poktan_officer ON poktan (officer);
+
+CREATE TABLE IF NOT EXISTS visit_rollup (
+    period_type TEXT NOT NULL,
+    period TEXT NOT NULL,
+    officer TEXT NOT NULL,
+    visits INTEGER NOT NULL,
+    jumlah_hadir INTEGER NOT NULL,
+    laki_laki INTEGER NOT NULL,
+    perempuan INTEGER NOT NULL,
+    PRIMARY KEY (period_type, period, officer)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS visit_rollup_kegiatan (
+    period_type TEXT NOT NULL,
+    period TEXT NOT NULL,
+    officer TEXT NOT NULL,
+    kegiatan TEXT NOT NULL,
+    visits INTEGER NOT NULL,
+    PRIMARY KEY (period_type, period, officer, kegiatan)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS visit_rollup_poktan (
+    period_type TEXT NOT NULL,
+    period TEXT NOT NULL,
+    officer TEXT NOT NULL,
+    poktan TEXT NOT NULL,
+    visits INTEGER NOT NULL,
+    PRIMARY KEY (period_type, period, officer, poktan)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _rollup_statements(row, sign):
+    """Trigger statements adding (sign=+1) or removing (sign=-1) visit `row` (NEW/OLD) from all rollups."""
+    stmts = []
+    for ptype, expr in ROLLUP_PERIODS.items():
+        period = expr.format(d=f"{row}.date")
+        key = f"'{ptype}', {period}, {row}.officer"
+        stmts.append(
+            f"INSERT INTO visit_rollup VALUES ({key}, {sign}, {sign} * {row}.jumlah_hadir, "
+            f"{sign} * {row}.laki_laki, {sign} * {row}.perempuan) "
+            "ON CONFLICT DO UPDATE SET visits = visits + excluded.visits, "
+            "jumlah_hadir = jumlah_hadir + excluded.jumlah_hadir, laki_laki = laki_laki + excluded.laki_laki, "
+            "perempuan = perempuan + excluded.perempuan;")
+        for table, col in (("visit_rollup_kegiatan", "kegiatan"), ("visit_rollup_poktan", "poktan")):
+            stmts.append(
+                f"INSERT INTO {table} VALUES ({key}, {row}.{col}, {sign}) "
+                "ON CONFLICT DO UPDATE SET visits = visits + excluded.visits;")
+            if sign < 0:
+                stmts.append(
+                    f"DELETE FROM {table} WHERE period_type = '{ptype}' AND period = {period} "
+                    f"AND officer = {row}.officer AND {col} = {row}.{col} AND visits <= 0;")
+        if sign < 0:
+            stmts.append(
+                f"DELETE FROM visit_rollup WHERE period_type = '{ptype}' AND period = {period} "
+                f"AND officer = {row}.officer AND visits <= 0;")
+    return "\n    ".join(stmts)
+
+
+def _poktan_statements(row, sign):
+    if sign > 0:
+        return (
+            f"INSERT INTO poktan (name, desa, kecamatan, officer, visits, last_visit) "
+            f"VALUES ({row}.poktan, {row}.desa, {row}.kecamatan, {row}.officer, 1, {row}.date) "
+            "ON CONFLICT(name) DO UPDATE SET visits = visits + 1, "
+            "last_visit = MAX(COALESCE(last_visit, ''), excluded.last_visit), "
+            "desa = COALESCE(NULLIF(excluded.desa, ''), desa), "
+            "kecamatan = COALESCE(NULLIF(excluded.kecamatan, ''), kecamatan), "
+            "officer = COALESCE(NULLIF(excluded.officer, ''), officer);")
+    return (
+        f"UPDATE poktan SET visits = visits - 1, "
+        f"last_visit = (SELECT MAX(date) FROM visits WHERE poktan = {row}.poktan) "
+        f"WHERE name = {row}.poktan;")
+
+
+# Dropped and recreated on open so databases created by older versions get the current definitions
+TRIGGERS = f"""
+BEGIN IMMEDIATE;
+DROP TRIGGER IF EXISTS trg_visits_insert;
+DROP TRIGGER IF EXISTS trg_visits_delete;
+DROP TRIGGER IF EXISTS trg_visits_update;
+CREATE TRIGGER trg_visits_insert AFTER INSERT ON visits BEGIN
+    {_rollup_statements("NEW", 1)}
+    {_poktan_statements("NEW", 1)}
+END;
+CREATE TRIGGER trg_visits_delete AFTER DELETE ON visits BEGIN
+    {_rollup_statements("OLD", -1)}
+    {_poktan_statements("OLD", -1)}
+END;
+CREATE TRIGGER trg_visits_update
+AFTER UPDATE OF date, officer, poktan, desa, kecamatan, kegiatan, jumlah_hadir, laki_laki, perempuan ON visits BEGIN
+    {_rollup_statements("OLD", -1)}
+    {_poktan_statements("OLD", -1)}
+    {_rollup_statements("NEW", 1)}
+    {_poktan_statements("NEW", 1)}
+END;
+COMMIT;
+"""
+
+
+def week_start(day):
+    """Monday of the week containing `day`."""
+    day = pd.Timestamp(day).date()
+    return day - timedelta(days=day.weekday())
+
+
+def period_key(period_type, day):
+    day = pd.Timestamp(day).date()
+    if period_type == "week":
+        return str(week_start(day))
+    if period_type == "month":
+        return day.strftime("%Y-%m")
+    raise ValueError(f"Periode tidak dikenal: {period_type}")
+
+
+def _load_json_list(path):
+    if not path or not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return data if isinstance(data, list) else []
+
+
+class PPLStore:
+    """Indexed tasks / visits / poktan with trigger-maintained weekly and monthly rollups."""
+
+    def __init__(self, db_file=PPL_DB, legacy_files=None):
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            conn.executescript(TRIGGERS)
+        if legacy_files:
+            self.migrate_json(**legacy_files)
+
+    @contextmanager
+    def _connect(self):
+        """One unit of work: committed (or rolled back) and always closed."""
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        try:
+            conn.row_factory = sqlite3.Row
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _rows(self, sql, args=()):
+        with self._connect() as conn:
+            return [dict(r) for r in conn.execute(sql, args)]
+
+    # ---------- Legacy import ----------
+    def migrate_json(self, tasks_file=None, visits_file=None, poktan_file=None):
+        """Import the old JSON lists once (recorded in `meta`). Returns (tasks, visits, poktan) imported."""
+        with self._connect() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+                return 0, 0, 0
+        tasks = _load_json_list(tasks_file)
+        visits = _load_json_list(visits_file)
+        poktan = _load_json_list(poktan_file)
+        n_tasks = self.add_tasks(tasks)
+        skipped = []
+        n_visits = self.add_visits(visits, skipped=skipped)
+        rows = []
+        for p in poktan:
+            name = str(p.get("name") or p.get("nama") or p.get("poktan") or "").strip()
+            if name:
+                rows.append((name, p.get("desa") or "", p.get("kecamatan") or "", p.get("officer") or ""))
+        with self._connect() as conn:
+            conn.executemany("INSERT OR IGNORE INTO poktan (name, desa, kecamatan, officer) VALUES (?, ?, ?, ?)", rows)
+            conn.execute("INSERT INTO meta VALUES ('json_migrated', ?)", (datetime.now().isoformat(timespec="seconds"),))
+            if skipped:
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('json_skipped_visits', ?)",
+                             (json.dumps(skipped, ensure_ascii=False, default=str),))
+        return n_tasks, n_visits, len(rows)
+
+    def skipped_legacy_visits(self):
+        """Legacy visits left out of the JSON import (malformed date / counts), with the reason."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'json_skipped_visits'").fetchone()
+        return json.loads(row[0]) if row else []
+
+    # ---------- Tasks ----------
+    @staticmethod
+    def _task_row(task):
+        task = dict(task)
+        task.setdefault("id", uuid.uuid4().hex)
+        task.setdefault("created_date", str(date.today()))
+        defaults = {"description": "", "poktan": "", "desa": "", "priority": "medium", "status": "pending",
+                    "officer": ""}
+        return tuple(task.get(c) if task.get(c) is not None else defaults.get(c) for c in TASK_COLUMNS)
+
+    def add_tasks(self, tasks):
+        rows = [self._task_row(t) for t in tasks if t.get("title")]
+        with self._connect() as conn:
+            conn.executemany(f"INSERT OR REPLACE INTO tasks ({', '.join(TASK_COLUMNS)}) "
+                             f"VALUES ({', '.join('?' * len(TASK_COLUMNS))})", rows)
+        return len(rows)
+
+    def add_task(self, task):
+        if not task.get("title"):
+            raise ValueError("Judul tugas wajib diisi")
+        row = self._task_row(task)
+        self.add_tasks([dict(zip(TASK_COLUMNS, row))])
+        return row[0]
+
+    def set_task_status(self, task_id, status):
+        if status not in TASK_STATUSES:
+            raise ValueError(f"Status tidak dikenal: {status}")
+        with self._connect() as conn:
+            conn.execute("UPDATE tasks SET status = ? WHERE id = ?", (status, task_id))
+
+    def delete_task(self, task_id):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    def tasks(self, status=None, priority=None, officer=None, desa=None, sort_by="due_date", limit=None):
+        """Filtered, sorted task dicts (filters and sort run on the indexes)."""
+        if sort_by not in TASK_SORTS:
+            raise ValueError(f"Kolom urut tidak dikenal: {sort_by}")
+        clauses, args = [], []
+        for col, value in (("status", status), ("priority", priority), ("officer", officer), ("desa", desa)):
+            if value in (None, "all"):
+                continue
+            if isinstance(value, (list, tuple)):
+                clauses.append(f"{col} IN ({', '.join('?' * len(value))})")
+                args += list(value)
+            else:
+                clauses.append(f"{col} = ?")
+                args.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT * FROM tasks{where} ORDER BY {TASK_SORTS[sort_by]}, id"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return self._rows(sql, args)
+
+    def task_status_counts(self, officer=None):
+        where, args = (" WHERE officer = ?", [officer]) if officer else ("", [])
+        counts = dict.fromkeys(TASK_STATUSES, 0)
+        with self._connect() as conn:
+            counts.update(dict(conn.execute(f"SELECT status, COUNT(*) FROM tasks{where} GROUP BY status", args)))
+        return counts
+
+    # ---------- Visits ----------
+    @staticmethod
+    def _visit_row(visit):
+        visit = dict(visit)
+        visit.setdefault("id", uuid.uuid4().hex)
+        visit.setdefault("created_at", str(datetime.now()))
+        row = []
+        for c in VISIT_COLUMNS:
+            value = visit.get(c)
+            if c in VISIT_COUNTS:
+                number = pd.to_numeric(value if value not in (None, "") else 0, errors="coerce")
+                if pd.isna(number):
+                    raise ValueError(f"Jumlah tidak valid ({c}): {value}")
+                value = int(number)
+            elif c == "date":
+                day = pd.to_datetime(value, errors="coerce") if value else pd.Timestamp(date.today())
+                if pd.isna(day):
+                    raise ValueError(f"Tanggal kunjungan tidak valid: {value}")
+                value = str(day.date())
+            elif value is None:
+                value = "Lainnya" if c == "kegiatan" else ""
+            row.append(value)
+        return tuple(row)
+
+    def add_visits(self, visits, skipped=None):
+        """
+        Upsert visits; returns the number written. Malformed rows raise ValueError,
+        or are left out and appended to `skipped` ({id, poktan, date, alasan}) when a list is given.
+        """
+        rows = []
+        for v in visits:
+            if not v.get("poktan"):
+                continue
+            try:
+                rows.append(self._visit_row(v))
+            except ValueError as e:
+                if skipped is None:
+                    raise
+                skipped.append({"id": v.get("id"), "poktan": v.get("poktan"), "date": v.get("date"), "alasan": str(e)})
+        # Upsert (not INSERT OR REPLACE) so a re-sent id goes through the update trigger
+        updates = ", ".join(f"{c} = excluded.{c}" for c in VISIT_COLUMNS if c != "id")
+        with self._connect() as conn:
+            conn.executemany(f"INSERT INTO visits ({', '.join(VISIT_COLUMNS)}) "
+                             f"VALUES ({', '.join('?' * len(VISIT_COLUMNS))}) "
+                             f"ON CONFLICT(id) DO UPDATE SET {updates}", rows)
+        return len(rows)
+
+    def add_visit(self, visit):
+        if not visit.get("poktan"):
+            raise ValueError("Nama Kelompok Tani wajib diisi")
+        row = self._visit_row(visit)
+        self.add_visits([dict(zip(VISIT_COLUMNS, row))])
+        return row[0]
+
+    def update_visit(self, visit_id, fields):
+        cols = [c for c in VISIT_COLUMNS if c in fields and c != "id"]
+        if not cols:
+            return
+        with self._connect() as conn:
+            conn.execute(f"UPDATE visits SET {', '.join(f'{c} = ?' for c in cols)} WHERE id = ?",
+                         [fields[c] for c in cols] + [visit_id])
+
+    def delete_visit(self, visit_id):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM visits WHERE id = ?", (visit_id,))
+
+    def visits(self, start=None, end=None, officer=None, desa=None, limit=None, newest_first=False):
+        """Visit dicts in [start, end] (inclusive ISO dates), via the date / officer / desa indexes."""
+        clauses, args = [], []
+        for col, value in (("officer", officer), ("desa", desa)):
+            if value:
+                clauses.append(f"{col} = ?")
+                args.append(value)
+        if start is not None:
+            clauses.append("date >= ?")
+            args.append(str(start))
+        if end is not None:
+            clauses.append("date <= ?")
+            args.append(str(end))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "DESC" if newest_first else "ASC"
+        sql = f"SELECT * FROM visits{where} ORDER BY date {order}, created_at {order}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return self._rows(sql, args)
+
+    def visit_count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM visits").fetchone()[0]
+
+    def visits_frame(self):
+        with self._connect() as conn:
+            return pd.read_sql_query("SELECT * FROM visits ORDER BY date DESC, created_at DESC", conn)
+
+    # ---------- Rollups ----------
+    def rollup(self, period_type, day, officer=None):
+        """
+        Visit summary of the week / month containing `day` read from the rollup
+        tables: visits, jumlah_hadir, laki_laki, perempuan, poktan (distinct),
+        kegiatan {name: visits}.
+        """
+        key = period_key(period_type, day)
+        where = "period_type = ? AND period = ?" + (" AND officer = ?" if officer else "")
+        args = [period_type, key] + ([officer] if officer else [])
+        with self._connect() as conn:
+            totals = conn.execute(
+                "SELECT COALESCE(SUM(visits), 0), COALESCE(SUM(jumlah_hadir), 0), "
+                f"COALESCE(SUM(laki_laki), 0), COALESCE(SUM(perempuan), 0) FROM visit_rollup WHERE {where}",
+                args).fetchone()
+            kegiatan = dict(conn.execute(
+                f"SELECT kegiatan, SUM(visits) FROM visit_rollup_kegiatan WHERE {where} "
+                "GROUP BY kegiatan ORDER BY SUM(visits) DESC, kegiatan", args).fetchall())
+            poktan = conn.execute(
+                f"SELECT COUNT(DISTINCT poktan) FROM visit_rollup_poktan WHERE {where}", args).fetchone()[0]
+        return {"period": key, "visits": totals[0], "jumlah_hadir": totals[1], "laki_laki": totals[2],
+                "perempuan": totals[3], "poktan": poktan, "kegiatan": kegiatan}
+
+    def rollup_series(self, period_type, officer=None, limit=12):
+        """Latest `limit` periods (oldest first) as a DataFrame [period, visits, jumlah_hadir, ...]."""
+        where = "period_type = ?" + (" AND officer = ?" if officer else "")
+        args = [period_type] + ([officer] if officer else [])
+        with self._connect() as conn:
+            df = pd.read_sql_query(
+                f"SELECT period, SUM(visits) AS visits, SUM(jumlah_hadir) AS jumlah_hadir, "
+                f"SUM(laki_laki) AS laki_laki, SUM(perempuan) AS perempuan FROM visit_rollup WHERE {where} "
+                f"GROUP BY period ORDER BY period DESC LIMIT {int(limit)}", conn, params=args)
+        return df.iloc[::-1].reset_index(drop=True)
+
+    def range_summary(self, start, end, officer=None):
+        """Summary for [start, end]: rollup rows for an exact Monday–Sunday week, else an indexed range scan."""
+        start, end = pd.Timestamp(start).date(), pd.Timestamp(end).date()
+        if start == week_start(start) and end == start + timedelta(days=6):
+            return self.rollup("week", start, officer)
+        clauses = "date >= ? AND date <= ?" + (" AND officer = ?" if officer else "")
+        args = [str(start), str(end)] + ([officer] if officer else [])
+        with self._connect() as conn:
+            totals = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(jumlah_hadir), 0), COALESCE(SUM(laki_laki), 0), "
+                f"COALESCE(SUM(perempuan), 0), COUNT(DISTINCT poktan) FROM visits WHERE {clauses}", args).fetchone()
+            kegiatan = dict(conn.execute(
+                f"SELECT kegiatan, COUNT(*) FROM visits WHERE {clauses} GROUP BY kegiatan "
+                "ORDER BY COUNT(*) DESC, kegiatan", args).fetchall())
+        return {"period": f"{start}..{end}", "visits": totals[0], "jumlah_hadir": totals[1],
+                "laki_laki": totals[2], "perempuan": totals[3], "poktan": totals[4], "kegiatan": kegiatan}
+
+    # ---------- Poktan ----------
+    def poktan(self, desa=None, officer=None):
+        clauses, args = [], []
+        for col, value in (("desa", desa), ("officer", officer)):
+            if value:
+                clauses.append(f"{col} = ?")
+                args.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._rows(f"SELECT * FROM poktan{where} ORDER BY name", args)
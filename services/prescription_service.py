@@ -0,0 +1,260 @@
+import json
+
+import numpy as np
+import pandas as pd
+from matplotlib.path import Path
+
+from services.soil_interpolation_service import (
+    M_PER_DEG_LAT,
+    M_PER_DEG_LON,
+    extract_samples,
+    interpolate_samples,
+)
+from utils.lazy_imports import lazy_attr
+
+KMeans = lazy_attr("sklearn.cluster", "KMeans")
+
+# ==========================================
+# 🚜 VARIABLE-RATE PRESCRIPTION ENGINE
+# ==========================================
+# Per-cell lime & NPK doses over a soil raster, clipped to machine limits
+# and grouped into k-means management zones.
+
+# Soil targets follow the ppm thresholds used on Peta Data Tanah (page 2)
+NUTRIENT_RULES = {
+    "n_value": {"target_ppm": 3500, "max_nutrient_kg_ha": 120, "product": "urea_kg_ha", "content": 0.46},
+    "p_value": {"target_ppm": 17.5, "max_nutrient_kg_ha": 60, "product": "sp36_kg_ha", "content": 0.36},
+    "k_value": {"target_ppm": 3000, "max_nutrient_kg_ha": 90, "product": "kcl_kg_ha", "content": 0.60},
+}
+
+PRODUCT_LABELS = {
+    "lime_kg_ha": "Kapur Dolomit",
+    "urea_kg_ha": "Urea (46% N)",
+    "sp36_kg_ha": "SP-36 (36% P2O5)",
+    "kcl_kg_ha": "KCl (60% K2O)",
+}
+
+# (min, max) applicator rate in kg/ha. Below min the section is shut off.
+MACHINE_LIMITS = {
+    "lime_kg_ha": (250, 6000),
+    "urea_kg_ha": (50, 400),
+    "sp36_kg_ha": (50, 300),
+    "kcl_kg_ha": (50, 300),
+}
+
+
+def cells_in_boundary(grid_lat, grid_lon, boundary):
+    """Boolean mask of grid cells inside a [[lat, lon], ...] polygon (all True if no boundary)."""
+    if not boundary or len(boundary) < 3:
+        return np.ones(np.shape(grid_lat), dtype=bool)
+    poly = Path(np.asarray(boundary, dtype=float)[:, ::-1])  # (lon, lat)
+    pts = np.column_stack([np.ravel(grid_lon), np.ravel(grid_lat)])
+    return poly.contains_points(pts).reshape(np.shape(grid_lat))
+
+
+def cell_size_m(grid_lat, grid_lon):
+    """(width, height) of one grid cell in metres."""
+    lat_c = float(np.mean(grid_lat))
+    d_lon = abs(grid_lon[0, 1] - grid_lon[0, 0]) if grid_lon.shape[1] > 1 else 0.0
+    d_lat = abs(grid_lat[1, 0] - grid_lat[0, 0]) if grid_lat.shape[0] > 1 else 0.0
+    return d_lon * M_PER_DEG_LON * np.cos(np.radians(lat_c)), d_lat * M_PER_DEG_LAT
+
+
+def apply_machine_limits(rates, limits):
+    """Clip to (min, max); rates under half the minimum are switched off, the rest raised to minimum."""
+    lo, hi = limits
+    out = np.minimum(rates, hi)
+    out = np.where(out < lo, np.where(out < lo / 2, 0.0, lo), out)
+    return out
+
+
+def compute_doses(layers, target_ph=6.5, lime_ton_per_ph=2.0, limits=MACHINE_LIMITS):
+    """
+    Vectorized per-cell doses (kg/ha) from soil layers.
+    `layers` maps 'ph' / 'n_value' / 'p_value' / 'k_value' to equally shaped arrays.
+    Returns dict of product → (raw, applied) arrays.
+    """
+    doses = {}
+    if "ph" in layers:
+        raw = np.clip(target_ph - np.asarray(layers["ph"], dtype=float), 0, None) * lime_ton_per_ph * 1000
+        doses["lime_kg_ha"] = raw
+    for key, rule in NUTRIENT_RULES.items():
+        if key not in layers:
+            continue
+        deficit = np.clip(1 - np.asarray(layers[key], dtype=float) / rule["target_ppm"], 0, 1)
+        doses[rule["product"]] = deficit * rule["max_nutrient_kg_ha"] / rule["content"]
+
+    return {
+        prod: (raw, apply_machine_limits(raw, limits.get(prod, (0, np.inf))))
+        for prod, raw in doses.items()
+    }
+
+
+def assign_zones(features, n_zones=4, sample_size=20000, random_state=0):
+    """
+    K-means management zones on standardized dose features.
+    Fits on a subsample for speed, then labels every cell. Zone 1 has the lowest total dose.
+    """
+    n = len(features)
+    if n == 0:
+        return np.zeros(0, dtype=int)
+    n_zones = int(max(1, min(n_zones, n)))
+    std = features.std(axis=0)
+    std[std == 0] = 1.0
+    X = (features - features.mean(axis=0)) / std
+
+    rng = np.random.default_rng(random_state)
+    fit_idx = rng.choice(n, size=min(n, sample_size), replace=False)
+    km = KMeans(n_clusters=n_zones, n_init=3, random_state=random_state).fit(X[fit_idx])
+    labels = km.predict(X)
+
+    order = np.argsort(km.cluster_centers_.sum(axis=1))
+    rank = np.empty(n_zones, dtype=int)
+    rank[order] = np.arange(1, n_zones + 1)
+    return rank[labels]
+
+
+def generate_prescription(grid_lat, grid_lon, layers, boundary=None, n_zones=4,
+                          target_ph=6.5, lime_ton_per_ph=2.0, limits=MACHINE_LIMITS):
+    """
+    Build a variable-rate prescription over a raster.
+    Returns dict with `cells` (per-cell DataFrame), `zones` (zone rate table),
+    `totals_kg` (VRA), `uniform_kg` (flat-rate comparison) and `area_ha`.
+    """
+    grid_lat = np.asarray(grid_lat, dtype=float)
+    grid_lon = np.asarray(grid_lon, dtype=float)
+    inside = cells_in_boundary(grid_lat, grid_lon, boundary)
+    for arr in layers.values():
+        inside &= np.isfinite(arr)
+
+    w, h = cell_size_m(grid_lat, grid_lon)
+    cell_ha = w * h / 10000
+    doses = compute_doses({k: np.asarray(v)[inside] for k, v in layers.items()},
+                          target_ph=target_ph, lime_ton_per_ph=lime_ton_per_ph, limits=limits)
+    products = list(doses.keys())
+
+    cells = pd.DataFrame({
+        "row": np.nonzero(inside)[0],
+        "col": np.nonzero(inside)[1],
+        "lat": grid_lat[inside],
+        "lon": grid_lon[inside],
+    })
+    for prod in products:
+        cells[prod] = doses[prod][1]
+
+    features = cells[products].to_numpy() if products else np.zeros((len(cells), 1))
+    cells["zone"] = assign_zones(features, n_zones=n_zones)
+
+    # Machines apply one rate per zone: the zone mean of the clipped per-cell rate
+    zones = cells.groupby("zone").agg(cells=("zone", "size"), **{p: (p, "mean") for p in products})
+    zones["area_ha"] = zones["cells"] * cell_ha
+    for prod in products:
+        zones[prod] = apply_machine_limits(zones[prod].to_numpy(), limits.get(prod, (0, np.inf))).round(0)
+        cells[f"zone_{prod}"] = zones[prod].reindex(cells["zone"]).to_numpy()
+    zones = zones.reset_index()
+
+    area_ha = len(cells) * cell_ha
+    totals = {p: float((zones[p] * zones["area_ha"]).sum()) for p in products}
+    # Conventional practice: one flat rate from the composite (field-mean) soil test
+    composite = compute_doses({k: np.array([np.mean(v[inside]) if inside.any() else np.nan]) for k, v in layers.items()},
+                              target_ph=target_ph, lime_ton_per_ph=lime_ton_per_ph, limits=limits)
+    uniform = {p: float(np.nan_to_num(composite[p][1][0]) * area_ha) for p in products}
+
+    return {
+        "cells": cells,
+        "zones": zones,
+        "products": products,
+        "totals_kg": totals,
+        "uniform_kg": uniform,
+        "area_ha": area_ha,
+        "cell_size_m": (w, h),
+        "mask": inside,
+    }
+
+
+def prescription_from_samples(records, boundary=None, resolution=200, method="idw", **kwargs):
+    """Interpolate sample records (page 2 format) over the boundary, then build the prescription."""
+    samples = {prop: extract_samples(records, prop) for prop in ("ph", "n_value", "p_value", "k_value")}
+    samples = {prop: s for prop, s in samples.items() if len(s[2]) >= 2}
+    if not samples:
+        return None
+
+    # All layers must share one grid
+    if boundary and len(boundary) >= 3:
+        b = np.asarray(boundary, dtype=float)
+        bounds = (b[:, 0].min(), b[:, 1].min(), b[:, 0].max(), b[:, 1].max())
+    else:
+        all_lat = np.concatenate([s[0] for s in samples.values()])
+        all_lon = np.concatenate([s[1] for s in samples.values()])
+        bounds = (all_lat.min(), all_lon.min(), all_lat.max(), all_lon.max())
+
+    layers = {}
+    for prop, (lats, lons, vals) in samples.items():
+        res = interpolate_samples(lats, lons, vals, method=method, resolution=resolution, bounds=bounds)
+        layers[prop] = res["grid"]
+    return generate_prescription(res["grid_lat"], res["grid_lon"], layers, boundary=boundary, **kwargs)
+
+
+# ---------- Export ----------
+def to_csv(rx, level="zone"):
+    """CSV bytes of the prescription (zone-rate per cell, or raw per-cell rates with level='cell')."""
+    cells = rx["cells"]
+    cols = ["lat", "lon", "zone"]
+    cols += [f"zone_{p}" for p in rx["products"]] if level == "zone" else rx["products"]
+    return cells[cols].round(7).to_csv(index=False).encode("utf-8")
+
+
+def _row_runs(cells, key):
+    """Start/end indices of horizontal runs of adjacent cells sharing the same `key` value."""
+    row = cells["row"].to_numpy()
+    col = cells["col"].to_numpy()
+    val = cells[key].to_numpy()
+    brk = np.ones(len(cells), dtype=bool)
+    brk[1:] = (row[1:] != row[:-1]) | (col[1:] != col[:-1] + 1) | (val[1:] != val[:-1])
+    starts = np.flatnonzero(brk)
+    ends = np.append(starts[1:], len(cells)) - 1
+    return starts, ends
+
+
+def to_geojson(rx, level="zone"):
+    """
+    GeoJSON FeatureCollection of application polygons.
+    level='zone' merges adjacent same-zone cells along each row into one rectangle
+    (compact, what rate controllers import); level='cell' emits every cell.
+    Property names match the product keys so controllers can map them directly.
+    """
+    cells = rx["cells"].sort_values(["row", "col"])
+    w, h = rx["cell_size_m"]
+    lat_c = float(cells["lat"].mean()) if len(cells) else 0.0
+    half_lat = h / 2 / M_PER_DEG_LAT
+    half_lon = w / 2 / (M_PER_DEG_LON * np.cos(np.radians(lat_c)))
+
+    if level == "zone":
+        starts, ends = _row_runs(cells, "zone")
+        src_cols = {p: f"zone_{p}" for p in rx["products"]}
+    else:
+        starts = ends = np.arange(len(cells))
+        src_cols = {p: p for p in rx["products"]}
+
+    lat = cells["lat"].to_numpy()
+    lon = cells["lon"].to_numpy()
+    s = np.round(lat[starts] - half_lat, 7)
+    n = np.round(lat[starts] + half_lat, 7)
+    wl = np.round(lon[starts] - half_lon, 7)
+    el = np.round(lon[ends] + half_lon, 7)
+    zones = cells["zone"].to_numpy()[starts]
+    rates = {p: cells[c].to_numpy()[starts] for p, c in src_cols.items()}
+
+    features = []
+    for i in range(len(starts)):
+        props = {"zone": int(zones[i])}
+        props.update({p: float(rates[p][i]) for p in rx["products"]})
+        features.append({
+            "type": "Feature",
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [[[wl[i], s[i]], [el[i], s[i]], [el[i], n[i]], [wl[i], n[i]], [wl[i], s[i]]]],
+            },
+            "properties": props,
+        })
+    return json.dumps({"type": "FeatureCollection", "features": features}, separators=(",", ":"), default=float).encode("utf-8")
@@ -0,0 +1,207 @@
+import io
+import re
+
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# 📋 E-RDKK BATCH ALLOCATION
+# ==========================================
+# Subsidized fertilizer quota for every member of a poktan roster and every
+# planting season (MT) in one pass: dose lookup through a commodity × season
+# × fertilizer array, the 2 Ha per NIK per season cap applied on the member's
+# total area, group / village totals and the wide submission sheet (one row
+# per member and commodity, MT 1–3 side by side).
+
+MAX_LUAS_HA = 2.0           # Permentan: max subsidized area per NIK per season
+NIK_LENGTH = 16
+
+SEASONS = ("MT 1", "MT 2", "MT 3")
+FERTILIZERS = ("urea", "npk")
+FERTILIZER_LABELS = {"urea": "Urea", "npk": "NPK"}
+COMMODITIES = ("Padi", "Jagung", "Kedelai", "Cabai", "Bawang Merah", "Bawang Putih", "Tebu Rakyat", "Kopi", "Kakao")
+
+# kg/Ha per season (same reference as the single-farmer simulator)
+QUOTA_REF = {
+    "Padi": {"urea": 200, "npk": 250},
+    "Jagung": {"urea": 250, "npk": 300},
+    "Kedelai": {"urea": 50, "npk": 150},
+    "Cabai": {"urea": 200, "npk": 200},
+}
+DEFAULT_QUOTA = {"urea": 150, "npk": 150}
+
+REQUIRED_COLUMNS = ("nik", "poktan", "desa", "luas_lahan", "komoditas")
+OPTIONAL_COLUMNS = ("nama", "kecamatan", "mt")
+COLUMN_ALIASES = {
+    "no_nik": "nik",
+    "nama_petani": "nama",
+    "kelompok_tani": "poktan",
+    "desa_kelurahan": "desa",
+    "kelurahan": "desa",
+    "luas": "luas_lahan",
+    "luas_ha": "luas_lahan",
+    "luas_lahan_ha": "luas_lahan",
+    "komoditas_prioritas": "komoditas",
+    "musim_tanam": "mt",
+}
+ALL_SEASONS = ("", "semua", "all", "mt 1-3", "1-3")
+
+LEVEL_KEYS = {
+    "poktan": ["desa", "poktan"],
+    "desa": ["desa"],
+}
+
+
+def quota_per_ha(komoditas):
+    """Dose (kg/Ha per season) for one commodity."""
+    return QUOTA_REF.get(komoditas, DEFAULT_QUOTA)
+
+
+def dose_table():
+    """Array [commodity, season, fertilizer] in kg/Ha; the last commodity row is the default dose."""
+    rows = [[quota_per_ha(c)[f] for f in FERTILIZERS] for c in COMMODITIES]
+    rows.append([DEFAULT_QUOTA[f] for f in FERTILIZERS])
+    table = np.asarray(rows, dtype=float)
+    return np.repeat(table[:, None, :], len(SEASONS), axis=1)
+
+
+# ---------- Roster ----------
+
+def _season(value):
+    """'MT 2', 'mt2', '2', 2.0 → 'MT 2'; blank / 'semua' → all seasons; None if invalid."""
+    text = str(value).strip().lower()
+    if text in ALL_SEASONS or text in ("nan", "<na>", "none"):
+        return list(SEASONS)
+    digits = re.sub(r"\.0$", "", text.replace("mt", "").strip())
+    label = f"MT {digits}"
+    return [label] if label in SEASONS else None
+
+
+def normalize_roster(df):
+    """Lower-case, snake-case and alias the roster header; raises ValueError on missing columns."""
+    df = df.rename(columns=lambda c: str(c).strip().lower().replace(" ", "_").replace("/", "_"))
+    df = df.rename(columns=COLUMN_ALIASES)
+    missing = set(REQUIRED_COLUMNS) - set(df.columns)
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ada: {', '.join(sorted(missing))}")
+    return df
+
+
+def process_roster(df):
+    """
+    Validate the member roster and expand it to one row per member × season.
+    A blank / 'Semua' MT (or no `mt` column) means all three seasons.
+    Returns (valid rows, rejected rows with an `alasan` column).
+    """
+    df = normalize_roster(df).reset_index(drop=True)
+    for col in OPTIONAL_COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+    for col in ("nik", "nama", "poktan", "desa", "kecamatan", "komoditas"):
+        df[col] = df[col].astype("string").str.strip().fillna("")
+    df["nik"] = df["nik"].str.replace(r"\.0$", "", regex=True)
+    df["komoditas"] = df["komoditas"].str.title()
+    df["luas_lahan"] = pd.to_numeric(df["luas_lahan"], errors="coerce")
+    seasons = df["mt"].map(_season)
+
+    reasons = pd.Series("", index=df.index, dtype=object)
+    checks = [
+        (~df["nik"].str.fullmatch(rf"\d{{{NIK_LENGTH}}}"), f"NIK harus {NIK_LENGTH} digit"),
+        (df["poktan"].eq("") | df["desa"].eq(""), "poktan/desa kosong"),
+        (df["luas_lahan"].isna() | (df["luas_lahan"] <= 0), "luas lahan tidak valid"),
+        (df["komoditas"].eq(""), "komoditas kosong"),
+        (seasons.isna(), "MT tidak valid"),
+    ]
+    for mask, reason in checks:
+        mask = mask.fillna(True).to_numpy(bool)
+        reasons[mask & (reasons == "")] = reason
+    bad = reasons != ""
+
+    rejected = df[bad].assign(alasan=reasons[bad])
+    valid = df[~bad].assign(mt=seasons[~bad]).explode("mt", ignore_index=True)
+    return valid, rejected.reset_index(drop=True)
+
+
+# ---------- Allocation ----------
+
+def allocate_rdkk(roster, max_luas_ha=MAX_LUAS_HA):
+    """
+    Quota per roster row (one member × season, from `process_roster`).
+    A member's parcels in one season share the area cap pro rata. Adds
+    luas_total_nik, luas_subsidi, dibatasi, <fertilizer>_kg and dosis_default
+    (no commodity-specific dose) columns.
+    """
+    out = roster.copy()
+    total = out.groupby(["nik", "mt"], sort=False)["luas_lahan"].transform("sum").to_numpy(float)
+    scale = np.minimum(1.0, max_luas_ha / total)
+    out["luas_total_nik"] = total
+    out["luas_subsidi"] = out["luas_lahan"].to_numpy(float) * scale
+    out["dibatasi"] = total > max_luas_ha
+
+    commodity_idx = pd.Categorical(out["komoditas"], categories=COMMODITIES).codes      # -1 → default row
+    season_idx = pd.Categorical(out["mt"], categories=SEASONS).codes
+    doses = dose_table()[commodity_idx, season_idx]                                      # (n, fertilizer)
+    kg = doses * out["luas_subsidi"].to_numpy(float)[:, None]
+    for i, fert in enumerate(FERTILIZERS):
+        out[f"{fert}_kg"] = kg[:, i]
+    out["dosis_default"] = ~out["komoditas"].isin(list(QUOTA_REF)).to_numpy()
+    return out
+
+
+def aggregate_rdkk(allocations, level="poktan"):
+    """Totals per poktan or desa and season: anggota (distinct NIK), luas, luas_subsidi, fertilizer kg."""
+    if level not in LEVEL_KEYS:
+        raise ValueError(f"Level agregasi tidak dikenal: {level}")
+    keys = LEVEL_KEYS[level] + ["mt"]
+    agg = {"anggota": ("nik", "nunique"), "luas_lahan": ("luas_lahan", "sum"),
+           "luas_subsidi": ("luas_subsidi", "sum"), "dibatasi": ("dibatasi", "sum")}
+    agg.update({f"{f}_kg": (f"{f}_kg", "sum") for f in FERTILIZERS})
+    return allocations.groupby(keys, sort=True, observed=True).agg(**agg).reset_index()
+
+
+def rdkk_submission(allocations):
+    """
+    Submission sheet: one row per member × commodity, season quotas side by side
+    (``MT 1 Urea (Kg)`` … ``MT 3 NPK (Kg)``) plus yearly totals.
+    """
+    ident = ["kecamatan", "desa", "poktan", "nik", "nama", "komoditas"]
+    values = [f"{f}_kg" for f in FERTILIZERS]
+    base = allocations.groupby(ident + ["mt"], sort=False)[["luas_lahan"] + values].sum()
+    wide = base[values].unstack("mt").reindex(columns=pd.MultiIndex.from_product([values, SEASONS]), fill_value=0)
+    wide = wide.fillna(0)
+    luas = base["luas_lahan"].groupby(level=ident, sort=False).max()
+    sheet = pd.DataFrame(index=wide.index)
+    sheet["Luas Lahan (Ha)"] = luas.round(4)
+    for mt in SEASONS:
+        for f in FERTILIZERS:
+            sheet[f"{mt} {FERTILIZER_LABELS[f]} (Kg)"] = wide[(f"{f}_kg", mt)].round(2)
+    for f in FERTILIZERS:
+        sheet[f"Total {FERTILIZER_LABELS[f]} (Kg)"] = wide[f"{f}_kg"].sum(axis=1).round(2)
+    sheet = sheet.reset_index().rename(columns={
+        "kecamatan": "Kecamatan", "desa": "Desa", "poktan": "Kelompok Tani", "nik": "NIK",
+        "nama": "Nama Petani", "komoditas": "Komoditas",
+    })
+    return sheet.sort_values(["Kecamatan", "Desa", "Kelompok Tani", "NIK"], kind="stable", ignore_index=True)
+
+
+def submission_excel(sheet, totals=None):
+    """XLSX bytes with the submission sheet (and optional totals sheet)."""
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf) as writer:
+        sheet.to_excel(writer, index=False, sheet_name="RDKK")
+        if totals is not None:
+            totals.to_excel(writer, index=False, sheet_name="Rekap")
+    return buf.getvalue()
+
+
+def template_roster_csv():
+    """Example roster (header + three members) for the download button."""
+    example = pd.DataFrame([
+        {"nik": "3201010101800001", "nama": "Ahmad", "poktan": "Sukamaju I", "desa": "Sukamakmur",
+         "kecamatan": "Caringin", "luas_lahan": 0.8, "komoditas": "Padi", "mt": "Semua"},
+        {"nik": "3201010101800002", "nama": "Siti", "poktan": "Sukamaju I", "desa": "Sukamakmur",
+         "kecamatan": "Caringin", "luas_lahan": 1.2, "komoditas": "Padi", "mt": "MT 1"},
+        {"nik": "3201010101800002", "nama": "Siti", "poktan": "Sukamaju I", "desa": "Sukamakmur",
+         "kecamatan": "Caringin", "luas_lahan": 1.2, "komoditas": "Jagung", "mt": "MT 3"},
+    ])
+    return example.to_csv(index=False)
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import marshal
+import os
+import sys
+import threading
+
+# ==========================================
+# 📚 REFERENCE DATA STORE
+# ==========================================
+# Large static datasets (disease / pest guides, fertilizer catalog, crop
+# templates, ...) live as versioned JSON files in services/reference_data/.
+# They are compiled once into a marshal snapshot keyed by content hash and
+# loaded once per process; pages get a deep-frozen shared object, so a rerun
+# pays a dictionary lookup instead of rebuilding thousands of literal lines.
+
+REFERENCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reference_data")
+SNAPSHOT_DIR = os.path.join("data", "reference_cache")
+MANIFEST = "manifest.json"
+
+
+# ---------- Immutable containers ----------
+def _readonly(self, *args, **kwargs):
+    raise TypeError("Data referensi bersifat read-only; gunakan copy_reference() untuk salinan yang bisa diubah")
+
+
+class FrozenDict(dict):
+    """dict that refuses mutation; .copy() and deepcopy return plain mutable objects."""
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _readonly
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+class FrozenList(list):
+    """list that refuses mutation."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = remove = pop = clear = sort = reverse = _readonly
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return FrozenList, (list(self),)
+
+
+def freeze(obj):
+    if isinstance(obj, dict):
+        return FrozenDict((k, freeze(v)) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return FrozenList(freeze(v) for v in obj)
+    return obj
+
+
+def thaw(obj):
+    if isinstance(obj, dict):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [thaw(v) for v in obj]
+    return obj
+
+
+# ---------- Source files & snapshot ----------
+def _restore_keys(pairs):
+    # JSON object keys are strings; all-digit keys were ints in the source (e.g. growth targets per day)
+    if pairs and all(k.isdigit() for k, _ in pairs):
+        return {int(k): v for k, v in pairs}
+    return dict(pairs)
+
+
+def read_manifest(source_dir=REFERENCE_DIR):
+    with open(os.path.join(source_dir, MANIFEST), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def source_digest(source_dir=REFERENCE_DIR):
+    """Hash of the manifest, every data file and the marshal format (snapshot key)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{marshal.version}:{sys.version_info[:2]}".encode())
+    manifest = read_manifest(source_dir)
+    h.update(json.dumps(manifest, sort_keys=True).encode())
+    for name, spec in sorted(manifest["datasets"].items()):
+        with open(os.path.join(source_dir, spec["file"]), "rb") as f:
+            h.update(name.encode())
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def compile_snapshot(source_dir=REFERENCE_DIR):
+    """Parse every dataset once. Returns {name: marshal bytes}."""
+    blobs = {}
+    for name, spec in read_manifest(source_dir)["datasets"].items():
+        with open(os.path.join(source_dir, spec["file"]), encoding="utf-8") as f:
+            blobs[name] = marshal.dumps(json.load(f, object_pairs_hook=_restore_keys))
+    return blobs
+
+
+def load_snapshot(source_dir=REFERENCE_DIR, snapshot_dir=SNAPSHOT_DIR):
+    """Snapshot blobs for the current sources, compiled and written on first use."""
+    path = os.path.join(snapshot_dir, f"reference-{source_digest(source_dir)}.marshal")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return marshal.load(f)
+    blobs = compile_snapshot(source_dir)
+    try:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            marshal.dump(blobs, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass                       # read-only deployment: keep the in-memory compile
+    return blobs
+
+
+# ---------- Accessor ----------
+class ReferenceStore:
+    """Process-wide reference datasets: frozen shared objects plus cheap mutable copies."""
+
+    def __init__(self, source_dir=REFERENCE_DIR, snapshot_dir=SNAPSHOT_DIR):
+        self.source_dir = source_dir
+        self.snapshot_dir = snapshot_dir
+        self._lock = threading.Lock()
+        self._blobs = None
+        self._frozen = {}
+
+    def _snapshot(self):
+        if self._blobs is None:
+            with self._lock:
+                if self._blobs is None:
+                    self._blobs = load_snapshot(self.source_dir, self.snapshot_dir)
+        return self._blobs
+
+    def names(self):
+        return list(self._snapshot())
+
+    def get(self, name):
+        """Shared deep-frozen dataset (built once per process)."""
+        data = self._frozen.get(name)
+        if data is None:
+            blobs = self._snapshot()
+            if name not in blobs:
+                raise KeyError(f"Data referensi tidak dikenal: {name}")
+            with self._lock:
+                data = self._frozen.setdefault(name, freeze(marshal.loads(blobs[name])))
+        return data
+
+    def copy(self, name):
+        """Fresh mutable copy (e.g. for per-session editing)."""
+        blobs = self._snapshot()
+        if name not in blobs:
+            raise KeyError(f"Data referensi tidak dikenal: {name}")
+        return marshal.loads(blobs[name])
+
+    def version(self, name):
+        return read_manifest(self.source_dir)["datasets"][name]["version"]
+
+
+_default_store = ReferenceStore()
+
+
+def get_reference(name):
+    return _default_store.get(name)
+
+
+def copy_reference(name):
+    return _default_store.copy(name)
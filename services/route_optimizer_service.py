@@ -0,0 +1,235 @@
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# 🚛 FLEET ROUTE OPTIMIZER (RANTAI PASOK)
+# ==========================================
+# Daily pickup planning for a collector: every truck leaves the depot (gudang
+# pengepul), collects farm loads and unloads at a Pasar Induk. Distances come
+# from one vectorized haversine matrix; routes are built with Clarke-Wright
+# savings under vehicle capacity and polished with 2-opt. Shrinkage (susut)
+# is charged per commodity on the km each load rides until the market.
+
+EARTH_RADIUS_KM = 6371
+ROAD_FACTOR = 1.4           # Road distance ≈ 1.4 × great-circle distance
+CO2_PER_LITER = 2.68        # Diesel, kg CO2 / liter
+
+# Shrinkage % per 100 km (same categories as the single-trip calculator)
+SHRINKAGE_PER_100KM = {
+    "Sayur Daun": 2.5,
+    "Sayur Buah": 1.2,
+    "Umbi": 0.5,
+    "Keras": 0.3,
+}
+
+
+def shrinkage_factor(komoditas, default=0.0):
+    """% weight lost per 100 km for a commodity label."""
+    for key, factor in SHRINKAGE_PER_100KM.items():
+        if key in str(komoditas):
+            return factor
+    return default
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km; inputs broadcast (scalars or arrays)."""
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = np.radians(np.asarray(lon2) - np.asarray(lon1))
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def road_distance_matrix(lat_a, lon_a, lat_b, lon_b, road_factor=ROAD_FACTOR):
+    """(len(a) × len(b)) road distance matrix in km."""
+    lat_a, lon_a = np.asarray(lat_a, float)[:, None], np.asarray(lon_a, float)[:, None]
+    lat_b, lon_b = np.asarray(lat_b, float)[None, :], np.asarray(lon_b, float)[None, :]
+    return haversine_km(lat_a, lon_a, lat_b, lon_b) * road_factor
+
+
+# ---------- Routing core (node 0 = depot, nodes 1..n = pickups, node n+1 = market) ----------
+def _route_cost(route, dist, shrink_rate, per_km):
+    """Travel cost + shrinkage value for depot → route → market."""
+    path = [0, *route, dist.shape[0] - 1]
+    legs = dist[path[:-1], path[1:]]
+    remaining = np.cumsum(legs[::-1])[::-1]          # km from each node to market
+    return legs.sum() * per_km + float(np.dot(shrink_rate[route], remaining[1:]))
+
+
+def savings_routes(dist, demand, capacity):
+    """Clarke-Wright savings for open depot → pickups → market routes."""
+    n = len(demand)
+    market = n + 1
+    routes = {i: [i] for i in range(1, n + 1)}
+    route_of = {i: i for i in range(1, n + 1)}
+    load = {i: float(demand[i - 1]) for i in range(1, n + 1)}
+
+    # Joining route ending at i with route starting at j saves d(i,M) + d(D,j) - d(i,j)
+    idx = np.arange(1, n + 1)
+    s = dist[idx, market][:, None] + dist[0, idx][None, :] - dist[np.ix_(idx, idx)]
+    np.fill_diagonal(s, -np.inf)
+    order = np.argsort(s, axis=None)[::-1]
+    for flat in order:
+        i, j = divmod(int(flat), n)
+        if s[i, j] <= 0:
+            break
+        i, j = i + 1, j + 1
+        ri, rj = route_of[i], route_of[j]
+        if ri == rj or routes[ri][-1] != i or routes[rj][0] != j:
+            continue
+        if load[ri] + load[rj] > capacity:
+            continue
+        routes[ri].extend(routes[rj])
+        load[ri] += load[rj]
+        for node in routes[rj]:
+            route_of[node] = ri
+        del routes[rj], load[rj]
+    return list(routes.values())
+
+
+def two_opt(route, dist, shrink_rate, per_km, max_passes=20):
+    """2-opt on a fixed-endpoint path, minimizing travel + shrinkage cost."""
+    best = list(route)
+    best_cost = _route_cost(best, dist, shrink_rate, per_km)
+    for _ in range(max_passes):
+        improved = False
+        for a in range(len(best) - 1):
+            for b in range(a + 1, len(best)):
+                cand = best[:a] + best[a:b + 1][::-1] + best[b + 1:]
+                cost = _route_cost(cand, dist, shrink_rate, per_km)
+                if cost < best_cost - 1e-9:
+                    best, best_cost, improved = cand, cost, True
+        if not improved:
+            break
+    return best
+
+
+def _pick_vehicle(load_kg, km, vehicles, harga_bbm):
+    """Cheapest vehicle type (rental + fuel) that can carry the load."""
+    best = None
+    for name, v in vehicles.items():
+        if v["kapasitas"] < load_kg:
+            continue
+        cost = v["sewa"] + km / v["km_per_liter"] * harga_bbm
+        if best is None or cost < best[1]:
+            best = (name, cost)
+    return best[0] if best else None
+
+
+def plan_fleet(pickups, depot, markets, vehicles, harga_bbm=6800, biaya_sopir=250000,
+               biaya_tol=150000, market=None, road_factor=ROAD_FACTOR):
+    """
+    Plan a day's pickups.
+
+    pickups  — DataFrame with id, lat, lon, kg, komoditas, harga_kg
+    depot    — (lat, lon) of the collector's warehouse
+    markets  — {name: {"lat", "lon", ...}} (e.g. PASAR_INDUK)
+    vehicles — {name: {"kapasitas", "km_per_liter", "sewa"}} (e.g. VEHICLES)
+    market   — force one destination; default assigns each pickup to the market
+               with the lowest direct delivery + shrinkage cost
+
+    Returns dict: routes (per truck), stops (per pickup), summary.
+    """
+    df = pickups.reset_index(drop=True).copy()
+    if df.empty:
+        raise ValueError("Daftar pickup kosong")
+    capacity = max(v["kapasitas"] for v in vehicles.values())
+    if (df["kg"] > capacity).any():
+        raise ValueError(f"Ada muatan melebihi kapasitas armada terbesar ({capacity:,} kg)")
+
+    df["susut_pct_100km"] = df["komoditas"].map(shrinkage_factor)
+    # Shrinkage value (Rp) per km ridden, per pickup
+    shrink_rate = (df["kg"] * df["susut_pct_100km"] / 100 / 100 * df["harga_kg"]).to_numpy(float)
+    avg_km_per_liter = np.mean([v["km_per_liter"] for v in vehicles.values()])
+    per_km = harga_bbm / avg_km_per_liter
+
+    names = list(markets)
+    m_lat = np.array([markets[m]["lat"] for m in names])
+    m_lon = np.array([markets[m]["lon"] for m in names])
+    farm_market = road_distance_matrix(df["lat"], df["lon"], m_lat, m_lon, road_factor)
+    depot_farm = road_distance_matrix([depot[0]], [depot[1]], df["lat"], df["lon"], road_factor)[0]
+    if market is None:
+        direct = (depot_farm[:, None] + farm_market) * per_km + farm_market * shrink_rate[:, None]
+        df["pasar"] = [names[k] for k in direct.argmin(axis=1)]
+    else:
+        df["pasar"] = market
+
+    farm_farm = road_distance_matrix(df["lat"], df["lon"], df["lat"], df["lon"], road_factor)
+    route_rows, stop_rows = [], []
+    for pasar, group in df.groupby("pasar", sort=False):
+        ids = group.index.to_numpy()
+        k = names.index(pasar)
+        n = len(ids)
+        # Local matrix: 0 = depot, 1..n = pickups, n+1 = market
+        dist = np.zeros((n + 2, n + 2))
+        dist[0, 1:n + 1] = depot_farm[ids]
+        dist[0, n + 1] = haversine_km(depot[0], depot[1], m_lat[k], m_lon[k]) * road_factor
+        dist[1:n + 1, 1:n + 1] = farm_farm[np.ix_(ids, ids)]
+        dist[1:n + 1, n + 1] = farm_market[ids, k]
+        rate = np.concatenate([[0.0], shrink_rate[ids], [0.0]])
+
+        for route in savings_routes(dist, group["kg"].to_numpy(float), capacity):
+            route = two_opt(route, dist, rate, per_km)
+            path = [0, *route, n + 1]
+            legs = dist[path[:-1], path[1:]]
+            remaining = np.cumsum(legs[::-1])[::-1][1:]
+            km = float(legs.sum())
+            load = float(group["kg"].to_numpy()[np.array(route) - 1].sum())
+            vehicle = _pick_vehicle(load, km, vehicles, harga_bbm)
+            v = vehicles[vehicle]
+            liter = km / v["km_per_liter"]
+            route_id = len(route_rows) + 1
+
+            shrink_kg = shrink_value = 0.0
+            for order, (node, km_left) in enumerate(zip(route, remaining), start=1):
+                row = df.loc[ids[node - 1]]
+                s_kg = row["kg"] * row["susut_pct_100km"] / 100 * km_left / 100
+                shrink_kg += s_kg
+                shrink_value += s_kg * row["harga_kg"]
+                stop_rows.append({"route_id": route_id, "urutan": order, "id": row["id"], "komoditas": row["komoditas"],
+                                  "lat": row["lat"], "lon": row["lon"], "kg": row["kg"],
+                                  "km_ke_pasar": km_left, "susut_kg": s_kg})
+
+            fuel = liter * harga_bbm
+            total = v["sewa"] + fuel + biaya_sopir + biaya_tol
+            route_rows.append({
+                "route_id": route_id, "pasar": pasar, "armada": vehicle, "jumlah_pickup": len(route),
+                "muatan_kg": load, "utilisasi_pct": load / v["kapasitas"] * 100, "jarak_km": km,
+                "bbm_liter": liter, "biaya_bbm": fuel, "sewa": v["sewa"], "sopir": biaya_sopir, "tol": biaya_tol,
+                "biaya_total": total, "susut_kg": shrink_kg, "nilai_susut": shrink_value,
+                "hpp_per_kg": (total + shrink_value) / max(load - shrink_kg, 1e-9),
+                "co2_kg": liter * CO2_PER_LITER,
+            })
+
+    routes = pd.DataFrame(route_rows)
+    stops = pd.DataFrame(stop_rows)
+    summary = {
+        "trucks": len(routes),
+        "pickups": len(df),
+        "total_kg": float(df["kg"].sum()),
+        "total_km": float(routes["jarak_km"].sum()),
+        "biaya_total": float(routes["biaya_total"].sum()),
+        "nilai_susut": float(routes["nilai_susut"].sum()),
+        "hpp_per_kg": float((routes["biaya_total"].sum() + routes["nilai_susut"].sum())
+                            / max(df["kg"].sum() - routes["susut_kg"].sum(), 1e-9)),
+        "co2_kg": float(routes["co2_kg"].sum()),
+    }
+    return {"routes": routes, "stops": stops, "summary": summary}
+
+
+def sample_pickups(depot, n=50, radius_km=40, seed=0):
+    """Random demo pickups around the depot (for the planner's default table)."""
+    rng = np.random.default_rng(seed)
+    r = radius_km * np.sqrt(rng.uniform(0, 1, n)) / 111.0
+    theta = rng.uniform(0, 2 * np.pi, n)
+    komoditas = rng.choice(["Sayur Daun (Sawi/Caisim)", "Sayur Buah (Cabe/Tomat)",
+                            "Umbi-umbian (Kentang/Bawang)", "Buah Keras (Semangka/Melon)"], n)
+    harga = {"Sayur Daun": 4000, "Sayur Buah": 15000, "Umbi": 12000, "Buah Keras": 6000}
+    return pd.DataFrame({
+        "id": [f"PU-{i + 1:03d}" for i in range(n)],
+        "lat": depot[0] + r * np.sin(theta),
+        "lon": depot[1] + r * np.cos(theta),
+        "kg": rng.integers(2, 30, n) * 50,
+        "komoditas": komoditas,
+        "harga_kg": [next(v for k, v in harga.items() if k in c) for c in komoditas],
+    })
@@ -0,0 +1,305 @@
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+
+from utils.lazy_imports import lazy_attr
+
+lu_factor = lazy_attr("scipy.linalg", "lu_factor")
+lu_solve = lazy_attr("scipy.linalg", "lu_solve")
+curve_fit = lazy_attr("scipy.optimize", "curve_fit")
+cKDTree = lazy_attr("scipy.spatial", "cKDTree")
+
+# ==========================================
+# 🗺️ SOIL INTERPOLATION ENGINE (IDW / KRIGING)
+# ==========================================
+# Turns scattered NPK/pH sample points into a continuous raster and renders
+# it once as a PNG overlay, cached on disk by dataset version.
+
+CACHE_DIR = os.path.join("data", "raster_cache")
+
+# Sample record keys used by page 2 (soil_map_npk_data.json)
+SOIL_PROPERTIES = {
+    "ph": {"label": "pH Tanah", "cmap": "RdYlGn", "unit": ""},
+    "n_value": {"label": "Nitrogen", "cmap": "YlGn", "unit": "ppm"},
+    "p_value": {"label": "Fosfor", "cmap": "YlOrBr", "unit": "ppm"},
+    "k_value": {"label": "Kalium", "cmap": "PuBu", "unit": "ppm"},
+}
+
+M_PER_DEG_LAT = 110540.0
+M_PER_DEG_LON = 111320.0
+
+# Max distance-matrix cells held in memory per chunk
+_CHUNK_CELLS = 4_000_000
+
+
+def extract_samples(records, prop):
+    """Return (lat, lon, value) arrays for records that carry a numeric `prop`."""
+    lats, lons, vals = [], [], []
+    for rec in records:
+        try:
+            lat = float(rec["latitude"])
+            lon = float(rec["longitude"])
+            val = float(rec[prop])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if np.isfinite(lat) and np.isfinite(lon) and np.isfinite(val):
+            lats.append(lat)
+            lons.append(lon)
+            vals.append(val)
+    return np.asarray(lats, dtype=float), np.asarray(lons, dtype=float), np.asarray(vals, dtype=float)
+
+
+def dataset_version(lats, lons, values):
+    """Content hash of a sample set; changes only when the samples change."""
+    arr = np.round(np.column_stack([lats, lons, values]), 7)
+    order = np.lexsort(arr.T[::-1])
+    return hashlib.sha1(np.ascontiguousarray(arr[order]).tobytes()).hexdigest()
+
+
+def to_local_xy(lats, lons, lat0, lon0):
+    """Equirectangular projection to metres around (lat0, lon0). Adequate at field/district scale."""
+    x = (np.asarray(lons) - lon0) * M_PER_DEG_LON * np.cos(np.radians(lat0))
+    y = (np.asarray(lats) - lat0) * M_PER_DEG_LAT
+    return x, y
+
+
+def build_grid(bounds, resolution=200, pad=0.05):
+    """
+    Regular grid over bounds = (lat_min, lon_min, lat_max, lon_max).
+    Rows run north → south so the array maps directly onto an image overlay.
+    Returns (grid_lat, grid_lon, padded_bounds).
+    """
+    lat_min, lon_min, lat_max, lon_max = bounds
+    d_lat = max(lat_max - lat_min, 1e-4) * pad
+    d_lon = max(lon_max - lon_min, 1e-4) * pad
+    lat_min, lat_max = lat_min - d_lat, lat_max + d_lat
+    lon_min, lon_max = lon_min - d_lon, lon_max + d_lon
+
+    aspect = (lat_max - lat_min) * M_PER_DEG_LAT / max((lon_max - lon_min) * M_PER_DEG_LON * np.cos(np.radians((lat_min + lat_max) / 2)), 1e-9)
+    n_cols = int(resolution)
+    n_rows = int(np.clip(round(resolution * aspect), 2, resolution * 4))
+
+    lat_axis = np.linspace(lat_max, lat_min, n_rows)
+    lon_axis = np.linspace(lon_min, lon_max, n_cols)
+    grid_lon, grid_lat = np.meshgrid(lon_axis, lat_axis)
+    return grid_lat, grid_lon, (lat_min, lon_min, lat_max, lon_max)
+
+
+def idw(sx, sy, sv, gx, gy, power=2.0, n_neighbors=None):
+    """
+    Inverse Distance Weighting at arbitrary target points (any shape).
+    With `n_neighbors`, only the k nearest samples (KD-tree) contribute; otherwise
+    all samples are used via chunked broadcasting.
+    """
+    sx, sy, sv = (np.asarray(a, dtype=float).ravel() for a in (sx, sy, sv))
+    shape = np.shape(gx)
+    tx = np.asarray(gx, dtype=float).ravel()
+    ty = np.asarray(gy, dtype=float).ravel()
+
+    if len(sv) == 0:
+        return np.full(shape, np.nan)
+    if len(sv) == 1:
+        return np.full(shape, sv[0])
+
+    if n_neighbors and len(sv) > n_neighbors:
+        tree = cKDTree(np.column_stack([sx, sy]))
+        dist, idx = tree.query(np.column_stack([tx, ty]), k=int(n_neighbors))
+        out = _idw_weights(dist, sv[idx], power)
+        return out.reshape(shape)
+
+    out = np.empty(tx.size)
+    step = max(1, _CHUNK_CELLS // len(sv))
+    for start in range(0, tx.size, step):
+        stop = start + step
+        dist = np.hypot(tx[start:stop, None] - sx[None, :], ty[start:stop, None] - sy[None, :])
+        out[start:stop] = _idw_weights(dist, np.broadcast_to(sv, dist.shape), power)
+    return out.reshape(shape)
+
+
+def _idw_weights(dist, vals, power):
+    exact = dist < 1e-9
+    with np.errstate(divide="ignore"):
+        w = 1.0 / np.power(dist, power)
+    w[exact] = 0.0
+    hit = exact.any(axis=1)
+    with np.errstate(invalid="ignore"):
+        est = (w * vals).sum(axis=1) / w.sum(axis=1)
+    # Target coincides with a sample: take the sample value directly
+    if hit.any():
+        est[hit] = (exact[hit] * vals[hit]).sum(axis=1) / exact[hit].sum(axis=1)
+    return est
+
+
+# ---------- Ordinary Kriging ----------
+def _spherical(h, nugget, sill, rng):
+    h = np.asarray(h, dtype=float)
+    r = np.maximum(rng, 1e-9)
+    hr = np.minimum(h / r, 1.0)
+    return np.where(h > 0, nugget + (sill - nugget) * (1.5 * hr - 0.5 * hr ** 3), 0.0)
+
+
+def fit_variogram(sx, sy, sv, n_lags=12):
+    """
+    Fit a spherical semivariogram to the empirical one.
+    Returns dict(nugget, sill, range). Falls back to a heuristic model when the fit fails.
+    """
+    pts = np.column_stack([sx, sy])
+    diff = pts[:, None, :] - pts[None, :, :]
+    h = np.hypot(diff[..., 0], diff[..., 1])
+    g = 0.5 * (sv[:, None] - sv[None, :]) ** 2
+    iu = np.triu_indices(len(sv), k=1)
+    h, g = h[iu], g[iu]
+
+    variance = float(np.var(sv)) or 1e-6
+    max_h = float(h.max()) if h.size else 1.0
+    fallback = {"nugget": 0.0, "sill": variance, "range": max(max_h / 2, 1.0)}
+    if h.size < 6:
+        return fallback
+
+    edges = np.linspace(0, max_h / 2, n_lags + 1)
+    which = np.digitize(h, edges) - 1
+    valid = (which >= 0) & (which < n_lags)
+    counts = np.bincount(which[valid], minlength=n_lags)
+    sums = np.bincount(which[valid], weights=g[valid], minlength=n_lags)
+    keep = counts > 0
+    if keep.sum() < 3:
+        return fallback
+    lag_h = ((edges[:-1] + edges[1:]) / 2)[keep]
+    lag_g = sums[keep] / counts[keep]
+
+    try:
+        popt, _ = curve_fit(
+            _spherical, lag_h, lag_g,
+            p0=[0.0, variance, max_h / 3],
+            bounds=([0.0, 1e-9, 1e-6], [variance * 2, variance * 4, max_h * 2]),
+            maxfev=5000,
+        )
+        return {"nugget": float(popt[0]), "sill": float(popt[1]), "range": float(popt[2])}
+    except (RuntimeError, ValueError):
+        return fallback
+
+
+def ordinary_kriging(sx, sy, sv, gx, gy, variogram=None, max_samples=2000):
+    """
+    Ordinary kriging at arbitrary target points.
+    The kriging system is LU-factored once and solved for all targets in chunks.
+    Returns (estimate, kriging_variance), both shaped like `gx`.
+    """
+    sx, sy, sv = (np.asarray(a, dtype=float).ravel() for a in (sx, sy, sv))
+    n = len(sv)
+    if n > max_samples:
+        raise ValueError(f"Kriging dibatasi {max_samples} sampel (diberikan {n}); gunakan IDW.")
+    if n < 3:
+        est = idw(sx, sy, sv, gx, gy)
+        return est, np.zeros(np.shape(gx))
+
+    vg = variogram or fit_variogram(sx, sy, sv)
+    model = lambda h: _spherical(h, vg["nugget"], vg["sill"], vg["range"])
+
+    h_ss = np.hypot(sx[:, None] - sx[None, :], sy[:, None] - sy[None, :])
+    K = np.ones((n + 1, n + 1))
+    K[:n, :n] = model(h_ss)
+    K[n, n] = 0.0
+    # Tiny ridge keeps duplicate sample locations from making K singular
+    K[:n, :n] += np.eye(n) * 1e-10 * max(vg["sill"], 1e-9)
+    lu = lu_factor(K)
+
+    shape = np.shape(gx)
+    tx = np.asarray(gx, dtype=float).ravel()
+    ty = np.asarray(gy, dtype=float).ravel()
+    est = np.empty(tx.size)
+    var = np.empty(tx.size)
+    step = max(1, _CHUNK_CELLS // (n + 1))
+    for start in range(0, tx.size, step):
+        stop = start + step
+        rhs = np.ones((n + 1, min(stop, tx.size) - start))
+        rhs[:n] = model(np.hypot(sx[:, None] - tx[None, start:stop], sy[:, None] - ty[None, start:stop]))
+        w = lu_solve(lu, rhs)
+        est[start:stop] = sv @ w[:n]
+        var[start:stop] = (w * rhs).sum(axis=0)
+    return est.reshape(shape), np.maximum(var, 0).reshape(shape)
+
+
+def interpolate_samples(lats, lons, values, method="idw", resolution=200, bounds=None, power=2.0, n_neighbors=12):
+    """
+    Interpolate lat/lon samples onto a regular grid.
+    Returns dict with `grid` (rows north→south), `grid_lat`, `grid_lon` and `bounds`.
+    """
+    lats, lons, values = (np.asarray(a, dtype=float) for a in (lats, lons, values))
+    if bounds is None:
+        bounds = (lats.min(), lons.min(), lats.max(), lons.max())
+    grid_lat, grid_lon, bounds = build_grid(bounds, resolution)
+
+    lat0, lon0 = float(np.mean(lats)), float(np.mean(lons))
+    sx, sy = to_local_xy(lats, lons, lat0, lon0)
+    gx, gy = to_local_xy(grid_lat, grid_lon, lat0, lon0)
+
+    if method == "kriging":
+        grid, _ = ordinary_kriging(sx, sy, values, gx, gy)
+    else:
+        grid = idw(sx, sy, values, gx, gy, power=power, n_neighbors=n_neighbors)
+
+    return {"grid": grid, "grid_lat": grid_lat, "grid_lon": grid_lon, "bounds": bounds}
+
+
+# ---------- Rendering & Cache ----------
+def render_png(grid, cmap="RdYlGn", vmin=None, vmax=None, opacity=0.75):
+    """Colour-map a 2D grid into PNG bytes (NaN cells transparent)."""
+    from matplotlib import colormaps
+    from PIL import Image
+
+    vmin = np.nanmin(grid) if vmin is None else vmin
+    vmax = np.nanmax(grid) if vmax is None else vmax
+    span = (vmax - vmin) or 1.0
+    norm = np.clip((grid - vmin) / span, 0, 1)
+    rgba = colormaps[cmap](np.nan_to_num(norm), bytes=True)
+    rgba[..., 3] = np.where(np.isnan(grid), 0, int(255 * opacity))
+
+    buf = io.BytesIO()
+    Image.fromarray(rgba, mode="RGBA").save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def get_overlay(records, prop, method="idw", resolution=200, cache_dir=CACHE_DIR):
+    """
+    Build (or load from disk) the raster overlay for one soil property.
+    Keyed by property, method, resolution and dataset version, so the
+    interpolation only re-runs when samples change.
+    Returns dict(path, bounds, vmin, vmax, version, n_samples) or None if < 2 samples.
+    """
+    lats, lons, vals = extract_samples(records, prop)
+    if len(vals) < 2:
+        return None
+
+    version = dataset_version(lats, lons, vals)
+    key = f"{prop}_{method}_{int(resolution)}_{version[:16]}"
+    png_path = os.path.join(cache_dir, f"{key}.png")
+    meta_path = os.path.join(cache_dir, f"{key}.json")
+
+    if os.path.exists(png_path) and os.path.exists(meta_path):
+        with open(meta_path, "r") as f:
+            return json.load(f)
+
+    result = interpolate_samples(lats, lons, vals, method=method, resolution=resolution)
+    cmap = SOIL_PROPERTIES.get(prop, {}).get("cmap", "viridis")
+    vmin, vmax = float(vals.min()), float(vals.max())
+    png = render_png(result["grid"], cmap=cmap, vmin=vmin, vmax=vmax)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(png_path, "wb") as f:
+        f.write(png)
+    lat_min, lon_min, lat_max, lon_max = (float(b) for b in result["bounds"])
+    meta = {
+        "path": png_path,
+        "bounds": [[lat_min, lon_min], [lat_max, lon_max]],
+        "vmin": vmin,
+        "vmax": vmax,
+        "version": version,
+        "n_samples": int(len(vals)),
+    }
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+    return meta
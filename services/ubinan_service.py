@@ -0,0 +1,233 @@
+import io
+import zipfile
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from utils.lazy_imports import lazy_import
+
+stats = lazy_import("scipy.stats")
+
+# ==========================================
+# 🌾 UBINAN (CROP-CUT) PROCESSING
+# ==========================================
+# Conversions of the single-plot Kalkulator Ubinan applied to a whole CSV of
+# crop cuts at once (column arithmetic, no per-row loop), group estimates per
+# kecamatan / desa / poktan with Student-t confidence intervals, and berita
+# acara documents rendered for every plot into one ZIP.
+
+GKP_TO_GKG = 0.8602      # BPS conversion
+GKG_TO_RICE = 0.6402     # milling yield
+
+REQUIRED_COLUMNS = ("poktan", "desa", "kecamatan", "panjang", "lebar", "berat_gkp", "rumpun")
+OPTIONAL_COLUMNS = ("petani", "varietas", "tanggal", "kadar_air")
+NUMERIC_COLUMNS = ("panjang", "lebar", "berat_gkp", "rumpun", "kadar_air")
+COLUMN_ALIASES = {
+    "kelompok_tani": "poktan",
+    "desa_kelurahan": "desa",
+    "kelurahan": "desa",
+    "panjang_m": "panjang",
+    "lebar_m": "lebar",
+    "berat": "berat_gkp",
+    "berat_kg": "berat_gkp",
+    "berat_gkp_kg": "berat_gkp",
+    "jumlah_rumpun": "rumpun",
+    "jml_rumpun": "rumpun",
+    "nama_petani": "petani",
+    "varietas_padi": "varietas",
+    "tanggal_ubinan": "tanggal",
+    "ka": "kadar_air",
+}
+
+LEVEL_KEYS = {
+    "kecamatan": ["kecamatan"],
+    "desa": ["kecamatan", "desa"],
+    "poktan": ["kecamatan", "desa", "poktan"],
+}
+CONFIDENCE = 0.95
+
+BERITA_ACARA_TEMPLATE = """BERITA ACARA PENGAMBILAN UBINAN
+-----------------------------------------
+Pada hari ini {tanggal}, telah dilakukan pengambilan ubinan padi sawah di:
+
+📍 LOKASI
+Kelompok Tani : {poktan}
+Desa/Kel.     : {desa}
+Kecamatan     : {kecamatan}
+
+🌾 DATA TEKNIS
+Varietas      : {varietas}
+Luas Petak    : {panjang} m x {lebar} m ({luas_m2} m²)
+Jumlah Rumpun : {rumpun} rumpun (Sampel)
+
+⚖️ HASIL UBINAN
+Berat Ubinan  : {berat_gkp} kg
+Kadar Air     : {kadar_air} %
+-----------------------------------------
+✅ KONVERSI HASIL (ESTIMASI)
+Produktivitas : {gkp_ton_ha:.2f} Ton/Ha (GKP)
+Populasi      : {populasi_ha:,.0f} Rumpun/Ha
+
+Demikian berita acara ini dibuat untuk dipergunakan sebagaimana mestinya.
+
+Mengetahui,
+Penyuluh Pertanian (PPL)             Ketua Kelompok Tani
+
+( .................... )             ( .................... )
+"""
+
+
+# ---------- Conversion ----------
+
+def convert_ubinan(panjang, lebar, berat_gkp, rumpun):
+    """
+    Crop-cut → per-hectare estimates (scalars or arrays).
+    Returns dict(luas_m2, faktor_konversi, gkp_ton_ha, gkg_ton_ha, beras_ton_ha, populasi_ha).
+    """
+    luas = np.asarray(panjang, dtype=float) * np.asarray(lebar, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        faktor = np.where(luas > 0, 10000 / luas, np.nan)
+    gkp = np.asarray(berat_gkp, dtype=float) * faktor / 1000
+    gkg = gkp * GKP_TO_GKG
+    return {
+        "luas_m2": luas,
+        "faktor_konversi": faktor,
+        "gkp_ton_ha": gkp,
+        "gkg_ton_ha": gkg,
+        "beras_ton_ha": gkg * GKG_TO_RICE,
+        "populasi_ha": np.asarray(rumpun, dtype=float) * faktor,
+    }
+
+
+def normalize_columns(df):
+    """Lower-case, snake-case and alias the CSV header; raises ValueError on missing columns."""
+    df = df.rename(columns=lambda c: str(c).strip().lower().replace(" ", "_").replace("/", "_"))
+    df = df.rename(columns=COLUMN_ALIASES)
+    missing = set(REQUIRED_COLUMNS) - set(df.columns)
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ada: {', '.join(sorted(missing))}")
+    return df
+
+
+def process_ubinan(df):
+    """
+    Validate and convert every crop cut.
+    Returns (valid rows with per-hectare columns, rejected rows with an `alasan` column).
+    """
+    df = normalize_columns(df).reset_index(drop=True)
+    for col in OPTIONAL_COLUMNS:
+        if col not in df.columns:
+            df[col] = np.nan
+    for col in NUMERIC_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    for col in ("poktan", "desa", "kecamatan"):
+        df[col] = df[col].astype("string").str.strip()
+
+    reasons = pd.Series("", index=df.index, dtype=object)
+    checks = [
+        (df[["poktan", "desa", "kecamatan"]].isna().any(axis=1)
+         | df[["poktan", "desa", "kecamatan"]].eq("").any(axis=1), "lokasi kosong"),
+        (df[["panjang", "lebar", "berat_gkp", "rumpun"]].isna().any(axis=1), "angka tidak valid"),
+        ((df["panjang"] <= 0) | (df["lebar"] <= 0), "ukuran petak ≤ 0"),
+        ((df["berat_gkp"] < 0) | (df["rumpun"] < 0), "nilai negatif"),
+    ]
+    for mask, reason in checks:
+        mask = mask.fillna(False).to_numpy(bool)
+        reasons[mask & (reasons == "")] = reason
+    bad = reasons != ""
+
+    rejected = df[bad].assign(alasan=reasons[bad])
+    valid = df[~bad].copy()
+    for col, values in convert_ubinan(valid["panjang"], valid["lebar"], valid["berat_gkp"], valid["rumpun"]).items():
+        valid[col] = values
+    return valid.reset_index(drop=True), rejected.reset_index(drop=True)
+
+
+# ---------- Aggregation ----------
+
+def aggregate_ubinan(processed, level="desa", value="gkp_ton_ha", confidence=CONFIDENCE):
+    """
+    Mean productivity per group with a Student-t confidence interval.
+    Columns: group keys, n_ubinan, rata_rata, std, se, ci_low, ci_high,
+    rata_rata_gkg, rata_rata_beras, populasi_ha. CI is NaN for single-plot groups.
+    """
+    if level not in LEVEL_KEYS:
+        raise ValueError(f"Level agregasi tidak dikenal: {level}")
+    keys = LEVEL_KEYS[level]
+    grouped = processed.groupby(keys, observed=True, sort=True)
+    out = grouped.agg(
+        n_ubinan=(value, "size"),
+        rata_rata=(value, "mean"),
+        std=(value, "std"),
+        rata_rata_gkg=("gkg_ton_ha", "mean"),
+        rata_rata_beras=("beras_ton_ha", "mean"),
+        populasi_ha=("populasi_ha", "mean"),
+    ).reset_index()
+    n = out["n_ubinan"].to_numpy(float)
+    se = out["std"].to_numpy(float) / np.sqrt(n)
+    with np.errstate(invalid="ignore"):
+        t = np.where(n > 1, stats.t.ppf(0.5 + confidence / 2, np.maximum(n - 1, 1)), np.nan)
+    half = t * se
+    out["se"] = se
+    out["ci_low"] = out["rata_rata"] - half
+    out["ci_high"] = out["rata_rata"] + half
+    cols = keys + ["n_ubinan", "rata_rata", "std", "se", "ci_low", "ci_high",
+                   "rata_rata_gkg", "rata_rata_beras", "populasi_ha"]
+    return out[cols]
+
+
+# ---------- Berita acara ----------
+
+def _format_tanggal(value, default):
+    ts = pd.to_datetime(value, errors="coerce") if value is not None and not pd.isna(value) else pd.NaT
+    day = default if pd.isna(ts) else ts.date()
+    return day.strftime("%A, %d %B %Y")
+
+
+def _plain(value, default="-"):
+    if value is None or pd.isna(value):
+        return default
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def render_berita_acara(row, default_date=None):
+    """Berita acara text for one crop cut (dict or Series with processed columns)."""
+    default_date = default_date or date.today()
+    return BERITA_ACARA_TEMPLATE.format(
+        tanggal=_format_tanggal(row.get("tanggal"), default_date),
+        poktan=_plain(row.get("poktan")), desa=_plain(row.get("desa")), kecamatan=_plain(row.get("kecamatan")),
+        varietas=_plain(row.get("varietas")),
+        panjang=_plain(row["panjang"]), lebar=_plain(row["lebar"]), luas_m2=_plain(round(float(row["luas_m2"]), 2)),
+        rumpun=_plain(row["rumpun"]), berat_gkp=_plain(row["berat_gkp"]), kadar_air=_plain(row.get("kadar_air")),
+        gkp_ton_ha=float(row["gkp_ton_ha"]), populasi_ha=float(row["populasi_ha"]),
+    )
+
+
+def _slug(text):
+    return "".join(ch if ch.isalnum() else "_" for ch in str(text)).strip("_")[:40] or "x"
+
+
+def berita_acara_zip(processed, default_date=None):
+    """ZIP (bytes) with one berita acara per crop cut, foldered by kecamatan/desa."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for i, row in enumerate(processed.to_dict("records"), start=1):
+            name = f"{_slug(row['kecamatan'])}/{_slug(row['desa'])}/BA_Ubinan_{i:04d}_{_slug(row['poktan'])}.txt"
+            zf.writestr(name, render_berita_acara(row, default_date))
+    return buf.getvalue()
+
+
+def template_csv():
+    """Example upload (header + two plots) for the download button."""
+    example = pd.DataFrame([
+        {"poktan": "Sukamaju I", "desa": "Sukamakmur", "kecamatan": "Caringin", "petani": "Pak Ahmad",
+         "varietas": "Ciherang", "tanggal": "2025-03-10", "panjang": 2.5, "lebar": 2.5, "berat_gkp": 6.0,
+         "rumpun": 120, "kadar_air": 22},
+        {"poktan": "Sukamaju II", "desa": "Sukamakmur", "kecamatan": "Caringin", "petani": "Bu Siti",
+         "varietas": "Inpari 32", "tanggal": "2025-03-11", "panjang": 2.5, "lebar": 2.5, "berat_gkp": 5.4,
+         "rumpun": 118, "kadar_air": 21},
+    ])
+    return example.to_csv(index=False)
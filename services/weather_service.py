@@ -62,6 +62,81 @@ class WeatherService:
             "raw_daily": daily
         }
 
+    def get_water_balance_inputs(self, lat, lon, past_days=0, forecast_days=16):
+        """
+        Daily ET0 + rain and current root-zone soil moisture for the irrigation scheduler.
+        Returns dict(dates, et0, rain, soil_moisture) or None.
+        """
+        try:
+            params = {
+                "latitude": lat,
+                "longitude": lon,
+                "hourly": "soil_moisture_0_to_1cm,soil_moisture_9_to_27cm",
+                "daily": "et0_fao_evapotranspiration,rain_sum",
+                "past_days": past_days,
+                "forecast_days": forecast_days,
+                "timezone": "auto"
+            }
+            response = requests.get(self.base_url, params=params, timeout=10)
+            if response.status_code != 200:
+                return None
+            data = response.json()
+        except Exception as e:
+            print(f"Weather API Error: {e}")
+            return None
+
+        daily = data.get('daily', {})
+        hourly = data.get('hourly', {})
+        # Root-zone layer preferred over the 0-1 cm skin layer; take the latest observed hour
+        moisture = hourly.get('soil_moisture_9_to_27cm') or hourly.get('soil_moisture_0_to_1cm') or []
+        now_idx = min(len(moisture), past_days * 24 + datetime.now().hour + 1)
+        observed = [v for v in moisture[:now_idx] if v is not None]
+
+        return {
+            "dates": daily.get('time', []),
+            "et0": [v if v is not None else 0.0 for v in daily.get('et0_fao_evapotranspiration', [])],
+            "rain": [v if v is not None else 0.0 for v in daily.get('rain_sum', [])],
+            "soil_moisture": observed[-1] if observed else None
+        }
+
+    def get_daily_fire_weather(self, lats, lons, past_days=30, forecast_days=7, chunk_size=100):
+        """
+        Daily max temperature, min humidity, max wind (km/h) and precipitation for many
+        locations. Open-Meteo accepts comma-separated coordinate lists, so sites are
+        fetched `chunk_size` at a time instead of one request each.
+        Returns dict of (sites × days) lists plus `dates`, or None on failure.
+        """
+        variables = ["temperature_2m_max", "relative_humidity_2m_min", "wind_speed_10m_max", "precipitation_sum"]
+        out = {v: [] for v in variables}
+        dates = []
+        try:
+            for start in range(0, len(lats), chunk_size):
+                params = {
+                    "latitude": ",".join(f"{x:.4f}" for x in lats[start:start + chunk_size]),
+                    "longitude": ",".join(f"{x:.4f}" for x in lons[start:start + chunk_size]),
+                    "daily": ",".join(variables),
+                    "wind_speed_unit": "kmh",
+                    "past_days": past_days,
+                    "forecast_days": forecast_days,
+                    "timezone": "auto"
+                }
+                response = requests.get(self.base_url, params=params, timeout=20)
+                if response.status_code != 200:
+                    return None
+                payload = response.json()
+                # Single location → dict, multiple → list
+                for site in (payload if isinstance(payload, list) else [payload]):
+                    daily = site.get('daily', {})
+                    dates = daily.get('time', dates)
+                    for v in variables:
+                        out[v].append(daily.get(v, []))
+        except Exception as e:
+            print(f"Weather API Error: {e}")
+            return None
+
+        out["dates"] = dates
+        return out
+
     def get_planting_recommendation(self, weather_data):
         """Simple logic for planting suitability"""
         if not weather_data: return "Data tidak tersedia"
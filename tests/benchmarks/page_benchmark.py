@@ -0,0 +1,202 @@
+"""
+Headless page-render benchmark
+Runs every page (and Home) with streamlit's AppTest in its own Python
+process and temporary working directory, with an authenticated session and
+all HTTP calls answered by local stub servers. Records first-run and rerun
+wall time plus peak memory, writes a JSON report and compares it against the
+stored baseline.
+
+Each page is run several times (--repeat) and the median is kept, since
+single first-run timings are too noisy to compare.
+
+Run with: python -m tests.benchmarks.page_benchmark [page prefixes ...] [--repeat N] [--update-baseline]
+"""
+
+import argparse
+import json
+import os
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from utils.startup_profiler import PROFILER_SECRETS, ROOT, page_files
+
+BASELINE_PATH = os.path.join(ROOT, "tests", "benchmarks", "baseline.json")
+REPORT_PATH = os.path.join("data", "perf", "page_benchmark.json")
+RESULT_MARKER = "@@PAGE_BENCHMARK@@"
+WORKDIR_PREFIX = "agrisensa-bench-"
+WORKDIR_PATTERN = re.compile(rf"/\S*?{WORKDIR_PREFIX}[^/\s]+")
+METRICS = ("first_run_ms", "rerun_ms", "page_rss_mb")
+# metric -> (relative tolerance, absolute slack): a regression must exceed both
+REGRESSION_TOLERANCE = {
+    "first_run_ms": (0.30, 150.0),
+    "rerun_ms": (0.30, 100.0),
+    "page_rss_mb": (0.25, 25.0),
+}
+
+
+# ========== SINGLE PAGE (CHILD PROCESS) ==========
+
+def normalize_exception(message):
+    """Exception text with the random scratch working directory replaced, so runs compare equal."""
+    return WORKDIR_PATTERN.sub("<workdir>", message)
+
+
+def _peak_rss_mb():
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def benchmark_page(path, timeout=60):
+    """First run and rerun of one page against the stub services (current process)."""
+    from streamlit.testing.v1 import AppTest
+
+    from tests.benchmarks.stub_services import StubServer, route_requests_to
+
+    result = {"page": os.path.basename(path), "exceptions": []}
+    rss_before = _peak_rss_mb()
+    with StubServer() as stub, route_requests_to(stub.url):
+        at = AppTest.from_file(os.path.join(ROOT, path), default_timeout=timeout)
+        at.session_state["authenticated"] = True
+        at.session_state["user"] = {"username": "benchmark", "role": "admin", "name": "Page Benchmark"}
+        for key, value in PROFILER_SECRETS.items():
+            at.secrets[key] = value
+        for phase in ("first_run_ms", "rerun_ms"):
+            start = time.perf_counter()
+            try:
+                at.run()
+            except Exception as e:
+                result["exceptions"].append(f"{type(e).__name__}: {e}")
+            result[phase] = (time.perf_counter() - start) * 1000
+        result["exceptions"] += sorted({e.message for e in at.exception})
+        result["exceptions"] = [normalize_exception(e) for e in result["exceptions"]]
+        result["http_calls"] = len(stub.calls)
+    result["peak_rss_mb"] = _peak_rss_mb()
+    result["page_rss_mb"] = result["peak_rss_mb"] - rss_before
+    return result
+
+
+# ========== ALL PAGES (PARENT PROCESS) ==========
+
+def run_in_fresh_process(path, timeout=60):
+    """Benchmark `path` in a new interpreter whose working directory is a scratch folder."""
+    with tempfile.TemporaryDirectory(prefix=WORKDIR_PREFIX) as workdir:
+        os.symlink(os.path.join(ROOT, "assets"), os.path.join(workdir, "assets"))
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))}
+        cmd = [sys.executable, "-m", "tests.benchmarks.page_benchmark", "--child", path, "--timeout", str(timeout)]
+        try:
+            proc = subprocess.run(cmd, cwd=workdir, env=env, capture_output=True, text=True, timeout=timeout * 3 + 30)
+        except subprocess.TimeoutExpired:
+            return {"page": os.path.basename(path), "exceptions": ["timeout"]}
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    tail = (proc.stderr or proc.stdout).strip().splitlines()[-1:] or ["no output"]
+    return {"page": os.path.basename(path), "exceptions": [f"benchmark: {tail[0]}"]}
+
+
+def compare_to_baseline(results, baseline):
+    """Regressions (page, metric, baseline, current) and pages with new exceptions."""
+    base = {r["page"]: r for r in baseline.get("pages", [])}
+    regressions = []
+    for r in results:
+        ref = base.get(r["page"])
+        if ref is None:
+            continue
+        for metric in METRICS:
+            cur, old = r.get(metric), ref.get(metric)
+            if cur is None or old is None:
+                continue
+            rel, slack = REGRESSION_TOLERANCE[metric]
+            if cur > old * (1 + rel) and cur - old > slack:
+                regressions.append({"page": r["page"], "metric": metric, "baseline": old, "current": cur})
+        seen = {normalize_exception(e) for e in ref.get("exceptions", [])}
+        new_errors = sorted({normalize_exception(e) for e in r.get("exceptions", [])} - seen)
+        if new_errors:
+            regressions.append({"page": r["page"], "metric": "exceptions", "baseline": None, "current": new_errors})
+    return regressions
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {"pages": []}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path, payload):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+
+
+def median_result(runs):
+    """One result from repeated runs of a page: median of each metric, union of exceptions."""
+    merged = dict(runs[0])
+    for metric in METRICS + ("peak_rss_mb",):
+        values = [r[metric] for r in runs if r.get(metric) is not None]
+        merged[metric] = statistics.median(values) if values else None
+    merged["exceptions"] = sorted({e for r in runs for e in r.get("exceptions", [])})
+    merged["runs"] = len(runs)
+    return merged
+
+
+def run_benchmark(paths, timeout=60, repeat=1):
+    results = []
+    for path in paths:
+        r = median_result([run_in_fresh_process(path, timeout) for _ in range(max(1, repeat))])
+        results.append(r)
+        flag = f"  ⚠️ {r['exceptions'][0][:60]}" if r.get("exceptions") else ""
+        print(f"{r['page'][:48]:<48} first {r.get('first_run_ms') or 0:7.0f} ms  rerun {r.get('rerun_ms') or 0:6.0f} ms  "
+              f"mem +{r.get('page_rss_mb') or 0:5.0f} MB{flag}", flush=True)
+    return {
+        "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0],
+        "pages": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless AppTest page benchmark")
+    parser.add_argument("pages", nargs="*", help="page prefixes (e.g. 12_ 46_); default: all pages")
+    parser.add_argument("--timeout", type=int, default=60, help="seconds per page run")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="fresh-process runs per page; the median is reported (single runs vary by ±40%%)")
+    parser.add_argument("--out", default=REPORT_PATH, help="JSON report path")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="stored baseline to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(RESULT_MARKER + json.dumps(benchmark_page(args.child, args.timeout), ensure_ascii=False), flush=True)
+        return 0
+
+    report = run_benchmark(page_files(args.pages), args.timeout, args.repeat)
+    report["regressions"] = compare_to_baseline(report["pages"], load_baseline(args.baseline))
+    write_json(args.out, report)
+
+    if args.update_baseline:
+        baseline = load_baseline(args.baseline)
+        merged = {r["page"]: r for r in baseline.get("pages", [])}
+        merged.update({r["page"]: {"page": r["page"],
+                                   **{m: round(r[m], 1) if r.get(m) is not None else None for m in METRICS},
+                                   "exceptions": r.get("exceptions", [])}
+                       for r in report["pages"]})
+        write_json(args.baseline, {"generated_at": report["generated_at"], "python": report["python"],
+                                   "pages": list(merged.values())})
+        print(f"\nBaseline diperbarui: {args.baseline}")
+        return 0
+
+    for reg in report["regressions"]:
+        print(f"REGRESI {reg['page']}: {reg['metric']} {reg['baseline']} -> {reg['current']}")
+    print(f"\n{len(report['pages'])} halaman, {len(report['regressions'])} regresi. Laporan: {args.out}")
+    return 1 if report["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""
+Local stub servers for headless page runs
+A threaded HTTP server answers the external APIs used by the app (Open-Meteo,
+Bapanas panel harga, AgriSensa auth API) with deterministic synthetic data,
+and `route_requests_to()` sends every outgoing `requests` call to it, so page
+benchmarks never touch the network.
+"""
+
+import json
+import math
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit, urlunsplit
+
+import requests
+
+from utils.bapanas_constants import COMMODITY_MAPPING, PROVINCE_MAPPING
+
+OPEN_METEO_HOST = "api.open-meteo.com"
+BAPANAS_HOST = "api-panelhargav2.badanpangan.go.id"
+AUTH_HOST = "agriisensa-api2.vercel.app"
+LOCAL_HOSTS = ("127.0.0.1", "localhost")
+
+
+# ========== SYNTHETIC PAYLOADS ==========
+
+def _series_value(name, k):
+    """Plausible tropical value for an Open-Meteo variable at step k (deterministic)."""
+    wave = math.sin(k / 24 * 2 * math.pi)
+    if "weather_code" in name:
+        return [1, 3, 61, 80][k % 4]
+    if "probability" in name:
+        return [20, 45, 70, 35][k % 4]
+    if "humidity" in name:
+        return round(78 - 12 * wave, 1)
+    if "soil_moisture" in name:
+        return 0.32
+    if "soil_temperature" in name:
+        return round(27 + 2 * wave, 1)
+    if "temperature" in name:
+        return round(27 + 5 * wave, 1)
+    if "rain" in name or "precipitation" in name or "showers" in name:
+        return 6.0 if k % 5 == 0 else 0.0
+    if "et0" in name or "evapotranspiration" in name:
+        return 4.2
+    if "wind_direction" in name:
+        return 120
+    if "wind" in name or "gust" in name:
+        return round(8 + 3 * abs(wave), 1)
+    if "uv" in name:
+        return 9.0
+    if "cloud" in name:
+        return 55
+    if "pressure" in name:
+        return 1010.0
+    if "sunshine" in name or "daylight" in name:
+        return 36000.0
+    return 1.0
+
+
+def _variables(query, key):
+    return [v for v in ",".join(query.get(key, [])).split(",") if v]
+
+
+def open_meteo_forecast(query):
+    lats = (query.get("latitude") or ["-6.2"])[0].split(",")
+    lons = (query.get("longitude") or ["106.8"])[0].split(",")
+    past = int((query.get("past_days") or ["0"])[0])
+    days = past + int((query.get("forecast_days") or ["7"])[0])
+    start = datetime.combine(date.today() - timedelta(days=past), datetime.min.time())
+
+    def site(i):
+        out = {"latitude": float(lats[i]), "longitude": float(lons[min(i, len(lons) - 1)]),
+               "timezone": "Asia/Jakarta", "elevation": 120.0}
+        current = _variables(query, "current")
+        if current:
+            out["current"] = {"time": datetime.now().strftime("%Y-%m-%dT%H:00"), "interval": 900,
+                              **{v: _series_value(v, 12) for v in current}}
+        hourly = _variables(query, "hourly")
+        if hourly:
+            out["hourly"] = {"time": [(start + timedelta(hours=h)).strftime("%Y-%m-%dT%H:00") for h in range(days * 24)],
+                             **{v: [_series_value(v, h) for h in range(days * 24)] for v in hourly}}
+        daily = _variables(query, "daily")
+        if daily:
+            out["daily"] = {"time": [(start + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(days)],
+                            **{v: [_series_value(v, d) for d in range(days)] for v in daily}}
+        return out
+
+    sites = [site(i) for i in range(len(lats))]
+    return sites if len(sites) > 1 else sites[0]
+
+
+def open_meteo_elevation(query):
+    lats = (query.get("latitude") or ["0"])[0].split(",")
+    return {"elevation": [450.0] * len(lats)}
+
+
+def bapanas_prices(query):
+    yesterday = (date.today() - timedelta(days=1)).strftime("%d-%m-%Y")
+    return {"status": "success", "data": [
+        {"name": name, "today": 10000 + 750 * i, "yesterday": 9900 + 750 * i,
+         "yesterday_date": yesterday, "satuan": "Rp./kg"}
+        for i, name in enumerate(COMMODITY_MAPPING)
+    ]}
+
+
+def bapanas_price_map(query):
+    return {"status": "success", "data": [
+        {"province_name": name, "latlong": f"{-8 + (i % 10) * 1.2:.2f},{96 + i * 1.1:.2f}",
+         "rata_rata_geometrik": 12000 + 150 * i, "level_harga": "Konsumen", "status_map": "Normal"}
+        for i, name in enumerate(PROVINCE_MAPPING) if name != "Nasional"
+    ]}
+
+
+def auth_api(endpoint, body):
+    if endpoint in ("simple-login", "simple-register"):
+        username = body.get("username", "stub")
+        return {"success": True, "user": {"username": username, "role": "user", "name": username.title()}}
+    if endpoint == "activities":
+        return {"success": True, "activities": []}
+    return {"success": True}
+
+
+# host -> [(path prefix, handler(query, body) -> payload)]
+ROUTES = {
+    OPEN_METEO_HOST: [
+        ("/v1/elevation", lambda q, b: open_meteo_elevation(q)),
+        ("/v1/", lambda q, b: open_meteo_forecast(q)),
+    ],
+    BAPANAS_HOST: [
+        ("/api/front/harga-pangan-informasi", lambda q, b: bapanas_prices(q)),
+        ("/api/front/harga-peta-provinsi", lambda q, b: bapanas_price_map(q)),
+    ],
+    AUTH_HOST: [
+        ("/api/auth/", None),     # endpoint name taken from the path
+    ],
+}
+
+
+# ========== HTTP SERVER ==========
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Requests arrive as /<original host>/<original path>?<query>."""
+
+    def _respond(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        parts = urlsplit(self.path)
+        host, _, path = parts.path.lstrip("/").partition("/")
+        path = "/" + path
+        query = parse_qs(parts.query)
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+        except ValueError:
+            body = {}
+        self.server.calls.append((self.command, host, path))
+        for prefix, handler in ROUTES.get(host, []):
+            if path.startswith(prefix):
+                if host == AUTH_HOST:
+                    return self._respond(200, auth_api(path[len(prefix):].strip("/"), body))
+                return self._respond(200, handler(query, body))
+        self._respond(404, {"status": "error", "message": f"stub: no route for {host}{path}"})
+
+    do_GET = do_POST = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer:
+    """Threaded local server; use as a context manager. `calls` lists (method, host, path)."""
+
+    def __init__(self, port=0):
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _StubHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.calls = []
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def calls(self):
+        return self._httpd.calls
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stub-services", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ========== REQUESTS ROUTING ==========
+
+def stub_url(url, server_url):
+    """https://host/path?q -> <server>/host/path?q (local URLs unchanged)."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or parts.hostname in LOCAL_HOSTS:
+        return url
+    server = urlsplit(server_url)
+    return urlunsplit((server.scheme, server.netloc, f"/{parts.hostname}{parts.path or '/'}", parts.query, ""))
+
+
+@contextmanager
+def route_requests_to(server_url):
+    """Send every `requests` call (any host) to the stub server while active."""
+    original = requests.sessions.Session.request
+
+    def request(self, method, url, *args, **kwargs):
+        headers = kwargs.get("headers")
+        if headers and "Host" in headers:
+            kwargs["headers"] = {k: v for k, v in headers.items() if k != "Host"}
+        return original(self, method, stub_url(url, server_url), *args, **kwargs)
+
+    requests.sessions.Session.request = request
+    try:
+        yield
+    finally:
+        requests.sessions.Session.request = original
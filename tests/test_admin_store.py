@@ -0,0 +1,137 @@
+"""
+Admin Store Tests
+=================
+Tests for the shared admin datastore: keys, paging, filters and bulk upsert (Admin Dashboard).
+Run with: pytest tests/test_admin_store.py -v
+"""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from services.admin_store_service import AdminStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AdminStore(str(tmp_path / "admin.db"))
+
+
+def make_prices(n):
+    return pd.DataFrame({
+        "commodity": [("Cabai Rawit", "Bawang Merah", "Tomat")[i % 3] for i in range(n)],
+        "price": [10000 + i for i in range(n)],
+        "date": [f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}" for i in range(n)],
+        "province": "Jawa Barat", "city": "Bandung", "type": "retail", "reporter": "admin",
+    })
+
+
+class TestCrud:
+    """Tests for seeding, keys and unique names."""
+
+    def test_seeded_and_shared(self, store):
+        """Default commodities are seeded once and visible to a second instance."""
+        assert store.count("commodities") == 10
+        other = AdminStore(store.db_file)
+        assert other.count("commodities") == 10
+
+    def test_autoincrement_ids(self, store):
+        """IDs keep increasing and are never reused after a delete."""
+        a = store.insert("commodities", {"name": "Kopi", "category": "Perkebunan", "unit": "kg", "price": 60000})
+        store.delete("commodities", a)
+        b = store.insert("commodities", {"name": "Kakao", "category": "Perkebunan", "unit": "kg", "price": 40000})
+        assert b > a
+        assert store.get("commodities", a) is None
+
+    def test_duplicate_name_rejected(self, store):
+        with pytest.raises(ValueError):
+            store.insert("commodities", {"name": "tomat", "category": "Sayuran"})
+        with pytest.raises(ValueError):
+            store.update("commodities", 1, {"name": "Tomat"})
+
+
+class TestQueries:
+    """Tests for server-side filter, sort and pagination."""
+
+    def test_filter_search_sort(self, store):
+        df, total = store.query("commodities", {"category": "Sayuran"}, search="a", sort_by="price", descending=True)
+        assert total == len(df) > 0
+        assert (df["category"] == "Sayuran").all()
+        assert df["price"].is_monotonic_decreasing
+        assert store.query("commodities", {"category": "Semua"})[1] == 10
+
+    def test_pagination(self, store):
+        store.bulk_upsert("manual_prices", make_prices(125))
+        pages = [store.query("manual_prices", sort_by="id", page=p, page_size=50)[0] for p in (1, 2, 3)]
+        assert [len(p) for p in pages] == [50, 50, 25]
+        assert pd.concat(pages)["id"].tolist() == list(range(1, 126))
+
+    def test_date_range_filter(self, store):
+        store.bulk_upsert("manual_prices", make_prices(120))
+        df, total = store.query("manual_prices", {"date": ("2025-06-01", None)}, page_size=1000)
+        assert total == len(df) and (df["date"] >= "2025-06-01").all()
+
+    def test_unknown_columns_rejected(self, store):
+        with pytest.raises(ValueError):
+            store.query("commodities", sort_by="price; DROP TABLE commodities")
+        with pytest.raises(ValueError):
+            store.count("commodities", {"bogus": 1})
+
+
+class TestBulk:
+    """Tests for bulk upsert, audit log and export."""
+
+    def test_upsert_by_name(self, store):
+        """Existing names are updated in place, new names inserted."""
+        df = pd.DataFrame({"name": ["Tomat", "Kopi"], "category": ["Sayuran", "Perkebunan"],
+                           "unit": ["kg", "kg"], "price": [17000, 60000]})
+        assert store.bulk_upsert("commodities", df) == 2
+        assert store.count("commodities") == 11
+        tomat = store.query("commodities", search="Tomat")[0].iloc[0]
+        assert tomat["price"] == 17000 and tomat["id"] == 9
+
+    def test_audit_and_export(self, store):
+        store.log_action("admin", "CREATE", "commodities", 1, "Created X")
+        store.log_action("admin", "DELETE", "commodities", 1, "Deleted X")
+        df, total = store.query("audit_log", {"action": "DELETE"})
+        assert total == 1 and df.iloc[0]["table"] == "commodities"
+        csv = store.export_csv("audit_log").decode()
+        assert csv.splitlines()[0].startswith("id,timestamp,user,action,table")
+        assert len(csv.splitlines()) == 3
+
+    def test_large_table_paging(self, store, monkeypatch):
+        """Bulk load is one connection / transaction; a filtered page comes off the index."""
+        opened = []
+        connect = sqlite3.connect
+        monkeypatch.setattr(sqlite3, "connect", lambda *a, **k: opened.append(connect(*a, **k)) or opened[-1])
+        assert store.bulk_upsert("manual_prices", make_prices(30_000)) == 30_000
+        assert len(opened) == 1
+        assert store.count("manual_prices") == 30_000
+
+        df, total = store.query("manual_prices", {"commodity": "Tomat"}, sort_by="date", descending=True, page=100)
+        assert len(df) == 50 and total == 10_000
+        assert (df["commodity"] == "Tomat").all()
+        assert list(df["date"]) == sorted(df["date"], reverse=True)
+        last, _ = store.query("manual_prices", {"commodity": "Tomat"}, sort_by="date", descending=True, page=200)
+        assert len(last) == 50 and last["date"].max() <= df["date"].min()
+
+        with store._connect() as conn:
+            plan = " ".join(r[3] for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM manual_prices WHERE commodity = ? ORDER BY date DESC, id DESC "
+                "LIMIT 50 OFFSET 4950", ("Tomat",)))
+        assert "idx_prices_commodity" in plan and "TEMP B-TREE" not in plan
+
+    def test_connections_are_closed(self, tmp_path, monkeypatch):
+        """Every call closes its connection (the store is shared for the server lifetime)."""
+        opened = []
+        connect = sqlite3.connect
+        monkeypatch.setattr(sqlite3, "connect", lambda *a, **k: opened.append(connect(*a, **k)) or opened[-1])
+        store = AdminStore(str(tmp_path / "admin.db"))
+        store.query("commodities")
+        store.log_action("admin", "CREATE", "commodities", 1, "x")
+        store.export_csv("audit_log")
+        assert len(opened) > 3
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
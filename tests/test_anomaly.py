@@ -0,0 +1,90 @@
+"""
+Anomaly Engine Tests
+====================
+Tests for rolling robust z-scores, IsolationForest and seasonal residuals per group (Intelligence Pro).
+Run with: pytest tests/test_anomaly.py -v
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.anomaly_service import (
+    detect_anomalies,
+    infer_period,
+    isolation_scores,
+    robust_z,
+    rolling_median_mad,
+    seasonal_residual_z,
+)
+
+
+@pytest.fixture
+def sensor():
+    rng = np.random.default_rng(0)
+    n = 4000
+    df = pd.DataFrame({
+        "Waktu": np.tile(pd.date_range("2024-01-01", periods=n // 2, freq="h"), 2),
+        "Suhu": rng.normal(25, 1, n),
+        "Kelembapan": rng.normal(70, 3, n),
+        "Sensor": np.repeat(["S1", "S2"], n // 2),
+    })
+    df.loc[[100, 2500], "Suhu"] = 60
+    return df.sample(frac=1, random_state=1)       # shuffled: the engine must re-order by time
+
+
+class TestScores:
+    """Tests for the per-series scoring functions."""
+
+    def test_rolling_matches_naive_windows(self):
+        x = np.random.default_rng(2).normal(size=300)
+        med, mad = rolling_median_mad(x, window=11)
+        for i in (5, 150, 294):
+            w = x[i - 5:i + 6]
+            assert med[i] == pytest.approx(np.median(w))
+            assert mad[i] == pytest.approx(np.median(np.abs(w - np.median(w))))
+        assert med[0] == med[5] and med[-1] == med[-6]          # edges reuse the nearest window
+
+    def test_zero_mad_does_not_explode(self):
+        z = robust_z(np.array([5.0] * 10 + [6.0]))
+        assert z[:10].tolist() == [0.0] * 10 and np.isinf(z[-1])
+
+    def test_seasonal_residual_ignores_cycle(self):
+        """A regular daily cycle is not anomalous; a break in it is."""
+        t = np.arange(24 * 60)
+        x = 10 * np.sin(2 * np.pi * t / 24) + np.random.default_rng(3).normal(0, 0.3, len(t))
+        x[700] += 5
+        z = seasonal_residual_z(x, period=24)
+        assert np.argmax(z) == 700 and (z > 3.5).sum() <= 5
+        assert infer_period(pd.date_range("2024", periods=10, freq="h").to_numpy()) == 24
+
+    def test_isolation_flags_multivariate_outlier(self):
+        X = np.random.default_rng(4).normal(size=(5000, 2))
+        X[42] = [6, -6]
+        scores, flags = isolation_scores(X, contamination=0.01)
+        assert flags[42] and abs(flags.mean() - 0.01) < 0.005
+
+
+class TestEngine:
+    """Tests for group-wise detection and its output."""
+
+    def test_flags_spikes_per_group(self, sensor):
+        flagged, summary = detect_anomalies(sensor, ["Suhu"], "rolling_z", group_col="Sensor", date_col="Waktu")
+        assert {100, 2500} <= set(flagged.index)
+        assert flagged.index[0] in (100, 2500)                 # sorted by score
+        assert summary.set_index("kelompok")["n_baris"].to_dict() == {"S1": 2000, "S2": 2000}
+        assert summary["n_anomali"].sum() == len(flagged)
+
+    def test_isolation_forest_multi_column(self, sensor):
+        flagged, _ = detect_anomalies(sensor, ["Suhu", "Kelembapan"], "isolation_forest", contamination=0.005)
+        assert {100, 2500} <= set(flagged.index) and len(flagged) < 0.01 * len(sensor)
+
+    def test_process_pool_matches_serial(self, sensor):
+        serial, _ = detect_anomalies(sensor, ["Suhu"], "seasonal", group_col="Sensor", date_col="Waktu")
+        pooled, _ = detect_anomalies(sensor, ["Suhu"], "seasonal", group_col="Sensor", date_col="Waktu",
+                                     max_workers=2, parallel_threshold=1)
+        assert sorted(serial.index) == sorted(pooled.index)
+
+    def test_unknown_method_rejected(self, sensor):
+        with pytest.raises(ValueError):
+            detect_anomalies(sensor, ["Suhu"], "dbscan")
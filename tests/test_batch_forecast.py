@@ -0,0 +1,91 @@
+"""
+Batch Forecast Tests
+====================
+Tests for the vectorized trend forecaster, series building and cached batch runs (Intelligence Pro).
+Run with: pytest tests/test_batch_forecast.py -v
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from services.batch_forecast_service import (
+    ForecastCache,
+    batch_forecast,
+    build_series,
+    forecast_series,
+    series_hash,
+)
+
+
+@pytest.fixture
+def sales():
+    dates = pd.date_range("2023-01-01", periods=24, freq="MS")
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "Tanggal": np.tile(dates, 2),
+        "Hasil_Panen_Ton": np.concatenate([np.linspace(10, 25, 24), np.linspace(30, 5, 24)]) + rng.normal(0, 1, 48),
+        "Biaya": rng.integers(5, 15, 48) * 1e6,
+        "Lokasi": ["Blok A"] * 24 + ["Blok B"] * 24,
+    })
+
+
+class TestSingleSeries:
+    """Tests for the trend model."""
+
+    def test_matches_ordinal_regression(self):
+        """Same predictions as the original ordinal-date LinearRegression with list-built dates."""
+        dates = pd.date_range("2023-01-01", periods=12, freq="MS")
+        values = np.arange(12) * 3.0 + 5
+        res = forecast_series(dates.to_numpy(), values, periods=4)
+
+        ordinal = np.array([[d.toordinal()] for d in dates])
+        model = LinearRegression().fit(ordinal, values)
+        avg_diff = (dates[-1] - dates[0]).days / len(dates)
+        future = [dates[-1] + datetime.timedelta(days=int(avg_diff) * i) for i in range(1, 5)]
+        expected = model.predict([[d.toordinal()] for d in future])
+
+        assert pd.to_datetime(res["future_dates"]).tolist() == future
+        assert np.allclose(res["predictions"], expected)
+        assert res["r2"] == pytest.approx(model.score(ordinal, values))
+
+    def test_insufficient_points(self):
+        res = forecast_series(np.array(["2024-01-01"], dtype="datetime64[D]"), [1.0], 3)
+        assert res["status"] == "insufficient" and len(res["predictions"]) == 0
+
+
+class TestBatch:
+    """Tests for series building, combined output and the model cache."""
+
+    def test_build_wide_and_grouped(self, sales):
+        wide = build_series(sales, "Tanggal", value_cols=["Hasil_Panen_Ton", "Biaya"])
+        assert set(wide) == {"Hasil_Panen_Ton", "Biaya"}
+        assert len(wide["Biaya"][0]) == 24                     # summed over both blocks per date
+        grouped = build_series(sales, "Tanggal", group_col="Lokasi", target="Hasil_Panen_Ton")
+        assert set(grouped) == {"Blok A", "Blok B"}
+        assert np.allclose(grouped["Blok A"][1], sales["Hasil_Panen_Ton"][:24])
+
+    def test_combined_table_and_trends(self, sales):
+        series = build_series(sales, "Tanggal", group_col="Lokasi", target="Hasil_Panen_Ton")
+        table, summary = batch_forecast(series, periods=6, cache=ForecastCache())
+        assert set(table["jenis"]) == {"Aktual", "Prediksi"}
+        assert (table[table["jenis"] == "Prediksi"].groupby("series").size() == 6).all()
+        trend = summary.set_index("series")["tren_per_hari"]
+        assert trend["Blok A"] > 0 > trend["Blok B"]
+
+    def test_cache_and_process_pool(self, sales):
+        """Pool results equal serial ones; a rerun is served from the cache."""
+        series = {f"s{i}": (pd.date_range("2024-01-01", periods=10).to_numpy(), np.arange(10.0) * i) for i in range(10)}
+        cache = ForecastCache()
+        _, pooled = batch_forecast(series, 3, max_workers=2, parallel_threshold=1, cache=cache)
+        _, serial = batch_forecast(series, 3, parallel_threshold=100, cache=ForecastCache())
+        assert np.allclose(pooled["prediksi_akhir"], serial["prediksi_akhir"])
+        assert len(cache) == 10
+
+        key = series_hash(*series["s3"], 3)
+        cache.put(key, {**cache.get(key), "r2": -1.0})     # marker proves the hit path
+        _, again = batch_forecast(series, 3, cache=cache)
+        assert again.set_index("series").loc["s3", "r2"] == -1.0
@@ -0,0 +1,130 @@
+"""
+Batch Registry Tests
+====================
+Tests for the persistent batch registry, scan lookup and CSV import (Traceability Produk).
+Run with: pytest tests/test_batch_registry.py -v
+"""
+
+import datetime
+import io
+import sqlite3
+
+import pytest
+
+from services.batch_registry_service import BatchRegistry, batch_hash, parse_scan
+from services.label_render_service import build_qr_url
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return BatchRegistry(str(tmp_path / "registry.db"), cache_size=2)
+
+
+@pytest.fixture
+def batch():
+    return {
+        "id": "AGRI-20250101-001", "produk": "Kopi Arabika", "varietas": "Gayo", "tgl": datetime.date(2025, 1, 1),
+        "petani": "Gapoktan Sejahtera", "lokasi": "Aceh Tengah", "harga": 85000, "kontak": None,
+        "riwayat": "Kompos", "klaim": ["Organik"], "foto": None,
+    }
+
+
+def make_csv(n):
+    lines = ["id,produk,tgl,petani,harga,klaim"]
+    lines += [f"B-{i:05d},{'Kopi' if i % 2 else 'Cabai'},2025-01-{i % 28 + 1:02d},Petani {i % 3},{1000 + i},Organik;Halal"
+              for i in range(n)]
+    return io.StringIO("\n".join(lines))
+
+
+class TestLookup:
+    """Tests for upsert and the scan read path."""
+
+    def test_roundtrip(self, registry, batch):
+        """Stored batch comes back with the page's field types."""
+        registry.upsert(batch)
+        got = registry.get(batch["id"])
+        assert got["tgl"] == datetime.date(2025, 1, 1)
+        assert got["klaim"] == ["Organik"]
+        assert got["hash"] == batch_hash(batch["id"], "Kompos", "Gapoktan Sejahtera")
+        assert registry.get("AGRI-TIDAK-ADA") is None
+
+    def test_scan_url_resolves(self, registry, batch):
+        """The QR passport URL resolves to its batch."""
+        registry.upsert(batch)
+        assert parse_scan(build_qr_url(batch)) == batch["id"]
+        assert registry.get(build_qr_url(batch))["produk"] == "Kopi Arabika"
+
+    def test_cache_invalidated_on_write(self, registry, batch):
+        """Updating a cached batch is visible on the next scan."""
+        registry.upsert(batch)
+        assert registry.get(batch["id"])["harga"] == 85000
+        registry.upsert({**batch, "harga": 90000})
+        assert registry.get(batch["id"])["harga"] == 90000
+
+    def test_cached_copy_not_shared(self, registry, batch):
+        """Callers cannot mutate the cached entry."""
+        registry.upsert(batch)
+        registry.get(batch["id"])["produk"] = "Diubah"
+        assert registry.get(batch["id"])["produk"] == "Kopi Arabika"
+
+
+class TestImportAndSearch:
+    """Tests for bulk CSV import and indexed search."""
+
+    def test_import_in_chunks(self, registry):
+        """Chunked import stores every row with derived hash and parsed claims."""
+        seen = []
+        assert registry.import_csv(make_csv(250), chunk_size=100, progress=lambda rows, fraction: seen.append((rows, fraction))) == 250
+        assert [rows for rows, _ in seen] == [100, 200, 250, 250]
+        fractions = [f for _, f in seen]
+        assert fractions == sorted(fractions) and 0 < fractions[0] < 1 and fractions[-1] == 1.0
+        assert registry.count() == 250
+        got = registry.get("B-00007")
+        assert got["harga"] == 1007 and got["klaim"] == ["Organik", "Halal"]
+        assert got["hash"] == batch_hash("B-00007", "", "Petani 1")
+
+    def test_connections_are_closed(self, tmp_path, monkeypatch):
+        """Write connections are closed after each call (the registry is shared for the server lifetime)."""
+        opened = []
+        connect = sqlite3.connect
+        monkeypatch.setattr(sqlite3, "connect", lambda *a, **k: opened.append(connect(*a, **k)) or opened[-1])
+        registry = BatchRegistry(str(tmp_path / "registry.db"))
+        registry.import_csv(make_csv(30), chunk_size=10)
+        registry.upsert({"id": "X-1", "produk": "Kopi", "tgl": "2025-01-01", "petani": "P"})
+        reader = registry._reader()
+        for conn in opened:
+            if conn is not reader:
+                with pytest.raises(sqlite3.ProgrammingError):
+                    conn.execute("SELECT 1")
+
+    def test_missing_columns(self, registry):
+        """CSV without required columns is rejected."""
+        with pytest.raises(ValueError):
+            registry.import_csv(io.StringIO("id,produk\nX,Kopi"))
+
+    def test_bad_date_rolls_back_whole_import(self, registry):
+        """A malformed date in a late chunk leaves nothing half-imported."""
+        lines = make_csv(30).getvalue().splitlines()
+        lines[25] = lines[25].replace("2025-01-", "bukan-tanggal-")
+        with pytest.raises(ValueError, match="B-00024"):
+            registry.import_csv(io.StringIO("\n".join(lines)), chunk_size=10)
+        assert registry.count() == 0
+
+    def test_bad_dates_reported(self, registry):
+        """With a `rejected` list the bad rows are skipped and reported."""
+        lines = make_csv(30).getvalue().splitlines()
+        lines[25] = lines[25].replace("2025-01-", "bukan-tanggal-")
+        rejected = []
+        assert registry.import_csv(io.StringIO("\n".join(lines)), chunk_size=10, rejected=rejected) == 29
+        assert [r["id"] for r in rejected] == ["B-00024"]
+        assert registry.get("B-00024") is None and registry.count() == 29
+
+    def test_search_filters(self, registry):
+        """Search combines farmer, commodity and date filters."""
+        registry.import_csv(make_csv(200))
+        res = registry.search(petani="Petani 1", produk="Kopi", date_from="2025-01-15")
+        assert len(res) > 0
+        assert (res["petani"] == "Petani 1").all() and (res["produk"] == "Kopi").all()
+        assert (res["tgl"] >= "2025-01-15").all()
+        assert res["tgl"].is_monotonic_decreasing
+        assert registry.distinct("petani") == ["Petani 0", "Petani 1", "Petani 2"]
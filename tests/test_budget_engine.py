@@ -0,0 +1,103 @@
+"""
+Budget Engine Tests
+===================
+Tests for the compiled RAB arrays and scenario/sensitivity analysis (Analisis Usaha Tani).
+Run with: pytest tests/test_budget_engine.py -v
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.budget_engine_service import (
+    CompiledRAB,
+    compile_all_templates,
+    compile_rab_table,
+    evaluate_scenarios,
+    sensitivity_analysis,
+)
+
+ITEMS = [
+    {"kategori": "Benih (Opsi A)", "item": "Benih Biji", "satuan": "Sachet", "volume": 10, "harga": 100000, "opsi": "semai"},
+    {"kategori": "Benih (Opsi B)", "item": "Bibit Siap Tanam", "satuan": "Tanaman", "volume": 1000, "harga": 500, "opsi": "bibit"},
+    {"kategori": "Pupuk", "item": "Urea", "satuan": "Kg", "volume": 200, "harga": 6000},
+    {"kategori": "Pupuk", "item": "KNO3 (Booster)", "satuan": "Kg", "volume": 10, "harga": 30000, "opsi": "premium"},
+    {"kategori": "Tenaga Kerja", "item": "Tanam", "satuan": "HOK", "volume": 20, "harga": 90000},
+    {"kategori": "Tenaga Kerja", "item": "Persemaian", "satuan": "HOK", "volume": 5, "harga": 90000, "opsi": "semai"},
+]
+
+
+def loop_cost(items, area, wage, fert_mult, seed_method, booster):
+    """Reference: the page's per-row loop."""
+    total = 0.0
+    for it in items:
+        opsi = it.get("opsi")
+        if opsi in ("semai", "bibit") and opsi != seed_method:
+            continue
+        if opsi == "premium" and not booster:
+            continue
+        price = wage if it["satuan"] == "HOK" else it["harga"] * (fert_mult if "Pupuk" in it["kategori"] else 1)
+        total += it["volume"] * area * price
+    return total
+
+
+@pytest.fixture
+def rab():
+    return CompiledRAB(ITEMS, name="Uji")
+
+
+class TestCompiledRAB:
+    """Tests for compilation and option masks."""
+
+    @pytest.mark.parametrize("method,booster", [("semai", True), ("semai", False), ("bibit", True), ("bibit", False)])
+    def test_matches_loop(self, rab, method, booster):
+        """Vectorized cost equals the row loop for every option combination."""
+        assert rab.cost_per_ha(100000, 1.3, method, booster) == pytest.approx(loop_cost(ITEMS, 1, 100000, 1.3, method, booster))
+
+    def test_all_templates_compile(self):
+        """Every CropService template compiles with positive cost."""
+        compiled = compile_all_templates()
+        assert compiled
+        assert all(r.cost_per_ha(90000) > 0 for r in compiled.values())
+
+    def test_compile_edited_table(self):
+        """Edited page table (totals for the whole area) is compiled per hectare."""
+        df = pd.DataFrame({"Kategori": ["Pupuk", "Tenaga Kerja"], "Uraian": ["Urea", "Tanam"], "Satuan": ["Kg", "HOK"],
+                           "Volume": [400.0, 40.0], "Harga Satuan (Rp)": [6000, 90000]})
+        rab = compile_rab_table(df, area_ha=2)
+        assert rab.cost_per_ha(90000) == pytest.approx(200 * 6000 + 20 * 90000)
+
+
+class TestScenarios:
+    """Tests for batched scenarios and the sensitivity report."""
+
+    def test_broadcast_grid_and_options(self, rab):
+        """Scenario axes broadcast; option_index selects the option combo per scenario."""
+        wages = np.array([80000, 100000])[:, None]
+        yields = np.array([5000, 8000, 12000])[None, :]
+        res = evaluate_scenarios(rab, 2.0, yields, 3000, wages, 1.0)
+        assert res["profit"].shape == (2, 3)
+        expected = 2 * 8000 * 3000 - loop_cost(ITEMS, 2, 100000, 1.0, "semai", True)
+        assert res["profit"][1, 1] == pytest.approx(expected)
+
+        opts = [("semai", True), ("bibit", False)]
+        both = evaluate_scenarios(rab, 1.0, 5000, 3000, 90000, options=opts, option_index=[0, 1])
+        assert both["cost"][1] == pytest.approx(loop_cost(ITEMS, 1, 90000, 1.0, "bibit", False))
+
+    def test_break_even(self, rab):
+        """At the break-even price profit is zero."""
+        res = evaluate_scenarios(rab, 1.5, 6000, 3000, 90000)
+        at_bep = evaluate_scenarios(rab, 1.5, 6000, res["bep_price"], 90000)
+        assert at_bep["profit"] == pytest.approx(0.0, abs=1e-6)
+
+    def test_sensitivity_report(self, rab):
+        """One call returns distribution, tornado and break-even surfaces."""
+        base = {"area_ha": 1.0, "yield_per_ha": 6000, "price": 3000, "hok_wage": 90000}
+        rep = sensitivity_analysis(rab, base, n_samples=2000, surface_steps=10)
+        assert len(rep["samples"]) == 2000
+        assert rep["stats"]["p5"] <= rep["stats"]["p50"] <= rep["stats"]["p95"]
+        assert rep["tornado"]["swing"].is_monotonic_decreasing
+        assert set(rep["tornado"]["variable"]) == {"yield_per_ha", "price", "hok_wage", "fert_mult"}
+        assert rep["bep_price"].shape == (10, 10)
+        # Higher yield → lower break-even price
+        assert (np.diff(rep["bep_price"].to_numpy(), axis=0) < 0).all()
@@ -0,0 +1,161 @@
+"""
+Catalog Index Tests
+===================
+Tests for the faceted bitset index behind the catalog filters (Katalog Pupuk & Harga, Direktori Bahan Aktif).
+Run with: pytest tests/test_catalog_index.py -v
+"""
+
+import random
+
+import pytest
+
+from services.catalog_index_service import ALL, CatalogIndex, tokenize
+
+CATALOG = {
+    "Urea Pusri": {"category": "Tunggal", "brand": "Pusri", "price_per_kg": 2500, "n_content": 46,
+                   "description": "Pupuk nitrogen", "usage": "Padi, jagung"},
+    "SP-36 Petrokimia": {"category": "Tunggal", "brand": "Petrokimia", "price_per_kg": 3000, "n_content": 0,
+                         "description": "Pupuk fosfat", "usage": "Padi, kedelai"},
+    "NPK Phonska": {"category": "Majemuk", "brand": "Petrokimia", "price_per_kg": 4000, "n_content": 15,
+                    "description": "NPK 15-15-15", "usage": "Semua tanaman"},
+    "NPK Mutiara": {"category": "Majemuk", "brand": "Meroke", "price_per_kg": 12000, "n_content": 16,
+                    "description": "NPK 16-16-16 premium", "usage": "Hortikultura"},
+    "Petroganik": {"category": "Organik", "brand": "Petrokimia", "price_per_kg": 800, "n_content": 2,
+                   "description": "Pupuk organik granul", "usage": "Padi, sayuran"},
+}
+
+
+@pytest.fixture
+def index():
+    return CatalogIndex(CATALOG, facets=("category", "brand"), price_field="price_per_kg",
+                        text_fields=("description", "usage"), sort_fields=("n_content",))
+
+
+def names(index, mask, **kwargs):
+    return list(index.select(mask, **kwargs))
+
+
+class TestFilters:
+    """Facet, price and text filters"""
+
+    def test_no_filter_returns_everything(self, index):
+        mask, _ = index.query()
+        assert set(names(index, mask)) == set(CATALOG)
+
+    def test_facets_are_anded(self, index):
+        mask, _ = index.query({"category": "Tunggal", "brand": "Petrokimia"})
+        assert names(index, mask) == ["SP-36 Petrokimia"]
+
+    def test_all_means_no_filter(self, index):
+        mask, _ = index.query({"category": ALL, "brand": None})
+        assert len(names(index, mask)) == len(CATALOG)
+
+    def test_unknown_facet_value_matches_nothing(self, index):
+        mask, _ = index.query({"brand": "Tidak Ada"})
+        assert mask == 0
+        assert index.select(mask) == {}
+
+    def test_price_range_is_inclusive(self, index):
+        mask, _ = index.query(price_range=(2500, 4000))
+        assert set(names(index, mask)) == {"Urea Pusri", "SP-36 Petrokimia", "NPK Phonska"}
+
+    def test_empty_price_range(self, index):
+        assert index.price_mask(5000, 6000) == 0
+        assert index.price_mask(6000, 5000) == 0
+
+    def test_text_tokens_must_all_match(self, index):
+        mask, _ = index.query(text="npk premium")
+        assert names(index, mask) == ["NPK Mutiara"]
+
+    def test_text_prefix_match_is_case_insensitive(self, index):
+        mask, _ = index.query(text="PET")
+        assert set(names(index, mask)) == {"SP-36 Petrokimia", "Petroganik"}
+
+    def test_text_searches_description_and_usage(self, index):
+        mask, _ = index.query(text="kedelai")
+        assert names(index, mask) == ["SP-36 Petrokimia"]
+
+    def test_tokenize(self):
+        assert tokenize("NPK 15-15-15, Padi") == ["npk", "15", "15", "15", "padi"]
+
+
+class TestFacetCounts:
+    """Counts shown next to every facet value"""
+
+    def test_counts_without_filters(self, index):
+        _, counts = index.query()
+        assert counts["category"] == {"Tunggal": 2, "Majemuk": 2, "Organik": 1}
+        assert counts["brand"]["Petrokimia"] == 3
+
+    def test_counts_are_drill_sideways(self, index):
+        # Selecting a brand narrows category counts but not the brand counts themselves
+        _, counts = index.query({"brand": "Petrokimia"})
+        assert counts["category"] == {"Tunggal": 1, "Majemuk": 1, "Organik": 1}
+        assert counts["brand"] == {"Pusri": 1, "Petrokimia": 3, "Meroke": 1}
+
+    def test_counts_follow_text_and_price(self, index):
+        _, counts = index.query(text="padi", price_range=(0, 2600))
+        assert counts["category"] == {"Tunggal": 1, "Majemuk": 0, "Organik": 1}
+
+    def test_facet_values_sorted(self, index):
+        assert index.facet_values("category") == ["Majemuk", "Organik", "Tunggal"]
+
+
+class TestSortingAndPaging:
+    """Result ordering and pagination"""
+
+    def test_sort_by_price(self, index):
+        mask, _ = index.query()
+        prices = [r["price_per_kg"] for r in index.select(mask, sort_by="price").values()]
+        assert prices == sorted(prices)
+        prices = [r["price_per_kg"] for r in index.select(mask, sort_by="price", descending=True).values()]
+        assert prices == sorted(prices, reverse=True)
+
+    def test_sort_by_name_and_field(self, index):
+        mask, _ = index.query()
+        assert names(index, mask, sort_by="name") == sorted(CATALOG)
+        assert names(index, mask, sort_by="n_content", descending=True)[0] == "Urea Pusri"
+
+    def test_paging(self, index):
+        mask, _ = index.query()
+        full = names(index, mask, sort_by="name")
+        assert names(index, mask, sort_by="name", offset=2, limit=2) == full[2:4]
+
+    def test_insertion_order_without_price_field(self):
+        index = CatalogIndex(CATALOG, facets=("category",))
+        mask, _ = index.query()
+        assert names(index, mask) == list(CATALOG)
+
+
+class TestAgainstLinearScan:
+    """Randomized catalog: index results equal a plain filter loop"""
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(7)
+        words = ["padi", "jagung", "cabai", "organik", "granul", "cair", "premium", "npk", "urea"]
+        items = {}
+        for i in range(3000):
+            items[f"Produk {i}"] = {
+                "category": rng.choice(["Tunggal", "Majemuk", "Organik", "Hayati"]),
+                "brand": f"Brand {rng.randrange(25)}",
+                "price_per_kg": rng.randrange(500, 50000),
+                "description": " ".join(rng.sample(words, 3)),
+            }
+        index = CatalogIndex(items, facets=("category", "brand"), price_field="price_per_kg",
+                             text_fields=("description",))
+
+        for _ in range(50):
+            category = rng.choice([ALL, "Tunggal", "Organik"])
+            brand = rng.choice([ALL, "Brand 3", "Brand 11"])
+            term = rng.choice(["", "pad", "npk gran", "12"])
+            lo = rng.randrange(0, 30000)
+            hi = lo + rng.randrange(0, 30000)
+            expected = {
+                name for name, r in items.items()
+                if category in (ALL, r["category"]) and brand in (ALL, r["brand"])
+                and lo <= r["price_per_kg"] <= hi
+                and all(any(tok.startswith(t) for tok in tokenize(f"{name} {r['description']}"))
+                        for t in tokenize(term))
+            }
+            mask, _ = index.query({"category": category, "brand": brand}, text=term, price_range=(lo, hi))
+            assert set(index.select(mask)) == expected
@@ -0,0 +1,132 @@
+"""
+Data Ingestion Tests
+====================
+Tests for the streaming CSV → Parquet cache, dtype downcasting and chart downsampling (Intelligence Pro).
+Run with: pytest tests/test_data_ingest.py -v
+"""
+
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services import data_ingest_service
+from services.data_ingest_service import (
+    binned_counts,
+    content_hash,
+    csv_to_parquet,
+    detect_date_columns,
+    downcast_frame,
+    downsample,
+    infer_schema,
+    load_dataset,
+    lttb_indices,
+    minmax_indices,
+    prune_cache,
+)
+
+
+@pytest.fixture
+def csv_bytes():
+    n = 5000
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "Tanggal": pd.date_range("2024-01-01", periods=n, freq="h").strftime("%Y-%m-%d %H:%M:%S"),
+        "Hasil_Panen_Ton": rng.normal(20, 3, n).round(3),
+        "Biaya": rng.integers(5, 15, n) * 1000,
+        "Lokasi": rng.choice(["Blok A", "Blok B"], n),
+    })
+    return df.to_csv(index=False).encode()
+
+
+class TestIngestion:
+    """Tests for schema inference, streaming and the Parquet cache."""
+
+    def test_schema_from_sample(self, csv_bytes):
+        schema = infer_schema(pd.read_csv(io.BytesIO(csv_bytes), nrows=100))
+        assert schema == {"dates": ["Tanggal"], "numeric": ["Hasil_Panen_Ton", "Biaya"], "text": ["Lokasi"]}
+
+    def test_chunked_matches_full_read(self, csv_bytes, tmp_path):
+        """Streaming in small chunks gives the same data as one read."""
+        path = str(tmp_path / "out.parquet")
+        assert csv_to_parquet(io.BytesIO(csv_bytes), path, chunk_rows=700, sample_rows=50) == 5000
+        streamed = pd.read_parquet(path)
+        full = pd.read_csv(io.BytesIO(csv_bytes))
+        assert np.allclose(streamed["Hasil_Panen_Ton"], full["Hasil_Panen_Ton"])
+        assert (streamed["Tanggal"] == pd.to_datetime(full["Tanggal"])).all()
+
+    def test_failed_conversion_leaves_no_partial_file(self, csv_bytes, tmp_path):
+        """Types changing after the sample abort the stream without a stray .tmp file."""
+        df = pd.read_csv(io.BytesIO(csv_bytes))
+        df["Biaya"] = df["Biaya"].astype(object)
+        df.loc[4000, "Biaya"] = "tidak ada"
+        path = str(tmp_path / "out.parquet")
+        with pytest.raises(ValueError):
+            csv_to_parquet(io.BytesIO(df.to_csv(index=False).encode()), path, chunk_rows=700, sample_rows=50)
+        assert os.listdir(tmp_path) == []
+
+    def test_cache_and_downcast(self, csv_bytes, tmp_path, monkeypatch):
+        """Second load hits the content-hash cache; dtypes are compact."""
+        f = io.BytesIO(csv_bytes)
+        df = load_dataset(f, "laporan.csv", cache_dir=str(tmp_path))
+        cached = os.path.join(str(tmp_path), f"{content_hash(f)}.parquet")
+        assert os.path.exists(cached)
+        assert pd.api.types.is_datetime64_any_dtype(df["Tanggal"])
+        assert df["Biaya"].dtype == np.int16
+        assert df["Hasil_Panen_Ton"].dtype == np.float32
+        assert isinstance(df["Lokasi"].dtype, pd.CategoricalDtype)
+
+        monkeypatch.setattr(data_ingest_service, "csv_to_parquet", lambda *a, **k: pytest.fail("cache missed"))
+        again = load_dataset(io.BytesIO(csv_bytes), "copy.csv", cache_dir=str(tmp_path))
+        assert len(again) == 5000
+
+    def test_infinite_values_stay_float(self):
+        df = downcast_frame(pd.DataFrame({"a": [1.0, np.inf, -np.inf], "b": [1.0, 2.0, 3.0]}))
+        assert np.isinf(df["a"]).sum() == 2
+        assert pd.api.types.is_integer_dtype(df["b"])
+
+    def test_cache_pruned_least_recently_used(self, tmp_path):
+        for i, name in enumerate(("old", "mid", "new")):
+            path = tmp_path / f"{name}.parquet"
+            path.write_bytes(b"x" * 100)
+            os.utime(path, (1000 + i, 1000 + i))
+        removed = prune_cache(str(tmp_path), max_bytes=250, keep=str(tmp_path / "new.parquet"))
+        assert [os.path.basename(p) for p in removed] == ["old.parquet"]
+        assert sorted(os.listdir(tmp_path)) == ["mid.parquet", "new.parquet"]
+
+    def test_detect_dates_on_loaded_text(self):
+        df = pd.DataFrame({"tgl": ["2024-01-01", "2024-02-01"], "nama": ["a", "b"]})
+        assert detect_date_columns(df) == ["tgl"]
+        assert pd.api.types.is_datetime64_any_dtype(df["tgl"])
+
+
+class TestDownsampling:
+    """Tests for LTTB, min-max and pre-binned histograms."""
+
+    def test_lttb_keeps_endpoints_and_spike(self):
+        x = np.arange(10_000)
+        y = np.zeros(10_000)
+        y[5_123] = 100.0
+        idx = lttb_indices(x, y, 200)
+        assert len(idx) == 200 and idx[0] == 0 and idx[-1] == 9_999
+        assert np.all(np.diff(idx) > 0)
+        assert 5_123 in idx
+
+    def test_minmax_keeps_extremes(self):
+        y = np.sin(np.linspace(0, 50, 10_001))
+        y[777] = -5
+        idx = minmax_indices(y, 100)
+        assert 777 in idx and y[idx].max() == y.max()
+
+    def test_downsample_per_group(self):
+        df = pd.DataFrame({"t": np.tile(np.arange(5000), 2), "v": np.random.default_rng(1).normal(size=10_000),
+                           "g": np.repeat(["A", "B"], 5000)})
+        out = downsample(df, "t", "v", n_out=300, group="g")
+        assert out.groupby("g").size().tolist() == [300, 300]
+
+    def test_binned_counts_total(self):
+        df = pd.DataFrame({"v": np.arange(1000.0), "g": ["A", "B"] * 500})
+        out = binned_counts(df, "v", "g", bins=10)
+        assert out["count"].sum() == 1000
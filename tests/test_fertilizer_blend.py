@@ -0,0 +1,97 @@
+"""
+Fertilizer Blend Tests
+======================
+Tests for the least-cost N-P-K blend solver: sacks, organic share, stock and batch plans (Konversi Pupuk).
+Run with: pytest tests/test_fertilizer_blend.py -v
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.fertilizer_blend_service import BlendOptimizer, products_from_db
+
+DB = {
+    "Urea": {"N": 46, "P": 0, "K": 0, "price_per_kg": 2500, "type": "anorganik"},
+    "SP-36": {"N": 0, "P": 36, "K": 0, "price_per_kg": 3000, "type": "anorganik"},
+    "KCl": {"N": 0, "P": 0, "K": 60, "price_per_kg": 3500, "type": "anorganik"},
+    "NPK 15-15-15": {"N": 15, "P": 15, "K": 15, "price_per_kg": 4000, "type": "anorganik"},
+    "Kompos": {"N": 1.5, "P": 1.0, "K": 1.5, "price_per_kg": 500, "type": "organik"},
+    "Guano": {"N": 10, "P": 12, "K": 2, "price_per_kg": 5000, "type": "organik"},
+}
+
+
+@pytest.fixture
+def optimizer():
+    return BlendOptimizer(products_from_db(DB))
+
+
+def brute_force(optimizer, target, max_sacks=6, products=("Urea", "SP-36", "KCl", "NPK 15-15-15")):
+    """Cheapest whole-sack mix by enumeration (small inorganic subset)."""
+    idx = [optimizer.names.index(p) for p in products]
+    best = np.inf
+    for combo in itertools.product(range(max_sacks + 1), repeat=len(idx)):
+        kg = np.array(combo) * 50.0
+        if (optimizer.A[:, idx] @ kg >= np.array(target) - 1e-9).all():
+            best = min(best, kg @ optimizer.price[idx])
+    return best
+
+
+class TestSingleField:
+    """Tests for one nutrient target."""
+
+    def test_price_key_detected(self):
+        df = products_from_db({"Urea": {"N": 46, "P": 0, "K": 0, "price": 2500, "type": "anorganik"}})
+        assert df.iloc[0]["price"] == 2500 and not df.iloc[0]["organic"]
+
+    def test_matches_enumeration(self):
+        inorganic = {k: v for k, v in DB.items() if v["type"] == "anorganik"}
+        opt = BlendOptimizer(products_from_db(inorganic))
+        for target in ([100, 50, 50], [60, 20, 80], [30, 30, 30]):
+            res = opt.solve(dict(zip("NPK", target)))
+            assert res["cost"] == pytest.approx(brute_force(opt, target))
+            assert all(res["supplied"][n] >= t - 1e-6 for n, t in zip("NPK", target))
+
+    def test_whole_sacks(self, optimizer):
+        plan = optimizer.solve({"N": 37, "P": 11, "K": 9})["plan"]
+        assert (plan["Berat (kg)"] % 50 == 0).all() and (plan["Karung (50kg)"] > 0).all()
+
+    def test_organic_share(self, optimizer):
+        res = optimizer.solve({"N": 100, "P": 50, "K": 50}, organic_share=0.3)
+        plan = res["plan"].set_index("Pupuk")
+        organic_kg = plan.loc[plan["Organik"], "Berat (kg)"]
+        org = optimizer.A[:, [optimizer.names.index(n) for n in organic_kg.index]] @ organic_kg.to_numpy()
+        assert (org >= 0.3 * np.array([100, 50, 50]) - 1e-6).all()
+
+    def test_stock_limits_and_infeasible(self, optimizer):
+        res = optimizer.solve({"N": 100, "P": 0, "K": 0}, stock={"Urea": 100})
+        assert res["plan"].set_index("Pupuk").loc["Urea", "Berat (kg)"] <= 100
+        empty = {n: 0 for n in optimizer.names}
+        assert optimizer.solve({"N": 100, "P": 50, "K": 50}, stock=empty)["status"] == "infeasible"
+
+
+class TestBatch:
+    """Tests for season plans over many fields."""
+
+    def test_batch_meets_every_field(self, optimizer):
+        targets = pd.DataFrame(np.random.default_rng(0).uniform(20, 200, (1500, 3)).round(), columns=list("NPK"))
+        res = optimizer.optimize(targets, organic_share=0.2, stock={"Guano": 5000})
+        assert not res["exact"]
+        assert (res["supplied"].to_numpy() >= targets.to_numpy() - 1e-6).all()
+        assert (res["fields"].sum() <= res["sacks"] * 50 + 1e-6).all()
+        assert res["sacks"]["Guano"] * 50 <= 5000
+        assert res["lower_bound"] <= res["cost"] <= res["lower_bound"] + (optimizer.price * 50).sum()
+
+    def test_duplicate_fields_share_one_solution(self, optimizer):
+        res = optimizer.optimize([[100, 50, 50]] * 3 + [[10, 0, 0]])
+        assert res["exact"] and len(res["fields"]) == 4
+        assert np.allclose(res["fields"].iloc[0], res["fields"].iloc[2])
+
+    def test_exact_small_batch_not_worse_than_separate(self, optimizer):
+        """Pooling sacks across fields never costs more than buying per field."""
+        targets = [[37, 11, 9], [23, 19, 4], [41, 7, 13]]
+        pooled = optimizer.optimize(targets)["cost"]
+        separate = sum(optimizer.solve(dict(zip("NPK", t)))["cost"] for t in targets)
+        assert pooled <= separate
@@ -0,0 +1,68 @@
+"""
+Fire Danger Tests
+=================
+Tests for the vectorized FDRS index and multi-block forecast (Agroforestri page).
+Run with: pytest tests/test_fire_danger.py -v
+"""
+
+import numpy as np
+import pytest
+
+from services.fire_danger_service import (
+    FIRE_LEVELS,
+    danger_level,
+    days_without_rain,
+    fire_danger_index,
+    forecast_fire_danger,
+)
+
+
+def scalar_fdrs(temp, hum, wind, hth, fuel_factor):
+    """Reference: the original chained if/elif calculator."""
+    s_t = 30 if temp > 35 else 20 if temp > 30 else 10 if temp > 25 else 0
+    s_h = 30 if hum < 40 else 20 if hum < 60 else 10 if hum < 80 else 0
+    s_w = 30 if wind > 30 else 20 if wind > 15 else 10 if wind > 5 else 0
+    s_d = 30 if hth > 14 else 20 if hth > 7 else 10 if hth > 3 else 0
+    return (s_t + s_h + s_w + s_d) * fuel_factor
+
+
+class TestIndex:
+    """Tests for the index and level classification."""
+
+    def test_matches_scalar_calculator(self):
+        """Vectorized scores equal the original calculator on every threshold edge."""
+        temps, hums, winds, hths = [20, 25, 26, 30, 31, 35, 36], [10, 39, 40, 59, 60, 79, 80], [0, 5, 6, 15, 16, 30, 31], [0, 3, 4, 7, 8, 14, 15]
+        grid = np.array(np.meshgrid(temps, hums, winds, hths, [1.0, 1.2, 1.5], indexing="ij")).reshape(5, -1)
+        expected = [scalar_fdrs(*row) for row in grid.T]
+        assert fire_danger_index(*grid) == pytest.approx(expected)
+
+    def test_levels(self):
+        """Level boundaries follow the calculator (20/40/70/100)."""
+        assert danger_level([0, 19.9, 20, 39, 40, 69, 70, 99, 100, 180]).tolist() == [0, 0, 1, 1, 2, 2, 3, 3, 4, 4]
+        assert FIRE_LEVELS[4][1].startswith("EXTREME")
+
+
+class TestForecast:
+    """Tests for dry-day derivation and the blocks × days matrix."""
+
+    def test_days_without_rain(self):
+        """Dry-day counter resets on rain and carries a prior count."""
+        assert days_without_rain([0, 0, 5, 0, 0.5, 0]).tolist() == [1, 2, 0, 1, 2, 3]
+        assert days_without_rain([[0, 2], [0, 0]], prior_dry_days=[10, 0]).tolist() == [[11, 0], [1, 2]]
+
+    def test_matrix_and_alerts(self):
+        """History feeds HTH; only forecast days are scored; alerts sorted by severity."""
+        history, horizon = 20, 7
+        n_days = history + horizon
+        precip = np.zeros((2, n_days))
+        precip[1, history + 2] = 10.0  # block 2 gets rain on forecast day 3
+        res = forecast_fire_danger(
+            np.full((2, n_days), 36.0), np.full((2, n_days), 30.0), np.full((2, n_days), 40.0), precip,
+            fuel_factors=[1.5, 1.0], forecast_start=history, block_names=["P1", "P2"], alert_level=3,
+        )
+        assert res["matrix"].shape == (2, horizon)
+        assert res["hth"][0, 0] == history + 1
+        assert res["hth"][1, 2] == 0
+        assert res["matrix"].loc["P1"].min() == pytest.approx(180.0)
+        assert res["alerts"]["index"].is_monotonic_decreasing
+        assert set(res["alerts"]["block"]) == {"P1", "P2"}
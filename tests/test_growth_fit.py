@@ -0,0 +1,105 @@
+"""
+Growth Fit Tests
+================
+Tests for the growth measurement store and cached logistic fits (Pantau Pertumbuhan).
+Run with: pytest tests/test_growth_fit.py -v
+"""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.growth_fit_service import GrowthStore, fit_logistic, logistic_model
+
+
+@pytest.fixture
+def store(tmp_path):
+    return GrowthStore(db_file=str(tmp_path / "growth.db"), legacy_csv=None)
+
+
+def add_curve(store, plot, kom, K=120, r=0.1, t0=40, days=range(5, 80, 10)):
+    for d in days:
+        store.add_measurement(plot, kom, "2025-01-01", d, float(logistic_model(d, K, r, t0)), refit=False)
+
+
+class TestFitLogistic:
+    """Tests for the single-curve fit."""
+
+    def test_recovers_parameters(self):
+        """Exact logistic data gives back K, r, t0."""
+        t = np.arange(5, 90, 5)
+        res = fit_logistic(t, logistic_model(t, 150, 0.08, 45), p0=[100, 0.05, 30])
+        assert res["status"] == "ok"
+        assert [res["K"], res["r"], res["t0"]] == pytest.approx([150, 0.08, 45], rel=1e-3)
+
+    def test_insufficient_and_failed_are_reported(self):
+        """Too few points or a broken fit returns a status instead of raising."""
+        assert fit_logistic([1, 2], [1, 2], p0=[10, 0.1, 5])["status"] == "insufficient"
+        bad = fit_logistic([1, 1, 1], [np.nan, 2, 3], p0=[10, 0.1, 5])
+        assert bad["status"] in ("failed", "not_converged")
+        assert bad["K"] is None
+
+
+class TestGrowthStore:
+    """Tests for per-plot storage and the fit cache."""
+
+    def test_plots_are_separate(self, store):
+        """Measurements are keyed by plot and commodity."""
+        add_curve(store, "A", "Tomat")
+        add_curve(store, "B", "Tomat", days=[5, 15])
+        assert len(store.get_measurements("A", "Tomat")) == 8
+        assert len(store.get_measurements("B", "Tomat")) == 2
+        assert store.list_plots() == ["A", "B"]
+
+    def test_fit_is_cached_until_new_measurement(self, store):
+        """get_fit reuses the stored fit; a new measurement refits warm-started."""
+        add_curve(store, "A", "Jagung Hibrida", K=200)
+        first = store.get_fit("A", "Jagung Hibrida")
+        assert first["K"] == pytest.approx(200, rel=1e-3)
+        assert store.get_fit("A", "Jagung Hibrida")["updated_at"] == first["updated_at"]
+
+        res = store.add_measurement("A", "Jagung Hibrida", "2025-03-01", 85, float(logistic_model(85, 200, 0.1, 40)))
+        assert res["status"] == "ok" and res["n_points"] == 9
+        assert store.stale_keys() == []
+
+    def test_batch_fit_records_every_plot(self, store):
+        """Batch fit covers stale plots (in a process pool), failures included."""
+        for i in range(20):
+            add_curve(store, f"P{i:02d}", "Tomat", K=100 + i)
+        store.add_measurement("X", "Tomat", "2025-01-01", 5, 3.0, refit=False)
+        assert len(store.stale_keys()) == 21
+
+        assert store.batch_fit(profiles_p0={"Tomat": [150, 0.08, 42]}, parallel_threshold=8) == 21
+        fits = store.all_fits().set_index("plot")
+        assert fits.loc["P05", "status"] == "ok"
+        assert fits.loc["P05", "K"] == pytest.approx(105, rel=1e-3)
+        assert fits.loc["X", "status"] == "insufficient"
+        assert store.stale_keys() == []
+        assert store.batch_fit() == 0
+
+    def test_connections_are_closed(self, tmp_path, monkeypatch):
+        """Every call closes its connection (the store is shared for the server lifetime)."""
+        opened = []
+        connect = sqlite3.connect
+        monkeypatch.setattr(sqlite3, "connect", lambda *a, **k: opened.append(connect(*a, **k)) or opened[-1])
+        store = GrowthStore(db_file=str(tmp_path / "growth.db"), legacy_csv=None)
+        add_curve(store, "A", "Tomat")
+        store.get_fit("A", "Tomat")
+        store.all_fits()
+        assert len(opened) > 3
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+
+    def test_legacy_csv_migration(self, tmp_path):
+        """The old journal CSV is imported once into the default plot."""
+        csv = tmp_path / "growth_journal.csv"
+        pd.DataFrame({"tanggal": ["2025-01-01"] * 3, "komoditas": ["Sawi"] * 3, "usia_hst": [5, 10, 15],
+                      "tinggi_cm": [2.0, 6.0, 14.0], "jumlah_daun": [2, 4, 6], "gdd_cumulative": [50, 100, 150]}).to_csv(csv, index=False)
+        db = str(tmp_path / "g.db")
+        GrowthStore(db_file=db, legacy_csv=str(csv))
+        store = GrowthStore(db_file=db, legacy_csv=str(csv))
+        assert len(store.get_measurements("Lahan Utama", "Sawi")) == 3
+        assert store.latest_gdd("Lahan Utama", "Sawi") == 150
@@ -0,0 +1,102 @@
+"""
+Irrigation Scheduler Tests
+==========================
+Tests for the FAO-56 water balance used by Irigasi & Drainase.
+Run with: pytest tests/test_irrigation.py -v
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.irrigation_service import (
+    KC_CURVES,
+    effective_rainfall,
+    initial_depletion_from_moisture,
+    kc_matrix,
+    schedule_blocks,
+    schedule_irrigation,
+    season_length,
+)
+
+
+class TestKcCurve:
+    """Tests for the stage-wise crop coefficient curve."""
+
+    def test_stage_values(self):
+        """Jagung: 0.30 initial, 1.20 mid-season, linear in development, 0 outside season."""
+        dap = np.array([[-1, 0, 19, 35, 50, 89, 110, 200]])
+        kc = kc_matrix(["Jagung"], dap)[0]
+        assert kc[0] == 0.0
+        assert kc[1] == kc[2] == pytest.approx(0.30)
+        assert kc[3] == pytest.approx(0.30 + (15 / 30) * 0.90)
+        assert kc[4] == kc[5] == pytest.approx(1.20)
+        assert kc[6] == kc[7] == 0.0
+
+    def test_unknown_crop(self):
+        """Crops without a Kc table are rejected."""
+        with pytest.raises(ValueError):
+            kc_matrix(["Kopi"], np.zeros((1, 3)))
+
+
+class TestWaterBalance:
+    """Tests for the daily depletion and irrigation triggers."""
+
+    def test_effective_rainfall(self):
+        """Same rule as the page 32 calculator."""
+        assert effective_rainfall([0, 2, 10]).tolist() == pytest.approx([0, 1.2, 7.2])
+
+    def test_no_irrigation_when_rain_covers_etc(self):
+        """Daily rain well above ETc keeps the root zone at field capacity."""
+        days = season_length("Jagung")
+        res = schedule_irrigation(np.full(days, 4.0), np.full(days, 20.0), ["Jagung"], [0], ["Lempung"])
+        assert res["summary"]["irrigations"].iloc[0] == 0
+        assert res["depletion"].max() == 0.0
+
+    def test_dry_season_refills_at_raw(self):
+        """Without rain, each event refills a depletion of at least RAW and no stress occurs."""
+        days = season_length("Cabai")
+        res = schedule_irrigation(np.full(days, 5.0), np.zeros(days), ["Cabai"], [0], ["Lempung"], area_ha=2.0)
+        ev = res["events"]
+        assert len(ev) > 3
+        assert (ev["net_mm"].to_numpy() >= res["raw"][0, ev["day"]] - 1e-9).all()
+        assert res["summary"]["stress_days"].iloc[0] == 0
+        # Season water need is met by irrigation (minus what is still depleted at harvest)
+        s = res["summary"].iloc[0]
+        assert s["net_irrigation_mm"] == pytest.approx(s["etc_mm"] - res["depletion"][0, -1])
+        assert s["volume_m3"] == pytest.approx(s["gross_irrigation_mm"] * 10 * 2.0)
+
+    def test_plots_are_independent(self):
+        """Batch run equals individual runs."""
+        rng = np.random.default_rng(3)
+        et0, rain = rng.uniform(3, 6, 150), rng.exponential(3, 150)
+        crops, soils, offs = ["Padi", "Tomat", "Kedelai"], ["Liat", "Pasir", "Lempung"], [0, 10, 20]
+        batch = schedule_irrigation(et0, rain, crops, offs, soils)
+        for i in range(3):
+            single = schedule_irrigation(et0, rain, [crops[i]], [offs[i]], [soils[i]])
+            assert np.allclose(batch["irrigation"][i], single["irrigation"][0])
+
+    def test_initial_depletion_from_moisture(self):
+        """Soil at wilting point is fully depleted; at field capacity not at all."""
+        dr = initial_depletion_from_moisture([0.14, 0.30], ["Lempung", "Lempung"], np.array([0.5, 0.5]))
+        assert dr.tolist() == pytest.approx([80.0, 0.0])
+
+
+class TestBlocks:
+    """Tests for the block-table wrapper."""
+
+    def test_many_blocks_one_call(self):
+        """Hundreds of staggered blocks schedule in one call with dated events."""
+        n = 300
+        rng = np.random.default_rng(0)
+        blocks = pd.DataFrame({
+            "block": [f"B{i}" for i in range(n)],
+            "crop": rng.choice(list(KC_CURVES), n),
+            "soil": rng.choice(["Liat", "Lempung"], n),
+            "plant_date": pd.Timestamp("2025-06-01") + pd.to_timedelta(rng.integers(0, 30, n), unit="D"),
+            "area_ha": np.ones(n),
+        })
+        res = schedule_blocks(blocks, np.full(160, 5.0), np.zeros(160), "2025-06-01")
+        assert len(res["summary"]) == n
+        assert res["events"]["date"].min() >= pd.Timestamp("2025-06-01")
+        assert set(res["events"]["block"]) <= set(blocks["block"])
@@ -0,0 +1,109 @@
+"""
+Label Renderer Tests
+====================
+Tests for cached label templates, A4 sheet tiling and the streaming PDF (Traceability Produk).
+Run with: pytest tests/test_label_render.py -v
+"""
+
+import datetime
+import io
+import re
+
+import numpy as np
+import pytest
+import qrcode
+
+from services.label_render_service import (
+    A4_PX,
+    LABEL_SIZES,
+    build_qr_url,
+    get_label_template,
+    labels_pdf_bytes,
+    labels_per_sheet,
+    linear_gradient,
+    make_qr,
+    render_label,
+    sheet_layout,
+    write_labels_pdf,
+)
+
+
+@pytest.fixture
+def record():
+    return {
+        "id": "AGRI-20250101-001", "produk": "Kopi Arabika", "varietas": "Gayo Grade A",
+        "tgl": datetime.date(2025, 1, 1), "petani": "Gapoktan Sejahtera", "lokasi": "Aceh Tengah",
+        "harga": 85000, "kontak": "0812-0000-0000", "klaim": ["Organik", "Premium"],
+    }
+
+
+class TestRendering:
+    """Tests for gradients, QR and cached templates."""
+
+    def test_gradient_matches_row_loop(self):
+        """NumPy gradient equals the per-row integer interpolation."""
+        img = np.asarray(linear_gradient(4, 50, (240, 253, 250), (255, 255, 255)))
+        for i in (0, 17, 49):
+            ratio = i / 50
+            expected = [int(240 + 15 * ratio), int(253 + 2 * ratio), int(250 + 5 * ratio)]
+            assert img[i, 0].tolist() == expected
+
+    def test_qr_matches_library_image(self, record):
+        """Matrix-built QR equals qrcode's own image for the same mask search."""
+        url = build_qr_url(record)
+        qr = qrcode.QRCode(version=1, box_size=10, border=4)
+        qr.add_data(url)
+        qr.make(fit=True)
+        ref = np.asarray(qr.make_image(fill_color="black", back_color="white").convert("L"))
+        assert np.array_equal(np.asarray(make_qr(url)), ref)
+
+    def test_template_cached_and_not_mutated(self, record):
+        """Labels are drawn on copies of one cached template."""
+        template = get_label_template("medium_landscape", True)
+        before = np.asarray(template).copy()
+        label = render_label(record, "medium_landscape", make_qr(build_qr_url(record), mask_pattern=0))
+        assert label.size == LABEL_SIZES["medium_landscape"]
+        assert get_label_template("medium_landscape", True) is template
+        assert np.array_equal(np.asarray(template), before)
+
+
+class TestSheetsAndPdf:
+    """Tests for multi-up tiling and the streamed PDF."""
+
+    @pytest.mark.parametrize("size", list(LABEL_SIZES))
+    def test_layout_fits_a4(self, size):
+        """Every slot lies on the page and slots do not overlap."""
+        w, h = LABEL_SIZES[size]
+        slots = sheet_layout((w, h))
+        assert slots
+        for x, y in slots:
+            assert x >= 0 and y >= 0 and x + w <= A4_PX[0] and y + h <= A4_PX[1]
+        xs = sorted({x for x, _ in slots})
+        ys = sorted({y for _, y in slots})
+        assert all(b - a >= w for a, b in zip(xs, xs[1:]))
+        assert all(b - a >= h for a, b in zip(ys, ys[1:]))
+
+    def test_streamed_pdf(self, record):
+        """PDF has one page per sheet and a consistent xref table."""
+        per_sheet = labels_per_sheet("label_lengkap", "small")
+        records = [dict(record, id=f"AGRI-{i:04d}") for i in range(per_sheet + 1)]
+        buf = io.BytesIO()
+        pages = write_labels_pdf(records, buf, kind="label_lengkap", size="small", max_workers=1)
+        pdf = buf.getvalue()
+
+        assert pages == 2
+        assert pdf.startswith(b"%PDF-1.4") and pdf.rstrip().endswith(b"%%EOF")
+        assert b"/Count 2" in pdf
+        xref_pos = int(re.search(rb"startxref\n(\d+)", pdf).group(1))
+        entries = pdf[xref_pos:].split(b"\n")[3:]
+        for obj_id, line in enumerate(entries, start=1):
+            if not line.endswith(b" n "):
+                break
+            offset = int(line[:10])
+            assert pdf[offset:].startswith(f"{obj_id} 0 obj".encode())
+
+    def test_pdf_bytes_match_stream(self, record):
+        """Deferred-download helper returns the same document as the streamed writer."""
+        buf = io.BytesIO()
+        write_labels_pdf([record], buf, kind="qr_only", size="small", max_workers=1)
+        assert labels_pdf_bytes([record], kind="qr_only", size="small", max_workers=1) == buf.getvalue()
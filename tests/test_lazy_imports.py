@@ -0,0 +1,162 @@
+"""
+Lazy Import Tests
+=================
+Tests for deferred heavy imports, the background warm-up and the cold-start profiler.
+Run with: pytest tests/test_lazy_imports.py -v
+"""
+
+import json
+import sys
+import textwrap
+
+import pytest
+
+from utils import lazy_imports, startup_profiler
+from utils.lazy_imports import LazyAttr, LazyModule, lazy_attr, lazy_import
+
+
+@pytest.fixture
+def fake_module(tmp_path, monkeypatch):
+    """Importable module that counts how often its body runs."""
+    counter = tmp_path / "count.txt"
+    counter.write_text("0")
+    (tmp_path / "heavy_fake_mod.py").write_text(textwrap.dedent(f"""
+        import pathlib
+        _p = pathlib.Path({str(counter)!r})
+        _p.write_text(str(int(_p.read_text()) + 1))
+
+        ANSWER = 42
+
+        class Model:
+            def __init__(self, k=1):
+                self.k = k
+
+            @classmethod
+            def default(cls):
+                return cls()
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "heavy_fake_mod", raising=False)
+    yield lambda: int(counter.read_text())
+    sys.modules.pop("heavy_fake_mod", None)
+    lazy_imports._load_times.pop("heavy_fake_mod", None)
+
+
+class TestLazyModule:
+    """Module proxies"""
+
+    def test_import_deferred_until_attribute_access(self, fake_module):
+        mod = lazy_import("heavy_fake_mod")
+        assert isinstance(mod, LazyModule)
+        assert fake_module() == 0
+        assert mod.ANSWER == 42
+        assert fake_module() == 1
+        assert mod.Model(k=3).k == 3
+        assert fake_module() == 1
+
+    def test_load_time_recorded(self, fake_module):
+        lazy_import("heavy_fake_mod").ANSWER
+        ms, source = lazy_imports.import_times()["heavy_fake_mod"]
+        assert ms >= 0 and source == "lazy"
+
+    def test_returns_real_module_when_loaded(self, fake_module):
+        import heavy_fake_mod
+        assert lazy_import("heavy_fake_mod") is heavy_fake_mod
+
+    def test_missing_module_fails_on_first_use(self):
+        mod = lazy_import("agrisensa_module_that_does_not_exist")
+        with pytest.raises(ModuleNotFoundError):
+            mod.anything
+
+
+class TestLazyAttr:
+    """`from module import name` proxies"""
+
+    def test_call_constructs_real_object(self, fake_module):
+        Model = lazy_attr("heavy_fake_mod", "Model")
+        assert isinstance(Model, LazyAttr)
+        assert fake_module() == 0
+        obj = Model(k=5)
+        assert obj.k == 5
+        assert type(obj).__name__ == "Model"
+        assert Model.resolve() is type(obj)
+
+    def test_attribute_forwarding(self, fake_module):
+        Model = lazy_attr("heavy_fake_mod", "Model")
+        assert Model.default().k == 1
+        assert fake_module() == 1
+
+    def test_returns_real_object_when_loaded(self, fake_module):
+        import heavy_fake_mod
+        assert lazy_attr("heavy_fake_mod", "Model") is heavy_fake_mod.Model
+
+
+class TestWarmUp:
+    """Background warm-up thread"""
+
+    def test_imports_in_background_once(self, fake_module, monkeypatch):
+        monkeypatch.setattr(lazy_imports, "_warmup_thread", None)
+        thread = lazy_imports.warm_up(["heavy_fake_mod", "agrisensa_module_that_does_not_exist"], delay=0)
+        thread.join(timeout=10)
+        assert "heavy_fake_mod" in sys.modules
+        assert lazy_imports.import_times()["heavy_fake_mod"][1] == "warmup"
+        assert lazy_imports.warm_up(["heavy_fake_mod"], delay=0) is thread
+        assert fake_module() == 1
+
+
+class TestStartupProfiler:
+    """Cold-start measurement and budget"""
+
+    def test_budget_check(self):
+        ok = {"page": "x.py", "import_ms": 10.0, "first_render_ms": 20.0}
+        slow = {"page": "x.py", "import_ms": 10_000.0, "first_render_ms": None}
+        assert startup_profiler.check_budget(ok) == []
+        assert startup_profiler.check_budget(slow)[0].startswith("import")
+        assert any(v.startswith("first_render") for v in startup_profiler.check_budget(slow))
+
+    def test_errors_are_violations(self):
+        crashed = {"page": "x.py", "import_ms": 5.0, "first_render_ms": 3.0, "errors": ["render: boom"]}
+        assert startup_profiler.check_budget(crashed) == ["error render: boom"]
+        timed_out = {"page": "x.py", "errors": ["timeout"], "import_ms": None, "first_render_ms": None}
+        assert len(startup_profiler.check_budget(timed_out)) == 3
+
+    def test_page_override(self, monkeypatch):
+        monkeypatch.setitem(startup_profiler.PAGE_BUDGET_OVERRIDES_MS, "slow.py", {"first_render": 99_999})
+        assert startup_profiler.check_budget({"page": "slow.py", "import_ms": 1.0, "first_render_ms": 50_000.0}) == []
+
+    def test_page_selection_by_prefix(self):
+        pages = startup_profiler.page_files(["2_"])
+        assert pages and all(p.split("/")[-1].startswith("2_") for p in pages)
+
+    def test_profile_page(self, tmp_path, fake_module):
+        page = tmp_path / "demo_page.py"
+        page.write_text(textwrap.dedent("""
+            import streamlit as st
+            from utils.lazy_imports import lazy_attr
+            Model = lazy_attr("heavy_fake_mod", "Model")
+
+            if st.checkbox("Latih model"):
+                Model()
+            st.write("ok")
+        """))
+        result = startup_profiler.profile_page(str(page), timeout=30)
+        assert result["errors"] == []
+        assert result["import_ms"] >= 0 and result["first_render_ms"] > 0
+        assert "heavy_fake_mod" not in result["lazy_imports"]      # code path not taken
+        assert result["slowest_imports"][0]["statement"].startswith(("import", "from"))
+
+    def test_page_reading_secrets_renders(self, tmp_path):
+        """Pages that look up st.secrets are profiled, not reported as broken."""
+        page = tmp_path / "secrets_page.py"
+        page.write_text("import streamlit as st\nst.write('GOOGLE_API_KEY' in st.secrets)\n")
+        assert startup_profiler.profile_page(str(page), timeout=30)["errors"] == []
+
+    def test_check_fails_on_broken_page(self, tmp_path, monkeypatch):
+        page = tmp_path / "broken_page.py"
+        page.write_text("import streamlit as st\nst.write('start')\nraise RuntimeError('render gagal')\n")
+        monkeypatch.setattr(startup_profiler, "page_files", lambda selectors=None: [str(page)])
+        out = tmp_path / "cold_start.json"
+        assert startup_profiler.main(["--check", "--out", str(out), "--timeout", "30"]) == 1
+        (result,) = json.loads(out.read_text())["pages"]
+        assert any("render gagal" in e for e in result["errors"])
+        assert result["over_budget"]
@@ -0,0 +1,122 @@
+"""
+Supply Chain Ledger Tests
+=========================
+Tests for the persistent hash chain, Merkle checkpoints and paginated timeline (Rantai Pasok).
+Run with: pytest tests/test_ledger.py -v
+"""
+
+import sqlite3
+
+import pytest
+
+from services.ledger_service import GENESIS_HASH, SupplyLedger, entry_hash, merkle_root
+
+
+def make_entries(n, start=0):
+    return [{"actor": f"Aktor {i}", "timestamp": "2025-12-18 06:00", "action": f"Serah Terima #{i}"}
+            for i in range(start, start + n)]
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return SupplyLedger(str(tmp_path / "ledger.db"), checkpoint_interval=10)
+
+
+def tamper(ledger, sql, *args):
+    conn = sqlite3.connect(ledger.db_file)
+    conn.execute(sql, args)
+    conn.commit()
+    conn.close()
+
+
+class TestChain:
+    """Tests for appends and stored hashes."""
+
+    def test_hashes_match_page_scheme(self, ledger):
+        """Stored hashes follow the timeline's original chaining from genesis."""
+        first = ledger.append("🚜 Petani", "Validasi Panen", timestamp="2025-12-18 06:00")
+        second = ledger.append("🚛 Pengepul", "Quality Control", timestamp="2025-12-18 10:00")
+        assert first["prev_hash"] == GENESIS_HASH
+        assert first["hash"] == entry_hash("🚜 Petani", "2025-12-18 06:00", "Validasi Panen", GENESIS_HASH)
+        assert second["prev_hash"] == first["hash"]
+        assert ledger.head()["seq"] == 2
+
+    def test_persistent_and_shared(self, ledger):
+        """A second instance on the same file continues the same chain."""
+        ledger.append_many(make_entries(5))
+        other = SupplyLedger(ledger.db_file, checkpoint_interval=10)
+        entry = other.append("Aktor X", "Lanjutan")
+        assert entry["seq"] == 6
+        assert ledger.verify()["ok"]
+
+    def test_connections_are_closed(self, tmp_path, monkeypatch):
+        """Every call closes its connection (the ledger is shared for the server lifetime)."""
+        opened = []
+        connect = sqlite3.connect
+        monkeypatch.setattr(sqlite3, "connect", lambda *a, **k: opened.append(connect(*a, **k)) or opened[-1])
+        ledger = SupplyLedger(str(tmp_path / "ledger.db"), checkpoint_interval=10)
+        ledger.append_many(make_entries(12))
+        ledger.timeline()
+        ledger.verify(full=True)
+        assert len(opened) > 3
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+
+    def test_pagination(self, ledger):
+        """Timeline pages are newest-first and cover every entry once."""
+        ledger.append_many(make_entries(45))
+        first = ledger.timeline(page=1, page_size=20)
+        assert [e["seq"] for e in first] == list(range(45, 25, -1))
+        seqs = [e["seq"] for p in (1, 2, 3) for e in ledger.timeline(page=p, page_size=20)]
+        assert sorted(seqs) == list(range(1, 46))
+        assert ledger.timeline(page=1, page_size=5, newest_first=False)[0]["seq"] == 1
+
+
+class TestVerification:
+    """Tests for checkpoints and incremental / full verification."""
+
+    def test_checkpoints_sealed(self, ledger):
+        """A Merkle checkpoint is sealed every interval entries."""
+        ledger.append_many(make_entries(25))
+        cps = ledger.checkpoints()
+        assert [c["upto_seq"] for c in cps] == [10, 20]
+        hashes = [e["hash"] for e in ledger.timeline(page=1, page_size=10, newest_first=False)]
+        assert cps[0]["merkle_root"] == merkle_root(hashes)
+        assert cps[0]["last_hash"] == hashes[-1]
+
+    def test_incremental_only_replays_tail(self, ledger):
+        """Routine check recomputes only entries after the last checkpoint."""
+        ledger.append_many(make_entries(25))
+        res = ledger.verify()
+        assert res == {"ok": True, "first_bad_seq": None, "checked": 5, "checkpoints": 2}
+        assert ledger.verify(full=True)["checked"] == 25
+
+    def test_tail_tamper_detected(self, ledger):
+        """Editing an open-tail entry is caught by the quick check."""
+        ledger.append_many(make_entries(25))
+        tamper(ledger, "UPDATE ledger SET action = 'Palsu' WHERE seq = 23")
+        assert ledger.verify()["first_bad_seq"] == 23
+
+    def test_sealed_tamper_needs_audit(self, ledger):
+        """Editing inside a sealed segment is found by the segment audit."""
+        ledger.append_many(make_entries(25))
+        tamper(ledger, "UPDATE ledger SET action = 'Palsu' WHERE seq = 7")
+        assert ledger.verify()["ok"]
+        assert ledger.verify(full=True)["first_bad_seq"] == 7
+        assert not ledger.verify_segment(10)["ok"]
+        assert ledger.verify_segment(20)["ok"]
+
+    def test_rewritten_anchor_detected(self, ledger):
+        """Rewriting a checkpoint entry's hash breaks its anchor."""
+        ledger.append_many(make_entries(25))
+        tamper(ledger, "UPDATE ledger SET hash = ? WHERE seq = 20", "f" * 64)
+        assert ledger.verify()["first_bad_seq"] == 20
+
+    def test_large_ledger_quick_check(self, tmp_path):
+        """Quick check cost is bounded by the checkpoint interval, not ledger size."""
+        big = SupplyLedger(str(tmp_path / "big.db"), checkpoint_interval=1000)
+        big.append_many(make_entries(20500))
+        res = big.verify()
+        assert res["ok"] and res["checked"] == 500 and res["checkpoints"] == 20
+        assert len(big.timeline(page=1000, page_size=20)) == 20
@@ -0,0 +1,137 @@
+"""
+Page Benchmark Tests
+====================
+Tests for the headless page benchmark: stub services, request routing and baseline comparison.
+Run with: pytest tests/test_page_benchmark.py -v
+"""
+
+import textwrap
+
+import pytest
+import requests
+
+from services.bapanas_service import BapanasService
+from services.weather_service import WeatherService
+from tests.benchmarks import page_benchmark
+from tests.benchmarks.stub_services import StubServer, route_requests_to, stub_url
+
+
+@pytest.fixture
+def stub():
+    with StubServer() as server, route_requests_to(server.url):
+        yield server
+
+
+class TestRouting:
+    """Outgoing requests go to the local stub"""
+
+    def test_stub_url_rewrites_external_hosts(self):
+        assert stub_url("https://api.open-meteo.com/v1/forecast?latitude=1", "http://127.0.0.1:9") == \
+            "http://127.0.0.1:9/api.open-meteo.com/v1/forecast?latitude=1"
+        assert stub_url("http://127.0.0.1:9/x", "http://127.0.0.1:9") == "http://127.0.0.1:9/x"
+
+    def test_unknown_host_gets_404_not_network(self, stub):
+        response = requests.get("https://example.invalid/anything", timeout=5)
+        assert response.status_code == 404
+        assert stub.calls == [("GET", "example.invalid", "/anything")]
+
+    def test_patch_removed_after_context(self):
+        original = requests.sessions.Session.request
+        with StubServer() as server, route_requests_to(server.url):
+            assert requests.sessions.Session.request is not original
+        assert requests.sessions.Session.request is original
+
+
+class TestStubPayloads:
+    """Synthetic payloads satisfy the app's API clients"""
+
+    def test_weather_forecast(self, stub):
+        data = WeatherService().get_weather_forecast(-6.2, 106.8)
+        assert data is not None
+        assert 20 < data["current_temp"] < 35
+        assert len(data["raw_daily"]["time"]) == 7
+
+    def test_water_balance_lengths(self, stub):
+        data = WeatherService().get_water_balance_inputs(-6.2, 106.8, past_days=3, forecast_days=5)
+        assert len(data["dates"]) == len(data["et0"]) == len(data["rain"]) == 8
+        assert data["soil_moisture"] == pytest.approx(0.32)
+
+    def test_multi_site_fire_weather(self, stub):
+        data = WeatherService().get_daily_fire_weather([-6.0, -6.5, -7.0], [106.0, 107.0, 108.0],
+                                                       past_days=2, forecast_days=2)
+        assert len(data["temperature_2m_max"]) == 3
+        assert all(len(row) == 4 for row in data["precipitation_sum"])
+
+    def test_bapanas_prices_and_map(self, stub):
+        service = BapanasService()
+        prices = service.get_latest_prices()
+        assert {"commodity", "price", "date"} <= set(prices.columns)
+        assert "Beras Medium" in set(prices["commodity"])
+        assert len(service.get_price_map_data()) > 30
+
+    def test_auth_login(self, stub):
+        from utils.auth import api_request
+        result = api_request("simple-login", "POST", {"username": "petani", "password": "x"})
+        assert result["success"] and result["user"]["username"] == "petani"
+
+
+class TestBaselineComparison:
+    """Regression detection against the stored baseline"""
+
+    BASE = {"pages": [{"page": "a.py", "first_run_ms": 1000.0, "rerun_ms": 100.0, "page_rss_mb": 90.0,
+                       "exceptions": []}]}
+
+    def test_within_tolerance(self):
+        current = [{"page": "a.py", "first_run_ms": 1100.0, "rerun_ms": 180.0, "page_rss_mb": 100.0, "exceptions": []}]
+        assert page_benchmark.compare_to_baseline(current, self.BASE) == []
+
+    def test_slowdown_flagged(self):
+        current = [{"page": "a.py", "first_run_ms": 1600.0, "rerun_ms": 100.0, "page_rss_mb": 90.0, "exceptions": []}]
+        regs = page_benchmark.compare_to_baseline(current, self.BASE)
+        assert [(r["metric"], r["current"]) for r in regs] == [("first_run_ms", 1600.0)]
+
+    def test_new_exception_flagged(self):
+        current = [{"page": "a.py", "first_run_ms": 1000.0, "rerun_ms": 100.0, "page_rss_mb": 90.0,
+                    "exceptions": ["KeyError: 'x'"]}]
+        regs = page_benchmark.compare_to_baseline(current, self.BASE)
+        assert regs[0]["metric"] == "exceptions"
+
+    def test_workdir_in_message_ignored(self):
+        msg = "No secrets found. Valid paths: /root/.streamlit/secrets.toml, /tmp/{}/.streamlit/secrets.toml"
+        base = {"pages": [dict(self.BASE["pages"][0], exceptions=[msg.format("agrisensa-bench-ezpc05o7")])]}
+        current = [dict(base["pages"][0], exceptions=[msg.format("agrisensa-bench-a1b2c3d4")])]
+        assert page_benchmark.compare_to_baseline(current, base) == []
+
+    def test_median_of_repeated_runs(self):
+        runs = [{"page": "a.py", "first_run_ms": ms, "rerun_ms": 100.0, "page_rss_mb": 90.0, "exceptions": exc}
+                for ms, exc in ((900.0, []), (2500.0, ["timeout"]), (1000.0, []))]
+        merged = page_benchmark.median_result(runs)
+        assert merged["first_run_ms"] == 1000.0 and merged["runs"] == 3
+        assert merged["exceptions"] == ["timeout"]
+
+    def test_new_page_not_compared(self):
+        assert page_benchmark.compare_to_baseline([{"page": "new.py", "first_run_ms": 9e9}], self.BASE) == []
+
+    def test_stored_baseline_covers_all_pages(self):
+        stored = {p["page"] for p in page_benchmark.load_baseline()["pages"]}
+        pages = {p.split("/")[-1] for p in page_benchmark.page_files()}
+        assert pages <= stored
+
+
+class TestBenchmarkPage:
+    """One page run in-process"""
+
+    def test_first_run_and_rerun(self, tmp_path, monkeypatch):
+        page = tmp_path / "weather_page.py"
+        page.write_text(textwrap.dedent("""
+            import requests
+            import streamlit as st
+            r = requests.get("https://api.open-meteo.com/v1/elevation", params={"latitude": -6.2, "longitude": 106.8})
+            st.metric("Elevasi", r.json()["elevation"][0])
+        """))
+        monkeypatch.setattr(page_benchmark, "ROOT", str(tmp_path))
+        result = page_benchmark.benchmark_page("weather_page.py", timeout=30)
+        assert result["exceptions"] == []
+        assert result["first_run_ms"] > 0 and result["rerun_ms"] > 0
+        assert result["http_calls"] == 2
+        assert result["peak_rss_mb"] > 0
@@ -0,0 +1,199 @@
+"""
+Plant Diagnosis Tests
+=====================
+Tests for the cached, rate-limited Gemini diagnosis client (Dokter Tanaman AI, Diagnostik Gejala).
+Run with: pytest tests/test_plant_diagnosis.py -v
+"""
+
+import io
+
+import pytest
+from PIL import Image
+
+from services.plant_diagnosis_service import (
+    MAX_PAYLOAD_BYTES,
+    DiagnosisClient,
+    GeminiBackend,
+    OfflineDiagnosisBackend,
+    RateLimiter,
+    ResponseCache,
+    image_content_hash,
+    parse_diagnosis,
+    prepare_image,
+)
+
+
+def make_photo(width=3000, height=2000, seed=0, fmt="BMP", mode="RGB"):
+    """Noisy photo-sized image as upload bytes (noise keeps JPEG output large)."""
+    img = Image.effect_noise((width, height), 60 + seed).convert(mode)
+    buf = io.BytesIO()
+    img.save(buf, format=fmt)
+    return buf.getvalue()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture(scope="module")
+def large_photo():
+    return make_photo()
+
+
+@pytest.fixture
+def backend():
+    return OfflineDiagnosisBackend()
+
+
+@pytest.fixture
+def client(backend):
+    return DiagnosisClient(backend, cache=ResponseCache(path=None), limiter=RateLimiter(max_calls=1000))
+
+
+class TestImagePayload:
+    """Downscaling and re-encoding"""
+
+    def test_large_upload_bounded(self, large_photo):
+        payload, size = prepare_image(large_photo)
+        assert len(payload) <= MAX_PAYLOAD_BYTES
+        assert max(size) <= 1024
+        assert Image.open(io.BytesIO(payload)).format == "JPEG"
+
+    def test_aspect_ratio_kept(self):
+        _, (w, h) = prepare_image(make_photo(2000, 1000), max_bytes=10_000_000)
+        assert (w, h) == (1024, 512)
+
+    def test_tight_limit_shrinks_further(self, large_photo):
+        payload, size = prepare_image(large_photo, max_bytes=30_000)
+        assert len(payload) <= 30_000 or max(size) <= 256
+        assert max(size) < 1024
+
+    def test_transparent_png_converted(self):
+        payload, _ = prepare_image(make_photo(400, 300, fmt="PNG", mode="RGBA"))
+        assert Image.open(io.BytesIO(payload)).mode == "RGB"
+
+    def test_content_hash(self):
+        a, b = make_photo(64, 64, seed=1), make_photo(64, 64, seed=2)
+        assert image_content_hash(a) == image_content_hash(bytes(a))
+        assert image_content_hash(a) != image_content_hash(b)
+        pil = Image.open(io.BytesIO(a))
+        assert image_content_hash(pil) == image_content_hash(pil.copy())
+
+
+class TestDiagnosisClient:
+    """Caching, batching and error handling against the offline backend"""
+
+    def test_diagnose_and_cache_hit(self, client, backend):
+        photo = make_photo(800, 600)
+        data, error = client.diagnose(photo)
+        assert error is None and data["diagnosis"].startswith("Bercak")
+        assert client.diagnose(photo) == (data, None)
+        assert len(backend.calls) == 1
+        assert 0 < backend.calls[0]["image_bytes"] <= MAX_PAYLOAD_BYTES
+
+    def test_cache_key_includes_model(self, client, backend):
+        photo = make_photo(200, 200)
+        client.diagnose(photo, model_name="models/a")
+        client.diagnose(photo, model_name="models/b")
+        assert [c["model"] for c in backend.calls] == ["models/a", "models/b"]
+
+    def test_cache_persisted(self, tmp_path, backend):
+        path = str(tmp_path / "diag.json")
+        photo = make_photo(200, 200)
+        DiagnosisClient(backend, cache=ResponseCache(path=path)).diagnose(photo)
+        data, _ = DiagnosisClient(backend, cache=ResponseCache(path=path)).diagnose(photo)
+        assert data["severity"] == "Medium"
+        assert len(backend.calls) == 1
+
+    def test_unparseable_response_not_cached(self):
+        backend = OfflineDiagnosisBackend(response_text="maaf, tidak bisa")
+        client = DiagnosisClient(backend, cache=ResponseCache(path=None))
+        photo = make_photo(100, 100)
+        for _ in range(2):
+            data, error = client.diagnose(photo)
+            assert data is None and "Gagal memproses" in error
+        assert len(backend.calls) == 2
+
+    def test_fenced_json_parsed(self):
+        assert parse_diagnosis('```json\n{"diagnosis": "Sehat"}\n```') == {"diagnosis": "Sehat"}
+
+    def test_batch_concurrent_and_ordered(self):
+        backend = OfflineDiagnosisBackend(delay=0.05)
+        client = DiagnosisClient(backend, cache=ResponseCache(path=None), max_workers=4)
+        photos = [make_photo(300, 300, seed=i) for i in range(6)]
+        results = client.diagnose_batch(photos + [photos[0]])
+        assert len(results) == 7 and all(err is None for _, err in results)
+        assert results[0] == results[-1]
+        assert len(backend.calls) == 6                    # duplicate sent once
+        assert 1 < backend.peak_concurrency <= 4
+
+    def test_explain_cached_by_prompt(self, client, backend):
+        first = client.explain("Jelaskan gejala busuk batang")
+        assert client.explain("Jelaskan gejala busuk batang") == first
+        client.explain("Jelaskan gejala lain")
+        assert len(backend.calls) == 2 and backend.calls[0]["image_bytes"] == 0
+
+
+class TestModelList:
+    """Model list TTL cache"""
+
+    def test_cached_until_ttl(self, backend):
+        clock = FakeClock()
+        client = DiagnosisClient(backend, model_list_ttl=100, clock=clock)
+        assert client.list_models()[0].startswith("models/")
+        clock.now = 99
+        client.list_models()
+        assert backend.list_calls == 1
+        clock.now = 101
+        client.list_models()
+        assert backend.list_calls == 2
+
+    def test_error_returns_empty(self):
+        class Broken(OfflineDiagnosisBackend):
+            def list_models(self):
+                raise RuntimeError("invalid key")
+
+        assert DiagnosisClient(Broken()).list_models() == []
+
+
+class TestGeminiBackend:
+    """Per-key clients instead of the process-global genai.configure()"""
+
+    def test_keys_not_shared_between_backends(self, monkeypatch):
+        pytest.importorskip("google.generativeai")
+        from services.plant_diagnosis_service import genai
+
+        monkeypatch.setattr(genai, "configure", lambda **kw: pytest.fail("global configure used"))
+        model_a = GeminiBackend("key-a")._model("models/gemini-1.5-flash")
+        model_b = GeminiBackend("key-b")._model("models/gemini-1.5-flash")
+        assert model_a._client._transport._credentials.token == "key-a"
+        assert model_b._client._transport._credentials.token == "key-b"
+
+
+class TestRateLimiter:
+    """Sliding-window limiter"""
+
+    def test_waits_when_window_full(self):
+        clock = FakeClock()
+        limiter = RateLimiter(max_calls=3, period=60, clock=clock, sleep=clock.sleep)
+        waits = [limiter.acquire() for _ in range(5)]
+        assert waits[:3] == [0, 0, 0]
+        assert waits[3] == pytest.approx(60) and waits[4] == 0
+        assert clock.now == pytest.approx(60)
+
+    def test_client_calls_go_through_limiter(self, backend):
+        clock = FakeClock()
+        limiter = RateLimiter(max_calls=2, period=60, clock=clock, sleep=clock.sleep)
+        client = DiagnosisClient(backend, cache=ResponseCache(path=None), limiter=limiter)
+        for i in range(3):
+            client.explain(f"prompt {i}")
+        assert clock.sleeps == [pytest.approx(60)]
@@ -0,0 +1,112 @@
+"""
+Planting Sweep Tests
+====================
+Tests for the vectorized planting-pattern sweep (Kalkulator Potensi Panen Padi).
+Run with: pytest tests/test_planting_sweep.py -v
+"""
+
+import numpy as np
+import pytest
+
+from services.planting_sweep_service import (
+    build_layouts,
+    pareto_frontier,
+    pareto_mask,
+    sweep_planting,
+)
+
+PATTERNS = {
+    "Jajar Legowo 2:1": {"spacing_row": 25, "spacing_plant": 12.5, "population_factor": 1.33},
+    "Tegel 25×25": {"spacing_row": 25, "spacing_plant": 25, "population_factor": 1.0},
+    "Custom": {"spacing_row": 25, "spacing_plant": 25, "population_factor": 1.0},
+}
+
+VARIETIES = {
+    "IR64": {"tillers": 18, "grains": 130, "weight": 26},
+    "Inpari 32": {"tillers": 22, "grains": 160, "weight": 28},
+}
+
+
+def calculator_gkp_net_ton(spacing_row, spacing_plant, factor, tillers, grains, weight, loss):
+    """Single-scenario chain of the page's calculate_population / calculate_yield."""
+    population = int((10000 / ((spacing_row / 100) * (spacing_plant / 100))) * factor)
+    gross_kg = population * tillers * grains * weight / 1_000_000
+    return gross_kg * (1 - loss / 100) / 1000
+
+
+class TestLayouts:
+    """Pattern × spacing grid"""
+
+    def test_custom_expanded_named_fixed(self):
+        layouts = build_layouts(PATTERNS, row_spacings=[20, 25, 30], plant_spacings=[15, 20])
+        assert (layouts["pattern"] == "Custom").sum() == 6
+        legowo = layouts[layouts["pattern"] == "Jajar Legowo 2:1"].iloc[0]
+        assert (legowo["spacing_row"], legowo["spacing_plant"]) == (25, 12.5)
+
+
+class TestSweep:
+    """Broadcast evaluation"""
+
+    def test_size_is_full_product(self):
+        df = sweep_planting(PATTERNS, VARIETIES, loss_scenarios=(10, 20),
+                            row_spacings=[20, 25, 30], plant_spacings=[15, 20])
+        assert len(df) == (2 + 6) * 2 * 2
+        assert list(df["rank"]) == list(range(1, len(df) + 1))
+
+    def test_matches_calculator(self):
+        df = sweep_planting(PATTERNS, VARIETIES, loss_scenarios=(15,), row_spacings=[22.5], plant_spacings=[17.5])
+        for _, row in df.iterrows():
+            info = PATTERNS[row["pattern"]]
+            v = VARIETIES[row["variety"]]
+            expected = calculator_gkp_net_ton(row["spacing_row"], row["spacing_plant"], info["population_factor"],
+                                              v["tillers"], v["grains"], v["weight"], 15)
+            assert row["gkp_net_ton"] == pytest.approx(expected)
+        tegel = df[(df["pattern"] == "Tegel 25×25") & (df["variety"] == "IR64")].iloc[0]
+        assert tegel["population"] == 160000
+        assert tegel["gkg_ton"] == pytest.approx(tegel["gkp_net_ton"] * 0.8602)
+
+    def test_ranked_by_margin(self):
+        df = sweep_planting(PATTERNS, VARIETIES, rank_by="margin")
+        assert df["margin"].is_monotonic_decreasing
+        df = sweep_planting(PATTERNS, VARIETIES, rank_by="total_cost")
+        assert df["total_cost"].is_monotonic_increasing
+
+    def test_costs_scale_with_population(self):
+        df = sweep_planting(PATTERNS, VARIETIES, loss_scenarios=(10,), row_spacings=[20, 40], plant_spacings=[20])
+        custom = df[(df["pattern"] == "Custom") & (df["variety"] == "IR64")].set_index("spacing_row")
+        assert custom.loc[20.0, "seed_cost"] == pytest.approx(2 * custom.loc[40.0, "seed_cost"], rel=1e-4)
+        assert custom.loc[20.0, "labor_cost"] == pytest.approx(2 * custom.loc[40.0, "labor_cost"], rel=1e-4)
+
+    def test_panicle_cap(self):
+        capped = sweep_planting(PATTERNS, VARIETIES, max_panicles_per_m2=400)
+        assert capped["panicles_m2"].max() == pytest.approx(400)
+        free = sweep_planting(PATTERNS, VARIETIES)
+        assert free["gkp_net_ton"].max() > capped["gkp_net_ton"].max()
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            sweep_planting(PATTERNS, VARIETIES, rank_by="unknown")
+        with pytest.raises(ValueError):
+            sweep_planting(PATTERNS, {})
+
+
+class TestPareto:
+    """Non-dominated decisions"""
+
+    def test_mask(self):
+        benefit = np.array([10, 8, 8, 12, 5])
+        cost = np.array([5, 5, 3, 9, 6])
+        assert list(pareto_mask(benefit, cost)) == [True, False, True, True, False]
+
+    def test_frontier_not_dominated(self):
+        df = sweep_planting(PATTERNS, VARIETIES, max_panicles_per_m2=500)
+        front = pareto_frontier(df)
+        assert front["loss_pct"].nunique() == 1
+        rest = df[~df["pareto"] & (df["loss_pct"] == front["loss_pct"].iloc[0])]
+        for _, p in front.iterrows():
+            dominates = ((rest["gkp_net_ton"] >= p["gkp_net_ton"]) & (rest["seed_cost"] <= p["seed_cost"])
+                         & (rest["labor_cost"] <= p["labor_cost"]))
+            strictly = ((rest["gkp_net_ton"] > p["gkp_net_ton"]) | (rest["seed_cost"] < p["seed_cost"])
+                        | (rest["labor_cost"] < p["labor_cost"]))
+            assert not (dominates & strictly).any()
+        assert front["total_cost"].is_monotonic_increasing
@@ -0,0 +1,222 @@
+"""
+PPL Store Tests
+===============
+Tests for the indexed task/visit store and its rollups (Ruang Kerja PPL).
+Run with: pytest tests/test_ppl_store.py -v
+"""
+
+import json
+import random
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from services.ppl_store_service import PPLStore, period_key, week_start
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PPLStore(str(tmp_path / "ppl.db"))
+
+
+def visit(day, poktan="Sukamaju I", officer="ppl1", kegiatan="Penyuluhan Kelompok", hadir=15, laki=10, perempuan=5,
+          **extra):
+    return {"date": str(day), "poktan": poktan, "officer": officer, "kegiatan": kegiatan,
+            "jumlah_hadir": hadir, "laki_laki": laki, "perempuan": perempuan, "desa": "Sukamakmur", **extra}
+
+
+def brute_summary(visits, start, end):
+    rows = [v for v in visits if str(start) <= v["date"] <= str(end)]
+    kegiatan = {}
+    for v in rows:
+        kegiatan[v["kegiatan"]] = kegiatan.get(v["kegiatan"], 0) + 1
+    return {"visits": len(rows), "jumlah_hadir": sum(v["jumlah_hadir"] for v in rows),
+            "laki_laki": sum(v["laki_laki"] for v in rows), "perempuan": sum(v["perempuan"] for v in rows),
+            "poktan": len({v["poktan"] for v in rows}), "kegiatan": kegiatan}
+
+
+class TestPeriods:
+    """Week / month keys"""
+
+    def test_keys(self):
+        assert week_start(date(2025, 3, 16)) == date(2025, 3, 10)      # Sunday → Monday
+        assert period_key("week", "2025-03-10") == "2025-03-10"
+        assert period_key("month", "2025-03-31") == "2025-03"
+        with pytest.raises(ValueError):
+            period_key("year", "2025-03-31")
+
+
+class TestRollups:
+    """Trigger-maintained weekly and monthly rollups"""
+
+    def test_match_brute_force(self, store):
+        rng = random.Random(7)
+        visits = []
+        for i in range(300):
+            day = date(2024, 11, 1) + timedelta(days=rng.randrange(120))
+            hadir = rng.randrange(5, 40)
+            laki = rng.randrange(hadir + 1)
+            visits.append(visit(day, poktan=f"Poktan {rng.randrange(12)}", kegiatan=rng.choice("ABC"),
+                                hadir=hadir, laki=laki, perempuan=hadir - laki, id=str(i)))
+        store.add_visits(visits)
+        for day in (date(2024, 11, 4), date(2024, 12, 30), date(2025, 2, 17)):
+            got = store.rollup("week", day)
+            assert {k: got[k] for k in got if k != "period"} == brute_summary(visits, day, day + timedelta(days=6))
+        got = store.rollup("month", date(2025, 1, 15))
+        assert {k: got[k] for k in got if k != "period"} == brute_summary(visits, "2025-01-01", "2025-01-31")
+
+    def test_update_moves_between_periods(self, store):
+        store.add_visit(visit("2025-03-12", id="v1", hadir=20))
+        store.update_visit("v1", {"date": "2025-04-02", "kegiatan": "Rapat Koordinasi"})
+        assert store.rollup("month", "2025-03-01")["visits"] == 0
+        april = store.rollup("month", "2025-04-01")
+        assert april["visits"] == 1 and april["jumlah_hadir"] == 20
+        assert april["kegiatan"] == {"Rapat Koordinasi": 1}
+
+    def test_delete_removes_empty_rows(self, store):
+        store.add_visit(visit("2025-03-12", id="v1"))
+        store.add_visit(visit("2025-03-13", id="v2", poktan="Makmur"))
+        store.delete_visit("v1")
+        week = store.rollup("week", "2025-03-12")
+        assert week["visits"] == 1 and week["poktan"] == 1
+        store.delete_visit("v2")
+        with store._connect() as conn:
+            for table in ("visit_rollup", "visit_rollup_kegiatan", "visit_rollup_poktan"):
+                assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0
+
+    def test_resent_visit_not_double_counted(self, store):
+        store.add_visit(visit("2025-03-12", id="v1", hadir=20))
+        store.add_visit(visit("2025-03-12", id="v1", hadir=25))
+        week = store.rollup("week", "2025-03-12")
+        assert week["visits"] == 1 and week["jumlah_hadir"] == 25
+
+    def test_officer_filter_and_series(self, store):
+        store.add_visits([visit("2025-03-12", id="a", officer="ppl1"), visit("2025-03-12", id="b", officer="ppl2"),
+                          visit("2025-04-01", id="c", officer="ppl1")])
+        assert store.rollup("month", "2025-03-01", officer="ppl2")["visits"] == 1
+        series = store.rollup_series("month", officer="ppl1")
+        assert list(series["period"]) == ["2025-03", "2025-04"]
+
+    def test_range_summary(self, store):
+        visits = [visit(date(2025, 3, 1) + timedelta(days=i), id=str(i), hadir=i) for i in range(30)]
+        store.add_visits(visits)
+        for start, end in ((date(2025, 3, 10), date(2025, 3, 16)), (date(2025, 3, 5), date(2025, 3, 20))):
+            got = store.range_summary(start, end)
+            assert {k: got[k] for k in got if k != "period"} == brute_summary(visits, start, end)
+
+
+class TestConnections:
+    """Shared store must not leak connections"""
+
+    def test_connections_are_closed(self, tmp_path, monkeypatch):
+        opened = []
+        connect = sqlite3.connect
+        monkeypatch.setattr(sqlite3, "connect", lambda *a, **k: opened.append(connect(*a, **k)) or opened[-1])
+        store = PPLStore(str(tmp_path / "ppl.db"))
+        store.add_visit(visit("2025-03-12", id="v1"))
+        store.rollup("week", "2025-03-12")
+        store.visits_frame()
+        store.tasks()
+        assert len(opened) > 3
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+
+
+class TestPoktan:
+    """Poktan table kept in step with visits"""
+
+    def test_counts_and_last_visit(self, store):
+        store.add_visits([visit("2025-03-01", id="a"), visit("2025-03-20", id="b"), visit("2025-03-10", id="c")])
+        (row,) = store.poktan()
+        assert row["visits"] == 3 and row["last_visit"] == "2025-03-20"
+        store.delete_visit("b")
+        (row,) = store.poktan()
+        assert row["visits"] == 2 and row["last_visit"] == "2025-03-10"
+
+    def test_location_edit_updates_poktan(self, store):
+        store.add_visit(visit("2025-03-12", id="v1", kecamatan="Caringin"))
+        store.update_visit("v1", {"desa": "Cibodas", "kecamatan": "Cijeruk"})
+        (row,) = store.poktan()
+        assert (row["desa"], row["kecamatan"], row["visits"]) == ("Cibodas", "Cijeruk", 1)
+
+    def test_old_update_trigger_replaced_on_open(self, tmp_path):
+        db = str(tmp_path / "ppl.db")
+        PPLStore(db)
+        conn = sqlite3.connect(db)
+        conn.executescript("DROP TRIGGER trg_visits_update; CREATE TRIGGER trg_visits_update "
+                           "AFTER UPDATE OF date ON visits BEGIN SELECT 1; END;")
+        conn.close()
+        store = PPLStore(db)
+        store.add_visit(visit("2025-03-12", id="v1"))
+        store.update_visit("v1", {"desa": "Cibodas"})
+        assert store.poktan()[0]["desa"] == "Cibodas"
+
+
+class TestTasks:
+    """Filters and sorting"""
+
+    def test_filter_sort_counts(self, store):
+        store.add_tasks([
+            {"id": "1", "title": "A", "priority": "low", "status": "pending", "due_date": "2025-03-05"},
+            {"id": "2", "title": "B", "priority": "high", "status": "in_progress", "due_date": "2025-03-09"},
+            {"id": "3", "title": "C", "priority": "medium", "status": "done", "due_date": "2025-03-01"},
+        ])
+        assert [t["id"] for t in store.tasks(status=["pending", "in_progress"])] == ["1", "2"]
+        assert [t["id"] for t in store.tasks(sort_by="priority")] == ["2", "3", "1"]
+        store.set_task_status("1", "done")
+        assert store.task_status_counts() == {"pending": 0, "in_progress": 1, "done": 2}
+        store.delete_task("3")
+        assert [t["id"] for t in store.tasks(status="done")] == ["1"]
+
+    def test_invalid_input(self, store):
+        with pytest.raises(ValueError):
+            store.add_task({"title": ""})
+        with pytest.raises(ValueError):
+            store.set_task_status("1", "archived")
+        with pytest.raises(ValueError):
+            store.tasks(sort_by="title")
+
+    def test_queries_use_indexes(self, store):
+        with store._connect() as conn:
+            plans = {
+                "status": "SELECT * FROM tasks WHERE status = 'pending' ORDER BY due_date",
+                "visits": "SELECT * FROM visits WHERE date >= '2025-01-01' AND date <= '2025-01-31'",
+                "officer": "SELECT * FROM visits WHERE officer = 'ppl1' AND date >= '2025-01-01'",
+            }
+            for sql in plans.values():
+                detail = " ".join(r[3] for r in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+                assert "USING INDEX" in detail and "TEMP B-TREE" not in detail
+
+
+class TestMigration:
+    """One-time JSON import"""
+
+    def test_imports_once(self, tmp_path):
+        tasks_file, visits_file, poktan_file = (tmp_path / n for n in ("t.json", "v.json", "p.json"))
+        tasks_file.write_text(json.dumps([{"id": "t1", "title": "Kunjungan", "status": "pending"}]))
+        visits_file.write_text(json.dumps([visit("2025-03-12", id="v1", officer=None)]))
+        poktan_file.write_text(json.dumps([{"nama": "Tani Jaya", "desa": "Cibodas"}]))
+        legacy = {"tasks_file": str(tasks_file), "visits_file": str(visits_file), "poktan_file": str(poktan_file)}
+        store = PPLStore(str(tmp_path / "ppl.db"), legacy_files=legacy)
+        assert store.visit_count() == 1
+        assert store.rollup("week", "2025-03-12")["visits"] == 1
+        assert {p["name"] for p in store.poktan()} == {"Sukamaju I", "Tani Jaya"}
+        # Re-opening does not duplicate anything
+        store = PPLStore(str(tmp_path / "ppl.db"), legacy_files=legacy)
+        assert store.migrate_json(**legacy) == (0, 0, 0)
+        assert store.rollup("week", "2025-03-12")["visits"] == 1
+        assert len(store.tasks()) == 1
+
+    def test_malformed_legacy_visits_skipped(self, tmp_path):
+        visits_file = tmp_path / "v.json"
+        visits_file.write_text(json.dumps([visit("2025-03-12", id="ok"), visit("12 Maret", id="bad_date"),
+                                           visit("2025-03-13", id="bad_count", hadir="banyak")]))
+        store = PPLStore(str(tmp_path / "ppl.db"), legacy_files={"visits_file": str(visits_file)})
+        assert [v["id"] for v in store.visits()] == ["ok"]
+        skipped = store.skipped_legacy_visits()
+        assert [v["id"] for v in skipped] == ["bad_date", "bad_count"]
+        assert "Tanggal" in skipped[0]["alasan"]
+        with pytest.raises(ValueError):
+            store.add_visit(visit("bukan tanggal"))
@@ -0,0 +1,103 @@
+"""
+Prescription Engine Tests
+=========================
+Tests for the variable-rate (VRA) prescription generator used by the GIS page.
+Run with: pytest tests/test_prescription.py -v
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from services.prescription_service import (
+    apply_machine_limits,
+    cells_in_boundary,
+    compute_doses,
+    generate_prescription,
+    prescription_from_samples,
+    to_csv,
+    to_geojson,
+)
+from services.soil_interpolation_service import build_grid
+
+
+@pytest.fixture
+def field_grid():
+    """~1 km square grid with a west→east pH gradient (5.0 → 7.0)."""
+    grid_lat, grid_lon, _ = build_grid((-6.21, 106.84, -6.20, 106.85), resolution=60, pad=0)
+    u = (grid_lon - grid_lon.min()) / np.ptp(grid_lon)
+    layers = {"ph": 5.0 + 2.0 * u, "n_value": np.full_like(u, 2000.0)}
+    return grid_lat, grid_lon, layers
+
+
+class TestDoses:
+    """Tests for per-cell dose formulas and machine limits."""
+
+    def test_lime_dose(self):
+        """Lime = (target − pH) × ton per pH unit, never negative."""
+        doses = compute_doses({"ph": np.array([5.5, 7.0])}, target_ph=6.5, lime_ton_per_ph=2.0,
+                              limits={"lime_kg_ha": (0, 1e9)})
+        raw, applied = doses["lime_kg_ha"]
+        assert raw.tolist() == [2000.0, 0.0]
+        assert applied.tolist() == [2000.0, 0.0]
+
+    def test_machine_limits(self):
+        """Rates are capped at max, tiny rates shut off, small rates raised to min."""
+        out = apply_machine_limits(np.array([10.0, 40.0, 100.0, 900.0]), (50, 400))
+        assert out.tolist() == [0.0, 50.0, 100.0, 400.0]
+
+
+class TestPrescription:
+    """Tests for the full prescription run."""
+
+    def test_boundary_mask(self, field_grid):
+        """Only cells inside the polygon are prescribed."""
+        grid_lat, grid_lon, _ = field_grid
+        boundary = [[-6.21, 106.84], [-6.21, 106.845], [-6.20, 106.845], [-6.20, 106.84]]
+        mask = cells_in_boundary(grid_lat, grid_lon, boundary)
+        assert 0.4 < mask.mean() < 0.6
+
+    def test_zones_ordered_by_dose(self, field_grid):
+        """Zone 1 receives the least lime, the last zone the most."""
+        rx = generate_prescription(*field_grid, n_zones=3, limits={"lime_kg_ha": (0, 1e9), "urea_kg_ha": (0, 1e9)})
+        lime = rx["zones"].set_index("zone")["lime_kg_ha"]
+        assert list(lime.index) == [1, 2, 3]
+        assert lime.is_monotonic_increasing
+        assert rx["area_ha"] == pytest.approx(len(rx["cells"]) * np.prod(rx["cell_size_m"]) / 10000)
+
+    def test_large_grid(self):
+        """A 160k-cell raster is prescribed in one pass, every cell zoned."""
+        grid_lat, grid_lon, _ = build_grid((-6.3, 106.8, -6.2, 106.9), resolution=400, pad=0)
+        rng = np.random.default_rng(0)
+        layers = {"ph": rng.uniform(4.5, 7.5, grid_lat.shape), "k_value": rng.uniform(1000, 4000, grid_lat.shape)}
+        rx = generate_prescription(grid_lat, grid_lon, layers)
+        assert len(rx["cells"]) == grid_lat.size
+        assert rx["cells"]["zone"].notna().all()
+
+    def test_from_samples_shares_grid(self):
+        """Layers with different sample sets still land on one grid."""
+        records = [
+            {"latitude": -6.20, "longitude": 106.84, "ph": 5.0, "n_value": 1000},
+            {"latitude": -6.21, "longitude": 106.85, "ph": 6.0},
+            {"latitude": -6.22, "longitude": 106.83, "ph": 6.5, "n_value": 4000},
+        ]
+        rx = prescription_from_samples(records, resolution=30)
+        assert set(rx["products"]) == {"lime_kg_ha", "urea_kg_ha"}
+
+
+class TestExport:
+    """Tests for CSV / GeoJSON export."""
+
+    def test_exports(self, field_grid):
+        """Zone GeoJSON merges row runs; CSV has one line per cell."""
+        rx = generate_prescription(*field_grid, n_zones=3)
+        geo = json.loads(to_geojson(rx))
+        cell_geo = json.loads(to_geojson(rx, level="cell"))
+        assert len(cell_geo["features"]) == len(rx["cells"])
+        assert len(geo["features"]) < len(cell_geo["features"])
+        assert {"zone", "lime_kg_ha"} <= set(geo["features"][0]["properties"])
+
+        lines = to_csv(rx).decode().strip().splitlines()
+        assert len(lines) == len(rx["cells"]) + 1
+        assert lines[0].startswith("lat,lon,zone,zone_lime_kg_ha")
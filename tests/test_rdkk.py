@@ -0,0 +1,135 @@
+"""
+RDKK Tests
+==========
+Tests for the batch e-RDKK fertilizer quota engine (Ruang Kerja PPL).
+Run with: pytest tests/test_rdkk.py -v
+"""
+
+import io
+
+import pandas as pd
+import pytest
+
+from services.rdkk_service import (
+    MAX_LUAS_HA,
+    aggregate_rdkk,
+    allocate_rdkk,
+    process_roster,
+    quota_per_ha,
+    rdkk_submission,
+    submission_excel,
+    template_roster_csv,
+)
+
+NIK_A = "3201010101800001"
+NIK_B = "3201010101800002"
+NIK_C = "3201010101800003"
+
+
+@pytest.fixture
+def roster():
+    return pd.DataFrame({
+        "NIK": [NIK_A, NIK_B, NIK_B, NIK_C],
+        "Nama Petani": ["Ahmad", "Siti", "Siti", "Budi"],
+        "Kelompok Tani": ["Sukamaju I", "Sukamaju I", "Sukamaju I", "Makmur"],
+        "Desa": ["Sukamakmur", "Sukamakmur", "Sukamakmur", "Cibodas"],
+        "Kecamatan": ["Caringin"] * 4,
+        "Luas": ["0.5", "1.5", "1.5", "1.0"],
+        "Komoditas": ["Padi", "Padi", "Jagung", "Kopi"],
+        "MT": ["Semua", "MT 1", "mt1", "2"],
+    })
+
+
+def single_member_quota(luas, komoditas):
+    """Single-farmer simulator of the RDKK tab."""
+    ref = quota_per_ha(komoditas)
+    luas_valid = min(luas, MAX_LUAS_HA)
+    return ref["urea"] * luas_valid, ref["npk"] * luas_valid
+
+
+class TestRoster:
+    """Validation and season expansion"""
+
+    def test_aliases_and_expansion(self, roster):
+        valid, rejected = process_roster(roster)
+        assert rejected.empty
+        assert len(valid) == 3 + 1 + 1 + 1
+        assert sorted(valid.loc[valid["nik"] == NIK_A, "mt"]) == ["MT 1", "MT 2", "MT 3"]
+
+    def test_bad_rows_rejected(self, roster):
+        roster.loc[0, "NIK"] = "32010101"
+        roster.loc[1, "Luas"] = "-1"
+        roster.loc[2, "MT"] = "MT 5"
+        roster.loc[3, "Desa"] = None
+        valid, rejected = process_roster(roster)
+        assert valid.empty
+        assert list(rejected["alasan"]) == ["NIK harus 16 digit", "luas lahan tidak valid", "MT tidak valid",
+                                            "poktan/desa kosong"]
+
+    def test_missing_column(self, roster):
+        with pytest.raises(ValueError, match="komoditas"):
+            process_roster(roster.drop(columns=["Komoditas"]))
+
+    def test_numeric_season_column(self, roster):
+        roster["MT"] = ["", "1", "2", "1"]
+        csv = roster.to_csv(index=False)
+        valid, rejected = process_roster(pd.read_csv(io.StringIO(csv), dtype={"NIK": str}))
+        assert rejected.empty
+        assert sorted(valid.loc[valid["nik"] == NIK_A, "mt"]) == ["MT 1", "MT 2", "MT 3"]
+        assert list(valid.loc[valid["nik"] != NIK_A, "mt"]) == ["MT 1", "MT 2", "MT 1"]
+
+    def test_template_round_trip(self):
+        valid, rejected = process_roster(pd.read_csv(io.StringIO(template_roster_csv()), dtype=str))
+        assert rejected.empty and len(valid) == 5
+
+
+class TestAllocation:
+    """Quota per member × season"""
+
+    def test_matches_single_simulator(self, roster):
+        alloc = allocate_rdkk(process_roster(roster)[0])
+        for _, row in alloc[alloc["nik"].isin([NIK_A, NIK_C])].iterrows():
+            urea, npk = single_member_quota(row["luas_lahan"], row["komoditas"])
+            assert row["urea_kg"] == pytest.approx(urea)
+            assert row["npk_kg"] == pytest.approx(npk)
+        assert alloc.loc[alloc["nik"] == NIK_C, "dosis_default"].all()
+
+    def test_cap_shared_across_parcels(self, roster):
+        alloc = allocate_rdkk(process_roster(roster)[0])
+        siti = alloc[alloc["nik"] == NIK_B]
+        assert siti["dibatasi"].all()
+        assert siti["luas_subsidi"].sum() == pytest.approx(MAX_LUAS_HA)
+        padi = siti[siti["komoditas"] == "Padi"].iloc[0]
+        assert padi["urea_kg"] == pytest.approx(200 * 1.0)
+        assert not alloc.loc[alloc["nik"] == NIK_A, "dibatasi"].any()
+
+
+class TestTotals:
+    """Group / village totals and submission file"""
+
+    def test_aggregate(self, roster):
+        alloc = allocate_rdkk(process_roster(roster)[0])
+        desa = aggregate_rdkk(alloc, "desa").set_index(["desa", "mt"])
+        assert desa.loc[("Sukamakmur", "MT 1"), "anggota"] == 2
+        assert desa.loc[("Sukamakmur", "MT 1"), "urea_kg"] == pytest.approx(0.5 * 200 + 200 + 250)
+        assert aggregate_rdkk(alloc, "poktan")["urea_kg"].sum() == pytest.approx(alloc["urea_kg"].sum())
+        with pytest.raises(ValueError):
+            aggregate_rdkk(alloc, "kabupaten")
+
+    def test_submission_sheet(self, roster):
+        alloc = allocate_rdkk(process_roster(roster)[0])
+        sheet = rdkk_submission(alloc)
+        assert len(sheet) == 4                     # member × commodity
+        ahmad = sheet[sheet["NIK"] == NIK_A].iloc[0]
+        assert ahmad["MT 2 Urea (Kg)"] == pytest.approx(100)
+        assert ahmad["Total NPK (Kg)"] == pytest.approx(3 * 0.5 * 250)
+        budi = sheet[sheet["NIK"] == NIK_C].iloc[0]
+        assert budi["MT 1 Urea (Kg)"] == 0 and budi["MT 2 Urea (Kg)"] == pytest.approx(150)
+        assert sheet["Total Urea (Kg)"].sum() == pytest.approx(alloc["urea_kg"].sum())
+
+    def test_excel_export(self, roster):
+        alloc = allocate_rdkk(process_roster(roster)[0])
+        data = submission_excel(rdkk_submission(alloc), aggregate_rdkk(alloc))
+        sheets = pd.read_excel(io.BytesIO(data), sheet_name=None, dtype={"NIK": str})
+        assert set(sheets) == {"RDKK", "Rekap"}
+        assert NIK_A in set(sheets["RDKK"]["NIK"])
@@ -0,0 +1,95 @@
+"""
+Reference Data Tests
+====================
+Tests for the versioned reference datasets, marshal snapshot and frozen shared accessor.
+Run with: pytest tests/test_reference_data.py -v
+"""
+
+import copy
+import json
+import os
+import pickle
+
+import pytest
+
+from services.reference_data_service import (
+    FrozenDict,
+    ReferenceStore,
+    read_manifest,
+    source_digest,
+)
+
+
+@pytest.fixture
+def source(tmp_path):
+    src = tmp_path / "ref"
+    src.mkdir()
+    (src / "crops.json").write_text(json.dumps({
+        "Cabai": {"targets": {"10": {"height": 5}, "20": {"height": 12}}, "tags": ["buah", "pedas"]},
+    }), encoding="utf-8")
+    (src / "manifest.json").write_text(json.dumps(
+        {"schema": 1, "datasets": {"crops": {"file": "crops.json", "version": 1, "source": "test"}}}))
+    return src
+
+
+@pytest.fixture
+def store(source, tmp_path):
+    return ReferenceStore(str(source), str(tmp_path / "cache"))
+
+
+class TestAccessor:
+    """Tests for frozen shared data and mutable copies."""
+
+    def test_frozen_and_shared(self, store):
+        crops = store.get("crops")
+        assert crops is store.get("crops")
+        with pytest.raises(TypeError):
+            crops["Baru"] = {}
+        with pytest.raises(TypeError):
+            crops["Cabai"]["tags"].append("x")
+        with pytest.raises(TypeError):
+            crops["Cabai"].update(tags=[])
+
+    def test_digit_keys_restored(self, store):
+        assert sorted(store.get("crops")["Cabai"]["targets"]) == [10, 20]
+
+    def test_copies_are_independent(self, store):
+        mine = store.copy("crops")
+        mine["Cabai"]["tags"].append("x")
+        assert store.get("crops")["Cabai"]["tags"] == ["buah", "pedas"]
+        thawed = copy.deepcopy(store.get("crops"))
+        thawed["Cabai"]["targets"][10]["height"] = 99
+        assert store.get("crops")["Cabai"]["targets"][10]["height"] == 5
+        assert isinstance(pickle.loads(pickle.dumps(store.get("crops"))), FrozenDict)
+
+    def test_unknown_dataset(self, store):
+        with pytest.raises(KeyError):
+            store.get("tidak_ada")
+
+
+class TestSnapshot:
+    """Tests for snapshot compilation and invalidation."""
+
+    def test_snapshot_written_once_and_reused(self, source, store, tmp_path, monkeypatch):
+        store.get("crops")
+        assert os.listdir(tmp_path / "cache") == [f"reference-{source_digest(str(source))}.marshal"]
+
+        def no_compile(*args):
+            raise AssertionError("sources re-parsed")
+        monkeypatch.setattr("services.reference_data_service.compile_snapshot", no_compile)
+        again = ReferenceStore(str(source), str(tmp_path / "cache"))
+        assert again.get("crops") == store.get("crops")
+
+    def test_edit_invalidates(self, source, store, tmp_path):
+        before = source_digest(str(source))
+        (source / "crops.json").write_text(json.dumps({"Tomat": {}}), encoding="utf-8")
+        assert source_digest(str(source)) != before
+        assert list(ReferenceStore(str(source), str(tmp_path / "cache")).get("crops")) == ["Tomat"]
+
+    def test_shipped_datasets_load(self, tmp_path):
+        store = ReferenceStore(snapshot_dir=str(tmp_path))
+        names = set(read_manifest()["datasets"])
+        assert {"disease_database", "fertilizer_catalog", "crop_database", "mushroom_data"} <= names
+        for name in names:
+            assert len(store.get(name)) > 0
+        assert store.get("hama_database")["Kutu Daun (Aphids)"]["ae_threshold"] == 7.5
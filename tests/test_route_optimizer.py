@@ -0,0 +1,121 @@
+"""
+Route Optimizer Tests
+=====================
+Tests for the distance matrix, savings + 2-opt routing and fleet costing (Rantai Pasok).
+Run with: pytest tests/test_route_optimizer.py -v
+"""
+
+import math
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.route_optimizer_service import (
+    haversine_km,
+    plan_fleet,
+    road_distance_matrix,
+    sample_pickups,
+    savings_routes,
+    shrinkage_factor,
+    two_opt,
+)
+
+DEPOT = (-6.59, 106.79)
+MARKETS = {
+    "PI Kramat Jati (Jakarta)": {"lat": -6.27, "lon": 106.87},
+    "PI Caringin (Bandung)": {"lat": -6.94, "lon": 107.57},
+}
+VEHICLES = {
+    "Pick Up (L300)": {"kapasitas": 1000, "km_per_liter": 9, "sewa": 350000},
+    "Colt Diesel (6 Roda)": {"kapasitas": 4500, "km_per_liter": 5, "sewa": 900000},
+}
+
+
+def scalar_haversine(lat1, lon1, lat2, lon2):
+    """Reference: the page's original math-module formula."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlambda = math.radians(lat2 - lat1), math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 6371 * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+class TestDistances:
+    """Tests for the vectorized distances and shrinkage table."""
+
+    def test_matrix_matches_scalar(self):
+        """Matrix entries equal the scalar formula × road factor."""
+        lat = np.array([-6.59, -6.8])
+        lon = np.array([106.79, 107.1])
+        mat = road_distance_matrix(lat, lon, [-6.27, -6.94], [106.87, 107.57])
+        assert mat.shape == (2, 2)
+        assert mat[1, 0] == pytest.approx(scalar_haversine(-6.8, 107.1, -6.27, 106.87) * 1.4)
+        assert float(haversine_km(*DEPOT, *DEPOT)) == 0.0
+
+    def test_shrinkage_categories(self):
+        assert shrinkage_factor("Sayur Daun (Bayam)") == 2.5
+        assert shrinkage_factor("Umbi-umbian (Kentang/Bawang)") == 0.5
+        assert shrinkage_factor("Lainnya", default=1.0) == 1.0
+
+
+class TestRouting:
+    """Tests for savings construction and 2-opt."""
+
+    def test_savings_merges_and_respects_capacity(self):
+        """Nearby pickups share a truck only while the load fits."""
+        # depot 0, pickups 1..4 on a line towards the market 5
+        pos = np.array([0.0, 10, 11, 12, 13, 50])
+        dist = np.abs(pos[:, None] - pos[None, :])
+        routes = savings_routes(dist, demand=[400, 400, 400, 400], capacity=1000)
+        assert sorted(len(r) for r in routes) == [2, 2]
+        assert sorted(n for r in routes for n in r) == [1, 2, 3, 4]
+
+    def test_two_opt_untangles(self):
+        """2-opt restores the monotone order on a line."""
+        pos = np.array([0.0, 1, 2, 3, 4, 5])
+        dist = np.abs(pos[:, None] - pos[None, :])
+        assert two_opt([3, 1, 4, 2], dist, np.zeros(6), per_km=1.0) == [1, 2, 3, 4]
+
+
+class TestPlanFleet:
+    """Tests for the full day plan."""
+
+    @pytest.fixture
+    def pickups(self):
+        return sample_pickups(DEPOT, n=40, seed=1)
+
+    def test_every_pickup_served_once(self, pickups):
+        plan = plan_fleet(pickups, DEPOT, MARKETS, VEHICLES)
+        assert sorted(plan["stops"]["id"]) == sorted(pickups["id"])
+        assert (plan["routes"]["muatan_kg"] <= 4500).all()
+        assert plan["routes"]["muatan_kg"].sum() == pytest.approx(pickups["kg"].sum())
+        assert plan["summary"]["trucks"] == len(plan["routes"])
+
+    def test_vehicle_fits_load(self, pickups):
+        """Each route gets a vehicle able to carry its load; small loads get the pick up."""
+        plan = plan_fleet(pickups, DEPOT, MARKETS, VEHICLES)
+        caps = plan["routes"]["armada"].map(lambda v: VEHICLES[v]["kapasitas"])
+        assert (plan["routes"]["muatan_kg"] <= caps).all()
+        single = plan_fleet(pickups.head(1).assign(kg=300), DEPOT, MARKETS, VEHICLES)
+        assert single["routes"]["armada"].iloc[0] == "Pick Up (L300)"
+
+    def test_shrinkage_uses_km_to_market(self):
+        """Susut = kg × factor% × km-to-market / 100."""
+        one = pd.DataFrame([{"id": "A", "lat": -6.5, "lon": 106.8, "kg": 1000,
+                             "komoditas": "Sayur Daun (Bayam)", "harga_kg": 4000}])
+        plan = plan_fleet(one, DEPOT, MARKETS, VEHICLES, market="PI Kramat Jati (Jakarta)")
+        stop = plan["stops"].iloc[0]
+        assert stop["susut_kg"] == pytest.approx(1000 * 0.025 * stop["km_ke_pasar"] / 100)
+        assert plan["routes"]["nilai_susut"].iloc[0] == pytest.approx(stop["susut_kg"] * 4000)
+
+    def test_oversized_load_rejected(self, pickups):
+        with pytest.raises(ValueError):
+            plan_fleet(pickups.assign(kg=5000), DEPOT, MARKETS, VEHICLES)
+
+    def test_hundreds_of_pickups_fast(self):
+        """A 300-pickup day plans within seconds."""
+        start = time.perf_counter()
+        plan = plan_fleet(sample_pickups(DEPOT, n=300, seed=2), DEPOT, MARKETS, VEHICLES)
+        assert time.perf_counter() - start < 10
+        assert plan["summary"]["pickups"] == 300
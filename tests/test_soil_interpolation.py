@@ -0,0 +1,102 @@
+"""
+Soil Interpolation Tests
+========================
+Tests for the IDW / kriging raster engine used by Peta Data Tanah and GIS pages.
+Run with: pytest tests/test_soil_interpolation.py -v
+"""
+
+import numpy as np
+import pytest
+
+from services.soil_interpolation_service import (
+    dataset_version,
+    get_overlay,
+    idw,
+    interpolate_samples,
+    ordinary_kriging,
+)
+
+
+@pytest.fixture
+def gradient_samples():
+    """pH rising from south (5.0) to north (7.0) over a ~5 km block."""
+    rng = np.random.default_rng(0)
+    lats = -6.25 + rng.random(80) * 0.05
+    lons = 106.80 + rng.random(80) * 0.05
+    ph = 5.0 + 2.0 * (lats + 6.25) / 0.05
+    return lats, lons, ph
+
+
+class TestIDW:
+    """Tests for inverse distance weighting."""
+
+    def test_exact_at_sample(self):
+        """A target on top of a sample returns that sample's value."""
+        out = idw([0.0, 10.0], [0.0, 0.0], [1.0, 3.0], np.array([0.0, 10.0]), np.array([0.0, 0.0]))
+        assert out.tolist() == [1.0, 3.0]
+
+    def test_midpoint_is_mean(self):
+        """Equidistant targets get the plain average."""
+        out = idw([0.0, 10.0], [0.0, 0.0], [1.0, 3.0], np.array([5.0]), np.array([0.0]))
+        assert out[0] == pytest.approx(2.0)
+
+    def test_knn_close_to_bruteforce_when_k_near_n(self):
+        """KD-tree path with k = n - 1 stays close to the broadcast path; k = n uses the broadcast path."""
+        rng = np.random.default_rng(1)
+        sx, sy, sv = rng.random(20), rng.random(20), rng.random(20)
+        gx, gy = rng.random(50), rng.random(50)
+        full = idw(sx, sy, sv, gx, gy)
+        knn = idw(sx, sy, sv, gx, gy, n_neighbors=19)
+        assert np.abs(full - knn).max() < 0.1
+        assert np.array_equal(idw(sx, sy, sv, gx, gy, n_neighbors=20), full)
+
+
+class TestKriging:
+    """Tests for ordinary kriging."""
+
+    def test_exact_interpolator(self):
+        """Kriging honours the data at sample locations with zero variance."""
+        sx = np.array([0.0, 1.0, 2.0, 3.0])
+        est, var = ordinary_kriging(sx, np.zeros(4), [1.0, 2.0, 3.0, 4.0], sx, np.zeros(4))
+        assert est == pytest.approx([1.0, 2.0, 3.0, 4.0], abs=1e-6)
+        assert var == pytest.approx(np.zeros(4), abs=1e-6)
+
+    def test_sample_limit(self):
+        """Very large sample sets are rejected in favour of IDW."""
+        with pytest.raises(ValueError):
+            ordinary_kriging(np.zeros(5), np.zeros(5), np.zeros(5), np.zeros(1), np.zeros(1), max_samples=4)
+
+
+class TestRaster:
+    """Tests for grid orientation and overlay caching."""
+
+    @pytest.mark.parametrize("method", ["idw", "kriging"])
+    def test_grid_north_up(self, gradient_samples, method):
+        """First raster row is the northern edge, so it carries the high pH."""
+        res = interpolate_samples(*gradient_samples, method=method, resolution=40)
+        assert res["grid"][0].mean() > res["grid"][-1].mean()
+        assert res["grid_lat"][0, 0] > res["grid_lat"][-1, 0]
+
+    def test_version_ignores_order(self, gradient_samples):
+        """Dataset version depends on content, not record order."""
+        lats, lons, ph = gradient_samples
+        assert dataset_version(lats, lons, ph) == dataset_version(lats[::-1], lons[::-1], ph[::-1])
+
+    def test_overlay_cached_until_samples_change(self, gradient_samples, tmp_path):
+        """Same samples reuse the PNG; an edited sample produces a new one."""
+        lats, lons, ph = gradient_samples
+        records = [{"latitude": a, "longitude": b, "ph": c} for a, b, c in zip(lats, lons, ph)]
+
+        first = get_overlay(records, "ph", resolution=30, cache_dir=str(tmp_path))
+        again = get_overlay(records, "ph", resolution=30, cache_dir=str(tmp_path))
+        assert first == again
+        assert len(list(tmp_path.glob("*.png"))) == 1
+
+        records[0]["ph"] = 9.0
+        changed = get_overlay(records, "ph", resolution=30, cache_dir=str(tmp_path))
+        assert changed["version"] != first["version"]
+        assert len(list(tmp_path.glob("*.png"))) == 2
+
+    def test_overlay_needs_two_samples(self, tmp_path):
+        """A single sample cannot make a raster."""
+        assert get_overlay([{"latitude": 0, "longitude": 0, "ph": 6}], "ph", cache_dir=str(tmp_path)) is None
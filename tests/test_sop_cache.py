@@ -0,0 +1,82 @@
+"""
+SOP Cache Tests
+===============
+Tests for the memoized AI SOP recommendations (Analisis Usaha Tani).
+Run with: pytest tests/test_sop_cache.py -v
+"""
+
+import numpy as np
+import pytest
+
+import services.ai_farm_service as ai
+
+
+class LinearModel:
+    """Cheap stand-in for the random forest."""
+
+    def predict(self, X):
+        return X[:, 0] * 20 + X[:, 1] * 10 + X[:, 2] * 5
+
+
+@pytest.fixture
+def counting_optimizer(monkeypatch):
+    calls = []
+    real = ai.optimize_solution
+
+    def wrapped(model, *args, **kwargs):
+        calls.append(args)
+        return real(LinearModel(), *args, **kwargs)
+
+    monkeypatch.setattr(ai, "optimize_solution", wrapped)
+    monkeypatch.setattr(ai, "get_ai_model", lambda: None)
+    return calls
+
+
+class TestCacheKey:
+    """Tests for input quantization."""
+
+    def test_nearby_inputs_share_a_key(self):
+        """Small jitter in rain/temp/texture maps to the same key."""
+        a = ai.sop_cache_key(10000, "Yield", {"rain": 2000, "temp": 27, "texture": 0.7}, 6000)
+        b = ai.sop_cache_key(10020, "Yield", {"rain": 2010, "temp": 27.1, "texture": 0.71}, 6020)
+        c = ai.sop_cache_key(10000, "Profit", {"rain": 2000, "temp": 27, "texture": 0.7}, 6000)
+        assert a == b
+        assert a != c
+
+
+class TestSOPCache:
+    """Tests for LRU eviction, persistence and the memoized optimizer."""
+
+    def test_lru_eviction(self):
+        """Least recently used entry is evicted first."""
+        cache = ai.SOPRecommendationCache(path=None, max_entries=2)
+        cache.put("a", {"n_kg": 1})
+        cache.put("b", {"n_kg": 2})
+        cache.get("a")
+        cache.put("c", {"n_kg": 3})
+        assert "a" in cache and "c" in cache and "b" not in cache
+
+    def test_persisted_to_disk(self, tmp_path):
+        """A new instance reloads entries from the JSON file."""
+        path = str(tmp_path / "sop.json")
+        ai.SOPRecommendationCache(path=path).put("k", {"n_kg": np.float64(150.0)})
+        assert ai.SOPRecommendationCache(path=path).get("k") == {"n_kg": 150.0}
+
+    def test_recommend_runs_optimizer_once(self, tmp_path, counting_optimizer):
+        """Repeated requests with the same quantized inputs are served from cache."""
+        cache = ai.SOPRecommendationCache(path=str(tmp_path / "sop.json"))
+        params = {"rain": 2000, "temp": 27, "texture": 0.7, "pest_strategy": "IPM (Terpadu)"}
+        first = ai.recommend_sop(10000, "Yield", params, 6000, cache=cache)
+        again = ai.recommend_sop(10000, "Yield", dict(params, rain=2005), 6000, cache=cache)
+        assert len(counting_optimizer) == 1
+        assert first == again
+        assert set(first) >= {"n_kg", "p_kg", "k_kg", "predicted_yield"}
+
+    def test_precompute_grid(self, counting_optimizer):
+        """Grid fills each combination once and skips what is cached."""
+        cache = ai.SOPRecommendationCache(path=None)
+        grid = {"texture": [0.2, 0.7], "pest_strategy": ["IPM (Terpadu)", "Konvensional"]}
+        assert ai.precompute_sop_grid(grid=grid, cache=cache) == 4
+        assert ai.precompute_sop_grid(grid=grid, cache=cache) == 0
+        ai.recommend_sop(10000, "Yield", {"texture": 0.2, "pest_strategy": "Konvensional"}, 6000, cache=cache)
+        assert len(counting_optimizer) == 4
@@ -0,0 +1,122 @@
+"""
+Ubinan Tests
+============
+Tests for bulk crop-cut conversion, aggregation and berita acara (Ruang Kerja PPL).
+Run with: pytest tests/test_ubinan.py -v
+"""
+
+import io
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.ubinan_service import (
+    aggregate_ubinan,
+    berita_acara_zip,
+    convert_ubinan,
+    process_ubinan,
+    render_berita_acara,
+    template_csv,
+)
+
+
+@pytest.fixture
+def crop_cuts():
+    return pd.DataFrame({
+        "Kelompok Tani": ["Sukamaju I", "Sukamaju I", "Sukamaju II", "Makmur", "Makmur"],
+        "Desa": ["Sukamakmur", "Sukamakmur", "Sukamakmur", "Cibodas", "Cibodas"],
+        "Kecamatan": ["Caringin", "Caringin", "Caringin", "Caringin", "Caringin"],
+        "panjang": [2.5, 2.5, 2.5, 2.5, 2.5],
+        "lebar": [2.5, 2.5, 2.5, 2.5, 2.5],
+        "berat": [6.0, 5.0, 5.5, 6.5, 7.0],
+        "jumlah_rumpun": [120, 110, 115, 130, 125],
+    })
+
+
+class TestConversion:
+    """Per-plot conversion (same as the single-plot calculator)"""
+
+    def test_scalar(self):
+        r = convert_ubinan(2.5, 2.5, 6.0, 120)
+        assert float(r["faktor_konversi"]) == pytest.approx(1600)
+        assert float(r["gkp_ton_ha"]) == pytest.approx(9.6)
+        assert float(r["gkg_ton_ha"]) == pytest.approx(9.6 * 0.8602)
+        assert float(r["beras_ton_ha"]) == pytest.approx(9.6 * 0.8602 * 0.6402)
+        assert float(r["populasi_ha"]) == pytest.approx(192000)
+
+    def test_vectorized_matches_scalar(self):
+        p, l, b, n = np.array([2.5, 2.0]), np.array([2.5, 3.0]), np.array([6.0, 4.2]), np.array([120, 95])
+        r = convert_ubinan(p, l, b, n)
+        for i in range(2):
+            assert r["gkp_ton_ha"][i] == pytest.approx(float(convert_ubinan(p[i], l[i], b[i], n[i])["gkp_ton_ha"]))
+
+
+class TestProcessing:
+    """CSV validation"""
+
+    def test_aliases_and_columns(self, crop_cuts):
+        valid, rejected = process_ubinan(crop_cuts)
+        assert len(valid) == 5 and rejected.empty
+        assert {"poktan", "gkp_ton_ha", "populasi_ha"} <= set(valid.columns)
+
+    def test_bad_rows_rejected(self, crop_cuts):
+        crop_cuts["berat"] = crop_cuts["berat"].astype(object)
+        crop_cuts.loc[1, "berat"] = "abc"
+        crop_cuts.loc[2, "lebar"] = 0
+        crop_cuts.loc[3, "Desa"] = None
+        valid, rejected = process_ubinan(crop_cuts)
+        assert len(valid) == 2
+        assert list(rejected["alasan"]) == ["angka tidak valid", "ukuran petak ≤ 0", "lokasi kosong"]
+
+    def test_missing_column(self, crop_cuts):
+        with pytest.raises(ValueError, match="berat_gkp"):
+            process_ubinan(crop_cuts.drop(columns=["berat"]))
+
+    def test_template_round_trip(self):
+        valid, rejected = process_ubinan(pd.read_csv(io.StringIO(template_csv())))
+        assert len(valid) == 2 and rejected.empty
+
+
+class TestAggregation:
+    """Group means with confidence intervals"""
+
+    def test_levels(self, crop_cuts):
+        valid, _ = process_ubinan(crop_cuts)
+        assert len(aggregate_ubinan(valid, "kecamatan")) == 1
+        assert len(aggregate_ubinan(valid, "desa")) == 2
+        assert len(aggregate_ubinan(valid, "poktan")) == 3
+        with pytest.raises(ValueError):
+            aggregate_ubinan(valid, "provinsi")
+
+    def test_confidence_interval(self, crop_cuts):
+        valid, _ = process_ubinan(crop_cuts)
+        desa = aggregate_ubinan(valid, "desa").set_index("desa")
+        cibodas = desa.loc["Cibodas"]
+        values = np.array([6.5, 7.0]) * 1600 / 1000
+        assert cibodas["rata_rata"] == pytest.approx(values.mean())
+        half = 12.706 * values.std(ddof=1) / np.sqrt(2)      # t(0.975, df=1)
+        assert cibodas["ci_high"] - cibodas["rata_rata"] == pytest.approx(half, rel=1e-3)
+
+    def test_single_plot_has_no_interval(self, crop_cuts):
+        valid, _ = process_ubinan(crop_cuts)
+        poktan = aggregate_ubinan(valid, "poktan").set_index("poktan")
+        assert np.isnan(poktan.loc["Sukamaju II", "ci_low"])
+
+
+class TestBeritaAcara:
+    """Document rendering"""
+
+    def test_single_document(self, crop_cuts):
+        valid, _ = process_ubinan(crop_cuts)
+        text = render_berita_acara(valid.iloc[0])
+        assert "Kelompok Tani : Sukamaju I" in text
+        assert "Produktivitas : 9.60 Ton/Ha (GKP)" in text
+        assert "Kadar Air     : - %" in text
+
+    def test_zip_has_one_file_per_plot(self, crop_cuts):
+        valid, _ = process_ubinan(crop_cuts)
+        names = zipfile.ZipFile(io.BytesIO(berita_acara_zip(valid))).namelist()
+        assert len(names) == 5
+        assert names[3].startswith("Caringin/Cibodas/")
@@ -0,0 +1,135 @@
+"""
+Lazy imports for heavy libraries
+sklearn, scipy, folium, cv2 and google.generativeai are bound as proxies and
+imported on first use, so a page only pays for the libraries its current code
+path needs. Home starts a background warm-up of the common ones.
+"""
+
+import importlib
+import sys
+import threading
+import time
+import types
+
+# ========== CONFIGURATION ==========
+# Imported in the background after Home renders (most-used first)
+WARMUP_MODULES = (
+    "plotly.express",
+    "folium",
+    "streamlit_folium",
+    "sklearn.ensemble",
+    "sklearn.linear_model",
+    "sklearn.preprocessing",
+    "scipy.stats",
+    "scipy.optimize",
+)
+WARMUP_DELAY_S = 2.0      # let the page that started the warm-up finish rendering first
+
+_load_times = {}          # module -> (milliseconds, "lazy" | "warmup")
+_lock = threading.Lock()
+_warmup_thread = None
+
+
+# ========== IMPORT HELPERS ==========
+
+def _timed_import(name, source):
+    """Import `name`, recording the wall time when this call did the work."""
+    if name in sys.modules:
+        return sys.modules[name]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _load_times.setdefault(name, ((time.perf_counter() - start) * 1000, source))
+    return module
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_target"]
+        if module is None:
+            module = _timed_import(self.__name__, "lazy")
+            self.__dict__["_lazy_target"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_target"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+class LazyAttr:
+    """Callable proxy for `from module import attr` (classes and functions)."""
+
+    __slots__ = ("_module", "_attr", "_target")
+
+    def __init__(self, module, attr):
+        self._module = module
+        self._attr = attr
+        self._target = None
+
+    def resolve(self):
+        if self._target is None:
+            self._target = getattr(_timed_import(self._module, "lazy"), self._attr)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self):
+        return f"<lazy {self._module}.{self._attr}>"
+
+
+def lazy_import(name):
+    """`import name` deferred until first attribute access (real module if already loaded)."""
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
+
+
+def lazy_attr(module, attr):
+    """
+    `from module import attr` deferred until first call / attribute access.
+    Returns the real object when the module is already loaded. The proxy is
+    not a class, so use it for calls only (not isinstance / subclassing).
+    """
+    loaded = sys.modules.get(module)
+    return getattr(loaded, attr) if loaded is not None else LazyAttr(module, attr)
+
+
+# ========== WARM-UP ==========
+
+def _warm(modules, delay):
+    time.sleep(delay)
+    for name in modules:
+        try:
+            _timed_import(name, "warmup")
+        except Exception:
+            pass  # optional dependency missing: the page reports it when it is used
+
+
+def warm_up(modules=WARMUP_MODULES, delay=WARMUP_DELAY_S):
+    """Import `modules` in a daemon thread after `delay` seconds, once per process. Returns the thread."""
+    global _warmup_thread
+    with _lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_warm, args=(tuple(modules), delay),
+                                              name="agrisensa-import-warmup", daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
+
+
+def import_times():
+    """{module: (ms, source)} for heavy modules imported through this helper so far."""
+    return dict(_load_times)
@@ -0,0 +1,68 @@
+"""
+Thread-safe LRU cache, optionally mirrored to a JSON file
+Shared by the SOP recommendation, plant diagnosis and batch forecast caches.
+Entries are kept in use order; the file holds a list of [key, value] pairs
+and is rewritten atomically on every persisted put.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe LRU; values must be JSON-serialisable when `path` is set."""
+
+    def __init__(self, path=None, max_entries=256):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        for key, value in entries[-self.max_entries:]:
+            self._data[key] = value
+
+    def _save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(list(self._data.items()), f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value, persist=True):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+            if persist:
+                self._save()
+
+    def flush(self):
+        with self._lock:
+            self._save()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
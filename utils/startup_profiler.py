@@ -0,0 +1,180 @@
+"""
+Cold-start profiler for AgriSensa pages
+Each page is profiled in a fresh Python process (streamlit and utils.auth
+preloaded, as in a running server): first the page's top-level imports are
+timed, then the first render with an authenticated session (AppTest).
+Results are written as JSON and compared against the cold-start budget.
+
+Run with: python -m utils.startup_profiler [page prefixes ...] [--check]
+"""
+
+import argparse
+import ast
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+
+# ========== COLD-START BUDGET ==========
+# Targets for the first visit to a page in a fresh server process (ms)
+COLD_START_BUDGET_MS = {
+    "import": 800,          # page's own top-level imports (pandas + plotly ≈ 450)
+    "first_render": 2500,   # first script run, including lazily imported libraries
+}
+# Pages with a known heavier first render (model training, large tables)
+PAGE_BUDGET_OVERRIDES_MS = {}
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORT_PATH = os.path.join("data", "perf", "cold_start.json")
+RESULT_MARKER = "@@COLD_START@@"
+SLOWEST_IMPORTS = 5
+# Makes st.secrets loadable (pages otherwise fail with "No secrets found") without handing pages an API key,
+# which would send their first render to the network (e.g. the Gemini model list)
+PROFILER_SECRETS = {"COLD_START_PROFILER": "1"}
+
+
+# ========== SINGLE PAGE (CHILD PROCESS) ==========
+
+def _top_level_imports(path):
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    return [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def profile_page(path, timeout=60):
+    """Import and first-render cost of one page in the current (fresh) process."""
+    import streamlit  # noqa: F401  (server baseline)
+    from streamlit.testing.v1 import AppTest
+
+    import utils.auth  # noqa: F401  (loaded by Home before any page)
+    from utils.lazy_imports import import_times
+
+    result = {"page": os.path.basename(path), "errors": []}
+    modules_before = len(sys.modules)
+    namespace = {"__name__": "__cold_start__", "__file__": path}
+    timings = []
+    start = time.perf_counter()
+    for node in _top_level_imports(path):
+        t = time.perf_counter()
+        try:
+            exec(compile(ast.Module(body=[node], type_ignores=[]), path, "exec"), namespace)
+        except Exception as e:
+            result["errors"].append(f"import: {type(e).__name__}: {e}")
+        timings.append((ast.unparse(node), (time.perf_counter() - t) * 1000))
+    result["import_ms"] = (time.perf_counter() - start) * 1000
+    result["modules_loaded"] = len(sys.modules) - modules_before
+    result["slowest_imports"] = [
+        {"statement": stmt, "ms": round(ms, 1)}
+        for stmt, ms in sorted(timings, key=lambda x: -x[1])[:SLOWEST_IMPORTS]
+    ]
+
+    at = AppTest.from_file(os.path.abspath(path), default_timeout=timeout)
+    at.session_state["authenticated"] = True
+    at.session_state["user"] = {"username": "profiler", "role": "admin", "name": "Cold Start Profiler"}
+    for key, value in PROFILER_SECRETS.items():
+        at.secrets[key] = value
+    start = time.perf_counter()
+    try:
+        at.run()
+    except Exception as e:
+        result["errors"].append(f"render: {type(e).__name__}: {e}")
+    result["first_render_ms"] = (time.perf_counter() - start) * 1000
+    result["errors"] += [f"render: {e.message}" for e in at.exception]
+    result["lazy_imports"] = {name: round(ms, 1) for name, (ms, source) in import_times().items()
+                              if source == "lazy"}
+    return result
+
+
+# ========== ALL PAGES (PARENT PROCESS) ==========
+
+def page_files(selectors=None):
+    """Home.py plus pages/*.py, optionally restricted to file name prefixes."""
+    pages = [os.path.relpath(p, ROOT) for p in glob.glob(os.path.join(ROOT, "pages", "*.py"))]
+    paths = ["Home.py"] + sorted(pages, key=lambda p: (int(os.path.basename(p).split("_")[0])
+                                                       if os.path.basename(p).split("_")[0].isdigit() else 999, p))
+    if selectors:
+        paths = [p for p in paths if os.path.basename(p).startswith(tuple(selectors))]
+    return paths
+
+
+def budget_for(page):
+    return {**COLD_START_BUDGET_MS, **PAGE_BUDGET_OVERRIDES_MS.get(page, {})}
+
+
+def run_in_fresh_process(path, timeout=60):
+    """Profile `path` in a new interpreter; returns the result dict (or an error entry)."""
+    cmd = [sys.executable, "-m", "utils.startup_profiler", "--child", path, "--timeout", str(timeout)]
+    try:
+        proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, timeout=timeout * 2 + 30)
+    except subprocess.TimeoutExpired:
+        return {"page": os.path.basename(path), "errors": ["timeout"], "import_ms": None, "first_render_ms": None}
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    tail = (proc.stderr or proc.stdout).strip().splitlines()[-1:] or ["no output"]
+    return {"page": os.path.basename(path), "errors": [f"profiler: {tail[0]}"], "import_ms": None, "first_render_ms": None}
+
+
+def check_budget(result):
+    """
+    List of budget violations for one page result. A page that failed to
+    import or render (errors, timeout, missing timing) is a violation too,
+    since its timings do not measure a real cold start.
+    """
+    budget = budget_for(result["page"])
+    over = [f"error {e}" for e in result.get("errors", [])]
+    for phase in ("import", "first_render"):
+        ms = result.get(f"{phase}_ms")
+        if ms is None:
+            over.append(f"{phase} tidak terukur")
+        elif ms > budget[phase]:
+            over.append(f"{phase} {ms:.0f} ms > {budget[phase]} ms")
+    return over
+
+
+def profile_pages(paths, timeout=60, report_path=REPORT_PATH):
+    results = []
+    for path in paths:
+        result = run_in_fresh_process(path, timeout)
+        result["over_budget"] = check_budget(result)
+        results.append(result)
+        imp, ren = result.get("import_ms"), result.get("first_render_ms")
+        flag = "  ⚠️ " + "; ".join(result["over_budget"]) if result["over_budget"] else ""
+        print(f"{result['page'][:48]:<48} import {imp or 0:7.0f} ms  render {ren or 0:7.0f} ms{flag}", flush=True)
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0],
+        "budget_ms": COLD_START_BUDGET_MS,
+        "pages": results,
+    }
+    if report_path:
+        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start import / first-render profiler")
+    parser.add_argument("pages", nargs="*", help="page prefixes (e.g. 12_ 46_); default: all pages")
+    parser.add_argument("--timeout", type=int, default=60, help="seconds per page render")
+    parser.add_argument("--out", default=REPORT_PATH, help="JSON report path")
+    parser.add_argument("--check", action="store_true", help="exit 1 when a page fails or exceeds its budget")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(RESULT_MARKER + json.dumps(profile_page(args.child, args.timeout), ensure_ascii=False), flush=True)
+        return 0
+
+    report = profile_pages(page_files(args.pages), args.timeout, args.out)
+    failed = [r for r in report["pages"] if r["over_budget"]]
+    print(f"\n{len(report['pages'])} halaman diprofil, {len(failed)} melewati budget. Laporan: {args.out}")
+    return 1 if args.check and failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())